@@ -0,0 +1,47 @@
+"""Vector content store: full point content keyed by project and content hash
+
+Revision ID: 008_vector_content_store
+Revises: 007_agent_framework_setup
+Create Date: 2025-10-30
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "008_vector_content_store"
+down_revision = "007_agent_framework_setup"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    inspector = inspect(op.get_bind())
+    if "vector_contents" in inspector.get_table_names():
+        return
+
+    op.create_table(
+        "vector_contents",
+        sa.Column("project_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("content_hash", sa.String(length=64), nullable=False),
+        sa.Column("content", sa.Text(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(["project_id"], ["projects.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("project_id", "content_hash"),
+    )
+
+
+def downgrade() -> None:
+    inspector = inspect(op.get_bind())
+    if "vector_contents" in inspector.get_table_names():
+        op.drop_table("vector_contents")
@@ -0,0 +1,112 @@
+"""Document version deltas: snapshot plus compressed delta chains
+
+Existing rows stay full snapshots; re-encode them into delta chains with
+`python -m app.services.document_versions compact`. Before downgrading, run
+`python -m app.services.document_versions expand` to rewrite deltas as
+snapshots.
+
+Revision ID: 009_document_version_deltas
+Revises: 008_vector_content_store
+Create Date: 2025-11-03
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision = "009_document_version_deltas"
+down_revision = "008_vector_content_store"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    inspector = inspect(op.get_bind())
+    columns = {column["name"] for column in inspector.get_columns("document_versions")}
+    if "content_storage" in columns:
+        return
+
+    op.add_column(
+        "document_versions",
+        sa.Column(
+            "content_storage",
+            sa.String(length=10),
+            server_default="snapshot",
+            nullable=False,
+        ),
+    )
+    op.add_column(
+        "document_versions", sa.Column("content_delta", sa.LargeBinary(), nullable=True)
+    )
+    op.add_column(
+        "document_versions",
+        sa.Column("delta_base_version", sa.Integer(), nullable=True),
+    )
+    op.add_column(
+        "document_versions", sa.Column("snapshot_version", sa.Integer(), nullable=True)
+    )
+    op.add_column(
+        "document_versions",
+        sa.Column(
+            "delta_chain_length", sa.Integer(), server_default="0", nullable=False
+        ),
+    )
+    op.add_column(
+        "document_versions",
+        sa.Column("content_hash", sa.String(length=64), nullable=True),
+    )
+    op.alter_column("document_versions", "content", nullable=True)
+
+    # Existing rows are snapshots; record their hash for read verification
+    op.execute(
+        "UPDATE document_versions "
+        "SET content_hash = encode(sha256(convert_to(content, 'UTF8')), 'hex')"
+    )
+
+    op.create_check_constraint(
+        "check_document_content_storage",
+        "document_versions",
+        "(content_storage = 'snapshot' AND content IS NOT NULL) OR "
+        "(content_storage = 'delta' AND content_delta IS NOT NULL "
+        "AND delta_base_version IS NOT NULL)",
+    )
+
+
+def downgrade() -> None:
+    inspector = inspect(op.get_bind())
+    columns = {column["name"] for column in inspector.get_columns("document_versions")}
+    if "content_storage" not in columns:
+        return
+
+    delta_rows = (
+        op.get_bind()
+        .execute(
+            sa.text(
+                "SELECT count(*) FROM document_versions WHERE content_storage = 'delta'"
+            )
+        )
+        .scalar()
+    )
+    if delta_rows:
+        raise RuntimeError(
+            f"{delta_rows} document versions are stored as deltas; run "
+            "`python -m app.services.document_versions expand` before downgrading"
+        )
+
+    op.drop_constraint(
+        "check_document_content_storage", "document_versions", type_="check"
+    )
+    op.alter_column("document_versions", "content", nullable=False)
+    for column in (
+        "content_hash",
+        "delta_chain_length",
+        "snapshot_version",
+        "delta_base_version",
+        "content_delta",
+        "content_storage",
+    ):
+        op.drop_column("document_versions", column)
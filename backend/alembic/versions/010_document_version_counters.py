@@ -0,0 +1,53 @@
+"""Document version counters: atomic per-document version allocation
+
+One row per (project_id, document_type) holds the last allocated version;
+new versions are numbered by an upsert on it (see
+app.services.document_version_counters). Counters are backfilled from the
+existing versions.
+
+Revision ID: 010_document_version_counters
+Revises: 009_document_version_deltas
+Create Date: 2025-11-05
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "010_document_version_counters"
+down_revision = "009_document_version_deltas"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    inspector = inspect(op.get_bind())
+    if "document_version_counters" in inspector.get_table_names():
+        return
+
+    op.create_table(
+        "document_version_counters",
+        sa.Column("project_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("document_type", sa.String(length=50), nullable=False),
+        sa.Column("last_version", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["project_id"], ["projects.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("project_id", "document_type"),
+    )
+
+    op.execute(
+        "INSERT INTO document_version_counters "
+        "(project_id, document_type, last_version) "
+        "SELECT project_id, document_type, max(version) "
+        "FROM document_versions GROUP BY project_id, document_type"
+    )
+
+
+def downgrade() -> None:
+    inspector = inspect(op.get_bind())
+    if "document_version_counters" in inspector.get_table_names():
+        op.drop_table("document_version_counters")
@@ -0,0 +1,168 @@
+"""Document latest-version pointer and covering version index
+
+document_version_counters.latest_version_id points at the highest existing
+version of each document and is maintained by a row trigger on
+document_versions, so "current version of type X in project Y" is two
+primary key lookups. A covering index on (project_id, document_type,
+version DESC, id) serves latest-version fallbacks, predecessor lookups and
+listings in index order (summary listings index-only); it supersedes
+ix_documents_project_type.
+
+On large tables, build the index with CREATE INDEX CONCURRENTLY ahead of
+this migration (the statement below is skipped when the index exists).
+
+Revision ID: 011_document_latest_version
+Revises: 010_document_version_counters
+Create Date: 2025-11-06
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "011_document_latest_version"
+down_revision = "010_document_version_counters"
+branch_labels = None
+depends_on = None
+
+
+COVERING_INDEX = (
+    "CREATE INDEX IF NOT EXISTS ix_document_versions_type_version_desc "
+    "ON document_versions (project_id, document_type, version DESC, id) "
+    "INCLUDE (created_by, readability_score, grammar_score, created_at, updated_at)"
+)
+
+REFRESH_FUNCTION = """
+CREATE OR REPLACE FUNCTION refresh_document_latest_version(
+    p_project_id uuid, p_document_type varchar
+) RETURNS void AS $$
+BEGIN
+    UPDATE document_version_counters c
+    SET latest_version_id = (
+        SELECT v.id
+        FROM document_versions v
+        WHERE v.project_id = p_project_id
+          AND v.document_type = p_document_type
+        ORDER BY v.version DESC
+        LIMIT 1
+    )
+    WHERE c.project_id = p_project_id
+      AND c.document_type = p_document_type;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+TRIGGER_FUNCTION = """
+CREATE OR REPLACE FUNCTION document_versions_latest_pointer()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        -- Versions are allocated in increasing order: a new row is usually
+        -- the latest, and only then does the pointer move
+        UPDATE document_version_counters c
+        SET latest_version_id = NEW.id
+        WHERE c.project_id = NEW.project_id
+          AND c.document_type = NEW.document_type
+          AND NOT EXISTS (
+              SELECT 1 FROM document_versions v
+              WHERE v.project_id = NEW.project_id
+                AND v.document_type = NEW.document_type
+                AND v.version > NEW.version
+          );
+        RETURN NULL;
+    END IF;
+
+    PERFORM refresh_document_latest_version(OLD.project_id, OLD.document_type);
+    IF TG_OP = 'UPDATE' AND (
+        NEW.project_id IS DISTINCT FROM OLD.project_id
+        OR NEW.document_type IS DISTINCT FROM OLD.document_type
+    ) THEN
+        PERFORM refresh_document_latest_version(NEW.project_id, NEW.document_type);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+TRIGGER = (
+    "CREATE TRIGGER document_versions_latest_pointer "
+    "AFTER INSERT OR DELETE OR UPDATE OF project_id, document_type, version "
+    "ON document_versions "
+    "FOR EACH ROW EXECUTE FUNCTION document_versions_latest_pointer()"
+)
+
+BACKFILL = """
+UPDATE document_version_counters c
+SET latest_version_id = (
+    SELECT v.id
+    FROM document_versions v
+    WHERE v.project_id = c.project_id
+      AND v.document_type = c.document_type
+    ORDER BY v.version DESC
+    LIMIT 1
+)
+"""
+
+
+def upgrade() -> None:
+    inspector = inspect(op.get_bind())
+    columns = {
+        column["name"] for column in inspector.get_columns("document_version_counters")
+    }
+    if "latest_version_id" in columns:
+        return
+
+    op.add_column(
+        "document_version_counters",
+        sa.Column("latest_version_id", postgresql.UUID(as_uuid=True), nullable=True),
+    )
+    op.create_foreign_key(
+        "fk_document_version_counters_latest_version",
+        "document_version_counters",
+        "document_versions",
+        ["latest_version_id"],
+        ["id"],
+        ondelete="SET NULL",
+    )
+
+    op.execute(REFRESH_FUNCTION)
+    op.execute(TRIGGER_FUNCTION)
+    op.execute(TRIGGER)
+    op.execute(BACKFILL)
+
+    op.execute(COVERING_INDEX)
+    op.drop_index("ix_documents_project_type", table_name="document_versions")
+
+
+def downgrade() -> None:
+    inspector = inspect(op.get_bind())
+    columns = {
+        column["name"] for column in inspector.get_columns("document_version_counters")
+    }
+    if "latest_version_id" not in columns:
+        return
+
+    op.create_index(
+        "ix_documents_project_type",
+        "document_versions",
+        ["project_id", "document_type"],
+        unique=False,
+    )
+    op.execute("DROP INDEX IF EXISTS ix_document_versions_type_version_desc")
+
+    op.execute(
+        "DROP TRIGGER IF EXISTS document_versions_latest_pointer ON document_versions"
+    )
+    op.execute("DROP FUNCTION IF EXISTS document_versions_latest_pointer()")
+    op.execute("DROP FUNCTION IF EXISTS refresh_document_latest_version(uuid, varchar)")
+    op.drop_constraint(
+        "fk_document_version_counters_latest_version",
+        "document_version_counters",
+        type_="foreignkey",
+    )
+    op.drop_column("document_version_counters", "latest_version_id")
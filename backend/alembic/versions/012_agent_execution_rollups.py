@@ -0,0 +1,57 @@
+"""Agent execution rollups: incrementally maintained execution metrics
+
+One row per (project_id, agent_type, hour of started_at) with additive
+counters, updated in the transactions that write agent_executions (see
+app.services.agent_metrics_rollup). Run
+``python -m app.services.agent_metrics_rollup backfill`` after upgrading to
+load existing history.
+
+Revision ID: 012_agent_execution_rollups
+Revises: 011_document_latest_version
+Create Date: 2025-11-07
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "012_agent_execution_rollups"
+down_revision = "011_document_latest_version"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    inspector = inspect(op.get_bind())
+    if "agent_execution_rollups" in inspector.get_table_names():
+        return
+
+    op.create_table(
+        "agent_execution_rollups",
+        sa.Column("project_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("agent_type", sa.String(length=50), nullable=False),
+        sa.Column("bucket_start", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("started_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("completed_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("failed_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("finished_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column(
+            "duration_seconds_sum", sa.Float(), nullable=False, server_default="0"
+        ),
+        sa.Column(
+            "open_started_epoch_sum", sa.Float(), nullable=False, server_default="0"
+        ),
+        sa.ForeignKeyConstraint(["project_id"], ["projects.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("project_id", "agent_type", "bucket_start"),
+    )
+
+
+def downgrade() -> None:
+    inspector = inspect(op.get_bind())
+    if "agent_execution_rollups" in inspector.get_table_names():
+        op.drop_table("agent_execution_rollups")
@@ -0,0 +1,62 @@
+"""Agent token usage: per-execution usage and rollup sums
+
+Adds prompt and completion token counts and model cost to agent_executions,
+and their sums to agent_execution_rollups. Existing executions have no
+recorded usage, so both start at zero and the rollup stays consistent
+without a backfill.
+
+Revision ID: 013_agent_token_usage
+Revises: 012_agent_execution_rollups
+Create Date: 2025-11-10
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision = "013_agent_token_usage"
+down_revision = "012_agent_execution_rollups"
+branch_labels = None
+depends_on = None
+
+EXECUTION_COLUMNS = (
+    ("prompt_tokens", sa.BigInteger()),
+    ("completion_tokens", sa.BigInteger()),
+    ("cost_usd", sa.Float()),
+)
+ROLLUP_COLUMNS = (
+    ("prompt_tokens_sum", sa.BigInteger()),
+    ("completion_tokens_sum", sa.BigInteger()),
+    ("cost_usd_sum", sa.Float()),
+)
+
+
+def _add_missing(table: str, columns: tuple) -> None:
+    existing = {column["name"] for column in inspect(op.get_bind()).get_columns(table)}
+    for name, column_type in columns:
+        if name not in existing:
+            op.add_column(
+                table,
+                sa.Column(name, column_type, nullable=False, server_default="0"),
+            )
+
+
+def _drop_present(table: str, columns: tuple) -> None:
+    existing = {column["name"] for column in inspect(op.get_bind()).get_columns(table)}
+    for name, _ in columns:
+        if name in existing:
+            op.drop_column(table, name)
+
+
+def upgrade() -> None:
+    _add_missing("agent_executions", EXECUTION_COLUMNS)
+    _add_missing("agent_execution_rollups", ROLLUP_COLUMNS)
+
+
+def downgrade() -> None:
+    _drop_present("agent_execution_rollups", ROLLUP_COLUMNS)
+    _drop_present("agent_executions", EXECUTION_COLUMNS)
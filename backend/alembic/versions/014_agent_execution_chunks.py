@@ -0,0 +1,54 @@
+"""Agent execution chunks: incrementally persisted streamed output
+
+One row per chunk of an execution's streamed output, written in batches
+while the agent generates (see app.agents.streaming). The assembled output
+is still stored in agent_executions.output_data on completion.
+
+Revision ID: 014_agent_execution_chunks
+Revises: 013_agent_token_usage
+Create Date: 2025-11-12
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "014_agent_execution_chunks"
+down_revision = "013_agent_token_usage"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    inspector = inspect(op.get_bind())
+    if "agent_execution_chunks" in inspector.get_table_names():
+        return
+
+    op.create_table(
+        "agent_execution_chunks",
+        sa.Column("execution_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("project_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("seq", sa.Integer(), nullable=False),
+        sa.Column("content", sa.Text(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.text("now()"),
+        ),
+        # Chunks are committed while the transaction creating the execution
+        # may still be open, so they reference the project, not the execution
+        sa.ForeignKeyConstraint(["project_id"], ["projects.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("execution_id", "seq"),
+    )
+
+
+def downgrade() -> None:
+    inspector = inspect(op.get_bind())
+    if "agent_execution_chunks" in inspector.get_table_names():
+        op.drop_table("agent_execution_chunks")
@@ -10,4 +10,5 @@ __all__ = [
     "tracker",
     "state_manager",
     "resilience",
+    "scheduler",
 ]
@@ -1,5 +1,5 @@
 """ADK protocol stubs for future remote agent support (MVP only)."""
 
-from .protocol import ADKAgentProtocol, RemoteAgentWrapper
+from .protocol import ADKAgentProtocol, RemoteAgentWrapper, StreamingAgentProtocol
 
-__all__ = ["ADKAgentProtocol", "RemoteAgentWrapper"]
+__all__ = ["ADKAgentProtocol", "RemoteAgentWrapper", "StreamingAgentProtocol"]
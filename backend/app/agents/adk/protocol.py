@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from collections.abc import AsyncIterator
 from typing import Protocol
 from uuid import UUID
 
@@ -14,6 +15,18 @@ class ADKAgentProtocol(Protocol):
         ...
 
 
+class StreamingAgentProtocol(ADKAgentProtocol, Protocol):
+    def stream(
+        self, input: AgentInput
+    ) -> AsyncIterator[str | AgentOutput]:  # pragma: no cover - interface
+        """Yield content deltas as they are generated.
+
+        May end with an AgentOutput carrying status and metadata; its content
+        can be left empty and is filled with the assembled deltas.
+        """
+        ...
+
+
 class RemoteAgentWrapper:
     """
     Wrapper for future remote agent calls via ADK.
@@ -0,0 +1,445 @@
+"""Token budgets for agent model calls.
+
+Budgets apply at three scopes: one execution (over its lifetime), one
+project and the whole deployment (both per fixed time window). Before a
+model call the caller reserves an upper bound of the tokens it may use;
+the reservation fails with BudgetExceeded if used plus reserved tokens
+would pass a hard limit at any scope, so concurrent agents cannot overspend
+between check and use. After the call the reservation is settled: the
+reserved tokens are released and the actual usage is added. Check and
+update are Lua scripts, so they are atomic across worker processes.
+
+Passing a soft limit (a fraction of the hard limit) does not block the
+call; the reservation reports the scopes over their soft limit so callers
+can throttle heavy projects, and the event is logged and counted.
+
+Execution and project counters live under the project's Redis key prefix,
+global counters under the system project's, so a reservation takes two
+round trips; when the global check fails the project reservation is
+released again. A reservation that is never settled (process crash) holds
+its tokens until the counters expire.
+
+Usage::
+
+    async with token_budget.spend(project_id, execution_id, 4000) as reservation:
+        response = await model.generate(prompt, max_tokens=2000)
+        reservation.record(TokenUsage(response.prompt_tokens, ...))
+    await tracker.record_usage(execution_id, reservation.usage)
+
+Graph nodes get this for free: the scheduler reserves a task's max_tokens
+around its agent call and the orchestrator records the settled usage on the
+node's execution. The agent finds the reservation with current_reservation()
+and records what its model calls used on it.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import time
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any
+from uuid import UUID
+
+from ..constants import SYSTEM_PROJECT_ID
+from ..core.config import get_settings
+from ..core.deadline import check_deadline, no_deadline
+from ..infrastructure.redis.redis_service import redis_service
+
+# Counters of one execution outlive any realistic execution
+EXECUTION_BUDGET_TTL_SECONDS = 86400
+
+SCOPES = ("execution", "project", "global")
+
+# Reservation of the agent call in progress (None: calls are not budgeted)
+_reservation: ContextVar[TokenReservation | None] = ContextVar(
+    "token_reservation", default=None
+)
+
+# Reserve ARGV[1] tokens on every key unless that passes a hard limit.
+# KEYS: counter hashes (fields used, reserved); ARGV[2 * i] and
+# ARGV[2 * i + 1]: TTL and hard limit (-1: none) of KEYS[i].
+# Returns {0, total after reserving per key} or {i, current total} for the
+# first key whose limit would be passed
+RESERVE_LUA = """
+local tokens = tonumber(ARGV[1])
+local totals = {}
+for i, key in ipairs(KEYS) do
+    local counters = redis.call('HMGET', key, 'used', 'reserved')
+    local total = (tonumber(counters[1]) or 0) + (tonumber(counters[2]) or 0)
+    local hard = tonumber(ARGV[2 * i + 1])
+    if hard >= 0 and total + tokens > hard then
+        return {i, total}
+    end
+    totals[i] = total + tokens
+end
+for i, key in ipairs(KEYS) do
+    redis.call('HINCRBY', key, 'reserved', tokens)
+    redis.call('EXPIRE', key, ARGV[2 * i])
+end
+return {0, unpack(totals)}
+"""
+
+# Release ARGV[1] reserved tokens and add ARGV[2] used tokens on every key.
+# ARGV[2 + i]: TTL of KEYS[i]. Returns 1
+SETTLE_LUA = """
+local reserved = tonumber(ARGV[1])
+local used = tonumber(ARGV[2])
+for i, key in ipairs(KEYS) do
+    if redis.call('HINCRBY', key, 'reserved', -reserved) < 0 then
+        redis.call('HSET', key, 'reserved', 0)
+    end
+    if used > 0 then
+        redis.call('HINCRBY', key, 'used', used)
+    end
+    redis.call('EXPIRE', key, ARGV[2 + i])
+end
+return 1
+"""
+
+SCRIPT_SHAS = {
+    script: hashlib.sha1(script.encode(), usedforsecurity=False).hexdigest()
+    for script in (RESERVE_LUA, SETTLE_LUA)
+}
+
+
+async def _run_script(conn: Any, script: str, keys: list[str], args: list[Any]) -> Any:
+    from redis.exceptions import NoScriptError
+
+    try:
+        return await conn.evalsha(SCRIPT_SHAS[script], len(keys), *keys, *args)
+    except NoScriptError:
+        # EVAL caches the script for subsequent EVALSHA calls
+        return await conn.eval(script, len(keys), *keys, *args)
+
+
+@dataclass(frozen=True)
+class TokenUsage:
+    """Model usage of one or more calls."""
+
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cost_usd: float = 0.0
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+    def __add__(self, other: TokenUsage) -> TokenUsage:
+        return TokenUsage(
+            self.prompt_tokens + other.prompt_tokens,
+            self.completion_tokens + other.completion_tokens,
+            self.cost_usd + other.cost_usd,
+        )
+
+
+class BudgetExceeded(RuntimeError):
+    """A reservation would pass a hard token limit."""
+
+    def __init__(self, scope: str, limit: int, committed: int, requested: int) -> None:
+        super().__init__(
+            f"{scope} token budget exceeded: {committed} used or reserved "
+            f"+ {requested} requested > {limit}"
+        )
+        self.scope = scope
+        self.limit = limit
+        self.committed = committed
+        self.requested = requested
+
+
+@dataclass
+class TokenReservation:
+    """Tokens held for one model call until it is settled."""
+
+    project_id: UUID
+    execution_id: UUID
+    tokens: int
+    window_start: int
+    # Scopes whose soft limit this reservation passed
+    soft_exceeded: tuple[str, ...] = ()
+    usage: TokenUsage | None = None
+    settled: bool = False
+
+    def record(self, usage: TokenUsage) -> None:
+        """Set the actual usage, added to the counters when settled."""
+        self.usage = usage if self.usage is None else self.usage + usage
+
+
+@contextmanager
+def reservation_scope(reservation: TokenReservation) -> Iterator[None]:
+    """Make a reservation the current one for the enclosed agent call."""
+    token = _reservation.set(reservation)
+    try:
+        yield
+    finally:
+        _reservation.reset(token)
+
+
+def current_reservation() -> TokenReservation | None:
+    """Reservation of the running agent call; agents record their usage on it."""
+    return _reservation.get()
+
+
+class TokenBudget:
+    """Per-execution, per-project and global token budgets in Redis.
+
+    Args:
+        redis: Service providing execute_with_retry (defaults to redis_service)
+        per_execution: Hard limit for one execution (None: unlimited)
+        per_project: Hard limit for one project per window (None: unlimited)
+        global_limit: Hard limit for all projects per window (None: unlimited)
+        window_seconds: Length of the project and global windows
+        soft_ratio: Soft limit as a fraction of the hard limit
+    """
+
+    def __init__(
+        self,
+        redis: Any | None = None,
+        per_execution: int | None = None,
+        per_project: int | None = None,
+        global_limit: int | None = None,
+        window_seconds: int = 3600,
+        soft_ratio: float = 0.8,
+    ) -> None:
+        if window_seconds < 1:
+            raise ValueError("window_seconds must be positive")
+        if not 0 < soft_ratio <= 1:
+            raise ValueError("soft_ratio must be in (0, 1]")
+        self.redis = redis or redis_service
+        self.limits = {
+            "execution": per_execution,
+            "project": per_project,
+            "global": global_limit,
+        }
+        self.window_seconds = window_seconds
+        self.soft_ratio = soft_ratio
+        self._counts = {
+            "reserved": 0,
+            "rejected": 0,
+            "settled": 0,
+            "tokens_used": 0,
+            **{f"soft_exceeded_{scope}": 0 for scope in SCOPES},
+            **{f"rejected_{scope}": 0 for scope in SCOPES},
+        }
+        self.logger = logging.getLogger(__name__)
+
+    def soft_limit(self, scope: str) -> int | None:
+        hard = self.limits[scope]
+        return None if hard is None else int(hard * self.soft_ratio)
+
+    def _window_start(self) -> int:
+        return int(time.time()) // self.window_seconds * self.window_seconds
+
+    def _keys(
+        self, execution_id: UUID, window_start: int
+    ) -> tuple[list[str], list[str]]:
+        window_key = f"budget:tokens:window:{window_start}"
+        return [f"budget:tokens:execution:{execution_id}", window_key], [window_key]
+
+    def _ttls(self) -> tuple[list[int], list[int]]:
+        window_ttl = 2 * self.window_seconds
+        return [EXECUTION_BUDGET_TTL_SECONDS, window_ttl], [window_ttl]
+
+    async def _script(
+        self,
+        operation: str,
+        script: str,
+        project_id: UUID,
+        keys: list[str],
+        args: list[Any],
+    ) -> Any:
+        async def _call(conn: Any, keys: list[str], args: list[Any]) -> Any:
+            return await _run_script(conn, script, keys, args)
+
+        return await self.redis.execute_with_retry(
+            operation=operation,
+            func=_call,
+            keys=keys,
+            args=args,
+            project_id=str(project_id),
+        )
+
+    async def reserve(
+        self, project_id: UUID, execution_id: UUID, tokens: int
+    ) -> TokenReservation:
+        """Reserve tokens for a model call.
+
+        Args:
+            project_id: Project UUID
+            execution_id: Execution making the call
+            tokens: Upper bound of the tokens the call may use
+
+        Returns:
+            Reservation to settle after the call
+
+        Raises:
+            BudgetExceeded: If a hard limit would be passed
+            ValueError: If tokens is negative
+            DeadlineExceeded: If the workflow deadline has passed (the call
+                would not finish in time)
+        """
+        if tokens < 0:
+            raise ValueError("tokens must be non-negative")
+        check_deadline("model.call")
+        window_start = self._window_start()
+        project_keys, global_keys = self._keys(execution_id, window_start)
+        project_ttls, global_ttls = self._ttls()
+
+        project_totals = await self._reserve_on(
+            project_id,
+            project_keys,
+            project_ttls,
+            ("execution", "project"),
+            tokens,
+        )
+        try:
+            global_totals = await self._reserve_on(
+                SYSTEM_PROJECT_ID, global_keys, global_ttls, ("global",), tokens
+            )
+        except BaseException:
+            await self._settle_on(project_id, project_keys, project_ttls, tokens, 0)
+            raise
+
+        totals = dict(
+            zip(
+                ("execution", "project", "global"),
+                project_totals + global_totals,
+                strict=True,
+            )
+        )
+        soft_exceeded = tuple(
+            scope
+            for scope, total in totals.items()
+            if (soft := self.soft_limit(scope)) is not None and total > soft
+        )
+        self._counts["reserved"] += 1
+        for scope in soft_exceeded:
+            self._counts[f"soft_exceeded_{scope}"] += 1
+        if soft_exceeded:
+            self.logger.warning(
+                "Token budget soft limit exceeded",
+                extra={
+                    "project_id": str(project_id),
+                    "execution_id": str(execution_id),
+                    "scopes": list(soft_exceeded),
+                    "totals": totals,
+                },
+            )
+        return TokenReservation(
+            project_id=project_id,
+            execution_id=execution_id,
+            tokens=tokens,
+            window_start=window_start,
+            soft_exceeded=soft_exceeded,
+        )
+
+    async def _reserve_on(
+        self,
+        project_id: UUID,
+        keys: list[str],
+        ttls: list[int],
+        scopes: tuple[str, ...],
+        tokens: int,
+    ) -> list[int]:
+        args: list[Any] = [tokens]
+        for ttl, scope in zip(ttls, scopes, strict=True):
+            limit = self.limits[scope]
+            args.extend((ttl, -1 if limit is None else limit))
+        result = await self._script(
+            "budget.reserve", RESERVE_LUA, project_id, keys, args
+        )
+        failed = int(result[0])
+        if failed:
+            scope = scopes[failed - 1]
+            self._counts["rejected"] += 1
+            self._counts[f"rejected_{scope}"] += 1
+            raise BudgetExceeded(scope, self.limits[scope], int(result[1]), tokens)
+        return [int(total) for total in result[1:]]
+
+    async def _settle_on(
+        self,
+        project_id: UUID,
+        keys: list[str],
+        ttls: list[int],
+        reserved: int,
+        used: int,
+    ) -> None:
+        await self._script(
+            "budget.settle", SETTLE_LUA, project_id, keys, [reserved, used, *ttls]
+        )
+
+    async def settle(
+        self, reservation: TokenReservation, usage: TokenUsage | None = None
+    ) -> None:
+        """Release a reservation and add the call's actual usage.
+
+        Usage is counted even if it exceeds the reservation. Settling twice
+        is a no-op. Settling is cleanup, so it runs even after the workflow's
+        deadline has passed.
+
+        Args:
+            reservation: Reservation returned by reserve()
+            usage: Actual usage (None or omitted: the call used nothing)
+        """
+        if reservation.settled:
+            return
+        reservation.settled = True
+        used = usage.total_tokens if usage is not None else 0
+        project_keys, global_keys = self._keys(
+            reservation.execution_id, reservation.window_start
+        )
+        project_ttls, global_ttls = self._ttls()
+        with no_deadline():
+            await self._settle_on(
+                reservation.project_id,
+                project_keys,
+                project_ttls,
+                reservation.tokens,
+                used,
+            )
+            await self._settle_on(
+                SYSTEM_PROJECT_ID, global_keys, global_ttls, reservation.tokens, used
+            )
+        self._counts["settled"] += 1
+        self._counts["tokens_used"] += used
+
+    @asynccontextmanager
+    async def spend(
+        self, project_id: UUID, execution_id: UUID, tokens: int
+    ) -> AsyncIterator[TokenReservation]:
+        """Reserve tokens for the block and settle with the recorded usage.
+
+        Record usage on the yielded reservation; if the block raises before
+        recording any, the reservation is released unused.
+        """
+        reservation = await self.reserve(project_id, execution_id, tokens)
+        try:
+            yield reservation
+        finally:
+            await self.settle(reservation, reservation.usage)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "limits": dict(self.limits),
+            "soft_limits": {scope: self.soft_limit(scope) for scope in SCOPES},
+            "window_seconds": self.window_seconds,
+            **self._counts,
+        }
+
+
+def _build_budget() -> TokenBudget:
+    settings = get_settings()
+    return TokenBudget(
+        per_execution=settings.AGENT_TOKEN_BUDGET_PER_EXECUTION,
+        per_project=settings.AGENT_TOKEN_BUDGET_PER_PROJECT,
+        global_limit=settings.AGENT_TOKEN_BUDGET_GLOBAL,
+        window_seconds=settings.AGENT_TOKEN_BUDGET_WINDOW_SECONDS,
+        soft_ratio=settings.AGENT_TOKEN_BUDGET_SOFT_RATIO,
+    )
+
+
+# Global budget instance
+token_budget = _build_budget()
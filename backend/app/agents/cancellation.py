@@ -0,0 +1,312 @@
+"""Cooperative cancellation and deadlines of agent workflows.
+
+A workflow runs inside CancellationRegistry.scope(context). The scope
+applies the context's deadline to everything the workflow awaits (see
+app.core.deadline: Redis commands, SQL statements, vector searches and
+model calls refuse to start after it) and cancels the workflow's task when
+the deadline passes or a cancel is requested, so the await it is blocked on
+stops at once instead of running into its own timeout. Cancellation
+propagates from the workflow's task to the tasks of a graph's nodes.
+
+cancel() stops a workflow of this process directly. For any other running
+workflow it records the request in the workflow's Redis state, which the
+workflow's scope polls, so any API instance can cancel any workflow within
+one poll interval.
+
+Resources are released while the cancellation unwinds: concurrency slots
+and token budget reservations by their context managers, anything else a
+workflow holds across awaits (such as queue tasks it enqueued) by release
+callbacks registered on its scope. Callbacks run last in, first out after
+the workflow has stopped, outside the deadline and each bounded by the
+release timeout, so cleanup cannot hang a cancelled workflow either.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import Any
+from uuid import UUID
+
+from ..core.config import get_settings
+from ..core.deadline import DeadlineExceeded, deadline_scope, no_deadline
+from .context import ExecutionContext
+from .state_manager import ExecutionStateManager
+
+logger = logging.getLogger(__name__)
+
+Release = Callable[[], Awaitable[Any]]
+
+# Reason of a cancellation caused by the deadline
+DEADLINE_REASON = "deadline exceeded"
+
+
+class ExecutionCancelled(Exception):
+    """A workflow was stopped by a cancel request."""
+
+    def __init__(self, correlation_id: UUID, reason: str) -> None:
+        super().__init__(f"Execution {correlation_id} cancelled: {reason}")
+        self.correlation_id = correlation_id
+        self.reason = reason
+
+
+@dataclass(frozen=True)
+class CancelOutcome:
+    """Result of a cancel request.
+
+    requested is False if no running workflow was found; stopped is True
+    once the workflow (of this process) has stopped and released its
+    resources.
+    """
+
+    requested: bool
+    stopped: bool = False
+
+
+class CancelScope:
+    """Cancellation handle of one running workflow."""
+
+    def __init__(
+        self, project_id: UUID, correlation_id: UUID, task: asyncio.Task[Any]
+    ) -> None:
+        self.project_id = project_id
+        self.correlation_id = correlation_id
+        self.task = task
+        self.reason: str | None = None
+        self.stopped = asyncio.Event()
+        self._closing = False
+        self._releases: list[tuple[str, Release]] = []
+
+    @property
+    def cancelled(self) -> bool:
+        return self.reason is not None
+
+    def add_release(self, name: str, release: Release) -> None:
+        """Release a resource when the workflow ends, however it ends.
+
+        For example, a queue task the workflow waits for is released with
+        add_release("queue task", lambda: queue_manager.cancel_task(task_id,
+        project_id)).
+
+        Args:
+            name: Resource name for logs
+            release: Awaited once after the workflow stops
+        """
+        self._releases.append((name, release))
+
+    def cancel(self, reason: str) -> bool:
+        """Cancel the workflow's task.
+
+        Returns:
+            False if the workflow was already cancelled or is finishing
+        """
+        if self.reason is not None or self._closing:
+            return False
+        self.reason = reason
+        self.task.cancel(reason)
+        return True
+
+    async def release_all(self, timeout_seconds: float) -> list[str]:
+        """Run the release callbacks, last registered first.
+
+        Returns:
+            Names of the releases that failed or timed out
+        """
+        failed: list[str] = []
+        with no_deadline():
+            while self._releases:
+                name, release = self._releases.pop()
+                try:
+                    await asyncio.wait_for(release(), timeout=timeout_seconds)
+                except Exception as e:
+                    failed.append(name)
+                    logger.warning(
+                        "Failed to release workflow resource",
+                        extra={
+                            "correlation_id": str(self.correlation_id),
+                            "resource": name,
+                            "error": str(e),
+                            "error_type": type(e).__name__,
+                        },
+                    )
+        return failed
+
+
+class CancellationRegistry:
+    """Scopes of the workflows running in this process.
+
+    Args:
+        state_manager: Execution state holding cross-process cancel requests
+            (defaults to a new ExecutionStateManager)
+        poll_interval_seconds: How often a scope polls its state for a cancel
+            request (0 disables polling)
+        release_timeout_seconds: Limit for each release callback
+    """
+
+    def __init__(
+        self,
+        state_manager: ExecutionStateManager | None = None,
+        poll_interval_seconds: float = 1.0,
+        release_timeout_seconds: float = 5.0,
+    ) -> None:
+        self.state_manager = state_manager
+        self.poll_interval_seconds = poll_interval_seconds
+        self.release_timeout_seconds = release_timeout_seconds
+        self._scopes: dict[UUID, CancelScope] = {}
+        self._counts = {
+            "cancel_requests": 0,
+            "cancelled": 0,
+            "deadline_exceeded": 0,
+            "release_failures": 0,
+        }
+
+    def _state(self) -> ExecutionStateManager:
+        if self.state_manager is None:
+            self.state_manager = ExecutionStateManager()
+        return self.state_manager
+
+    def get(self, correlation_id: UUID) -> CancelScope | None:
+        return self._scopes.get(correlation_id)
+
+    @asynccontextmanager
+    async def scope(self, context: ExecutionContext) -> AsyncIterator[CancelScope]:
+        """Run the enclosed workflow cancellably and within the context's deadline.
+
+        Raises:
+            ExecutionCancelled: If a cancel was requested
+            DeadlineExceeded: If the deadline passed
+            ValueError: If a workflow with the same correlation id is running
+        """
+        task = asyncio.current_task()
+        if task is None:
+            raise RuntimeError("cancel scopes need a running task")
+        correlation_id = context.correlation_id
+        if correlation_id in self._scopes:
+            raise ValueError(f"Workflow {correlation_id} is already running")
+        scope = self._scopes[correlation_id] = CancelScope(
+            context.project_id, correlation_id, task
+        )
+
+        loop = asyncio.get_running_loop()
+        timer = None
+        if context.deadline is not None:
+            remaining = (context.deadline - datetime.now(UTC)).total_seconds()
+            timer = loop.call_later(max(remaining, 0.0), scope.cancel, DEADLINE_REASON)
+        # Created before the deadline applies: polling must outlive it
+        watcher = None
+        if self.poll_interval_seconds > 0:
+            watcher = asyncio.create_task(self._watch(scope))
+
+        try:
+            with deadline_scope(context.deadline):
+                yield scope
+        except asyncio.CancelledError:
+            if scope.reason is None:
+                # Cancelled from outside (shutdown, client gone): propagate
+                raise
+            task.uncancel()
+            if scope.reason == DEADLINE_REASON:
+                self._counts["deadline_exceeded"] += 1
+                raise DeadlineExceeded("agent workflow") from None
+            self._counts["cancelled"] += 1
+            raise ExecutionCancelled(correlation_id, scope.reason) from None
+        except DeadlineExceeded:
+            # Refused by a downstream check before the timer fired
+            self._counts["deadline_exceeded"] += 1
+            raise
+        finally:
+            # No cancel may land on the cleanup awaits below
+            scope._closing = True
+            del self._scopes[correlation_id]
+            if timer is not None:
+                timer.cancel()
+            if watcher is not None:
+                watcher.cancel()
+                await asyncio.gather(watcher, return_exceptions=True)
+            failed = await scope.release_all(self.release_timeout_seconds)
+            self._counts["release_failures"] += len(failed)
+            scope.stopped.set()
+
+    async def _watch(self, scope: CancelScope) -> None:
+        while True:
+            await asyncio.sleep(self.poll_interval_seconds)
+            try:
+                state = await self._state().get_state(
+                    scope.project_id, scope.correlation_id, ["cancel_requested"]
+                )
+            except Exception as e:
+                logger.warning(
+                    "Failed to poll workflow cancel request",
+                    extra={
+                        "correlation_id": str(scope.correlation_id),
+                        "error": str(e),
+                        "error_type": type(e).__name__,
+                    },
+                )
+                continue
+            if state and state.get("cancel_requested"):
+                scope.cancel(state["cancel_requested"])
+                return
+
+    async def cancel(
+        self,
+        project_id: UUID,
+        correlation_id: UUID,
+        reason: str = "cancelled by user",
+        wait_seconds: float = 0.0,
+    ) -> CancelOutcome:
+        """Cancel a running workflow.
+
+        Args:
+            project_id: Project of the workflow
+            correlation_id: Correlation id of the workflow's context
+            reason: Recorded as the cancellation reason
+            wait_seconds: How long to wait for a workflow of this process
+                to stop and release its resources
+
+        Returns:
+            Whether a running workflow was found and whether it has stopped
+        """
+        self._counts["cancel_requests"] += 1
+        scope = self._scopes.get(correlation_id)
+        if scope is not None and scope.project_id == project_id:
+            if not scope.cancel(reason) and not scope.cancelled:
+                return CancelOutcome(requested=False)
+            if wait_seconds > 0:
+                try:
+                    await asyncio.wait_for(scope.stopped.wait(), timeout=wait_seconds)
+                except TimeoutError:
+                    pass
+            return CancelOutcome(requested=True, stopped=scope.stopped.is_set())
+
+        # Possibly running in another process: its scope polls the state
+        state = await self._state().get_state(project_id, correlation_id, ["status"])
+        if not state or state.get("status") != "running":
+            return CancelOutcome(requested=False)
+        requested = await self._state().update_fields(
+            project_id, correlation_id, {"cancel_requested": reason}
+        )
+        return CancelOutcome(requested=requested)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "running": len(self._scopes),
+            "poll_interval_seconds": self.poll_interval_seconds,
+            **self._counts,
+        }
+
+
+def _build_registry() -> CancellationRegistry:
+    settings = get_settings()
+    return CancellationRegistry(
+        poll_interval_seconds=settings.AGENT_CANCEL_POLL_SECONDS,
+        release_timeout_seconds=settings.AGENT_CANCEL_RELEASE_TIMEOUT_SECONDS,
+    )
+
+
+# Global cancellation registry
+agent_cancellation = _build_registry()
@@ -1,12 +1,14 @@
 from __future__ import annotations
 
 import logging
-from datetime import UTC, datetime
+from datetime import UTC, datetime, timedelta
 from typing import Any
 from uuid import UUID, uuid4
 
 from pydantic import BaseModel, Field
 
+from ..services.project_access import ProjectAccessGrant
+
 
 class ExecutionContext(BaseModel, frozen=True):
     project_id: UUID
@@ -16,14 +18,34 @@ class ExecutionContext(BaseModel, frozen=True):
     stage: str
     state: dict[str, Any] = Field(default_factory=dict)
     created_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
+    # Set once isolation is validated; reused instead of checking again
+    access: ProjectAccessGrant | None = None
+    # Absolute deadline of the workflow, checked by downstream operations
+    deadline: datetime | None = None
+
+    @property
+    def validated(self) -> bool:
+        """Whether the attached grant covers this context's project, user and language."""
+        access = self.access
+        return (
+            access is not None
+            and access.project_id == self.project_id
+            and access.user_id == self.user_id
+            and access.language == self.language
+        )
 
 
 def create_context(
-    project_id: UUID, user_id: UUID, stage: str, language: str
+    project_id: UUID,
+    user_id: UUID,
+    stage: str,
+    language: str,
+    timeout_seconds: float | None = None,
 ) -> ExecutionContext:
     """Create immutable execution context using existing correlation when available.
 
     Attempts to use correlation ID from telemetry context; if unavailable, generates a new UUID.
+    With timeout_seconds the context carries a deadline that far from now.
     """
     logger = logging.getLogger(__name__)
     try:
@@ -56,4 +78,9 @@ def create_context(
         language=language,
         user_id=user_id,
         stage=stage,
+        deadline=(
+            datetime.now(UTC) + timedelta(seconds=timeout_seconds)
+            if timeout_seconds is not None
+            else None
+        ),
     )
@@ -4,11 +4,13 @@ from fastapi import Depends
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from ..core.config import get_settings
 from ..db import get_database_session
 from .tracker import AgentExecutionTracker
 from .state_manager import ExecutionStateManager
 from .isolation import IsolationValidator
 from .orchestrator import AgentOrchestrator
+from .write_behind import tracker_write_behind
 
 
 async def tracker_provider(
@@ -27,7 +29,10 @@ async def tracker_provider(
     """
     # project_id validated by upstream dependency; not used here
     _ = project_id
-    return AgentExecutionTracker(session=session)
+    write_behind = (
+        tracker_write_behind if get_settings().AGENT_TRACKER_WRITE_BEHIND else None
+    )
+    return AgentExecutionTracker(session=session, write_behind=write_behind)
 
 
 async def isolation_provider(
@@ -4,10 +4,9 @@ from typing import Any, Dict
 import logging
 from uuid import UUID
 
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..models import Project
+from ..services.project_access import ProjectAccessGrant, ProjectAccessService
 
 
 class IsolationValidator:
@@ -15,17 +14,46 @@ class IsolationValidator:
 
     def __init__(self, session: AsyncSession) -> None:
         self.session = session
+        self.access = ProjectAccessService(session)
         self.logger = logging.getLogger(__name__)
 
-    async def validate_project_access(self, user_id: UUID, project_id: UUID) -> None:
-        result = await self.session.execute(
-            select(Project).where(
-                Project.id == project_id,
-                Project.created_by == user_id,
-                Project.is_deleted.is_(False),
+    async def validate(
+        self, user_id: UUID, project_id: UUID, language: str
+    ) -> ProjectAccessGrant:
+        """Validate access and language with one lookup.
+
+        Ownership, soft-delete status and language come from the same row, so
+        this costs at most one query (none when the request memo or the access
+        cache already holds the grant). Attach the returned grant to the
+        execution context so later layers do not check again.
+
+        Raises:
+            PermissionError: If the project is missing, deleted or not owned
+            ValueError: If language is empty or differs from the project's
+        """
+        if not isinstance(language, str) or not language.strip():
+            raise ValueError("language must be a non-empty string")
+        grant = await self.access.check(project_id, user_id)
+        if grant is None:
+            self.logger.error(
+                "Project access denied or not found",
+                extra={"user_id": str(user_id), "project_id": str(project_id)},
+            )
+            raise PermissionError("Project not found or access denied")
+        if grant.language != language:
+            self.logger.error(
+                "Language mismatch with project configuration",
+                extra={
+                    "project_id": str(project_id),
+                    "provided_language": language,
+                    "db_language": grant.language,
+                },
             )
-        )
-        if result.scalar_one_or_none() is None:
+            raise ValueError("Language mismatch with project configuration")
+        return grant
+
+    async def validate_project_access(self, user_id: UUID, project_id: UUID) -> None:
+        if await self.access.check(project_id, user_id) is None:
             self.logger.error(
                 "Project access denied or not found",
                 extra={"user_id": str(user_id), "project_id": str(project_id)},
@@ -37,13 +65,8 @@ class IsolationValidator:
     ) -> None:
         if not isinstance(language, str) or not language.strip():
             raise ValueError("language must be a non-empty string")
-        result = await self.session.execute(
-            select(Project.language).where(
-                Project.id == project_id,
-                Project.is_deleted.is_(False),
-            )
-        )
-        db_language = result.scalar_one_or_none()
+        # Reuses the grant of validate_project_access when it ran first
+        db_language = await self.access.project_language(project_id)
         if db_language is None:
             self.logger.error(
                 "Project not found or deleted",
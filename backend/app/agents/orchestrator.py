@@ -3,14 +3,29 @@ from __future__ import annotations
 import asyncio
 import logging
 import os
+from datetime import UTC, datetime, timedelta
 from typing import Any
+from uuid import UUID
 
 from opentelemetry.trace import Span
 
+from ..core.deadline import DeadlineExceeded
+from .budget import TokenBudget, token_budget
+from .cancellation import CancellationRegistry, ExecutionCancelled, agent_cancellation
 from .context import ExecutionContext
 from .contracts import AgentInput
 from .isolation import IsolationValidator
+from .result_cache import AgentResultCache, agent_result_cache
+from .scheduler import (
+    AgentGraphScheduler,
+    AgentTask,
+    AgentTaskGraph,
+    ConcurrencyLimiter,
+    NodeResult,
+    node_correlation_id,
+)
 from .state_manager import ExecutionStateManager
+from .streaming import AgentOutputStreaming, OutputStream, agent_output_streaming
 from .telemetry import add_common_span_attributes, start_span
 from .tracker import AgentExecutionTracker
 
@@ -23,10 +38,18 @@ class AgentOrchestrator:
         tracker: AgentExecutionTracker,
         state_manager: ExecutionStateManager,
         isolation: IsolationValidator,
+        result_cache: AgentResultCache | None = None,
+        streaming: AgentOutputStreaming | None = None,
+        cancellation: CancellationRegistry | None = None,
+        budget: TokenBudget | None = None,
     ) -> None:
         self.tracker = tracker
         self.state_manager = state_manager
         self.isolation = isolation
+        self.result_cache = result_cache or agent_result_cache
+        self.streaming = streaming or agent_output_streaming
+        self.cancellation = cancellation or agent_cancellation
+        self.budget = budget or token_budget
 
     async def initialize_crew(self, stage: str, context: ExecutionContext) -> Any:
         """Initialize CrewAI crew for a given stage.
@@ -45,6 +68,64 @@ class AgentOrchestrator:
         crew = Crew(agents=[], tasks=[], verbose=False)
         return crew
 
+    async def _validate_request(
+        self, context: ExecutionContext, input_data: AgentInput
+    ) -> ExecutionContext:
+        # Isolation checks (fail fast); a context validated upstream is reused
+        if not context.validated:
+            access = await self.isolation.validate(
+                user_id=context.user_id,
+                project_id=context.project_id,
+                language=context.language,
+            )
+            context = context.model_copy(update={"access": access})
+
+        # Validate input matches context
+        if input_data.project_id != context.project_id:
+            raise ValueError("Input project_id does not match execution context")
+        if input_data.language != context.language:
+            raise ValueError("Input language does not match project language")
+        return context
+
+    async def _end_read_transaction(self) -> None:
+        # Access checks may run on the tracker's (request) session and leave
+        # its implicit read transaction open; tracker writes begin their own
+        session = self.tracker.session
+        if session.in_transaction():
+            await session.commit()
+
+    @staticmethod
+    def _timeout_seconds() -> int:
+        return int(os.getenv("AGENT_EXECUTION_TIMEOUT_SECONDS", "300"))
+
+    def _with_deadline(self, context: ExecutionContext) -> ExecutionContext:
+        # A deadline set upstream is kept; otherwise the execution timeout applies
+        if context.deadline is not None:
+            return context
+        return context.model_copy(
+            update={
+                "deadline": datetime.now(UTC)
+                + timedelta(seconds=self._timeout_seconds())
+            }
+        )
+
+    async def _set_state_status(self, context: ExecutionContext, status: str) -> None:
+        # Best effort: a running status left behind only expires with the state
+        try:
+            await self.state_manager.update_fields(
+                context.project_id, context.correlation_id, {"status": status}
+            )
+        except Exception as e:
+            logging.warning(
+                "Failed to record workflow status in execution state",
+                extra={
+                    "correlation_id": str(context.correlation_id),
+                    "status": status,
+                    "error": str(e),
+                    "error_type": type(e).__name__,
+                },
+            )
+
     async def execute_agent_workflow(
         self,
         stage: str,
@@ -53,21 +134,19 @@ class AgentOrchestrator:
     ) -> dict:
         """Execute an agent workflow lifecycle with tracking and telemetry.
 
+        The workflow runs until the context's deadline (set from
+        AGENT_EXECUTION_TIMEOUT_SECONDS when absent) and can be stopped with
+        the cancellation registry (see app.agents.cancellation).
+
         Returns minimal execution metadata (execution_id, status).
-        """
-        # Isolation checks (fail fast)
-        await self.isolation.validate_project_access(
-            user_id=context.user_id, project_id=context.project_id
-        )
-        await self.isolation.validate_language_consistency(
-            project_id=context.project_id, language=context.language
-        )
 
-        # Validate input matches context
-        if input_data.project_id != context.project_id:
-            raise ValueError("Input project_id does not match execution context")
-        if input_data.language != context.language:
-            raise ValueError("Input language does not match project language")
+        Raises:
+            ExecutionCancelled: If the workflow was cancelled (recorded with
+                status cancelled)
+            TimeoutError: If the deadline passed (recorded as failed)
+        """
+        context = self._with_deadline(await self._validate_request(context, input_data))
+        await self._end_read_transaction()
 
         span: Span | None = None
         try:
@@ -90,34 +169,53 @@ class AgentOrchestrator:
                     input_data=input_data.model_dump(exclude_none=True),
                 )
 
-            # Initialize Redis execution state
-            await self.state_manager.create_state(context=context, stage=stage)
+            async with self.cancellation.scope(context):
+                # Initialize Redis execution state
+                await self.state_manager.create_state(context=context, stage=stage)
 
-            # Initialize crew (MVP)
-            crew = await self.initialize_crew(stage=stage, context=context)
+                # Initialize crew (MVP)
+                crew = await self.initialize_crew(stage=stage, context=context)
 
-            async def _run():
-                # TODO: Implement CrewAI task delegation (Story 8)
-                # Agent execution not implemented yet per compliance requirements
-                _ = crew
-                raise NotImplementedError(
-                    "Agent task delegation not implemented yet; see Story 8 for planned implementation."
-                )
+                async def _run():
+                    # TODO: Implement CrewAI task delegation (Story 8)
+                    # Agent execution not implemented yet per compliance requirements
+                    _ = crew
+                    raise NotImplementedError(
+                        "Agent task delegation not implemented yet; see Story 8 for planned implementation."
+                    )
 
-            timeout = int(os.getenv("AGENT_EXECUTION_TIMEOUT_SECONDS", "300"))
-            await asyncio.wait_for(_run(), timeout=timeout)
+                await _run()
 
             add_common_span_attributes(span, status="completed")
+            await self._set_state_status(context, "completed")
             return {"execution_id": str(execution_id), "status": "completed"}
 
+        except ExecutionCancelled as e:
+            logging.warning(
+                "Agent workflow cancelled",
+                extra={
+                    "correlation_id": str(context.correlation_id),
+                    "reason": e.reason,
+                },
+            )
+            if span:
+                add_common_span_attributes(span, status="cancelled")
+            await self.tracker.complete_execution(
+                execution_id=execution_id,
+                output_data={"cancel_reason": e.reason},
+                status="cancelled",
+            )
+            await self._set_state_status(context, "cancelled")
+            raise
         except TimeoutError:
             logging.exception("Agent workflow timed out")
             if span:
                 add_common_span_attributes(span, status="failed")
             await self.tracker.fail_execution(
                 correlation_id=context.correlation_id,
-                error_message=f"TimeoutError: Agent workflow timed out at stage {stage} after {os.getenv('AGENT_EXECUTION_TIMEOUT_SECONDS', '300')}s",
+                error_message=f"TimeoutError: Agent workflow timed out at stage {stage} after {self._timeout_seconds()}s",
             )
+            await self._set_state_status(context, "failed")
             raise
         except Exception as e:
             logging.exception("Agent workflow failed")
@@ -128,8 +226,192 @@ class AgentOrchestrator:
                 correlation_id=context.correlation_id,
                 error_message=f"{type(e).__name__}: Agent workflow failed at stage {stage}",
             )
+            await self._set_state_status(context, "failed")
             raise
 
+    async def execute_agent_graph(
+        self,
+        stage: str,
+        context: ExecutionContext,
+        input_data: AgentInput,
+        graph: AgentTaskGraph,
+        *,
+        limiter: ConcurrencyLimiter | None = None,
+        bypass_cache: bool = False,
+    ) -> dict:
+        """Run a graph of agent tasks of one stage, independent tasks in parallel.
+
+        Every node that runs gets its own execution record (agent type of the
+        node, correlation id derived from the context's). Tracker writes share
+        one session, so they are serialized; agent calls are not. The read
+        transaction left open by the access check is committed first; then
+        each write commits in its own short transaction (like
+        execute_agent_workflow's start), so no row or rollup bucket lock is held while agents run and
+        execution records are visible to other sessions at once. Results of
+        cacheable tasks come from the agent result cache when their inputs
+        are unchanged; bypass_cache recomputes them. Agents that stream
+        publish and persist their output incrementally under their node's
+        execution id (see app.agents.streaming). Tasks with max_tokens run
+        within the token budget; the usage their agents record is added to
+        their execution in the transaction that finishes it.
+
+        The graph runs until the context's deadline and can be cancelled like
+        a workflow; nodes still running when it stops are recorded as
+        cancelled (failed after the deadline).
+
+        Returns:
+            Overall status ("completed" only if every node completed) and the
+            status, execution id, output and error of each node
+
+        Raises:
+            ExecutionCancelled: If the graph was cancelled
+            DeadlineExceeded: If the deadline passed
+        """
+        context = self._with_deadline(await self._validate_request(context, input_data))
+        await self._end_read_transaction()
+        await self.state_manager.create_state(context=context, stage=stage)
+
+        tracker_lock = asyncio.Lock()
+        execution_ids: dict[str, UUID] = {}
+        finished: set[str] = set()
+
+        async def record_start(task: AgentTask, node_input: AgentInput) -> None:
+            async with tracker_lock, self.tracker.session.begin():
+                execution_ids[task.name] = await self.tracker.start_execution(
+                    project_id=context.project_id,
+                    agent_type=task.resolved_agent_type,
+                    correlation_id=node_input.correlation_id,
+                    input_data=node_input.model_dump(mode="json", exclude_none=True),
+                )
+
+        def open_stream(task: AgentTask, node_input: AgentInput) -> OutputStream | None:
+            execution_id = execution_ids.get(task.name)
+            if execution_id is None:
+                return None
+            return self.streaming.open(execution_id, context.project_id)
+
+        async def record_finish(task: AgentTask, result: NodeResult) -> None:
+            execution_id = execution_ids.get(task.name)
+            if execution_id is None:
+                # Cancelled before it ran: nothing was recorded
+                return
+            finished.add(task.name)
+            async with tracker_lock, self.tracker.session.begin():
+                if result.output is None:
+                    await self.tracker.fail_execution(
+                        correlation_id=node_correlation_id(
+                            context.correlation_id, task.name
+                        ),
+                        error_message=result.error or "Agent task failed",
+                    )
+                else:
+                    await self.tracker.complete_execution(
+                        execution_id=execution_id,
+                        output_data=result.output.model_dump(mode="json"),
+                        status=result.status,
+                    )
+                if result.usage is not None:
+                    await self.tracker.record_usage(execution_id, result.usage)
+
+        span = start_span("agent.graph.execute")
+        add_common_span_attributes(
+            span,
+            project_id=str(context.project_id),
+            stage=stage,
+            status="running",
+            language=context.language,
+        )
+
+        async def record_stopped(error: str, reason: str | None) -> None:
+            # Nodes interrupted by a cancel or the deadline never finished
+            for name, execution_id in execution_ids.items():
+                if name in finished:
+                    continue
+                try:
+                    async with self.tracker.session.begin():
+                        if reason is not None:
+                            await self.tracker.complete_execution(
+                                execution_id=execution_id,
+                                output_data={"cancel_reason": reason},
+                                status="cancelled",
+                            )
+                        else:
+                            await self.tracker.fail_execution(
+                                correlation_id=node_correlation_id(
+                                    context.correlation_id, name
+                                ),
+                                error_message=error,
+                            )
+                except Exception:
+                    logging.exception(
+                        "Failed to record interrupted agent task",
+                        extra={"task": name, "execution_id": str(execution_id)},
+                    )
+
+        scheduler = AgentGraphScheduler(
+            limiter=limiter,
+            task_timeout_seconds=self._timeout_seconds(),
+            on_start=record_start,
+            on_finish=record_finish,
+            result_cache=self.result_cache,
+            bypass_cache=bypass_cache,
+            open_stream=open_stream,
+            token_budget=self.budget,
+        )
+        try:
+            async with self.cancellation.scope(context):
+                results = await scheduler.run(graph, input_data)
+            status = (
+                "completed" if all(r.completed for r in results.values()) else "failed"
+            )
+            add_common_span_attributes(span, status=status)
+            await self._set_state_status(context, status)
+        except ExecutionCancelled as e:
+            logging.warning(
+                "Agent graph execution cancelled",
+                extra={
+                    "correlation_id": str(context.correlation_id),
+                    "reason": e.reason,
+                },
+            )
+            add_common_span_attributes(span, status="cancelled")
+            await record_stopped(str(e), e.reason)
+            await self._set_state_status(context, "cancelled")
+            raise
+        except DeadlineExceeded as e:
+            logging.exception("Agent graph execution timed out")
+            add_common_span_attributes(span, status="failed")
+            await record_stopped(f"DeadlineExceeded: {e}", None)
+            await self._set_state_status(context, "failed")
+            raise
+        except Exception:
+            logging.exception("Agent graph execution failed")
+            add_common_span_attributes(span, status="failed")
+            await self._set_state_status(context, "failed")
+            raise
+        finally:
+            span.end()
+
+        return {
+            "status": status,
+            "tasks": {
+                name: {
+                    "status": result.status,
+                    "execution_id": (
+                        str(execution_ids[name]) if name in execution_ids else None
+                    ),
+                    "output": (
+                        result.output.model_dump(mode="json")
+                        if result.output is not None
+                        else None
+                    ),
+                    "error": result.error,
+                    "duration_ms": result.duration_ms,
+                }
+                for name, result in results.items()
+            },
+        }
+
 
 async def get_orchestrator(
     tracker: AgentExecutionTracker,
@@ -0,0 +1,378 @@
+"""Content-addressed cache of agent results.
+
+Re-running a stage with unchanged inputs would repeat every model call. An
+agent result is cached under a SHA-256 of the canonical JSON of what
+determines it: agent type, prompt template version, model parameters and
+the normalized AgentInput (correlation id excluded, strings NFC-normalized,
+dict keys sorted). The input context includes the outputs of upstream
+agents, so a changed upstream result changes every downstream key.
+
+Entries live in Redis under the project's key prefix with a TTL, so they
+are shared by worker processes and never cross projects. Only completed
+outputs are stored, together with the name of their class in OUTPUT_TYPES
+so a hit is rebuilt with every field of a stage output; outputs of
+unregistered classes are not cached. Concurrent identical calls in one process are
+coalesced (single-flight): one caller computes, the others await its
+result. bypass=True skips the lookup and coalescing and stores the fresh
+result, which is how a caller forces regeneration.
+
+Cache errors never fail an agent call; they are logged and counted, and
+the agent runs uncached.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+import unicodedata
+from collections.abc import Awaitable, Callable, Mapping
+from dataclasses import dataclass
+from typing import Any
+from uuid import UUID
+
+from ..core.config import get_settings
+from ..infrastructure.redis.redis_service import redis_service
+from .contracts import (
+    AgentInput,
+    AgentOutput,
+    ArchitectureStageOutput,
+    ExecutionStatus,
+    IdeaStageOutput,
+    PlanningStageOutput,
+    SpecsStageOutput,
+)
+
+logger = logging.getLogger(__name__)
+
+# Bump to invalidate every entry when the key derivation or entry format changes
+CACHE_FORMAT_VERSION = 2
+KEY_PREFIX = "agent:result"
+
+# Output classes a cached entry can be rebuilt as, by the name stored with it
+OUTPUT_TYPES: dict[str, type[AgentOutput]] = {
+    cls.__name__: cls
+    for cls in (
+        AgentOutput,
+        IdeaStageOutput,
+        SpecsStageOutput,
+        ArchitectureStageOutput,
+        PlanningStageOutput,
+    )
+}
+
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, str):
+        return unicodedata.normalize("NFC", value)
+    if isinstance(value, Mapping):
+        return {str(k): _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    return value
+
+
+def normalize_input(input_data: AgentInput) -> dict[str, Any]:
+    """The fields of an agent input that determine its result."""
+    fields = input_data.model_dump(mode="json", exclude={"correlation_id"})
+    fields["user_message"] = fields["user_message"].strip()
+    return _normalize(fields)
+
+
+def canonical_json(value: Any) -> str:
+    return json.dumps(
+        value, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str
+    )
+
+
+def result_key(
+    agent_type: str,
+    prompt_version: str,
+    model_params: Mapping[str, Any],
+    input_data: AgentInput,
+) -> str:
+    """Content hash identifying an agent result."""
+    material = canonical_json(
+        {
+            "format": CACHE_FORMAT_VERSION,
+            "agent_type": agent_type,
+            "prompt_version": prompt_version,
+            "model_params": _normalize(model_params),
+            "input": normalize_input(input_data),
+        }
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class AgentTypeStats:
+    hits: int = 0
+    coalesced: int = 0
+    misses: int = 0
+    bypassed: int = 0
+    errors: int = 0
+    # Compute time of the results served without computing them again
+    latency_saved_ms: int = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        served = self.hits + self.coalesced
+        lookups = served + self.misses
+        return {
+            "hits": self.hits,
+            "coalesced": self.coalesced,
+            "misses": self.misses,
+            "bypassed": self.bypassed,
+            "errors": self.errors,
+            "hit_rate": served / lookups if lookups else 0.0,
+            "latency_saved_ms": self.latency_saved_ms,
+        }
+
+
+class AgentResultCache:
+    """Redis-backed, project-scoped cache of agent outputs with single-flight.
+
+    Args:
+        redis: Service providing execute_with_retry (defaults to redis_service)
+        ttl_seconds: Lifetime of an entry
+        enabled: When False every call computes and nothing is stored
+    """
+
+    def __init__(
+        self,
+        redis: Any | None = None,
+        ttl_seconds: int = 3600,
+        enabled: bool = True,
+    ) -> None:
+        if ttl_seconds < 1:
+            raise ValueError("ttl_seconds must be positive")
+        self.redis = redis or redis_service
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled
+        # (project_id, key) -> result of the call computing it
+        self._inflight: dict[tuple[UUID, str], asyncio.Future[_Computed]] = {}
+        self._stats: dict[str, AgentTypeStats] = {}
+
+    def _key(self, agent_type: str, digest: str) -> str:
+        return f"{KEY_PREFIX}:{agent_type}:{digest}"
+
+    def _stats_for(self, agent_type: str) -> AgentTypeStats:
+        stats = self._stats.get(agent_type)
+        if stats is None:
+            stats = self._stats[agent_type] = AgentTypeStats()
+        return stats
+
+    async def get_or_compute(
+        self,
+        agent_type: str,
+        input_data: AgentInput,
+        compute: Callable[[], Awaitable[AgentOutput]],
+        prompt_version: str = "",
+        model_params: Mapping[str, Any] | None = None,
+        *,
+        bypass: bool = False,
+    ) -> AgentOutput:
+        """Return the cached result of an agent call, computing it on a miss.
+
+        Args:
+            agent_type: Agent type (part of the key, and the stats bucket)
+            input_data: Agent input; its project scopes the entry
+            compute: Runs the agent
+            prompt_version: Prompt template version the agent uses
+            model_params: Model name, temperature and other call parameters
+            bypass: Skip lookup and coalescing; the fresh result is stored
+
+        Returns:
+            The agent output
+        """
+        stats = self._stats_for(agent_type)
+        if not self.enabled:
+            return await compute()
+
+        digest = result_key(agent_type, prompt_version, model_params or {}, input_data)
+        project_id = input_data.project_id
+        if bypass:
+            stats.bypassed += 1
+            computed = await self._compute(compute)
+            await self._store(project_id, agent_type, digest, computed)
+            return computed.output
+
+        flight_key = (project_id, digest)
+        while (inflight := self._inflight.get(flight_key)) is not None:
+            try:
+                computed = await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                if inflight.cancelled():
+                    # The computing caller was cancelled: take over
+                    continue
+                raise
+            stats.coalesced += 1
+            stats.latency_saved_ms += computed.duration_ms
+            return computed.output
+
+        future: asyncio.Future[_Computed] = asyncio.get_running_loop().create_future()
+        self._inflight[flight_key] = future
+        try:
+            cached = await self._load(project_id, agent_type, digest)
+            if cached is not None:
+                stats.hits += 1
+                stats.latency_saved_ms += cached.duration_ms
+                future.set_result(cached)
+                return cached.output
+
+            stats.misses += 1
+            computed = await self._compute(compute)
+            future.set_result(computed)
+            await self._store(project_id, agent_type, digest, computed)
+            return computed.output
+        except BaseException as e:
+            if not future.done():
+                if isinstance(e, Exception):
+                    # Waiters share the failure, as they would share a result
+                    future.set_exception(e)
+                    future.exception()  # Retrieved even if nobody waits
+                else:
+                    future.cancel()
+            raise
+        finally:
+            self._inflight.pop(flight_key, None)
+
+    async def _compute(
+        self, compute: Callable[[], Awaitable[AgentOutput]]
+    ) -> _Computed:
+        start = time.perf_counter()
+        output = await compute()
+        return _Computed(output, int((time.perf_counter() - start) * 1000))
+
+    async def _load(
+        self, project_id: UUID, agent_type: str, digest: str
+    ) -> _Computed | None:
+        from redis.asyncio import Redis
+
+        async def _get(conn: Redis, key: str) -> str | None:
+            return await conn.get(key)
+
+        try:
+            raw = await self.redis.execute_with_retry(
+                operation="agent_result_cache.get",
+                func=_get,
+                key=self._key(agent_type, digest),
+                project_id=str(project_id),
+            )
+            if raw is None:
+                return None
+            entry = json.loads(raw)
+            output_type = OUTPUT_TYPES[entry["output_type"]]
+            return _Computed(
+                output_type.model_validate(entry["output"]), int(entry["duration_ms"])
+            )
+        except Exception as e:
+            self._stats_for(agent_type).errors += 1
+            logger.warning(
+                "Agent result cache read failed",
+                extra={
+                    "project_id": str(project_id),
+                    "agent_type": agent_type,
+                    "error": str(e),
+                    "error_type": type(e).__name__,
+                },
+            )
+            return None
+
+    async def _store(
+        self, project_id: UUID, agent_type: str, digest: str, computed: _Computed
+    ) -> None:
+        if computed.output.status != ExecutionStatus.completed:
+            return
+        output_type = type(computed.output).__name__
+        if OUTPUT_TYPES.get(output_type) is not type(computed.output):
+            # A hit could not be rebuilt with the fields of this class
+            logger.debug(
+                "Agent output type not cacheable",
+                extra={"agent_type": agent_type, "output_type": output_type},
+            )
+            return
+        entry = json.dumps(
+            {
+                "output_type": output_type,
+                "output": computed.output.model_dump(mode="json"),
+                "duration_ms": computed.duration_ms,
+            }
+        )
+
+        from redis.asyncio import Redis
+
+        async def _set(conn: Redis, key: str, value: str, ex: int) -> bool:
+            return await conn.set(key, value, ex=ex)
+
+        try:
+            await self.redis.execute_with_retry(
+                operation="agent_result_cache.set",
+                func=_set,
+                key=self._key(agent_type, digest),
+                value=entry,
+                ex=self.ttl_seconds,
+                project_id=str(project_id),
+            )
+        except Exception as e:
+            self._stats_for(agent_type).errors += 1
+            logger.warning(
+                "Agent result cache write failed",
+                extra={
+                    "project_id": str(project_id),
+                    "agent_type": agent_type,
+                    "error": str(e),
+                    "error_type": type(e).__name__,
+                },
+            )
+
+    async def invalidate_project(self, project_id: UUID) -> int:
+        """Delete every cached result of a project.
+
+        Returns:
+            Number of entries deleted
+        """
+        from redis.asyncio import Redis
+
+        async def _delete_all(conn: Redis) -> int:
+            deleted = 0
+            async for key in conn.scan_iter(match=f"{KEY_PREFIX}:*"):
+                deleted += await conn.delete(key)
+            return deleted
+
+        return await self.redis.execute_with_retry(
+            operation="agent_result_cache.invalidate",
+            func=_delete_all,
+            project_id=str(project_id),
+        )
+
+    def stats(self) -> dict[str, Any]:
+        """Hit rate and latency saved per agent type."""
+        return {
+            "enabled": self.enabled,
+            "ttl_seconds": self.ttl_seconds,
+            "inflight": len(self._inflight),
+            "agent_types": {
+                agent_type: stats.as_dict()
+                for agent_type, stats in sorted(self._stats.items())
+            },
+        }
+
+
+@dataclass(frozen=True)
+class _Computed:
+    output: AgentOutput
+    duration_ms: int
+
+
+def _build_cache() -> AgentResultCache:
+    settings = get_settings()
+    return AgentResultCache(
+        ttl_seconds=settings.AGENT_RESULT_CACHE_TTL_SECONDS,
+        enabled=settings.AGENT_RESULT_CACHE_ENABLED,
+    )
+
+
+# Global cache instance
+agent_result_cache = _build_cache()
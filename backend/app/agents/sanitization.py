@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from typing import Any
+
+# One pass over the key instead of one regex per pattern; a plain substring
+# search is what the former ".*word.*" patterns matched (api_key is covered
+# by "key")
+SENSITIVE_KEY_PATTERN = re.compile(
+    r"password|token|secret|key|auth|credential", re.IGNORECASE
+)
+TRUNCATE_FIELDS = frozenset({"user_message", "content", "description"})
+TRUNCATE_LEN = 100
+TRUNCATED_SUFFIX = "... [truncated]"
+REDACTED = "[redacted]"
+MAX_DEPTH_REACHED = "[max_depth_reached]"
+
+# Size budget: a single string value is cut to MAX_VALUE_CHARS, and once the
+# string values kept so far exceed PAYLOAD_BUDGET_CHARS every further string
+# is cut to TRUNCATE_LEN. Cutting is a slice, done before anything else
+# looks at the value
+MAX_VALUE_CHARS = 64 * 1024
+PAYLOAD_BUDGET_CHARS = 1024 * 1024
+
+# Keys longer than this are matched without being memoized
+MEMO_MAX_KEY_LEN = 256
+
+_KEEP, _REDACT, _TRUNCATE = 0, 1, 2
+_DESCEND = object()
+
+
+@lru_cache(maxsize=8192)
+def _memo_key_action(key: str) -> int:
+    return _key_action(key)
+
+
+def _key_action(key: str) -> int:
+    if SENSITIVE_KEY_PATTERN.search(key):
+        return _REDACT
+    if key in TRUNCATE_FIELDS:
+        return _TRUNCATE
+    return _KEEP
+
+
+def key_action(key: Any) -> int:
+    """Decide how a dict value is treated from its key, memoizing the decision."""
+    if type(key) is not str:
+        key = str(key)
+    if len(key) > MEMO_MAX_KEY_LEN:
+        return _key_action(key)
+    return _memo_key_action(key)
+
+
+def key_memo_info() -> dict[str, int]:
+    """Hits, misses and size of the key decision memo."""
+    info = _memo_key_action.cache_info()
+    return {"hits": info.hits, "misses": info.misses, "size": info.currsize}
+
+
+def _truncate(value: str, length: int) -> str:
+    return value[:length] + TRUNCATED_SUFFIX
+
+
+class _Frame:
+    __slots__ = ("source", "depth", "items", "is_dict", "changes", "child_key")
+
+    def __init__(self, source: dict[Any, Any] | list[Any], depth: int) -> None:
+        self.source = source
+        self.depth = depth
+        self.is_dict = isinstance(source, dict)
+        self.items = iter(source.items()) if self.is_dict else enumerate(source)
+        self.changes: list[tuple[Any, Any]] | None = None
+        self.child_key: Any = None
+
+    def record(self, key: Any, value: Any) -> None:
+        if self.changes is None:
+            self.changes = []
+        self.changes.append((key, value))
+
+    def result(self) -> Any:
+        """The source if nothing below it changed, otherwise a patched copy."""
+        if self.changes is None:
+            return self.source
+        copy = dict(self.source) if self.is_dict else list(self.source)
+        for key, value in self.changes:
+            copy[key] = value
+        return copy
+
+
+class PayloadSanitizer:
+    """Redact sensitive keys and truncate large values of one payload.
+
+    The walk is iterative and copy-on-write: containers with nothing to
+    redact or truncate below them are returned as is, so the result shares
+    unchanged subtrees with the input. The input is never modified.
+    """
+
+    def __init__(
+        self,
+        max_depth: int = 5,
+        max_value_chars: int = MAX_VALUE_CHARS,
+        budget_chars: int = PAYLOAD_BUDGET_CHARS,
+    ) -> None:
+        self.max_depth = max_depth
+        self.max_value_chars = max_value_chars
+        self.remaining_chars = budget_chars
+
+    def _string(self, value: str) -> str:
+        limit = (
+            self.max_value_chars
+            if self.remaining_chars > 0
+            else min(self.max_value_chars, TRUNCATE_LEN)
+        )
+        if len(value) > limit:
+            value = _truncate(value, limit)
+        self.remaining_chars -= len(value)
+        return value
+
+    def _value(self, value: Any, depth: int) -> Any:
+        if depth >= self.max_depth:
+            return MAX_DEPTH_REACHED
+        if isinstance(value, str):
+            return self._string(value)
+        if isinstance(value, (dict, list)):
+            return _DESCEND if value else value
+        return value
+
+    def sanitize(self, data: Any, depth: int = 0) -> Any:
+        """Return the sanitized payload."""
+        root = self._value(data, depth)
+        if root is not _DESCEND:
+            return root
+
+        stack = [_Frame(data, depth)]
+        while True:
+            frame = stack[-1]
+            child_depth = frame.depth + 1
+            descended = False
+            for key, value in frame.items:
+                if frame.is_dict:
+                    action = key_action(key)
+                    if action == _REDACT:
+                        frame.record(key, REDACTED)
+                        continue
+                    if action == _TRUNCATE and isinstance(value, str):
+                        if len(value) > TRUNCATE_LEN:
+                            value = _truncate(value, TRUNCATE_LEN)
+                            frame.record(key, value)
+                        self.remaining_chars -= len(value)
+                        continue
+                new = self._value(value, child_depth)
+                if new is _DESCEND:
+                    frame.child_key = key
+                    stack.append(_Frame(value, child_depth))
+                    descended = True
+                    break
+                if new is not value:
+                    frame.record(key, new)
+            if descended:
+                continue
+
+            stack.pop()
+            result = frame.result()
+            if not stack:
+                return result
+            if result is not frame.source:
+                stack[-1].record(stack[-1].child_key, result)
+
+
+def sanitize_payload(data: Any, max_depth: int = 5, current_depth: int = 0) -> Any:
+    """Redact sensitive fields and truncate large values of a payload.
+
+    Args:
+        data: JSON-like payload (dicts, lists and scalars)
+        max_depth: Nesting depth below which values are replaced by a marker
+        current_depth: Depth of data itself
+
+    Returns:
+        The sanitized payload; unchanged subtrees are shared with data
+    """
+    return PayloadSanitizer(max_depth=max_depth).sanitize(data, current_depth)
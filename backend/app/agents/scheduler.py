@@ -0,0 +1,480 @@
+"""Parallel execution of a dependency graph of agent tasks within a stage.
+
+A stage such as architecture consults several expert agents whose work is
+largely independent. AgentTaskGraph declares the agents as nodes and the
+outputs each one needs as edges; AgentGraphScheduler runs every node as
+soon as all of its dependencies have completed, so independent experts run
+concurrently.
+
+Concurrency is bounded twice: per project and across the process, so one
+project's large graph cannot take every slot. A node receives the outputs
+of its dependencies in its input context under "upstream". When a node
+fails, times out or ends with a status other than completed, the nodes that
+depend on it (directly or transitively) are cancelled without running;
+independent branches continue.
+
+A task with max_tokens reserves that many tokens from the token budget
+around its agent call (a node over budget fails with BudgetExceeded); the
+usage the agent records on the reservation is reported in its result.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from typing import Any
+from uuid import UUID, uuid5
+
+from ..core.config import get_settings
+from ..core.deadline import bounded_timeout, no_deadline, remaining_seconds
+from .adk import ADKAgentProtocol
+from .budget import TokenBudget, TokenReservation, TokenUsage, reservation_scope
+from .contracts import AgentInput, AgentOutput, ExecutionStatus
+from .result_cache import AgentResultCache
+from .streaming import OutputStream, is_streaming, stream_agent_output
+
+logger = logging.getLogger(__name__)
+
+# Node results besides the ExecutionStatus values an agent can report
+CANCELLED = "cancelled"
+
+NodeHook = Callable[["AgentTask", AgentInput], Awaitable[None]]
+ResultHook = Callable[["AgentTask", "NodeResult"], Awaitable[None]]
+StreamOpener = Callable[["AgentTask", AgentInput], "OutputStream | None"]
+
+
+@dataclass(frozen=True)
+class AgentTask:
+    """One node of an agent task graph.
+
+    Args:
+        name: Unique node name; dependency outputs are keyed by it
+        agent: Agent executing the node
+        agent_type: Agent type recorded for the node (defaults to name)
+        depends_on: Names of the nodes whose outputs this node needs
+        user_message: Prompt for the agent (defaults to the graph input's)
+        context: Extra input context for the agent
+        prompt_version: Prompt template version (part of the result cache key)
+        model_params: Model call parameters (part of the result cache key)
+        cacheable: Whether the result may be served from the result cache
+        max_tokens: Tokens reserved from the token budget for the agent call
+            (0: the call is not budgeted)
+    """
+
+    name: str
+    agent: ADKAgentProtocol
+    agent_type: str = ""
+    depends_on: tuple[str, ...] = ()
+    user_message: str | None = None
+    context: dict[str, Any] = field(default_factory=dict)
+    prompt_version: str = ""
+    model_params: dict[str, Any] = field(default_factory=dict)
+    cacheable: bool = True
+    max_tokens: int = 0
+
+    @property
+    def resolved_agent_type(self) -> str:
+        return self.agent_type or self.name
+
+
+@dataclass
+class NodeResult:
+    """Outcome of one node.
+
+    status is an ExecutionStatus value reported by the agent, "failed" if
+    the agent raised or timed out, or "cancelled" if the node did not run
+    because a dependency did not complete. usage is the model usage the
+    agent recorded on its token reservation (None: not budgeted or served
+    from the result cache).
+    """
+
+    name: str
+    status: str
+    output: AgentOutput | None = None
+    error: str | None = None
+    started_at: datetime | None = None
+    duration_ms: int | None = None
+    usage: TokenUsage | None = None
+
+    @property
+    def completed(self) -> bool:
+        return self.status == ExecutionStatus.completed
+
+
+class AgentTaskGraph:
+    """Validated directed acyclic graph of agent tasks."""
+
+    def __init__(self, tasks: Iterable[AgentTask]) -> None:
+        self.tasks: dict[str, AgentTask] = {}
+        for task in tasks:
+            if not task.name:
+                raise ValueError("task name must be a non-empty string")
+            if task.name in self.tasks:
+                raise ValueError(f"Duplicate task name: {task.name}")
+            self.tasks[task.name] = task
+        if not self.tasks:
+            raise ValueError("graph must contain at least one task")
+
+        self.dependents: dict[str, list[str]] = {name: [] for name in self.tasks}
+        for task in self.tasks.values():
+            for dependency in task.depends_on:
+                if dependency not in self.tasks:
+                    raise ValueError(
+                        f"Task {task.name} depends on unknown task {dependency}"
+                    )
+                self.dependents[dependency].append(task.name)
+        self._check_acyclic()
+
+    def _check_acyclic(self) -> None:
+        # Kahn's algorithm: every node is reachable in topological order
+        remaining = {name: len(set(t.depends_on)) for name, t in self.tasks.items()}
+        ready = [name for name, count in remaining.items() if count == 0]
+        visited = 0
+        while ready:
+            name = ready.pop()
+            visited += 1
+            for dependent in set(self.dependents[name]):
+                remaining[dependent] -= 1
+                if remaining[dependent] == 0:
+                    ready.append(dependent)
+        if visited != len(self.tasks):
+            cyclic = sorted(name for name, count in remaining.items() if count > 0)
+            raise ValueError(f"Task graph has a cycle through: {', '.join(cyclic)}")
+
+    def descendants(self, name: str) -> set[str]:
+        """Names of the nodes that depend on name directly or transitively."""
+        found: set[str] = set()
+        stack = list(self.dependents[name])
+        while stack:
+            current = stack.pop()
+            if current not in found:
+                found.add(current)
+                stack.extend(self.dependents[current])
+        return found
+
+
+@dataclass
+class _ProjectSlots:
+    semaphore: asyncio.Semaphore
+    # Tasks holding or waiting for a slot
+    users: int = 0
+
+
+class ConcurrencyLimiter:
+    """Per-project and process-wide caps on concurrently running agent tasks.
+
+    A task takes its project's slot first and a global slot second, so a
+    project at its cap waits without holding global slots other projects
+    could use.
+    """
+
+    def __init__(self, max_concurrent: int, max_per_project: int) -> None:
+        if max_concurrent < 1 or max_per_project < 1:
+            raise ValueError("concurrency caps must be at least 1")
+        self.max_concurrent = max_concurrent
+        self.max_per_project = max_per_project
+        self._global = asyncio.Semaphore(max_concurrent)
+        self._projects: dict[UUID, _ProjectSlots] = {}
+        self.running = 0
+        self.peak_running = 0
+
+    def slot(self, project_id: UUID) -> _Slot:
+        """Async context manager holding one slot of the project."""
+        return _Slot(self, project_id)
+
+    async def _acquire(self, project_id: UUID) -> None:
+        project = self._projects.get(project_id)
+        if project is None:
+            project = self._projects[project_id] = _ProjectSlots(
+                asyncio.Semaphore(self.max_per_project)
+            )
+        project.users += 1
+        try:
+            await project.semaphore.acquire()
+            try:
+                await self._global.acquire()
+            except BaseException:
+                project.semaphore.release()
+                raise
+        except BaseException:
+            self._forget(project_id, project)
+            raise
+        self.running += 1
+        self.peak_running = max(self.peak_running, self.running)
+
+    def _release(self, project_id: UUID) -> None:
+        project = self._projects[project_id]
+        self.running -= 1
+        self._global.release()
+        project.semaphore.release()
+        self._forget(project_id, project)
+
+    def _forget(self, project_id: UUID, project: _ProjectSlots) -> None:
+        # Semaphores of projects with no running or waiting task are dropped
+        project.users -= 1
+        if project.users == 0:
+            del self._projects[project_id]
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "running": self.running,
+            "peak_running": self.peak_running,
+            "projects": len(self._projects),
+            "max_concurrent": self.max_concurrent,
+            "max_per_project": self.max_per_project,
+        }
+
+
+class _Slot:
+    def __init__(self, limiter: ConcurrencyLimiter, project_id: UUID) -> None:
+        self.limiter = limiter
+        self.project_id = project_id
+
+    async def __aenter__(self) -> None:
+        await self.limiter._acquire(self.project_id)
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        self.limiter._release(self.project_id)
+
+
+def node_correlation_id(correlation_id: UUID, name: str) -> UUID:
+    """Stable per-node correlation id derived from the workflow's."""
+    return uuid5(correlation_id, name)
+
+
+class AgentGraphScheduler:
+    """Run an AgentTaskGraph with bounded parallelism.
+
+    Args:
+        limiter: Concurrency caps shared with other schedulers
+        task_timeout_seconds: Limit for a single agent call (None: no limit);
+            never past the deadline of the running workflow
+        on_start: Awaited in the node's slot before its agent runs; an
+            exception fails the node
+        on_finish: Awaited with every node result, cancelled nodes included,
+            without the workflow's deadline; exceptions are logged and ignored
+        result_cache: Serves results of cacheable tasks (None: no caching)
+        bypass_cache: Recompute cacheable tasks and refresh their entries
+        open_stream: Returns the output stream of a node whose agent streams
+            (None, or a None result: the agent is called with execute())
+        token_budget: Budget reserving each task's max_tokens around its
+            agent call (None: calls are not budgeted)
+    """
+
+    def __init__(
+        self,
+        limiter: ConcurrencyLimiter | None = None,
+        task_timeout_seconds: float | None = None,
+        on_start: NodeHook | None = None,
+        on_finish: ResultHook | None = None,
+        result_cache: AgentResultCache | None = None,
+        *,
+        bypass_cache: bool = False,
+        open_stream: StreamOpener | None = None,
+        token_budget: TokenBudget | None = None,
+    ) -> None:
+        self.limiter = limiter or agent_concurrency
+        self.task_timeout_seconds = task_timeout_seconds
+        self.on_start = on_start
+        self.on_finish = on_finish
+        self.result_cache = result_cache
+        self.bypass_cache = bypass_cache
+        self.open_stream = open_stream
+        self.token_budget = token_budget
+
+    def node_input(
+        self,
+        task: AgentTask,
+        input_data: AgentInput,
+        outputs: dict[str, AgentOutput],
+    ) -> AgentInput:
+        """Input of a node: the graph input plus its dependencies' outputs."""
+        context = {**input_data.context, **task.context}
+        if task.depends_on:
+            context["upstream"] = {
+                name: outputs[name].model_dump(mode="json") for name in task.depends_on
+            }
+        return input_data.model_copy(
+            update={
+                "correlation_id": node_correlation_id(
+                    input_data.correlation_id, task.name
+                ),
+                "user_message": task.user_message or input_data.user_message,
+                "context": context,
+            }
+        )
+
+    async def run(
+        self, graph: AgentTaskGraph, input_data: AgentInput
+    ) -> dict[str, NodeResult]:
+        """Run every node of the graph.
+
+        Returns:
+            Result of each node by name, in the graph's declaration order
+        """
+        results: dict[str, NodeResult] = {}
+        outputs: dict[str, AgentOutput] = {}
+        waiting = {name: set(task.depends_on) for name, task in graph.tasks.items()}
+        running: dict[asyncio.Task[NodeResult], str] = {}
+
+        def launch_ready() -> None:
+            for name in [n for n, deps in waiting.items() if not deps]:
+                del waiting[name]
+                node_input = self.node_input(graph.tasks[name], input_data, outputs)
+                running[
+                    asyncio.create_task(self._run_node(graph.tasks[name], node_input))
+                ] = name
+
+        try:
+            launch_ready()
+            while running:
+                done, _ = await asyncio.wait(
+                    running, return_when=asyncio.FIRST_COMPLETED
+                )
+                for finished in done:
+                    name = running.pop(finished)
+                    result = results[name] = finished.result()
+                    await self._finished(graph.tasks[name], result)
+                    if result.completed and result.output is not None:
+                        outputs[name] = result.output
+                        for dependent in graph.dependents[name]:
+                            if dependent in waiting:
+                                waiting[dependent].discard(name)
+                        continue
+                    for dependent in sorted(graph.descendants(name)):
+                        if dependent in waiting:
+                            del waiting[dependent]
+                            cancelled = results[dependent] = NodeResult(
+                                name=dependent,
+                                status=CANCELLED,
+                                error=f"Dependency {name} did not complete",
+                            )
+                            await self._finished(graph.tasks[dependent], cancelled)
+                launch_ready()
+        finally:
+            for pending in running:
+                pending.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+
+        return {name: results[name] for name in graph.tasks}
+
+    async def _run_node(self, task: AgentTask, node_input: AgentInput) -> NodeResult:
+        async with self.limiter.slot(node_input.project_id):
+            started_at = datetime.now(UTC)
+            start = time.perf_counter()
+            reservations: list[TokenReservation] = []
+            try:
+                if self.on_start is not None:
+                    await self.on_start(task, node_input)
+                # A node never runs past the deadline of its workflow
+                timeout = bounded_timeout(self.task_timeout_seconds, "agent.call")
+                output = await asyncio.wait_for(
+                    self._execute(task, node_input, reservations), timeout=timeout
+                )
+                if not isinstance(output, AgentOutput):
+                    raise TypeError(
+                        f"Agent returned {type(output).__name__}, expected AgentOutput"
+                    )
+                status, error = output.status.value, None
+            except TimeoutError:
+                output = None
+                status = ExecutionStatus.failed.value
+                remaining = remaining_seconds()
+                if remaining is not None and remaining <= 0:
+                    error = "DeadlineExceeded: workflow deadline passed"
+                else:
+                    error = f"TimeoutError: task timed out after {self.task_timeout_seconds}s"
+            except Exception as e:
+                logger.exception(
+                    "Agent task failed",
+                    extra={
+                        "task": task.name,
+                        "agent_type": task.resolved_agent_type,
+                        "project_id": str(node_input.project_id),
+                    },
+                )
+                output = None
+                status = ExecutionStatus.failed.value
+                error = f"{type(e).__name__}: {e}"
+            return NodeResult(
+                name=task.name,
+                status=status,
+                output=output,
+                error=error,
+                started_at=started_at,
+                duration_ms=int((time.perf_counter() - start) * 1000),
+                usage=reservations[0].usage if reservations else None,
+            )
+
+    async def _call_agent(
+        self,
+        task: AgentTask,
+        node_input: AgentInput,
+        reservations: list[TokenReservation],
+    ) -> AgentOutput:
+        if self.token_budget is None or not task.max_tokens:
+            return await self._invoke(task, node_input)
+        # The node's correlation id identifies its execution to the budget
+        async with self.token_budget.spend(
+            node_input.project_id, node_input.correlation_id, task.max_tokens
+        ) as reservation:
+            reservations.append(reservation)
+            with reservation_scope(reservation):
+                return await self._invoke(task, node_input)
+
+    async def _invoke(self, task: AgentTask, node_input: AgentInput) -> AgentOutput:
+        stream = None
+        if self.open_stream is not None and is_streaming(task.agent):
+            stream = self.open_stream(task, node_input)
+        if stream is None:
+            return await task.agent.execute(node_input)
+        return await stream_agent_output(
+            task.agent, node_input, stream, task.resolved_agent_type
+        )
+
+    async def _execute(
+        self,
+        task: AgentTask,
+        node_input: AgentInput,
+        reservations: list[TokenReservation],
+    ) -> AgentOutput:
+        if self.result_cache is None or not task.cacheable:
+            return await self._call_agent(task, node_input, reservations)
+        return await self.result_cache.get_or_compute(
+            task.resolved_agent_type,
+            node_input,
+            lambda: self._call_agent(task, node_input, reservations),
+            prompt_version=task.prompt_version,
+            model_params=task.model_params,
+            bypass=self.bypass_cache,
+        )
+
+    async def _finished(self, task: AgentTask, result: NodeResult) -> None:
+        if self.on_finish is None:
+            return
+        try:
+            # Recording an outcome is cleanup: it runs even past the deadline
+            with no_deadline():
+                await self.on_finish(task, result)
+        except Exception:
+            logger.exception(
+                "Agent task result hook failed",
+                extra={"task": task.name, "status": result.status},
+            )
+
+
+def _build_limiter() -> ConcurrencyLimiter:
+    settings = get_settings()
+    return ConcurrencyLimiter(
+        max_concurrent=settings.AGENT_MAX_CONCURRENT_TASKS,
+        max_per_project=settings.AGENT_MAX_CONCURRENT_TASKS_PER_PROJECT,
+    )
+
+
+# Process-wide caps shared by every scheduler
+agent_concurrency = _build_limiter()
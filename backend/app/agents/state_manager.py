@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import hashlib
 import json
 import os
+from collections.abc import Iterable, Mapping
 from datetime import UTC, datetime
 from typing import Any
 from uuid import UUID
@@ -11,12 +13,91 @@ from .context import ExecutionContext
 
 STATE_TTL_SECONDS = int(os.getenv("AGENT_STATE_TTL_SECONDS", "86400"))
 
+# State is a hash with one JSON-encoded value per field, so parallel agents
+# writing different fields never overwrite each other. Both scripts write and
+# refresh the TTL in one atomic step and one round trip.
+#
+# KEYS[1]: state key; ARGV[1]: TTL seconds; ARGV[2..]: field, value pairs
+
+# Replace the state. Returns 1
+REPLACE_STATE_LUA = """
+redis.call('DEL', KEYS[1])
+redis.call('HSET', KEYS[1], unpack(ARGV, 2))
+redis.call('EXPIRE', KEYS[1], ARGV[1])
+return 1
+"""
+
+# Set fields of an existing state; state written as a single JSON string
+# (before the hash layout) is converted first. Returns 1 if the state was
+# updated, 0 if it does not exist
+UPDATE_FIELDS_LUA = """
+local kind = redis.call('TYPE', KEYS[1]).ok
+if kind == 'none' then
+    return 0
+end
+if kind == 'string' then
+    local legacy = cjson.decode(redis.call('GET', KEYS[1]))
+    redis.call('DEL', KEYS[1])
+    for field, value in pairs(legacy) do
+        redis.call('HSET', KEYS[1], field, cjson.encode(value))
+    end
+end
+redis.call('HSET', KEYS[1], unpack(ARGV, 2))
+redis.call('EXPIRE', KEYS[1], ARGV[1])
+return 1
+"""
+
+SCRIPT_SHAS = {
+    script: hashlib.sha1(script.encode(), usedforsecurity=False).hexdigest()
+    for script in (REPLACE_STATE_LUA, UPDATE_FIELDS_LUA)
+}
+
+
+def encode_fields(fields: Mapping[str, Any]) -> dict[str, str]:
+    """JSON-encode state values for storage as hash fields."""
+    return {name: json.dumps(value) for name, value in fields.items()}
+
+
+def decode_fields(raw: Mapping[Any, Any]) -> dict[str, Any]:
+    """Decode hash fields written by encode_fields, skipping missing ones."""
+    decoded: dict[str, Any] = {}
+    for name, value in raw.items():
+        if value is None:
+            continue
+        if isinstance(name, bytes):
+            name = name.decode()
+        decoded[name] = json.loads(value)
+    return decoded
+
+
+async def _run_script(conn: Any, script: str, key: str, args: list[Any]) -> Any:
+    from redis.exceptions import NoScriptError
+
+    try:
+        return await conn.evalsha(SCRIPT_SHAS[script], 1, key, *args)
+    except NoScriptError:
+        # EVAL caches the script for subsequent EVALSHA calls
+        return await conn.eval(script, 1, key, *args)
+
+
+def _script_args(ttl_seconds: int, fields: Mapping[str, Any]) -> list[Any]:
+    args: list[Any] = [ttl_seconds]
+    for name, value in encode_fields(fields).items():
+        args.extend((name, value))
+    return args
+
 
 class ExecutionStateManager:
-    """Manage execution state in Redis with project isolation and TTL."""
+    """Manage execution state in Redis with project isolation and TTL.
+
+    State is a Redis hash with one JSON-encoded value per field. Updates set
+    only the fields they change and refresh the TTL in the same round trip;
+    reads can fetch a subset of fields.
+    """
 
-    def __init__(self) -> None:
+    def __init__(self, redis: Any | None = None) -> None:
         self.ttl_seconds = STATE_TTL_SECONDS
+        self.redis = redis or redis_service
 
     def _key(self, project_id: UUID, correlation_id: UUID) -> str:
         return f"agent:execution:{project_id}:{correlation_id}"
@@ -36,69 +117,100 @@ class ExecutionStateManager:
 
         from redis.asyncio import Redis
 
-        async def _set(conn: Redis, key: str, value: str, ex: int) -> bool:
-            return await conn.set(key, value, ex=ex)
+        async def _create(conn: Redis, key: str, args: list[Any]) -> int:
+            return await _run_script(conn, REPLACE_STATE_LUA, key, args)
 
-        await redis_service.execute_with_retry(
+        await self.redis.execute_with_retry(
             operation="state.create",
-            func=_set,
+            func=_create,
             key=self._key(context.project_id, context.correlation_id),
-            value=json.dumps(payload),
-            ex=self.ttl_seconds,
+            args=_script_args(self.ttl_seconds, payload),
             project_id=str(context.project_id),
         )
 
-    async def update_state(
-        self, project_id: UUID, correlation_id: UUID, current_agent: str, progress: int
-    ) -> None:
-        from redis.asyncio import Redis
+    async def update_fields(
+        self, project_id: UUID, correlation_id: UUID, fields: Mapping[str, Any]
+    ) -> bool:
+        """Atomically set fields of an existing state and refresh its TTL.
+
+        updated_at is set as well. Fields not given are left untouched, so
+        concurrent writers of different fields do not lose each other's data.
+
+        Returns:
+            False if the state does not exist (expired or cleaned up)
+        """
+        if not fields:
+            raise ValueError("fields must not be empty")
+        args = _script_args(
+            self.ttl_seconds, {**fields, "updated_at": datetime.now(UTC).isoformat()}
+        )
 
-        # Clamp progress to 0-100 range
-        progress = max(0, min(100, int(progress)))
+        from redis.asyncio import Redis
 
-        async def _get(conn: Redis, key: str) -> str | None:
-            return await conn.get(key)
+        async def _update(conn: Redis, key: str, args: list[Any]) -> int:
+            return await _run_script(conn, UPDATE_FIELDS_LUA, key, args)
 
-        raw = await redis_service.execute_with_retry(
-            operation="state.get",
-            func=_get,
+        updated = await self.redis.execute_with_retry(
+            operation="state.update",
+            func=_update,
             key=self._key(project_id, correlation_id),
+            args=args,
             project_id=str(project_id),
         )
-        if not raw:
-            return
-        state = json.loads(raw)
-        state["current_agent"] = current_agent
-        state["progress"] = progress
-        state["updated_at"] = datetime.now(UTC).isoformat()
-
-        async def _set(conn: Redis, key: str, value: str, ex: int) -> bool:
-            return await conn.set(key, value, ex=ex)
+        return bool(updated)
 
-        await redis_service.execute_with_retry(
-            operation="state.update",
-            func=_set,
-            key=self._key(project_id, correlation_id),
-            value=json.dumps(state),
-            ex=self.ttl_seconds,
-            project_id=str(project_id),
+    async def update_state(
+        self, project_id: UUID, correlation_id: UUID, current_agent: str, progress: int
+    ) -> None:
+        # Clamp progress to 0-100 range
+        progress = max(0, min(100, int(progress)))
+        await self.update_fields(
+            project_id,
+            correlation_id,
+            {"current_agent": current_agent, "progress": progress},
         )
 
     async def get_state(
-        self, project_id: UUID, correlation_id: UUID
+        self,
+        project_id: UUID,
+        correlation_id: UUID,
+        fields: Iterable[str] | None = None,
     ) -> dict[str, Any] | None:
-        from redis.asyncio import Redis
+        """Get execution state, or only the given fields of it.
 
-        async def _get(conn: Redis, key: str) -> str | None:
-            return await conn.get(key)
+        Returns:
+            The state (fields absent from it are omitted), or None if it
+            does not exist or has none of the requested fields
+        """
+        names = list(fields) if fields is not None else None
+        if names == []:
+            raise ValueError("fields must not be empty")
 
-        raw = await redis_service.execute_with_retry(
+        from redis.asyncio import Redis
+        from redis.exceptions import ResponseError
+
+        async def _get(conn: Redis, key: str) -> dict[str, Any]:
+            try:
+                if names is None:
+                    return decode_fields(await conn.hgetall(key))
+                values = await conn.hmget(key, names)
+                return decode_fields(dict(zip(names, values, strict=True)))
+            except ResponseError as e:
+                if "WRONGTYPE" not in str(e):
+                    raise
+                # State written as a single JSON string before the hash layout
+                legacy = json.loads(await conn.get(key))
+                if names is None:
+                    return legacy
+                return {name: legacy[name] for name in names if name in legacy}
+
+        state = await self.redis.execute_with_retry(
             operation="state.get",
             func=_get,
             key=self._key(project_id, correlation_id),
             project_id=str(project_id),
         )
-        return json.loads(raw) if raw else None
+        return state or None
 
     async def cleanup(self, project_id: UUID, correlation_id: UUID) -> None:
         from redis.asyncio import Redis
@@ -106,7 +218,7 @@ class ExecutionStateManager:
         async def _delete(conn: Redis, key: str) -> int:
             return await conn.delete(key)
 
-        await redis_service.execute_with_retry(
+        await self.redis.execute_with_retry(
             operation="state.cleanup",
             func=_delete,
             key=self._key(project_id, correlation_id),
@@ -0,0 +1,401 @@
+"""Streaming agent output with incremental persistence.
+
+An agent implementing StreamingAgentProtocol yields its output as content
+deltas while it generates. Each delta becomes a numbered chunk that is
+published at once to SSE subscribers of the execution and buffered for
+persistence. The buffer is written to agent_execution_chunks as one
+multi-row INSERT, in its own committed transaction, when it reaches the
+batch size (chunks or characters) or when its oldest chunk has waited the
+flush interval. The interval is kept by a timer task of the stream, so
+chunks are persisted on time even while the agent pauses between deltas
+(waiting for a model or a tool). A crash therefore loses at most one
+bounded batch, and the persisted chunks stay readable in order of seq.
+
+When the agent finishes (or fails) the buffer is flushed and a terminal
+event with the status is published, which ends SSE streams. The assembled
+content is read back from the chunks and becomes the content of the
+agent's output, so the execution record keeps the full output as before.
+
+Publishing is best effort: without an initialized SSE service, or when
+publishing fails, chunks are only persisted. Persistence errors propagate
+and fail the agent call.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import AsyncIterator, Sequence
+from contextlib import AbstractAsyncContextManager
+from dataclasses import dataclass
+from typing import Any, Protocol
+from uuid import UUID
+
+from sqlalchemy import Table, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.config import get_settings
+from ..core.deadline import no_deadline
+from ..models import AgentExecutionChunk
+from .contracts import AgentInput, AgentOutput, ExecutionStatus
+from .write_behind import SessionFactory
+
+logger = logging.getLogger(__name__)
+
+
+class EventPublisher(Protocol):
+    async def publish_event(
+        self, project_id: UUID, operation_id: str, event: dict
+    ) -> None: ...
+
+
+def stream_operation_id(execution_id: UUID) -> str:
+    """SSE operation id under which an execution's output is published."""
+    return f"agent_output:{execution_id}"
+
+
+def is_streaming(agent: Any) -> bool:
+    """Whether an agent implements StreamingAgentProtocol."""
+    return callable(getattr(agent, "stream", None))
+
+
+@dataclass(frozen=True)
+class OutputChunk:
+    seq: int
+    content: str
+
+
+class ChunkStore:
+    """Writes and reads agent_execution_chunks.
+
+    Args:
+        session_factory: Returns an async context manager yielding a session
+            that commits on exit (defaults to database_manager.get_session)
+        chunks: Chunks table (defaults to agent_execution_chunks)
+    """
+
+    def __init__(
+        self,
+        session_factory: SessionFactory | None = None,
+        chunks: Table | None = None,
+    ) -> None:
+        self.session_factory = session_factory
+        self.chunks = chunks if chunks is not None else AgentExecutionChunk.__table__
+
+    def _session(self) -> AbstractAsyncContextManager[AsyncSession]:
+        if self.session_factory is not None:
+            return self.session_factory()
+        from ..core.database import database_manager
+
+        return database_manager.get_session()
+
+    async def write(
+        self, execution_id: UUID, project_id: UUID, chunks: Sequence[OutputChunk]
+    ) -> None:
+        """Insert chunks in one statement and commit."""
+        if not chunks:
+            return
+        async with self._session() as session:
+            await session.execute(
+                insert(self.chunks),
+                [
+                    {
+                        "execution_id": execution_id,
+                        "project_id": project_id,
+                        "seq": chunk.seq,
+                        "content": chunk.content,
+                    }
+                    for chunk in chunks
+                ],
+            )
+
+    async def read(
+        self,
+        execution_id: UUID,
+        project_id: UUID,
+        after_seq: int = -1,
+        limit: int | None = None,
+        session: AsyncSession | None = None,
+    ) -> list[OutputChunk]:
+        """Persisted chunks of an execution in order, after a given seq.
+
+        Reads with the given session (such as a request's) when set.
+        """
+        query = (
+            select(self.chunks.c.seq, self.chunks.c.content)
+            .where(
+                self.chunks.c.execution_id == execution_id,
+                self.chunks.c.project_id == project_id,
+                self.chunks.c.seq > after_seq,
+            )
+            .order_by(self.chunks.c.seq)
+        )
+        if limit is not None:
+            query = query.limit(limit)
+        if session is not None:
+            result = await session.execute(query)
+            return [OutputChunk(row.seq, row.content) for row in result]
+        async with self._session() as own_session:
+            result = await own_session.execute(query)
+            return [OutputChunk(row.seq, row.content) for row in result]
+
+    async def assemble(self, execution_id: UUID, project_id: UUID) -> str:
+        """The full output of an execution."""
+        chunks = await self.read(execution_id, project_id)
+        return "".join(chunk.content for chunk in chunks)
+
+
+class OutputStream:
+    """Streamed output of one execution.
+
+    Args:
+        execution_id: Execution producing the output
+        project_id: Project of the execution (scopes events and rows)
+        store: Persists the chunks
+        publisher: SSE publisher (defaults to the initialized SSE service)
+        max_batch_chunks: Flush when this many chunks are buffered
+        max_batch_chars: Flush when the buffered chunks reach this many characters
+        flush_interval_seconds: Flush when the oldest buffered chunk is this old
+    """
+
+    def __init__(
+        self,
+        execution_id: UUID,
+        project_id: UUID,
+        store: ChunkStore,
+        publisher: EventPublisher | None = None,
+        max_batch_chunks: int = 16,
+        max_batch_chars: int = 8192,
+        flush_interval_seconds: float = 1.0,
+    ) -> None:
+        if max_batch_chunks < 1 or max_batch_chars < 1:
+            raise ValueError("batch limits must be positive")
+        self.execution_id = execution_id
+        self.project_id = project_id
+        self.store = store
+        self.publisher = publisher
+        self.max_batch_chunks = max_batch_chunks
+        self.max_batch_chars = max_batch_chars
+        self.flush_interval_seconds = flush_interval_seconds
+        self.operation_id = stream_operation_id(execution_id)
+        self.next_seq = 0
+        self.closed = False
+        self.flushes = 0
+        self.publish_errors = 0
+        self._pending: list[OutputChunk] = []
+        self._pending_chars = 0
+        self._oldest: float | None = None
+        self._flush_lock = asyncio.Lock()
+        self._timer: asyncio.Task[None] | None = None
+
+    @property
+    def pending(self) -> int:
+        """Chunks not persisted yet."""
+        return len(self._pending)
+
+    def _publisher(self) -> EventPublisher | None:
+        if self.publisher is not None:
+            return self.publisher
+        from ..services import sse
+
+        return sse.sse_service
+
+    async def _publish(self, event: dict[str, Any]) -> None:
+        publisher = self._publisher()
+        if publisher is None:
+            return
+        try:
+            await publisher.publish_event(self.project_id, self.operation_id, event)
+        except Exception as e:
+            self.publish_errors += 1
+            logger.warning(
+                "Agent output publish failed",
+                extra={
+                    "execution_id": str(self.execution_id),
+                    "error": str(e),
+                    "error_type": type(e).__name__,
+                },
+            )
+
+    async def write(self, content: str) -> OutputChunk | None:
+        """Publish a content delta and buffer it for persistence.
+
+        Returns:
+            The chunk, or None for an empty delta
+        """
+        if self.closed:
+            raise RuntimeError("output stream is closed")
+        if not content:
+            return None
+        chunk = OutputChunk(self.next_seq, content)
+        self.next_seq += 1
+        self._pending.append(chunk)
+        self._pending_chars += len(content)
+        if self._oldest is None:
+            self._oldest = time.monotonic()
+        if self._timer is None and self.flush_interval_seconds > 0:
+            self._timer = asyncio.create_task(self._flush_when_due())
+
+        await self._publish(
+            {
+                "type": "agent.output.chunk",
+                "execution_id": str(self.execution_id),
+                "seq": chunk.seq,
+                "content": content,
+            }
+        )
+        if (
+            len(self._pending) >= self.max_batch_chunks
+            or self._pending_chars >= self.max_batch_chars
+            or time.monotonic() - self._oldest >= self.flush_interval_seconds
+        ):
+            await self.flush()
+        return chunk
+
+    async def _flush_when_due(self) -> None:
+        # Runs while chunks are buffered; write() restarts it for new ones
+        try:
+            while self._oldest is not None:
+                delay = self._oldest + self.flush_interval_seconds - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                    continue
+                # A cancel from close() must not interrupt a write in progress
+                await asyncio.shield(self.flush())
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            # The chunks stay buffered for the next write or close
+            logger.warning(
+                "Timed agent output flush failed",
+                extra={
+                    "execution_id": str(self.execution_id),
+                    "error": str(e),
+                    "error_type": type(e).__name__,
+                },
+            )
+        finally:
+            self._timer = None
+
+    async def flush(self) -> None:
+        """Persist the buffered chunks; on failure they stay buffered."""
+        async with self._flush_lock:
+            if not self._pending:
+                return
+            batch, oldest = self._pending, self._oldest
+            # Chunks written during the insert form the next batch
+            self._pending, self._pending_chars, self._oldest = [], 0, None
+            try:
+                await self.store.write(self.execution_id, self.project_id, batch)
+            except BaseException:
+                self._pending = batch + self._pending
+                self._pending_chars = sum(len(c.content) for c in self._pending)
+                self._oldest = oldest
+                raise
+            self.flushes += 1
+
+    async def close(self, status: str) -> None:
+        """Stop the flush timer, flush and publish the terminal event."""
+        if self.closed:
+            return
+        timer = self._timer
+        if timer is not None:
+            timer.cancel()
+            await asyncio.gather(timer, return_exceptions=True)
+            self._timer = None
+        await self.flush()
+        self.closed = True
+        # SSE streams end on a completed, failed or cancelled status
+        await self._publish(
+            {
+                "type": "agent.output.end",
+                "execution_id": str(self.execution_id),
+                "status": "failed" if status == "failed" else "completed",
+                "agent_status": status,
+                "chunks": self.next_seq,
+            }
+        )
+
+    async def assemble(self) -> str:
+        """The full output persisted so far."""
+        return await self.store.assemble(self.execution_id, self.project_id)
+
+
+class AgentOutputStreaming:
+    """Opens output streams with shared storage and batch settings."""
+
+    def __init__(
+        self,
+        store: ChunkStore | None = None,
+        publisher: EventPublisher | None = None,
+        max_batch_chunks: int = 16,
+        max_batch_chars: int = 8192,
+        flush_interval_seconds: float = 1.0,
+    ) -> None:
+        self.store = store or ChunkStore()
+        self.publisher = publisher
+        self.max_batch_chunks = max_batch_chunks
+        self.max_batch_chars = max_batch_chars
+        self.flush_interval_seconds = flush_interval_seconds
+
+    def open(self, execution_id: UUID, project_id: UUID) -> OutputStream:
+        return OutputStream(
+            execution_id,
+            project_id,
+            self.store,
+            publisher=self.publisher,
+            max_batch_chunks=self.max_batch_chunks,
+            max_batch_chars=self.max_batch_chars,
+            flush_interval_seconds=self.flush_interval_seconds,
+        )
+
+
+async def stream_agent_output(
+    agent: Any, input_data: AgentInput, stream: OutputStream, agent_type: str
+) -> AgentOutput:
+    """Run a streaming agent, streaming its deltas, and return its output.
+
+    The agent's stream yields content deltas (str) and may end with an
+    AgentOutput carrying status and metadata; its content, when empty, is
+    replaced by the assembled deltas. Without one the output is completed.
+    """
+    final: AgentOutput | None = None
+    try:
+        items: AsyncIterator[str | AgentOutput] = agent.stream(input_data)
+        async for item in items:
+            if isinstance(item, AgentOutput):
+                final = item
+            else:
+                await stream.write(item)
+    except BaseException:
+        try:
+            # Keep the partial output even when the deadline caused the failure
+            with no_deadline():
+                await stream.close(ExecutionStatus.failed.value)
+        except Exception:
+            logger.exception(
+                "Failed to flush output of a failed agent",
+                extra={"execution_id": str(stream.execution_id)},
+            )
+        raise
+
+    if final is None:
+        final = AgentOutput(agent_type=agent_type, status=ExecutionStatus.completed)
+    await stream.close(final.status.value)
+    if final.content:
+        return final
+    return final.model_copy(update={"content": await stream.assemble()})
+
+
+def _build_streaming() -> AgentOutputStreaming:
+    settings = get_settings()
+    return AgentOutputStreaming(
+        max_batch_chunks=settings.AGENT_STREAM_BATCH_CHUNKS,
+        max_batch_chars=settings.AGENT_STREAM_BATCH_CHARS,
+        flush_interval_seconds=settings.AGENT_STREAM_FLUSH_INTERVAL_SECONDS,
+    )
+
+
+# Global streaming instance
+agent_output_streaming = _build_streaming()
@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 import logging
-import re
 from datetime import UTC, datetime
 from typing import Any
 from uuid import UUID
@@ -10,27 +9,23 @@ from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..models import AgentExecution
+from ..services.agent_metrics_rollup import ExecutionState, agent_metrics_rollup
+from .budget import TokenUsage
+from .sanitization import sanitize_payload
+from .write_behind import TrackerEvent, TrackerWriteBehind
 
 
 class AgentExecutionTracker:
     """Persist agent execution lifecycle events to PostgreSQL with ACID guarantees."""
 
-    # Class-level constants for sanitization (compiled once)
-    SENSITIVE_PATTERNS = [
-        re.compile(r".*password.*", re.IGNORECASE),
-        re.compile(r".*token.*", re.IGNORECASE),
-        re.compile(r".*secret.*", re.IGNORECASE),
-        re.compile(r".*key.*", re.IGNORECASE),
-        re.compile(r".*auth.*", re.IGNORECASE),
-        re.compile(r".*credential.*", re.IGNORECASE),
-        re.compile(r".*api[_-]?key.*", re.IGNORECASE),
-    ]
-    TRUNCATE_FIELDS = {"user_message", "content", "description"}
-    TRUNCATE_LEN = 100
-
-    def __init__(self, session: AsyncSession) -> None:
+    def __init__(
+        self, session: AsyncSession, write_behind: TrackerWriteBehind | None = None
+    ) -> None:
         self.session = session
         self.logger = logging.getLogger(__name__)
+        self.rollup = agent_metrics_rollup
+        # Completions and failures are buffered and written in batches when set
+        self.write_behind = write_behind
 
     async def start_execution(
         self,
@@ -52,6 +47,14 @@ class AgentExecutionTracker:
         try:
             self.session.add(execution)
             await self.session.flush()  # Get ID without committing
+            await self.rollup.record(
+                self.session,
+                project_id,
+                agent_type,
+                execution.started_at,
+                None,
+                ExecutionState(execution.status),
+            )
             return execution.id  # type: ignore[return-value]
         except Exception:
             self.logger.exception(
@@ -71,14 +74,20 @@ class AgentExecutionTracker:
         status: str = "completed",
     ) -> None:
         now = datetime.now(UTC)
-        try:
-            # First, SELECT to get started_at
-            result = await self.session.execute(
-                select(AgentExecution.started_at).where(
-                    AgentExecution.id == execution_id
+        if self.write_behind is not None:
+            await self.write_behind.submit(
+                TrackerEvent(
+                    status=status,
+                    completed_at=now,
+                    execution_id=execution_id,
+                    output_data=self._sanitize(output_data or {}),
                 )
             )
-            started_at = result.scalar_one_or_none()
+            return
+        try:
+            # First, lock the row and read started_at and the current state
+            current = await self.rollup.lock_execution(self.session, execution_id)
+            started_at = current.started_at if current else None
 
             # Calculate duration_ms if started_at exists
             duration_ms = None
@@ -96,6 +105,8 @@ class AgentExecutionTracker:
                     duration_ms=duration_ms,
                 )
             )
+            if current is not None:
+                await self._record_transition(current, ExecutionState(status, now))
         except Exception:
             self.logger.exception(
                 "Failed to complete execution",
@@ -107,22 +118,38 @@ class AgentExecutionTracker:
         if not isinstance(error_message, str) or not error_message.strip():
             raise ValueError("error_message must be a non-empty string")
         now = datetime.now(UTC)
+        if self.write_behind is not None:
+            # Unknown correlation ids are logged by the flusher, not raised
+            await self.write_behind.submit(
+                TrackerEvent(
+                    status="failed",
+                    completed_at=now,
+                    correlation_id=correlation_id,
+                    error_message=error_message,
+                )
+            )
+            return
         try:
-            # First, SELECT to get execution.id and started_at
+            # First, SELECT to get execution.id, then lock the row
             result = await self.session.execute(
-                select(AgentExecution.id, AgentExecution.started_at).where(
+                select(AgentExecution.id).where(
                     AgentExecution.correlation_id == correlation_id
                 )
             )
-            row = result.one_or_none()
-            if not row:
+            execution_id = result.scalar_one_or_none()
+            current = (
+                await self.rollup.lock_execution(self.session, execution_id)
+                if execution_id is not None
+                else None
+            )
+            if current is None:
                 self.logger.error(
                     "Execution not found for failure update",
                     extra={"correlation_id": str(correlation_id)},
                 )
                 raise LookupError("Execution not found for given correlation_id")
 
-            execution_id, started_at = row
+            started_at = current.started_at
 
             # Calculate duration_ms if started_at exists
             duration_ms = None
@@ -140,6 +167,7 @@ class AgentExecutionTracker:
                     duration_ms=duration_ms,
                 )
             )
+            await self._record_transition(current, ExecutionState("failed", now))
         except Exception:
             self.logger.exception(
                 "Failed to mark execution as failed",
@@ -147,6 +175,69 @@ class AgentExecutionTracker:
             )
             raise
 
+    async def record_usage(self, execution_id: UUID, usage: TokenUsage) -> bool:
+        """Add model usage to an execution and its metrics rollup bucket.
+
+        Counters are incremented in the database, so concurrent calls of
+        one execution never lose usage.
+
+        Returns:
+            False if the execution does not exist
+        """
+        if usage.total_tokens == 0 and not usage.cost_usd:
+            return True
+        executions = self.rollup.executions
+        try:
+            result = await self.session.execute(
+                update(executions)
+                .where(executions.c.id == execution_id)
+                .values(
+                    prompt_tokens=executions.c.prompt_tokens + usage.prompt_tokens,
+                    completion_tokens=executions.c.completion_tokens
+                    + usage.completion_tokens,
+                    cost_usd=executions.c.cost_usd + usage.cost_usd,
+                )
+                .returning(
+                    executions.c.project_id,
+                    executions.c.agent_type,
+                    executions.c.started_at,
+                )
+            )
+            row = result.one_or_none()
+            if row is None:
+                self.logger.warning(
+                    "Execution not found for usage update",
+                    extra={"execution_id": str(execution_id)},
+                )
+                return False
+            await self.rollup.record_usage(
+                self.session,
+                row.project_id,
+                row.agent_type,
+                row.started_at,
+                usage.prompt_tokens,
+                usage.completion_tokens,
+                usage.cost_usd,
+            )
+            return True
+        except Exception:
+            self.logger.exception(
+                "Failed to record execution usage",
+                extra={"execution_id": str(execution_id)},
+            )
+            raise
+
+    async def _record_transition(self, current: Any, after: ExecutionState) -> None:
+        # Keep the metrics rollup in step with the status change
+        await self.rollup.record(
+            self.session,
+            current.project_id,
+            current.agent_type,
+            current.started_at,
+            ExecutionState(current.status, current.completed_at),
+            after,
+        )
+
     async def get_execution_history(
         self, project_id: UUID, limit: int = 50
     ) -> list[AgentExecution]:
@@ -175,37 +266,5 @@ class AgentExecutionTracker:
         max_depth: int = 5,
         current_depth: int = 0,
     ) -> dict[str, Any] | list[Any] | Any:
-        """Recursively sanitize sensitive fields from payloads."""
-        if current_depth >= max_depth:
-            return "[max_depth_reached]"
-        if data is None or isinstance(data, (str, int, float, bool)):
-            return data
-
-        if isinstance(data, dict):
-            sanitized: dict[str, Any] = {}
-            for key, value in data.items():
-                if any(p.match(key) for p in AgentExecutionTracker.SENSITIVE_PATTERNS):
-                    sanitized[key] = "[redacted]"
-                elif key in AgentExecutionTracker.TRUNCATE_FIELDS and isinstance(
-                    value, str
-                ):
-                    sanitized[key] = (
-                        value[: AgentExecutionTracker.TRUNCATE_LEN] + "... [truncated]"
-                        if len(value) > AgentExecutionTracker.TRUNCATE_LEN
-                        else value
-                    )
-                else:
-                    sanitized[key] = AgentExecutionTracker._sanitize(
-                        value, max_depth=max_depth, current_depth=current_depth + 1
-                    )
-            return sanitized
-
-        if isinstance(data, list):
-            return [
-                AgentExecutionTracker._sanitize(
-                    item, max_depth=max_depth, current_depth=current_depth + 1
-                )
-                for item in data
-            ]
-
-        return data
+        """Sanitize sensitive fields from payloads (see sanitize_payload)."""
+        return sanitize_payload(data, max_depth=max_depth, current_depth=current_depth)
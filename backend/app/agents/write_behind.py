@@ -0,0 +1,512 @@
+"""Write-behind batching for agent execution tracker events.
+
+In write-behind mode AgentExecutionTracker.complete_execution and
+fail_execution enqueue an event instead of writing to PostgreSQL. A
+background task flushes the queue in batches: one locking SELECT of every
+affected execution, one multi-row UPDATE, and one multi-row upsert of the
+metrics rollup, all in one transaction.
+
+A batch is written when it reaches the batch size or when its oldest event
+has waited the flush interval. The queue is bounded; when it is full,
+submitters wait (backpressure) rather than drop events. A failed batch is
+retried with backoff, and close() flushes everything still queued, so the
+application lifespan shutdown hook loses no events while the database is
+reachable.
+
+The flusher writes in its own session, so it may see an event before the
+transaction that started its execution has committed. Such events are
+retried with the next flushes until they are missing_retry_seconds old,
+and only then dropped as missing.
+
+Replaying an event is harmless: it writes the same values again and
+its rollup delta is zero, so a batch interrupted at shutdown is re-flushed
+as a whole.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import deque
+from collections.abc import Callable
+from contextlib import AbstractAsyncContextManager
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import (
+    JSON,
+    Table,
+    bindparam,
+    cast,
+    func,
+    or_,
+    select,
+    update,
+    values,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Update, column
+
+from ..core.config import get_settings
+from ..models import AgentExecution
+from ..services.agent_metrics_rollup import (
+    AgentMetricsRollup,
+    ExecutionState,
+    agent_metrics_rollup,
+)
+
+SessionFactory = Callable[[], AbstractAsyncContextManager[AsyncSession]]
+
+# Upper bound of the retry delay after failed flushes
+MAX_RETRY_DELAY_SECONDS = 5.0
+# Flush attempts made by close() before giving up on the remaining events
+CLOSE_FLUSH_ATTEMPTS = 3
+# Batch values left unset (None) keep the stored column value
+NULLABLE_JSON = JSON(none_as_null=True)
+
+
+@dataclass(frozen=True)
+class TrackerEvent:
+    """A buffered completion or failure of one execution.
+
+    Completions address the execution by id, failures by correlation id,
+    like the synchronous tracker methods.
+    """
+
+    status: str
+    completed_at: datetime
+    execution_id: UUID | None = None
+    correlation_id: UUID | None = None
+    output_data: dict[str, Any] | None = None
+    error_message: str | None = None
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+def _as_utc(value: datetime) -> datetime:
+    # Naive timestamps (SQLite) are UTC
+    return value if value.tzinfo else value.replace(tzinfo=UTC)
+
+
+class TrackerWriteBehind:
+    """Bounded in-process queue of tracker events with a batching flusher."""
+
+    def __init__(
+        self,
+        session_factory: SessionFactory | None = None,
+        batch_size: int = 200,
+        flush_interval_seconds: float = 0.2,
+        max_queue_size: int = 10_000,
+        executions: Table | None = None,
+        rollup: AgentMetricsRollup | None = None,
+        missing_retry_seconds: float = 30.0,
+    ) -> None:
+        """Initialize the buffer.
+
+        Args:
+            session_factory: Returns an async context manager yielding a
+                session that commits on exit (defaults to
+                database_manager.get_session)
+            batch_size: Events written per batch
+            flush_interval_seconds: Maximum wait of an event before a flush
+            max_queue_size: Queued events before submit() waits
+            executions: Executions table (defaults to agent_executions)
+            rollup: Metrics rollup kept in step (defaults to the shared one)
+            missing_retry_seconds: How long events of executions not (yet)
+                visible to the flusher are retried before they are dropped
+
+        Raises:
+            ValueError: If a size or an interval is not positive
+        """
+        if batch_size < 1 or max_queue_size < 1:
+            raise ValueError("batch_size and max_queue_size must be positive")
+        if flush_interval_seconds <= 0 or missing_retry_seconds <= 0:
+            raise ValueError(
+                "flush_interval_seconds and missing_retry_seconds must be positive"
+            )
+
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self.max_queue_size = max_queue_size
+        self.missing_retry_seconds = missing_retry_seconds
+        self.executions = (
+            executions if executions is not None else AgentExecution.__table__
+        )
+        self.rollup = rollup or agent_metrics_rollup
+        self.logger = logging.getLogger(__name__)
+
+        self._queue: asyncio.Queue[TrackerEvent] = asyncio.Queue(max_queue_size)
+        # Enqueue times of queued events, oldest first (for lag)
+        self._enqueued_times: deque[float] = deque()
+        self._inflight: list[TrackerEvent] = []
+        self._batch_ready = asyncio.Event()
+        self._flusher: asyncio.Task | None = None
+        self._closed = False
+
+        self._submitted = 0
+        self._flushed = 0
+        self._batches = 0
+        self._failed_flushes = 0
+        self._missing = 0
+        self._lost = 0
+        self._last_lag = 0.0
+        self._max_lag = 0.0
+
+    async def submit(self, event: TrackerEvent) -> None:
+        """Queue an event, waiting while the queue is full.
+
+        Raises:
+            RuntimeError: If the buffer is closed
+        """
+        if self._closed:
+            raise RuntimeError("Tracker write-behind buffer is closed")
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._run())
+        await self._queue.put(event)
+        self._enqueued_times.append(event.enqueued_at)
+        self._submitted += 1
+        if self._queue.qsize() + 1 >= self.batch_size:
+            self._batch_ready.set()
+
+    async def _drain(self) -> int:
+        # Write every queued event; only called once the flusher is stopped,
+        # so events of executions still not found are dropped, not retried
+        written = 0
+        while self._inflight or not self._queue.empty():
+            if not self._inflight:
+                self._inflight = self._take(self.batch_size)
+            written += await self._flush_inflight(retry_missing=False)
+        return written
+
+    async def close(self) -> None:
+        """Stop the flusher and write everything still queued.
+
+        Gives up after a few failed attempts so shutdown cannot hang on an
+        unreachable database; the events left are logged as lost.
+        """
+        self._closed = True
+        if self._flusher is not None:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            self._flusher = None
+
+        for attempt in range(1, CLOSE_FLUSH_ATTEMPTS + 1):
+            try:
+                await self._drain()
+                return
+            except Exception:
+                self.logger.exception(
+                    "Tracker write-behind flush failed during shutdown",
+                    extra={"attempt": attempt, "pending": self.pending},
+                )
+                await asyncio.sleep(min(0.1 * 2**attempt, MAX_RETRY_DELAY_SECONDS))
+
+        self._lost += self.pending
+        self.logger.error(
+            "Tracker events lost at shutdown",
+            extra={"lost": self.pending},
+        )
+
+    @property
+    def pending(self) -> int:
+        """Events queued or being written."""
+        return len(self._inflight) + self._queue.qsize()
+
+    def stats(self) -> dict[str, Any]:
+        """Get queue depth, lag and throughput counters."""
+        oldest = (
+            self._inflight[0].enqueued_at
+            if self._inflight
+            else (self._enqueued_times[0] if self._enqueued_times else None)
+        )
+        return {
+            "queue_depth": self._queue.qsize(),
+            "max_queue_size": self.max_queue_size,
+            "inflight": len(self._inflight),
+            "oldest_pending_age_seconds": (
+                time.monotonic() - oldest if oldest is not None else 0.0
+            ),
+            "last_flush_lag_seconds": self._last_lag,
+            "max_flush_lag_seconds": self._max_lag,
+            "submitted": self._submitted,
+            "flushed": self._flushed,
+            "batches": self._batches,
+            "failed_flushes": self._failed_flushes,
+            "missing_executions": self._missing,
+            "lost": self._lost,
+        }
+
+    def _take(self, limit: int) -> list[TrackerEvent]:
+        batch: list[TrackerEvent] = []
+        while len(batch) < limit and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+            self._enqueued_times.popleft()
+        return batch
+
+    async def _run(self) -> None:
+        failures = 0
+        while True:
+            if self._inflight:
+                # Events kept for a retry go first, topped up from the queue
+                self._inflight.extend(self._take(self.batch_size - len(self._inflight)))
+            else:
+                first = await self._queue.get()
+                self._enqueued_times.popleft()
+                self._inflight = [first]
+                # Wait until the batch is full or the oldest event is due;
+                # events stay queued meanwhile, so cancelling loses nothing
+                self._batch_ready.clear()
+                timeout = (
+                    first.enqueued_at + self.flush_interval_seconds - time.monotonic()
+                )
+                if self._queue.qsize() + 1 < self.batch_size and timeout > 0:
+                    try:
+                        await asyncio.wait_for(self._batch_ready.wait(), timeout)
+                    except TimeoutError:
+                        pass
+                self._inflight.extend(self._take(self.batch_size - 1))
+            try:
+                await self._flush_inflight()
+                failures = 0
+                if self._inflight:
+                    # Give the transactions starting those executions time
+                    await asyncio.sleep(self.flush_interval_seconds)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                failures += 1
+                self.logger.exception(
+                    "Tracker write-behind flush failed; retrying",
+                    extra={"events": len(self._inflight), "failures": failures},
+                )
+                await asyncio.sleep(
+                    min(
+                        self.flush_interval_seconds * 2**failures,
+                        MAX_RETRY_DELAY_SECONDS,
+                    )
+                )
+
+    async def _flush_inflight(self, retry_missing: bool = True) -> int:
+        batch = self._inflight
+        try:
+            retry = await self._write(batch, retry_missing)
+        except Exception:
+            self._failed_flushes += 1
+            raise
+        kept = {id(event) for event in retry}
+        written = [event for event in batch if id(event) not in kept]
+        self._inflight = retry
+        if not written:
+            return 0
+        lag = time.monotonic() - min(event.enqueued_at for event in written)
+        self._flushed += len(written)
+        self._batches += 1
+        self._last_lag = lag
+        self._max_lag = max(self._max_lag, lag)
+        return len(written)
+
+    def _session(self) -> AbstractAsyncContextManager[AsyncSession]:
+        if self.session_factory is not None:
+            return self.session_factory()
+        from ..core.database import database_manager
+
+        return database_manager.get_session()
+
+    async def _write(
+        self, batch: list[TrackerEvent], retry_missing: bool = True
+    ) -> list[TrackerEvent]:
+        # Returns the events kept for a retry (execution not visible yet)
+        executions = self.executions
+        execution_ids = {e.execution_id for e in batch if e.execution_id}
+        correlation_ids = {e.correlation_id for e in batch if e.correlation_id}
+
+        async with self._session() as session:
+            # Lock every affected row; concurrent writers update the rollup in turn
+            result = await session.execute(
+                select(
+                    executions.c.id,
+                    executions.c.correlation_id,
+                    executions.c.project_id,
+                    executions.c.agent_type,
+                    executions.c.started_at,
+                    executions.c.status,
+                    executions.c.completed_at,
+                )
+                .where(
+                    or_(
+                        executions.c.id.in_(execution_ids),
+                        executions.c.correlation_id.in_(correlation_ids),
+                    )
+                )
+                .order_by(executions.c.started_at)
+                .with_for_update()
+            )
+            rows = result.all()
+            by_id = {row.id: row for row in rows}
+            # A correlation id resolves to its most recently started execution
+            by_correlation = {row.correlation_id: row for row in rows}
+
+            # Merge the events of each execution in submission order
+            merged: dict[UUID, dict[str, Any]] = {}
+            retry: list[TrackerEvent] = []
+            now = time.monotonic()
+            for event in batch:
+                row = (
+                    by_id.get(event.execution_id)
+                    if event.execution_id
+                    else by_correlation.get(event.correlation_id)
+                )
+                if row is None and (
+                    retry_missing
+                    and now - event.enqueued_at < self.missing_retry_seconds
+                ):
+                    # Its start may not be committed yet
+                    retry.append(event)
+                    continue
+                if row is None:
+                    self._missing += 1
+                    self.logger.error(
+                        "Execution not found for buffered tracker event",
+                        extra={
+                            "execution_id": str(event.execution_id),
+                            "correlation_id": str(event.correlation_id),
+                        },
+                    )
+                    continue
+                row_values = merged.setdefault(
+                    row.id, {"output_data": None, "error_message": None}
+                )
+                row_values["status"] = event.status
+                row_values["completed_at"] = event.completed_at
+                row_values["duration_ms"] = int(
+                    (
+                        _as_utc(event.completed_at) - _as_utc(row.started_at)
+                    ).total_seconds()
+                    * 1000
+                )
+                if event.output_data is not None:
+                    row_values["output_data"] = event.output_data
+                if event.error_message is not None:
+                    row_values["error_message"] = event.error_message
+
+            if not merged:
+                return retry
+            await self._update(session, merged)
+            await self.rollup.record_many(
+                session,
+                [
+                    (
+                        by_id[execution_id].project_id,
+                        by_id[execution_id].agent_type,
+                        by_id[execution_id].started_at,
+                        ExecutionState(
+                            by_id[execution_id].status,
+                            by_id[execution_id].completed_at,
+                        ),
+                        ExecutionState(
+                            row_values["status"], row_values["completed_at"]
+                        ),
+                    )
+                    for execution_id, row_values in merged.items()
+                ],
+            )
+            return retry
+
+    def values_update(self, merged: dict[UUID, dict[str, Any]]) -> Update:
+        """Build the PostgreSQL multi-row UPDATE of a merged batch.
+
+        Args:
+            merged: Execution id -> status, completed_at, duration_ms,
+                output_data and error_message (None keeps the stored value)
+
+        Returns:
+            UPDATE agent_executions ... FROM (VALUES (...), (...)) AS batch
+        """
+        executions = self.executions
+        batch = values(
+            column("id", executions.c.id.type),
+            column("status", executions.c.status.type),
+            column("completed_at", executions.c.completed_at.type),
+            column("duration_ms", executions.c.duration_ms.type),
+            column("output_data", NULLABLE_JSON),
+            column("error_message", executions.c.error_message.type),
+            name="batch",
+        ).data(
+            [
+                (
+                    execution_id,
+                    row_values["status"],
+                    row_values["completed_at"],
+                    row_values["duration_ms"],
+                    row_values["output_data"],
+                    row_values["error_message"],
+                )
+                for execution_id, row_values in merged.items()
+            ]
+        )
+        return (
+            update(executions)
+            .where(executions.c.id == batch.c.id)
+            .values(
+                status=batch.c.status,
+                completed_at=batch.c.completed_at,
+                duration_ms=batch.c.duration_ms,
+                # All-NULL VALUES columns are typed text; cast back to JSON
+                output_data=func.coalesce(
+                    cast(batch.c.output_data, NULLABLE_JSON), executions.c.output_data
+                ),
+                error_message=func.coalesce(
+                    batch.c.error_message, executions.c.error_message
+                ),
+            )
+        )
+
+    async def _update(
+        self, session: AsyncSession, merged: dict[UUID, dict[str, Any]]
+    ) -> None:
+        if session.get_bind().dialect.name == "postgresql":
+            await session.execute(self.values_update(merged))
+            return
+
+        # Other dialects: one executemany of a parameterized UPDATE
+        executions = self.executions
+        await session.execute(
+            update(executions)
+            .where(executions.c.id == bindparam("b_id"))
+            .values(
+                status=bindparam("b_status"),
+                completed_at=bindparam("b_completed_at"),
+                duration_ms=bindparam("b_duration_ms"),
+                output_data=func.coalesce(
+                    bindparam("b_output_data", type_=NULLABLE_JSON),
+                    executions.c.output_data,
+                ),
+                error_message=func.coalesce(
+                    bindparam("b_error_message"), executions.c.error_message
+                ),
+            ),
+            [
+                {"b_id": execution_id, **{f"b_{k}": v for k, v in row_values.items()}}
+                for execution_id, row_values in merged.items()
+            ],
+        )
+
+
+def _build_write_behind() -> TrackerWriteBehind:
+    settings = get_settings()
+    return TrackerWriteBehind(
+        batch_size=settings.AGENT_TRACKER_BATCH_SIZE,
+        flush_interval_seconds=settings.AGENT_TRACKER_FLUSH_INTERVAL_SECONDS,
+        max_queue_size=settings.AGENT_TRACKER_QUEUE_SIZE,
+        missing_retry_seconds=settings.AGENT_TRACKER_MISSING_RETRY_SECONDS,
+    )
+
+
+# Global buffer, used by trackers when AGENT_TRACKER_WRITE_BEHIND is enabled
+tracker_write_behind = _build_write_behind()
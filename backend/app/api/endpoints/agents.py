@@ -10,11 +10,13 @@ Agent execution tracking and management with:
 """
 
 from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field, ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update, delete, func, case
+from sqlalchemy import select, update, delete
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
-from typing import List, Optional, Dict, Any
+from sqlalchemy.orm import load_only
+from typing import List, Optional, Dict, Any, Union
 from uuid import UUID, uuid4
 from datetime import datetime, timedelta
 import time
@@ -22,13 +24,25 @@ import structlog
 import asyncio
 
 from ...db import get_database_session
-from ...models import AgentExecution, Project, User
+from ...models import AgentExecution, User
 from ...core.config import get_settings
 from ...core.monitoring import performance_monitor
+from ...repositories.pagination import (
+    CountMode,
+    KeysetPage,
+    apply_keyset,
+    count_rows,
+    split_page,
+)
+from ...services.agent_metrics_rollup import ExecutionState, agent_metrics_rollup
+from ...services.project_access import ProjectAccessService
+from ...agents.cancellation import ExecutionCancelled, agent_cancellation
 from ...agents.dependencies import orchestrator_provider
 from ...agents.context import create_context
 from ...agents.orchestrator import AgentOrchestrator
 from ...agents.contracts import AgentInput, AgentOutput
+from ...agents.streaming import agent_output_streaming, stream_operation_id
+from ...services.sse import get_sse_service
 
 logger = structlog.get_logger()
 settings = get_settings()
@@ -75,19 +89,63 @@ class AgentExecutionRead(BaseModel):
     completed_at: Optional[datetime]
     created_at: datetime
     updated_at: datetime
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cost_usd: float = 0.0
+
+    class Config:
+        from_attributes = True
+
+
+class AgentExecutionSummary(BaseModel):
+    """Schema for execution listings without input and output payloads."""
+
+    id: UUID
+    project_id: UUID
+    agent_type: str
+    correlation_id: UUID
+    status: str
+    started_at: datetime
+    completed_at: Optional[datetime]
+    duration_ms: Optional[int] = None
+    created_at: datetime
+    updated_at: datetime
 
     class Config:
         from_attributes = True
 
 
 class AgentExecutionList(BaseModel):
-    """Schema for agent execution lists with pagination."""
+    """Schema for agent execution lists with offset or cursor pagination."""
 
-    executions: List[AgentExecutionRead]
-    total: int
+    executions: List[Union[AgentExecutionRead, AgentExecutionSummary]]
+    total: Optional[int]
     page: int
     per_page: int
-    total_pages: int
+    total_pages: Optional[int]
+    total_is_estimate: bool = False
+    next_cursor: Optional[str] = None
+
+
+# Stable listing order; the cursor carries these values of the last row
+EXECUTION_SORT_KEYS = (
+    (AgentExecution.started_at, True),
+    (AgentExecution.id, True),
+)
+
+# Columns loaded for summary listings (input/output payloads deferred)
+EXECUTION_SUMMARY_COLUMNS = (
+    AgentExecution.id,
+    AgentExecution.project_id,
+    AgentExecution.agent_type,
+    AgentExecution.correlation_id,
+    AgentExecution.status,
+    AgentExecution.started_at,
+    AgentExecution.completed_at,
+    AgentExecution.duration_ms,
+    AgentExecution.created_at,
+    AgentExecution.updated_at,
+)
 
 
 class AgentMetrics(BaseModel):
@@ -99,9 +157,30 @@ class AgentMetrics(BaseModel):
     average_execution_time_seconds: float
     success_rate: float
     executions_by_agent_type: Dict[str, int]
+    total_prompt_tokens: int = 0
+    total_completion_tokens: int = 0
+    total_tokens: int = 0
+    total_cost_usd: float = 0.0
+    tokens_by_agent_type: Dict[str, int] = Field(default_factory=dict)
     recent_executions: List[AgentExecutionRead]
 
 
+class AgentOutputChunkRead(BaseModel):
+    """Schema for a persisted chunk of streamed agent output."""
+
+    seq: int
+    content: str
+
+
+class AgentOutputChunkList(BaseModel):
+    """Schema for persisted output chunks, in order of seq."""
+
+    chunks: List[AgentOutputChunkRead]
+    next_seq: Optional[int] = Field(
+        None, description="after_seq of the next page (None: no more chunks)"
+    )
+
+
 class WorkflowStartResponse(BaseModel):
     """Response model for workflow initiation."""
 
@@ -109,6 +188,16 @@ class WorkflowStartResponse(BaseModel):
     status: str = Field(..., description="Current status of the workflow")
 
 
+class WorkflowCancelResponse(BaseModel):
+    """Response model for a workflow cancel request."""
+
+    correlation_id: str = Field(..., description="Correlation ID of the workflow")
+    status: str = Field(
+        ...,
+        description="cancelled once stopped and released, cancelling while stopping",
+    )
+
+
 @router.post(
     "/projects/{project_id}/agents/workflows/{stage}/start",
     status_code=202,
@@ -164,13 +253,15 @@ async def start_agent_workflow(
     language: str = Query(
         ..., description="Project language (ISO 639-1)", min_length=2, max_length=10
     ),
-    user_message: str = Query(..., description="Initial user message for PM", min_length=1),
+    user_message: str = Query(
+        ..., description="Initial user message for PM", min_length=1
+    ),
     orchestrator: AgentOrchestrator = Depends(orchestrator_provider),
 ):
     """Start an agent workflow for a given stage using the orchestrator.
 
     Returns minimal execution metadata for tracking.
-    
+
     TODO: Replace user_id Query parameter with authenticated identity (e.g., get_current_user dependency)
     in a future refactor when OAuth2 authentication is fully integrated.
     """
@@ -207,6 +298,9 @@ async def start_agent_workflow(
             error=str(e),
         )
         raise HTTPException(status_code=400, detail=str(e))
+    except ExecutionCancelled as e:
+        # Stopped by a cancel request; recorded with status cancelled
+        raise HTTPException(status_code=409, detail=str(e)) from e
     except Exception as e:
         # Unexpected errors - log with full context, return generic error
         logger.exception(
@@ -215,9 +309,63 @@ async def start_agent_workflow(
             user_id=str(user_id),
             stage=stage,
         )
+        raise HTTPException(status_code=500, detail="Workflow execution failed") from e
+
+
+@router.post(
+    "/projects/{project_id}/agents/workflows/{correlation_id}/cancel",
+    status_code=202,
+    response_model=WorkflowCancelResponse,
+)
+async def cancel_agent_workflow(
+    project_id: UUID,
+    correlation_id: UUID,
+    user_id: UUID = Query(..., description="User ID for access validation"),
+    reason: str = Query(
+        "cancelled by user", min_length=1, max_length=200, description="Recorded reason"
+    ),
+    session: AsyncSession = Depends(get_database_session),
+):
+    """
+    Cancel a running agent workflow or task graph.
+
+    The workflow stops its in-flight work and releases the resources it
+    holds; it is recorded with status cancelled. A workflow running in this
+    process is awaited up to AGENT_CANCEL_WAIT_SECONDS; one running in
+    another process stops within AGENT_CANCEL_POLL_SECONDS.
+
+    Args:
+        project_id: Project UUID
+        correlation_id: Correlation ID of the workflow
+        user_id: User ID for access validation
+        reason: Recorded cancellation reason
+        session: Database session
+
+    Returns:
+        Whether the workflow has stopped (cancelled) or is stopping (cancelling)
+    """
+    if not await ProjectAccessService(session).check(project_id, user_id):
         raise HTTPException(
-            status_code=500, detail="Workflow execution failed"
-        ) from e
+            status_code=404, detail="Project not found or access denied"
+        )
+    outcome = await agent_cancellation.cancel(
+        project_id,
+        correlation_id,
+        reason=reason,
+        wait_seconds=settings.AGENT_CANCEL_WAIT_SECONDS,
+    )
+    if not outcome.requested:
+        raise HTTPException(status_code=404, detail="No running workflow found")
+    logger.info(
+        "Agent workflow cancel requested",
+        project_id=str(project_id),
+        correlation_id=str(correlation_id),
+        stopped=outcome.stopped,
+    )
+    return WorkflowCancelResponse(
+        correlation_id=str(correlation_id),
+        status="cancelled" if outcome.stopped else "cancelling",
+    )
 
 
 @router.get("/agents/health")
@@ -246,6 +394,8 @@ class AgentExecutionRepository:
 
     def __init__(self, session: AsyncSession):
         self.session = session
+        self.access = ProjectAccessService(session)
+        self.rollup = agent_metrics_rollup
 
     async def create(
         self, execution_data: AgentExecutionCreate, user_id: UUID
@@ -254,16 +404,8 @@ class AgentExecutionRepository:
         start_time = time.time()
 
         try:
-            # Validate project access
-            project_result = await self.session.execute(
-                select(Project).where(
-                    Project.id == execution_data.project_id,
-                    Project.created_by == user_id,
-                    Project.is_deleted == False,
-                )
-            )
-            project = project_result.scalar_one_or_none()
-            if not project:
+            # Validate project access (memoized per request)
+            if not await self.access.check(execution_data.project_id, user_id):
                 raise HTTPException(
                     status_code=404, detail="Project not found or access denied"
                 )
@@ -280,6 +422,14 @@ class AgentExecutionRepository:
 
             self.session.add(execution)
             await self.session.flush()  # Get the ID without committing
+            await self.rollup.record(
+                self.session,
+                execution.project_id,
+                execution.agent_type,
+                execution.started_at,
+                None,
+                ExecutionState(execution.status),
+            )
 
             # Commit the transaction
             await self.session.commit()
@@ -319,16 +469,8 @@ class AgentExecutionRepository:
         start_time = time.time()
 
         try:
-            # Validate project access first
-            project_result = await self.session.execute(
-                select(Project).where(
-                    Project.id == project_id,
-                    Project.created_by == user_id,
-                    Project.is_deleted == False,
-                )
-            )
-            project = project_result.scalar_one_or_none()
-            if not project:
+            # Validate project access first (memoized per request)
+            if not await self.access.check(project_id, user_id):
                 return None
 
             # Get execution
@@ -363,21 +505,22 @@ class AgentExecutionRepository:
         per_page: int = 20,
         agent_type: Optional[str] = None,
         status: Optional[str] = None,
-    ) -> tuple[List[AgentExecution], int]:
-        """Get project agent executions with pagination and filtering."""
+        cursor: Optional[str] = None,
+        summary: bool = False,
+        count: CountMode = CountMode.EXACT,
+    ) -> KeysetPage:
+        """
+        Get project agent executions with pagination and filtering.
+
+        A cursor (next_cursor of the previous page) selects keyset
+        pagination and takes precedence over page, which is kept for
+        compatibility and still served with OFFSET.
+        """
         start_time = time.time()
 
         try:
-            # Validate project access
-            project_result = await self.session.execute(
-                select(Project).where(
-                    Project.id == project_id,
-                    Project.created_by == user_id,
-                    Project.is_deleted == False,
-                )
-            )
-            project = project_result.scalar_one_or_none()
-            if not project:
+            # Validate project access (memoized per request)
+            if not await self.access.check(project_id, user_id):
                 raise HTTPException(status_code=404, detail="Project not found")
 
             # Build query
@@ -391,28 +534,35 @@ class AgentExecutionRepository:
                 query = query.where(AgentExecution.status == status)
 
             # Get total count
-            count_query = select(func.count()).select_from(query.subquery())
-            total_result = await self.session.execute(count_query)
-            total = total_result.scalar()
-
-            # Apply pagination
-            offset = (page - 1) * per_page
-            query = (
-                query.order_by(AgentExecution.started_at.desc())
-                .offset(offset)
-                .limit(per_page)
+            total, total_is_estimate = await count_rows(self.session, query, count)
+
+            # Apply pagination (one extra row tells whether a next page exists)
+            try:
+                page_query = apply_keyset(query, EXECUTION_SORT_KEYS, cursor)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e)) from e
+            if not cursor:
+                page_query = page_query.offset((page - 1) * per_page)
+            if summary:
+                page_query = page_query.options(load_only(*EXECUTION_SUMMARY_COLUMNS))
+
+            result = await self.session.execute(page_query.limit(per_page + 1))
+            executions, next_cursor = split_page(
+                result.scalars().all(), per_page, EXECUTION_SORT_KEYS
             )
 
-            result = await self.session.execute(query)
-            executions = result.scalars().all()
-
             # Log performance
             duration = (time.time() - start_time) * 1000
             await performance_monitor.log_query_performance(
                 "agent_execution_list", duration, project_id=project_id, success=True
             )
 
-            return list(executions), total
+            return KeysetPage(
+                items=executions,
+                next_cursor=next_cursor,
+                total=total,
+                total_is_estimate=total_is_estimate,
+            )
 
         except SQLAlchemyError as e:
             logger.exception("Database error listing agent executions")
@@ -449,12 +599,27 @@ class AgentExecutionRepository:
             if not update_values:
                 return execution  # No changes needed
 
+            # Lock the row so concurrent transitions update metrics in turn
+            current = await self.rollup.lock_execution(self.session, execution_id)
+
             # Perform update
             await self.session.execute(
                 update(AgentExecution)
                 .where(AgentExecution.id == execution_id)
                 .values(**update_values)
             )
+            if current is not None:
+                await self.rollup.record(
+                    self.session,
+                    current.project_id,
+                    current.agent_type,
+                    current.started_at,
+                    ExecutionState(current.status, current.completed_at),
+                    ExecutionState(
+                        update_values.get("status", current.status),
+                        update_values.get("completed_at", current.completed_at),
+                    ),
+                )
 
             # Commit the transaction
             await self.session.commit()
@@ -489,61 +654,16 @@ class AgentExecutionRepository:
         start_time = time.time()
 
         try:
-            # Validate project access
-            project_result = await self.session.execute(
-                select(Project).where(
-                    Project.id == project_id,
-                    Project.created_by == user_id,
-                    Project.is_deleted == False,
-                )
-            )
-            project = project_result.scalar_one_or_none()
-            if not project:
+            # Validate project access (memoized per request)
+            if not await self.access.check(project_id, user_id):
                 raise HTTPException(status_code=404, detail="Project not found")
 
             # Calculate date range
             end_date = datetime.utcnow()
             start_date = end_date - timedelta(days=days)
 
-            # Get metrics
-            metrics_query = select(
-                func.count(AgentExecution.id).label("total_executions"),
-                func.sum(
-                    case((AgentExecution.status == "completed", 1), else_=0)
-                ).label("successful_executions"),
-                func.sum(case((AgentExecution.status == "failed", 1), else_=0)).label(
-                    "failed_executions"
-                ),
-                func.avg(
-                    func.extract(
-                        "epoch",
-                        func.coalesce(AgentExecution.completed_at, datetime.utcnow())
-                        - AgentExecution.started_at,
-                    )
-                ).label("avg_execution_time"),
-            ).where(
-                AgentExecution.project_id == project_id,
-                AgentExecution.started_at >= start_date,
-            )
-
-            metrics_result = await self.session.execute(metrics_query)
-            metrics = metrics_result.first()
-
-            # Get executions by agent type
-            type_query = (
-                select(
-                    AgentExecution.agent_type,
-                    func.count(AgentExecution.id).label("count"),
-                )
-                .where(
-                    AgentExecution.project_id == project_id,
-                    AgentExecution.started_at >= start_date,
-                )
-                .group_by(AgentExecution.agent_type)
-            )
-
-            type_result = await self.session.execute(type_query)
-            executions_by_type = dict(type_result.all())
+            # Pre-aggregated counters (see services.agent_metrics_rollup)
+            metrics = await self.rollup.read(self.session, project_id, start_date)
 
             # Get recent executions
             recent_query = (
@@ -556,30 +676,13 @@ class AgentExecutionRepository:
             recent_result = await self.session.execute(recent_query)
             recent_executions = recent_result.scalars().all()
 
-            # Calculate success rate
-            success_rate = 0.0
-            if metrics.total_executions > 0:
-                success_rate = (
-                    metrics.successful_executions / metrics.total_executions
-                ) * 100
-
             # Log performance
             duration = (time.time() - start_time) * 1000
             await performance_monitor.log_query_performance(
                 "agent_execution_metrics", duration, project_id=project_id, success=True
             )
 
-            return {
-                "total_executions": metrics.total_executions or 0,
-                "successful_executions": metrics.successful_executions or 0,
-                "failed_executions": metrics.failed_executions or 0,
-                "average_execution_time_seconds": float(
-                    metrics.avg_execution_time or 0
-                ),
-                "success_rate": success_rate,
-                "executions_by_agent_type": executions_by_type,
-                "recent_executions": list(recent_executions),
-            }
+            return {**metrics, "recent_executions": list(recent_executions)}
 
         except SQLAlchemyError as e:
             logger.exception("Database error getting agent metrics")
@@ -657,6 +760,17 @@ async def list_agent_executions(
     per_page: int = Query(20, ge=1, le=100, description="Items per page"),
     agent_type: Optional[str] = Query(None, description="Filter by agent type"),
     status: Optional[str] = Query(None, description="Filter by status"),
+    cursor: Optional[str] = Query(
+        None, description="next_cursor of the previous page (keyset pagination)"
+    ),
+    view: str = Query(
+        "full",
+        pattern="^(full|summary)$",
+        description="summary omits input and output data",
+    ),
+    count: CountMode = Query(
+        CountMode.EXACT, description="Total count: exact, estimated or none"
+    ),
     session: AsyncSession = Depends(get_database_session),
 ):
     """
@@ -665,28 +779,127 @@ async def list_agent_executions(
     Args:
         project_id: Project UUID
         user_id: User ID for access validation
-        page: Page number
+        page: Page number (ignored when a cursor is given)
         per_page: Items per page
         agent_type: Optional agent type filter
         status: Optional status filter
+        cursor: Keyset pagination cursor
+        view: full or summary listing
+        count: Total count mode
         session: Database session
 
     Returns:
         Paginated agent execution list
     """
     repo = AgentExecutionRepository(session)
-    executions, total = await repo.get_project_executions(
-        project_id, user_id, page, per_page, agent_type, status
+    result = await repo.get_project_executions(
+        project_id,
+        user_id,
+        page,
+        per_page,
+        agent_type,
+        status,
+        cursor=cursor,
+        summary=view == "summary",
+        count=count,
     )
 
-    total_pages = (total + per_page - 1) // per_page
+    schema = AgentExecutionSummary if view == "summary" else AgentExecutionRead
+    total = result.total
+    total_pages = (total + per_page - 1) // per_page if total is not None else None
 
     return AgentExecutionList(
-        executions=[AgentExecutionRead.model_validate(e) for e in executions],
+        executions=[schema.model_validate(e) for e in result.items],
         total=total,
         page=page,
         per_page=per_page,
         total_pages=total_pages,
+        total_is_estimate=result.total_is_estimate,
+        next_cursor=result.next_cursor,
+    )
+
+
+@router.get(
+    "/projects/{project_id}/agents/executions/{execution_id}/chunks",
+    response_model=AgentOutputChunkList,
+)
+async def list_agent_output_chunks(
+    project_id: UUID,
+    execution_id: UUID,
+    user_id: UUID = Query(..., description="User ID for access validation"),
+    after_seq: int = Query(-1, ge=-1, description="Return chunks after this seq"),
+    limit: int = Query(500, ge=1, le=5000, description="Maximum chunks returned"),
+    session: AsyncSession = Depends(get_database_session),
+):
+    """
+    Get persisted chunks of an execution's streamed output.
+
+    Clients joining a running execution read the chunks persisted so far,
+    then follow the stream and skip chunks whose seq they already have.
+    Access is checked on the project, not the execution row, which may not
+    be committed yet while the execution runs; chunks are read by project.
+
+    Args:
+        project_id: Project UUID
+        execution_id: Agent execution UUID
+        user_id: User ID for access validation
+        after_seq: Return chunks after this seq
+        limit: Maximum chunks returned
+        session: Database session
+
+    Returns:
+        Chunks in order of seq
+    """
+    if not await ProjectAccessService(session).check(project_id, user_id):
+        raise HTTPException(
+            status_code=404, detail="Project not found or access denied"
+        )
+    chunks = await agent_output_streaming.store.read(
+        execution_id, project_id, after_seq, limit + 1, session=session
+    )
+    has_more = len(chunks) > limit
+    chunks = chunks[:limit]
+    return AgentOutputChunkList(
+        chunks=[AgentOutputChunkRead(seq=c.seq, content=c.content) for c in chunks],
+        next_seq=chunks[-1].seq if has_more else None,
+    )
+
+
+@router.get("/projects/{project_id}/agents/executions/{execution_id}/stream")
+async def stream_agent_output(
+    project_id: UUID,
+    execution_id: UUID,
+    user_id: UUID = Query(..., description="User ID for access validation"),
+    session: AsyncSession = Depends(get_database_session),
+):
+    """
+    Stream an execution's output as Server-Sent Events while it is generated.
+
+    Events are agent.output.chunk (seq, content) and a final
+    agent.output.end (status), after which the stream closes. Access is
+    checked on the project, so a stream can be joined before the execution
+    row is committed.
+
+    Args:
+        project_id: Project UUID
+        execution_id: Agent execution UUID
+        user_id: User ID for access validation
+        session: Database session
+
+    Returns:
+        text/event-stream response
+    """
+    if not await ProjectAccessService(session).check(project_id, user_id):
+        raise HTTPException(
+            status_code=404, detail="Project not found or access denied"
+        )
+    try:
+        sse = get_sse_service()
+    except RuntimeError as e:
+        raise HTTPException(status_code=503, detail="Streaming unavailable") from e
+    return StreamingResponse(
+        sse.stream_progress(project_id, stream_operation_id(execution_id)),
+        media_type="text/event-stream",
     )
 
 
@@ -750,6 +963,11 @@ async def get_agent_metrics(
         average_execution_time_seconds=metrics["average_execution_time_seconds"],
         success_rate=metrics["success_rate"],
         executions_by_agent_type=metrics["executions_by_agent_type"],
+        total_prompt_tokens=metrics["total_prompt_tokens"],
+        total_completion_tokens=metrics["total_completion_tokens"],
+        total_tokens=metrics["total_tokens"],
+        total_cost_usd=metrics["total_cost_usd"],
+        tokens_by_agent_type=metrics["tokens_by_agent_type"],
         recent_executions=[
             AgentExecutionRead.model_validate(e) for e in metrics["recent_executions"]
         ],
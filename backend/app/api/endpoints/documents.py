@@ -12,25 +12,33 @@ Complete CRUD operations for document versions with:
 from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel, Field
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update, delete, func, and_
+from sqlalchemy import select, update, delete, and_
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
-from typing import List, Optional, Dict, Any
+from sqlalchemy.orm import load_only
+from typing import List, Optional, Dict, Any, Union
 from uuid import UUID
 from datetime import datetime
 import time
 import asyncio
 import structlog
-from tenacity import (
-    retry,
-    stop_after_attempt,
-    wait_exponential,
-    retry_if_exception_type,
-)
 
 from ...core.database import get_database_session
-from ...models import DocumentVersion, Project, User
+from ...models import DocumentVersion, User
 from ...core.config import get_settings
 from ...core.monitoring import performance_monitor
+from ...repositories.pagination import (
+    CountMode,
+    KeysetPage,
+    apply_keyset,
+    count_rows,
+    split_page,
+)
+from ...services.document_version_counters import (
+    VersionAllocator,
+    latest_version_query,
+)
+from ...services.document_versions import DocumentVersionStore
+from ...services.project_access import ProjectAccessService
 
 logger = structlog.get_logger()
 settings = get_settings()
@@ -85,14 +93,72 @@ class DocumentRead(DocumentBase):
         from_attributes = True
 
 
+class DocumentSummary(BaseModel):
+    """Schema for document listings without content and metadata."""
+
+    id: UUID
+    project_id: UUID
+    document_type: str
+    version: int
+    created_by: UUID
+    readability_score: Optional[float] = None
+    grammar_score: Optional[float] = None
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
 class DocumentList(BaseModel):
-    """Schema for document lists with pagination."""
+    """Schema for document lists with offset or cursor pagination."""
 
-    documents: List[DocumentRead]
-    total: int
+    documents: List[Union[DocumentRead, DocumentSummary]]
+    total: Optional[int]
     page: int
     per_page: int
-    total_pages: int
+    total_pages: Optional[int]
+    total_is_estimate: bool = False
+    next_cursor: Optional[str] = None
+
+
+# Stable listing order; the cursor carries these values of the last row
+DOCUMENT_SORT_KEYS = (
+    (DocumentVersion.document_type, False),
+    (DocumentVersion.version, True),
+    (DocumentVersion.id, False),
+)
+
+# Columns loaded for summary listings (content, deltas and metadata deferred)
+DOCUMENT_SUMMARY_COLUMNS = (
+    DocumentVersion.id,
+    DocumentVersion.project_id,
+    DocumentVersion.document_type,
+    DocumentVersion.version,
+    DocumentVersion.created_by,
+    DocumentVersion.readability_score,
+    DocumentVersion.grammar_score,
+    DocumentVersion.created_at,
+    DocumentVersion.updated_at,
+)
+
+
+# Attributes of a new version written by the insert (version is allocated)
+DOCUMENT_INSERT_ATTRIBUTES = (
+    "project_id",
+    "document_type",
+    "meta_data",
+    "readability_score",
+    "grammar_score",
+    "created_by",
+    "content_storage",
+    "stored_content",
+    "content_delta",
+    "delta_base_version",
+    "snapshot_version",
+    "delta_chain_length",
+    "content_hash",
+)
 
 
 # CRUD Operations
@@ -101,57 +167,40 @@ class DocumentRepository:
 
     def __init__(self, session: AsyncSession):
         self.session = session
+        self.access = ProjectAccessService(session)
+        self.versions = DocumentVersionStore(session)
+        self.allocator = VersionAllocator()
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=0.5, min=0.5, max=4),
-        retry=retry_if_exception_type(IntegrityError),
-        before_sleep=lambda retry_state: logger.warning(
-            "Document creation retry due to version conflict",
-            attempt=retry_state.attempt_number,
-            wait_time=retry_state.next_action.sleep,
-        ),
-    )
     async def create(
         self, doc_data: DocumentCreate, project_id: UUID, user_id: UUID
     ) -> DocumentVersion:
-        """Create a new document version with project isolation."""
+        """
+        Create a new document version with project isolation.
+
+        The version number comes from the document's counter row in the
+        same statement as the insert, so concurrent writers never collide
+        on a version and need no retries.
+        """
         start_time = time.time()
 
         try:
-            # Validate project access
-            project_result = await self.session.execute(
-                select(Project).where(
-                    Project.id == project_id,
-                    Project.created_by == user_id,
-                    Project.is_deleted == False,
-                )
-            )
-            project = project_result.scalar_one_or_none()
-            if not project:
+            # Validate project access (memoized per request)
+            if not await self.access.check(project_id, user_id):
                 raise HTTPException(
                     status_code=404, detail="Project not found or access denied"
                 )
 
-            # Get next version if not specified
-            if doc_data.version == 1:
-                last_version_result = await self.session.execute(
-                    select(func.coalesce(func.max(DocumentVersion.version), 0))
-                    .where(DocumentVersion.project_id == project_id)
-                    .where(DocumentVersion.document_type == doc_data.document_type)
-                )
-                next_version = (last_version_result.scalar() or 0) + 1
-            else:
-                # Use specified version but check for conflicts first
+            # Version 1 means "next version"; other values are explicit
+            requested_version = None
+            if doc_data.version != 1:
                 existing_result = await self.session.execute(
-                    select(DocumentVersion).where(
+                    select(DocumentVersion.id).where(
                         DocumentVersion.project_id == project_id,
                         DocumentVersion.document_type == doc_data.document_type,
                         DocumentVersion.version == doc_data.version,
                     )
                 )
-                existing = existing_result.scalar_one_or_none()
-                if existing:
+                if existing_result.scalar_one_or_none() is not None:
                     raise IntegrityError(
                         "Version conflict",
                         params=None,
@@ -159,22 +208,33 @@ class DocumentRepository:
                             f"Document version {doc_data.version} already exists"
                         ),
                     )
-                next_version = doc_data.version
+                requested_version = doc_data.version
 
             # Enforce server-side invariants
-            document = DocumentVersion(
+            draft = DocumentVersion(
                 project_id=project_id,
                 document_type=doc_data.document_type,
-                version=next_version,
-                content=doc_data.content,
+                version=requested_version,
                 meta_data=doc_data.meta_data,
                 readability_score=doc_data.readability_score,
                 grammar_score=doc_data.grammar_score,
                 created_by=user_id,  # Server-enforced user ID
             )
-
-            self.session.add(document)
-            await self.session.flush()  # Get the ID without committing
+            # Stored as a snapshot or a delta against the previous version
+            await self.versions.prepare_new_version(draft, doc_data.content)
+
+            result = await self.allocator.insert(
+                self.session,
+                DocumentVersion,
+                {
+                    attribute: getattr(draft, attribute)
+                    for attribute in DOCUMENT_INSERT_ATTRIBUTES
+                },
+                requested_version=requested_version,
+            )
+            document = result.scalar_one()
+            document._reconstructed_content = doc_data.content
+            next_version = document.version
 
             # Log performance
             duration = (time.time() - start_time) * 1000
@@ -188,6 +248,7 @@ class DocumentRepository:
                 project_id=str(project_id),
                 version=next_version,
                 type=doc_data.document_type,
+                content_storage=document.content_storage,
                 duration_ms=duration,
             )
 
@@ -225,16 +286,8 @@ class DocumentRepository:
         start_time = time.time()
 
         try:
-            # Validate project access first
-            project_result = await self.session.execute(
-                select(Project).where(
-                    Project.id == project_id,
-                    Project.created_by == user_id,
-                    Project.is_deleted == False,
-                )
-            )
-            project = project_result.scalar_one_or_none()
-            if not project:
+            # Validate project access first (memoized per request)
+            if not await self.access.check(project_id, user_id):
                 return None
 
             # Get document
@@ -245,6 +298,8 @@ class DocumentRepository:
                 )
             )
             document = result.scalar_one_or_none()
+            if document is not None:
+                await self.versions.load_contents([document])
 
             # Log performance
             duration = (time.time() - start_time) * 1000
@@ -273,21 +328,22 @@ class DocumentRepository:
         page: int = 1,
         per_page: int = 20,
         document_type: Optional[str] = None,
-    ) -> tuple[List[DocumentVersion], int]:
-        """Get project documents with pagination and filtering."""
+        cursor: Optional[str] = None,
+        summary: bool = False,
+        count: CountMode = CountMode.EXACT,
+    ) -> KeysetPage:
+        """
+        Get project documents with pagination and filtering.
+
+        A cursor (next_cursor of the previous page) selects keyset
+        pagination and takes precedence over page, which is kept for
+        compatibility and still served with OFFSET.
+        """
         start_time = time.time()
 
         try:
-            # Validate project access
-            project_result = await self.session.execute(
-                select(Project).where(
-                    Project.id == project_id,
-                    Project.created_by == user_id,
-                    Project.is_deleted == False,
-                )
-            )
-            project = project_result.scalar_one_or_none()
-            if not project:
+            # Validate project access (memoized per request)
+            if not await self.access.check(project_id, user_id):
                 raise HTTPException(status_code=404, detail="Project not found")
 
             # Build query
@@ -299,22 +355,24 @@ class DocumentRepository:
                 query = query.where(DocumentVersion.document_type == document_type)
 
             # Get total count
-            count_query = select(func.count()).select_from(query.subquery())
-            total_result = await self.session.execute(count_query)
-            total = total_result.scalar()
-
-            # Apply pagination
-            offset = (page - 1) * per_page
-            query = (
-                query.order_by(
-                    DocumentVersion.document_type, DocumentVersion.version.desc()
-                )
-                .offset(offset)
-                .limit(per_page)
+            total, total_is_estimate = await count_rows(self.session, query, count)
+
+            # Apply pagination (one extra row tells whether a next page exists)
+            try:
+                page_query = apply_keyset(query, DOCUMENT_SORT_KEYS, cursor)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e)) from e
+            if not cursor:
+                page_query = page_query.offset((page - 1) * per_page)
+            if summary:
+                page_query = page_query.options(load_only(*DOCUMENT_SUMMARY_COLUMNS))
+
+            result = await self.session.execute(page_query.limit(per_page + 1))
+            documents, next_cursor = split_page(
+                result.scalars().all(), per_page, DOCUMENT_SORT_KEYS
             )
-
-            result = await self.session.execute(query)
-            documents = result.scalars().all()
+            if not summary:
+                await self.versions.load_contents(documents)
 
             # Log performance
             duration = (time.time() - start_time) * 1000
@@ -322,7 +380,12 @@ class DocumentRepository:
                 "document_list", duration, True
             )
 
-            return list(documents), total
+            return KeysetPage(
+                items=documents,
+                next_cursor=next_cursor,
+                total=total,
+                total_is_estimate=total_is_estimate,
+            )
 
         except SQLAlchemyError as e:
             logger.error(
@@ -332,6 +395,7 @@ class DocumentRepository:
                 page=page,
                 per_page=per_page,
                 document_type=document_type,
+                cursor=cursor,
                 exc_info=True,
             )
             raise HTTPException(
@@ -345,29 +409,29 @@ class DocumentRepository:
         start_time = time.time()
 
         try:
-            # Validate project access
-            project_result = await self.session.execute(
-                select(Project).where(
-                    Project.id == project_id,
-                    Project.created_by == user_id,
-                    Project.is_deleted == False,
-                )
-            )
-            project = project_result.scalar_one_or_none()
-            if not project:
+            # Validate project access (memoized per request)
+            if not await self.access.check(project_id, user_id):
                 return None
 
-            # Get latest version
+            # Get latest version through the counter's pointer
             result = await self.session.execute(
-                select(DocumentVersion)
-                .where(
-                    DocumentVersion.project_id == project_id,
-                    DocumentVersion.document_type == document_type,
-                )
-                .order_by(DocumentVersion.version.desc())
-                .limit(1)
+                latest_version_query(project_id, document_type)
             )
             document = result.scalar_one_or_none()
+            if document is None:
+                # Versions inserted by writers that bypass the counters
+                result = await self.session.execute(
+                    select(DocumentVersion)
+                    .where(
+                        DocumentVersion.project_id == project_id,
+                        DocumentVersion.document_type == document_type,
+                    )
+                    .order_by(DocumentVersion.version.desc())
+                    .limit(1)
+                )
+                document = result.scalar_one_or_none()
+            if document is not None:
+                await self.versions.load_contents([document])
 
             # Log performance
             duration = (time.time() - start_time) * 1000
@@ -409,7 +473,9 @@ class DocumentRepository:
             # Update fields
             update_values = {}
             if update_data.content is not None:
-                update_values["content"] = update_data.content
+                # Rewritten as a snapshot; later deltas based on it are detached
+                await self.versions.replace_content(document, update_data.content)
+                await self.session.flush()
             if update_data.meta_data is not None:
                 update_values["meta_data"] = update_data.meta_data
             if update_data.readability_score is not None:
@@ -417,15 +483,16 @@ class DocumentRepository:
             if update_data.grammar_score is not None:
                 update_values["grammar_score"] = update_data.grammar_score
 
-            if not update_values:
+            if not update_values and update_data.content is None:
                 return document  # No changes needed
 
             # Perform update
-            await self.session.execute(
-                update(DocumentVersion)
-                .where(DocumentVersion.id == document_id)
-                .values(**update_values)
-            )
+            if update_values:
+                await self.session.execute(
+                    update(DocumentVersion)
+                    .where(DocumentVersion.id == document_id)
+                    .values(**update_values)
+                )
 
             await self.session.refresh(document)
 
@@ -439,7 +506,8 @@ class DocumentRepository:
                 "Document updated",
                 document_id=str(document_id),
                 project_id=str(project_id),
-                updated_fields=list(update_values.keys()),
+                updated_fields=list(update_values.keys())
+                + (["content"] if update_data.content is not None else []),
                 duration_ms=duration,
             )
 
@@ -469,6 +537,10 @@ class DocumentRepository:
             if not document:
                 return False
 
+            # Later versions stored as deltas against this one become snapshots
+            await self.versions.detach_dependents(document)
+            await self.session.flush()
+
             # Delete document
             await self.session.execute(
                 delete(DocumentVersion).where(DocumentVersion.id == document_id)
@@ -562,9 +634,20 @@ async def get_document(
 async def list_documents(
     project_id: UUID,
     user_id: UUID = Query(..., description="User ID for access validation"),
-    page: int = Query(1, ge=1, description="Page number"),
+    page: int = Query(1, ge=1, description="Page number (offset pagination)"),
     per_page: int = Query(20, ge=1, le=100, description="Items per page"),
     document_type: Optional[str] = Query(None, description="Filter by document type"),
+    cursor: Optional[str] = Query(
+        None, description="next_cursor of the previous page (keyset pagination)"
+    ),
+    view: str = Query(
+        "full",
+        pattern="^(full|summary)$",
+        description="summary omits content and metadata",
+    ),
+    count: CountMode = Query(
+        CountMode.EXACT, description="Total count: exact, estimated or none"
+    ),
     session: AsyncSession = Depends(get_database_session),
 ):
     """
@@ -573,27 +656,41 @@ async def list_documents(
     Args:
         project_id: Project UUID
         user_id: User ID for access validation
-        page: Page number
+        page: Page number (ignored when a cursor is given)
         per_page: Items per page
         document_type: Optional document type filter
+        cursor: Keyset pagination cursor
+        view: full or summary listing
+        count: Total count mode
         session: Database session
 
     Returns:
         Paginated document list
     """
     repo = DocumentRepository(session)
-    documents, total = await repo.get_project_documents(
-        project_id, user_id, page, per_page, document_type
+    result = await repo.get_project_documents(
+        project_id,
+        user_id,
+        page,
+        per_page,
+        document_type,
+        cursor=cursor,
+        summary=view == "summary",
+        count=count,
     )
 
-    total_pages = (total + per_page - 1) // per_page
+    schema = DocumentSummary if view == "summary" else DocumentRead
+    total = result.total
+    total_pages = (total + per_page - 1) // per_page if total is not None else None
 
     return DocumentList(
-        documents=[DocumentRead.model_validate(d) for d in documents],
+        documents=[schema.model_validate(d) for d in result.items],
         total=total,
         page=page,
         per_page=per_page,
         total_pages=total_pages,
+        total_is_estimate=result.total_is_estimate,
+        next_cursor=result.next_cursor,
     )
 
 
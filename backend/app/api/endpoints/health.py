@@ -20,6 +20,11 @@ PROCESS_START_TIME = time.time()
 
 from ...db import get_database_session, get_database_health, get_database_metrics
 from ...core.config import get_settings
+from ...services.project_access import project_access_cache
+from ...agents.budget import token_budget
+from ...agents.cancellation import agent_cancellation
+from ...agents.result_cache import agent_result_cache
+from ...agents.write_behind import tracker_write_behind
 from ...core.telemetry import get_tracer, get_correlation_id, otel_manager
 from ...monitoring.health_checker import redis_health_checker
 import httpx
@@ -168,6 +173,11 @@ async def database_metrics() -> Dict[str, Any]:
     """
     try:
         metrics = await get_database_metrics()
+        metrics["project_access_cache"] = project_access_cache.stats()
+        metrics["agent_tracker_write_behind"] = tracker_write_behind.stats()
+        metrics["agent_result_cache"] = agent_result_cache.stats()
+        metrics["agent_token_budget"] = token_budget.stats()
+        metrics["agent_cancellation"] = agent_cancellation.stats()
         return metrics
     except Exception as e:
         logger.exception(f"Database metrics collection failed: {str(e)}")
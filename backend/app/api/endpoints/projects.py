@@ -24,6 +24,7 @@ from ...db import get_database_session
 from ...models import Project, User
 from ...core.config import get_settings
 from ...core.monitoring import performance_monitor
+from ...services.project_access import invalidate_project_access
 
 logger = structlog.get_logger()
 settings = get_settings()
@@ -283,6 +284,8 @@ class ProjectRepository:
                 .where(Project.id == project_id)
                 .values(is_deleted=True, deleted_at=func.now())
             )
+            # Bulk UPDATE bypasses ORM events: drop cached access explicitly
+            invalidate_project_access(project_id, self.session)
 
             # Log performance
             duration = (time.time() - start_time) * 1000
@@ -19,6 +19,8 @@ from ...services.vector.domain.entities import (
     SearchContext,
     VectorData,
     DocumentType,
+    HybridFusion,
+    PayloadProjection,
 )
 
 logger = structlog.get_logger()
@@ -45,6 +47,14 @@ class VectorSearchRequest(BaseModel):
         default=None,
         description="Optional search filters (document_type, importance_min, score_threshold)",
     )
+    fields: Optional[List[str]] = Field(
+        default=None,
+        description=(
+            "Payload fields to return (title, metadata, importance, content_preview, "
+            "content). Defaults to everything except full content; include "
+            "'content' to receive untruncated content"
+        ),
+    )
 
     model_config = {
         "json_schema_extra": {
@@ -61,6 +71,109 @@ class VectorSearchRequest(BaseModel):
     }
 
 
+class VectorBatchSearchRequest(BaseModel):
+    """Request schema for batched multi-query vector search."""
+
+    query_vectors: List[List[float]] = Field(
+        ...,
+        min_length=1,
+        max_length=32,
+        description="Query vectors with 1536 dimensions each (max 32 per batch)",
+    )
+    limit: int = Field(
+        default=10,
+        ge=1,
+        le=50,
+        description="Maximum number of results to return per query",
+    )
+    filters: Optional[Dict[str, Any]] = Field(
+        default=None,
+        description="Optional search filters shared by all queries (document_type, importance_min, score_threshold)",
+    )
+    fields: Optional[List[str]] = Field(
+        default=None,
+        description=(
+            "Payload fields to return (title, metadata, importance, content_preview, "
+            "content). Defaults to everything except full content; include "
+            "'content' to receive untruncated content"
+        ),
+    )
+
+    model_config = {
+        "json_schema_extra": {
+            "example": {
+                "query_vectors": [[0.1] * 1536, [0.2] * 1536],
+                "limit": 5,
+                "filters": {"document_type": "knowledge"},
+            }
+        }
+    }
+
+
+class VectorHybridSearchRequest(BaseModel):
+    """Request schema for hybrid keyword + vector search."""
+
+    query_text: str = Field(
+        ...,
+        min_length=1,
+        max_length=1000,
+        description="Keyword query matched against BM25 sparse vectors",
+    )
+    query_vector: List[float] = Field(
+        ...,
+        min_length=1536,
+        max_length=1536,
+        description="Query vector with 1536 dimensions",
+    )
+    limit: int = Field(
+        default=10,
+        ge=1,
+        le=50,
+        description="Maximum number of results to return",
+    )
+    text_weight: float = Field(
+        default=0.3,
+        ge=0.0,
+        le=1.0,
+        description="Weight of the keyword score (weighted fusion only)",
+    )
+    vector_weight: float = Field(
+        default=0.7,
+        ge=0.0,
+        le=1.0,
+        description="Weight of the vector similarity score (weighted fusion only)",
+    )
+    fusion: HybridFusion = Field(
+        default=HybridFusion.WEIGHTED,
+        description="Rank fusion strategy: weighted or rrf",
+    )
+    filters: Optional[Dict[str, Any]] = Field(
+        default=None,
+        description="Optional search filters (document_type, importance_min, score_threshold)",
+    )
+    fields: Optional[List[str]] = Field(
+        default=None,
+        description=(
+            "Payload fields to return (title, metadata, importance, content_preview, "
+            "content). Defaults to everything except full content; include "
+            "'content' to receive untruncated content"
+        ),
+    )
+
+    model_config = {
+        "json_schema_extra": {
+            "example": {
+                "query_text": "authentication flow",
+                "query_vector": [0.1] * 1536,
+                "limit": 10,
+                "text_weight": 0.3,
+                "vector_weight": 0.7,
+                "fusion": "weighted",
+            }
+        }
+    }
+
+
 class VectorUpsertPoint(BaseModel):
     """Schema for individual vector point data with validation."""
 
@@ -180,6 +293,36 @@ class VectorSearchResponse(BaseModel):
     }
 
 
+class VectorBatchQueryResult(BaseModel):
+    """Search results for a single query within a batch."""
+
+    query_index: int = Field(
+        ...,
+        description="Position of the query vector in the request",
+    )
+    results: List[Dict[str, Any]] = Field(
+        ...,
+        description="Search results ranked by similarity",
+    )
+    total_found: int = Field(
+        ...,
+        description="Number of results found for this query",
+    )
+
+
+class VectorBatchSearchResponse(BaseModel):
+    """Response schema for batched multi-query vector search."""
+
+    queries: List[VectorBatchQueryResult] = Field(
+        ...,
+        description="Per-query search results in request order",
+    )
+    search_time_ms: float = Field(
+        ...,
+        description="Total batch search execution time in milliseconds",
+    )
+
+
 class VectorUpsertResponse(BaseModel):
     """Response schema for vector upsert."""
 
@@ -321,6 +464,7 @@ async def search_vectors(
         import time
 
         start_time = time.time()
+        projection = PayloadProjection.from_fields(request.fields)
 
         # Validate query vector
         query_vector = VectorData(request.query_vector)
@@ -331,12 +475,16 @@ async def search_vectors(
             context=context,
             limit=request.limit,
             filters=request.filters,
+            projection=projection,
         )
 
         search_time = (time.time() - start_time) * 1000  # Convert to milliseconds
 
         # Convert results to API response format
-        api_results = [result.to_dict() for result in results]
+        api_results = [
+            result.to_dict(full_content=projection.include_content)
+            for result in results
+        ]
 
         return VectorSearchResponse(
             results=api_results,
@@ -370,6 +518,170 @@ async def search_vectors(
         ) from e
 
 
+@router.post("/search/batch", response_model=VectorBatchSearchResponse)
+async def search_vectors_batch(
+    request: VectorBatchSearchRequest,
+    context: SearchContext = Depends(extract_search_context),
+    search_service=Depends(get_vector_search_service),
+):
+    """
+    Search for several query vectors in one request with mandatory filtering.
+
+    All queries share the same project_id and language isolation filter and
+    are sent to Qdrant as a single batch.
+
+    Args:
+        request: Batch search request with query vectors and shared options
+        context: Search context with project and language isolation
+        search_service: Vector search service
+
+    Returns:
+        Per-query search results ranked by similarity
+
+    Raises:
+        HTTPException: If search fails or parameters are invalid
+    """
+    try:
+        import time
+
+        start_time = time.time()
+        projection = PayloadProjection.from_fields(request.fields)
+
+        # Validate query vectors
+        query_vectors = [VectorData(vector) for vector in request.query_vectors]
+
+        # Perform batched search with mandatory filtering
+        batch_results = await search_service.search_many(
+            query_vectors=query_vectors,
+            context=context,
+            limit=request.limit,
+            filters=request.filters,
+            projection=projection,
+        )
+
+        search_time = (time.time() - start_time) * 1000  # Convert to milliseconds
+
+        return VectorBatchSearchResponse(
+            queries=[
+                VectorBatchQueryResult(
+                    query_index=index,
+                    results=[
+                        result.to_dict(full_content=projection.include_content)
+                        for result in results
+                    ],
+                    total_found=len(results),
+                )
+                for index, results in enumerate(batch_results)
+            ],
+            search_time_ms=search_time,
+        )
+
+    except ValueError as e:
+        logger.warning(
+            "Vector batch search validation failed",
+            error=str(e),
+            project_id=str(context.project_id),
+            language=str(context.language),
+            queries_count=len(request.query_vectors),
+        )
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid search parameters: {e}",
+        ) from e
+
+    except Exception as e:
+        logger.error(
+            "Vector batch search failed",
+            error=str(e),
+            exc_info=True,
+            project_id=str(context.project_id),
+            language=str(context.language),
+            queries_count=len(request.query_vectors),
+        )
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Vector batch search failed: {e}",
+        ) from e
+
+
+@router.post("/search/hybrid", response_model=VectorSearchResponse)
+async def search_vectors_hybrid(
+    request: VectorHybridSearchRequest,
+    context: SearchContext = Depends(extract_search_context),
+    search_service=Depends(get_vector_search_service),
+):
+    """
+    Search by keywords and vector similarity in one fused query.
+
+    Both the keyword and the vector branch are filtered by project_id and
+    language before fusion. No client can bypass these security filters.
+
+    Args:
+        request: Hybrid search request with query text, vector and weights
+        context: Search context with project and language isolation
+        search_service: Vector search service
+
+    Returns:
+        Search results ranked by fused score
+
+    Raises:
+        HTTPException: If search fails or parameters are invalid
+    """
+    try:
+        import time
+
+        start_time = time.time()
+        projection = PayloadProjection.from_fields(request.fields)
+
+        results = await search_service.hybrid_search(
+            query_text=request.query_text,
+            query_vector=VectorData(request.query_vector),
+            context=context,
+            limit=request.limit,
+            text_weight=request.text_weight,
+            vector_weight=request.vector_weight,
+            fusion=request.fusion,
+            filters=request.filters,
+            projection=projection,
+        )
+
+        search_time = (time.time() - start_time) * 1000  # Convert to milliseconds
+
+        return VectorSearchResponse(
+            results=[
+                result.to_dict(full_content=projection.include_content)
+                for result in results
+            ],
+            total_found=len(results),
+            search_time_ms=search_time,
+        )
+
+    except ValueError as e:
+        logger.warning(
+            "Vector hybrid search validation failed",
+            error=str(e),
+            project_id=str(context.project_id),
+            language=str(context.language),
+        )
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid search parameters: {e}",
+        ) from e
+
+    except Exception as e:
+        logger.error(
+            "Vector hybrid search failed",
+            error=str(e),
+            exc_info=True,
+            project_id=str(context.project_id),
+            language=str(context.language),
+        )
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Vector hybrid search failed: {e}",
+        ) from e
+
+
 @router.post("/upsert", response_model=VectorUpsertResponse)
 async def upsert_vectors(
     request: VectorUpsertRequest,
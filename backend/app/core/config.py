@@ -6,7 +6,7 @@ Implements secure defaults and validation for all settings.
 """
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from pydantic import Field, field_validator
+from pydantic import Field, ValidationInfo, field_validator
 from typing import Optional, List
 import os
 from functools import lru_cache
@@ -50,6 +50,20 @@ class Settings(BaseSettings):
         default=3600, ge=300, le=86400, description="Connection recycle time in seconds"
     )
 
+    # Document version storage configuration
+    DOCUMENT_VERSION_MAX_DELTA_CHAIN: int = Field(
+        default=16,
+        ge=0,
+        le=256,
+        description="Maximum deltas replayed to read a version (0 stores only snapshots)",
+    )
+    DOCUMENT_VERSION_MAX_DELTA_RATIO: float = Field(
+        default=0.5,
+        gt=0.0,
+        le=1.0,
+        description="Store a delta only if it is at most this fraction of the full content",
+    )
+
     # Vector database configuration
     QDRANT_URL: str = Field(
         default="http://localhost:6333", description="Qdrant vector database URL"
@@ -61,6 +75,267 @@ class Settings(BaseSettings):
         default=30, ge=1, le=300, description="Qdrant request timeout"
     )
 
+    QDRANT_QUANTIZATION: str = Field(
+        default="none",
+        description="Vector quantization mode for the collection (none, scalar, binary)",
+    )
+    QDRANT_QUANTIZATION_ALWAYS_RAM: bool = Field(
+        default=True, description="Keep quantized vectors in RAM"
+    )
+    QDRANT_VECTORS_ON_DISK: bool = Field(
+        default=False, description="Store original float32 vectors on disk"
+    )
+    QDRANT_SEARCH_RESCORE: bool = Field(
+        default=True,
+        description="Rescore quantized search candidates with original vectors",
+    )
+    QDRANT_SEARCH_OVERSAMPLING: float = Field(
+        default=2.0,
+        ge=1.0,
+        le=10.0,
+        description="Candidate oversampling factor for quantized search",
+    )
+    QDRANT_CONTENT_STORAGE: str = Field(
+        default="inline",
+        description=(
+            "Where full point content is stored: inline (Qdrant payload) or "
+            "external (PostgreSQL, keyed by content_hash)"
+        ),
+    )
+
+    QDRANT_EXACT_TIER_ENABLED: bool = Field(
+        default=False,
+        description="Serve searches for small projects from an in-process exact tier",
+    )
+    QDRANT_EXACT_TIER_MAX_POINTS: int = Field(
+        default=2000,
+        ge=1,
+        le=50_000,
+        description="Largest project (in points) kept in the in-process exact tier",
+    )
+    QDRANT_EXACT_TIER_MAX_PROJECTS: int = Field(
+        default=256,
+        ge=1,
+        description="Maximum number of projects held in the exact tier (LRU)",
+    )
+    QDRANT_EXACT_TIER_TTL_SECONDS: float = Field(
+        default=300.0,
+        gt=0,
+        description="Reload interval bounding staleness from other processes' writes",
+    )
+    QDRANT_EXACT_TIER_MAX_LARGE_PROJECTS: int = Field(
+        default=4096,
+        ge=1,
+        description="Projects remembered as too large for the exact tier (LRU)",
+    )
+
+    QDRANT_COLLECTION_INFO_REFRESH_SECONDS: float = Field(
+        default=30.0,
+        gt=0,
+        description="Background refresh interval of the cached collection info snapshot",
+    )
+
+    QDRANT_TENANT_INDEX: bool = Field(
+        default=True,
+        description="Mark the project_id payload index as the tenant key",
+    )
+    QDRANT_CUSTOM_SHARDING: bool = Field(
+        default=False,
+        description="Use custom shard keys (shared shard plus dedicated shards for large projects)",
+    )
+    QDRANT_DEDICATED_SHARD_THRESHOLD: int = Field(
+        default=100_000,
+        ge=1000,
+        description="Point count above which a project is promoted to a dedicated shard",
+    )
+    QDRANT_TENANT_ROUTING_REFRESH_SECONDS: float = Field(
+        default=10.0,
+        gt=0,
+        description="Interval at which each process reloads dedicated shard routing from Qdrant",
+    )
+
+    # Embedding service configuration
+    EMBEDDING_BACKEND: Optional[str] = Field(
+        default=None,
+        validate_default=True,
+        description=(
+            "Embedding model backend: deterministic (local hash-based, for "
+            "development and tests) or http (OpenAI-compatible embeddings API). "
+            "Defaults to deterministic in development and test; required "
+            "elsewhere"
+        ),
+    )
+    EMBEDDING_API_URL: str = Field(
+        default="https://api.openai.com/v1/embeddings",
+        description="Embeddings endpoint used by the http backend",
+    )
+    EMBEDDING_API_KEY: Optional[str] = Field(
+        default=None,
+        description="API key for the http embedding backend",
+    )
+    EMBEDDING_MODEL: str = Field(
+        default="text-embedding-3-small",
+        description="Embedding model name (must produce 1536-d vectors)",
+    )
+    EMBEDDING_MAX_BATCH_SIZE: int = Field(
+        default=64,
+        ge=1,
+        le=2048,
+        description="Maximum texts per micro-batch sent to the embedding backend",
+    )
+    EMBEDDING_MAX_WAIT_MS: float = Field(
+        default=10.0,
+        ge=0.0,
+        le=1000.0,
+        description="Maximum time a request waits for its micro-batch to fill",
+    )
+
+    # Project access check cache
+    PROJECT_ACCESS_CACHE_TTL_SECONDS: float = Field(
+        default=5.0,
+        ge=0.0,
+        le=300.0,
+        description=(
+            "Lifetime of cached project access grants shared across requests "
+            "(0 disables; bounds staleness across worker processes)"
+        ),
+    )
+    PROJECT_ACCESS_CACHE_MAX_ENTRIES: int = Field(
+        default=10_000,
+        ge=1,
+        description="Maximum number of cached project access grants (LRU)",
+    )
+
+    # Agent execution tracker write-behind
+    AGENT_TRACKER_WRITE_BEHIND: bool = Field(
+        default=False,
+        description=(
+            "Buffer execution completions and failures in process and write "
+            "them in batches (default: write synchronously)"
+        ),
+    )
+    AGENT_TRACKER_FLUSH_INTERVAL_SECONDS: float = Field(
+        default=0.2,
+        gt=0.0,
+        le=10.0,
+        description="Maximum time a buffered tracker event waits before a flush",
+    )
+    AGENT_TRACKER_BATCH_SIZE: int = Field(
+        default=200,
+        ge=1,
+        le=5000,
+        description="Tracker events written per batch (flushes early when reached)",
+    )
+    AGENT_TRACKER_QUEUE_SIZE: int = Field(
+        default=10_000,
+        ge=1,
+        description="Buffered tracker events before submitters wait (backpressure)",
+    )
+    AGENT_TRACKER_MISSING_RETRY_SECONDS: float = Field(
+        default=30.0,
+        gt=0.0,
+        le=600.0,
+        description=(
+            "How long buffered events of executions whose start is not committed "
+            "yet are retried before they are dropped"
+        ),
+    )
+
+    # Parallel agent task scheduling
+    AGENT_MAX_CONCURRENT_TASKS: int = Field(
+        default=16,
+        ge=1,
+        le=256,
+        description="Agent tasks running at once across all projects (per process)",
+    )
+    AGENT_MAX_CONCURRENT_TASKS_PER_PROJECT: int = Field(
+        default=4,
+        ge=1,
+        le=64,
+        description="Agent tasks of one project running at once (per process)",
+    )
+
+    # Agent result cache
+    AGENT_RESULT_CACHE_ENABLED: bool = Field(
+        default=True,
+        description="Reuse completed agent results for identical inputs",
+    )
+    AGENT_RESULT_CACHE_TTL_SECONDS: int = Field(
+        default=3600,
+        ge=1,
+        le=604800,
+        description="Lifetime of a cached agent result",
+    )
+
+    # Streaming agent output
+    AGENT_STREAM_BATCH_CHUNKS: int = Field(
+        default=16,
+        ge=1,
+        le=1000,
+        description="Persist streamed output when this many chunks are buffered",
+    )
+    AGENT_STREAM_BATCH_CHARS: int = Field(
+        default=8192,
+        ge=1,
+        le=1048576,
+        description="Persist streamed output when buffered chunks reach this size",
+    )
+    AGENT_STREAM_FLUSH_INTERVAL_SECONDS: float = Field(
+        default=1.0,
+        ge=0.0,
+        le=60.0,
+        description="Persist streamed output when the oldest buffered chunk is this old",
+    )
+
+    # Agent workflow cancellation
+    AGENT_CANCEL_POLL_SECONDS: float = Field(
+        default=1.0,
+        ge=0.0,
+        le=60.0,
+        description="How often running workflows poll for cancel requests (0 disables)",
+    )
+    AGENT_CANCEL_RELEASE_TIMEOUT_SECONDS: float = Field(
+        default=5.0,
+        gt=0.0,
+        le=60.0,
+        description="Limit for releasing each resource of a cancelled workflow",
+    )
+    AGENT_CANCEL_WAIT_SECONDS: float = Field(
+        default=5.0,
+        ge=0.0,
+        le=60.0,
+        description="How long a cancel request waits for the workflow to stop",
+    )
+
+    # Agent token budgets (unset: unlimited)
+    AGENT_TOKEN_BUDGET_PER_EXECUTION: Optional[int] = Field(
+        default=None,
+        ge=1,
+        description="Hard token limit of one agent execution",
+    )
+    AGENT_TOKEN_BUDGET_PER_PROJECT: Optional[int] = Field(
+        default=None,
+        ge=1,
+        description="Hard token limit of one project per budget window",
+    )
+    AGENT_TOKEN_BUDGET_GLOBAL: Optional[int] = Field(
+        default=None,
+        ge=1,
+        description="Hard token limit of all projects per budget window",
+    )
+    AGENT_TOKEN_BUDGET_WINDOW_SECONDS: int = Field(
+        default=3600,
+        ge=60,
+        le=604800,
+        description="Length of the project and global token budget windows",
+    )
+    AGENT_TOKEN_BUDGET_SOFT_RATIO: float = Field(
+        default=0.8,
+        gt=0.0,
+        le=1.0,
+        description="Soft token limit as a fraction of the hard limit",
+    )
+
     # Redis configuration
     REDIS_URL: str = Field(
         default="redis://localhost:5240",
@@ -251,6 +526,41 @@ class Settings(BaseSettings):
             raise ValueError("DATABASE_URL must be a PostgreSQL connection URL")
         return v
 
+    @field_validator("QDRANT_QUANTIZATION")
+    @classmethod
+    def validate_qdrant_quantization(cls, v):
+        """Validate Qdrant quantization mode."""
+        allowed = ["none", "scalar", "binary"]
+        if v.lower() not in allowed:
+            raise ValueError(f"QDRANT_QUANTIZATION must be one of: {allowed}")
+        return v.lower()
+
+    @field_validator("QDRANT_CONTENT_STORAGE")
+    @classmethod
+    def validate_qdrant_content_storage(cls, v):
+        """Validate Qdrant content storage mode."""
+        allowed = ["inline", "external"]
+        if v.lower() not in allowed:
+            raise ValueError(f"QDRANT_CONTENT_STORAGE must be one of: {allowed}")
+        return v.lower()
+
+    @field_validator("EMBEDDING_BACKEND")
+    @classmethod
+    def validate_embedding_backend(cls, v, info: ValidationInfo):
+        """Validate embedding backend; fake vectors are never a silent default."""
+        if v is None:
+            environment = info.data.get("ENVIRONMENT", "development")
+            if environment not in ("development", "test"):
+                raise ValueError(
+                    f"EMBEDDING_BACKEND must be set explicitly in {environment} "
+                    "(deterministic embeddings are hash-based fakes)"
+                )
+            return "deterministic"
+        allowed = ["deterministic", "http"]
+        if v.lower() not in allowed:
+            raise ValueError(f"EMBEDDING_BACKEND must be one of: {allowed}")
+        return v.lower()
+
     @field_validator("ENVIRONMENT")
     @classmethod
     def validate_environment(cls, v):
@@ -36,6 +36,7 @@ import structlog
 from prometheus_client import Gauge, Histogram, Counter
 
 from .config import get_settings
+from .deadline import check_deadline
 
 logger = structlog.get_logger()
 
@@ -119,6 +120,13 @@ class DatabaseMetrics:
     circuit_state: CircuitState = CircuitState.CLOSED
 
 
+def check_statement_deadline(
+    conn, cursor, statement, parameters, context, executemany
+) -> None:
+    """before_cursor_execute hook refusing statements after the deadline."""
+    check_deadline("db.execute")
+
+
 class DatabaseManager:
     """
     Advanced database connection manager with optimization and monitoring.
@@ -283,6 +291,11 @@ class DatabaseManager:
                 },
             )
 
+            # Statements are not started after the deadline of their workflow
+            event.listen(
+                engine.sync_engine, "before_cursor_execute", check_statement_deadline
+            )
+
             # Record connection duration
             duration = time.time() - start_time
             self.db_connection_duration.observe(duration)
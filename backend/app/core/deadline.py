@@ -0,0 +1,94 @@
+"""
+Deadlines propagated to downstream operations.
+
+A workflow sets its deadline once with deadline_scope(); the deadline is
+held in a context variable, so it follows the workflow into every task it
+creates. Downstream operations (Redis commands, SQL statements, vector
+searches, model calls) call check_deadline() before they start and refuse
+to start once the deadline has passed, and bound their own timeouts with
+bounded_timeout(). Code outside any scope has no deadline and is unaffected.
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import UTC, datetime
+from typing import Iterator, Optional
+
+# Absolute deadline as a Unix timestamp (None: no deadline)
+_deadline: ContextVar[Optional[float]] = ContextVar("deadline", default=None)
+
+
+class DeadlineExceeded(TimeoutError):
+    """An operation was started after the deadline of its workflow."""
+
+    def __init__(self, operation: str) -> None:
+        super().__init__(f"Deadline exceeded before {operation}")
+        self.operation = operation
+
+
+@contextmanager
+def deadline_scope(deadline: Optional[datetime]) -> Iterator[None]:
+    """Apply a deadline to the enclosed code.
+
+    A scope nested in another keeps the earlier of the two deadlines.
+
+    Args:
+        deadline: Timezone-aware deadline (None keeps the current one)
+    """
+    current = _deadline.get()
+    value = current
+    if deadline is not None:
+        timestamp = deadline.timestamp()
+        value = timestamp if current is None else min(current, timestamp)
+    token = _deadline.set(value)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+@contextmanager
+def no_deadline() -> Iterator[None]:
+    """Run the enclosed code without a deadline (cleanup after a deadline)."""
+    token = _deadline.set(None)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def current_deadline() -> Optional[datetime]:
+    """The deadline of the current context, if any."""
+    value = _deadline.get()
+    return datetime.fromtimestamp(value, UTC) if value is not None else None
+
+
+def remaining_seconds() -> Optional[float]:
+    """Seconds left until the deadline (negative once passed; None: no deadline)."""
+    value = _deadline.get()
+    return value - time.time() if value is not None else None
+
+
+def check_deadline(operation: str) -> None:
+    """Refuse to start an operation after the deadline.
+
+    Raises:
+        DeadlineExceeded: If the deadline of the current context has passed
+    """
+    remaining = remaining_seconds()
+    if remaining is not None and remaining <= 0:
+        raise DeadlineExceeded(operation)
+
+
+def bounded_timeout(timeout: Optional[float], operation: str) -> Optional[float]:
+    """The timeout of an operation, shortened to the time left until the deadline.
+
+    Raises:
+        DeadlineExceeded: If the deadline has already passed
+    """
+    check_deadline(operation)
+    remaining = remaining_seconds()
+    if remaining is None:
+        return timeout
+    return remaining if timeout is None else min(timeout, remaining)
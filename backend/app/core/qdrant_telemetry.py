@@ -34,6 +34,8 @@ class QdrantOperationType:
     """Qdrant operation type constants for span naming and metrics."""
 
     SEARCH = "qdrant.search"
+    SEARCH_BATCH = "qdrant.search_batch"
+    HYBRID_SEARCH = "qdrant.hybrid_search"
     UPSERT = "qdrant.upsert"
     RETRIEVE = "qdrant.retrieve"
     DELETE = "qdrant.delete"
@@ -307,10 +309,15 @@ def instrument_qdrant_client(qdrant_client):
     Returns:
         Instrumented QdrantClient wrapper
     """
+    # Already wrapped clients are returned as-is (no double instrumentation)
+    if getattr(type(qdrant_client), "instrumented", False):
+        return qdrant_client
 
     class InstrumentedQdrantClient:
         """Qdrant client wrapper with OpenTelemetry instrumentation."""
 
+        instrumented = True
+
         def __init__(self, client):
             """Initialize instrumented client wrapper."""
             self._client = client
@@ -383,6 +390,60 @@ def instrument_qdrant_client(qdrant_client):
 
                 return result
 
+        async def search_batch(
+            self, collection_name: str, requests: List[Any], **kwargs
+        ):
+            """Instrumented batch search operation."""
+            async with qdrant_telemetry.trace_qdrant_operation(
+                QdrantOperationType.SEARCH_BATCH,
+                collection_name=collection_name,
+                requests_count=len(requests),
+            ) as span:
+                result = await asyncio.to_thread(
+                    self._client.search_batch,
+                    collection_name=collection_name,
+                    requests=requests,
+                    **kwargs,
+                )
+
+                # Record batch and per-query search metrics
+                qdrant_telemetry.record_batch_metrics(
+                    QdrantOperationType.SEARCH_BATCH, len(requests)
+                )
+                for request, points in zip(requests, result):
+                    qdrant_telemetry.record_search_metrics(
+                        QdrantOperationType.SEARCH_BATCH,
+                        len(points),
+                        [point.score for point in points],
+                        {
+                            "limit": getattr(request, "limit", 0),
+                            "score_threshold": getattr(request, "score_threshold", 0.0)
+                            or 0.0,
+                        },
+                    )
+
+                span.set_attribute(
+                    "qdrant.result_count", sum(len(points) for points in result)
+                )
+                return result
+
+        async def query_points(self, collection_name: str, **kwargs):
+            """Instrumented universal query operation (prefetch + fusion)."""
+            async with qdrant_telemetry.trace_qdrant_operation(
+                QdrantOperationType.HYBRID_SEARCH,
+                collection_name=collection_name,
+                limit=kwargs.get("limit", 10),
+                prefetch_count=len(kwargs.get("prefetch") or []),
+            ) as span:
+                result = await asyncio.to_thread(
+                    self._client.query_points,
+                    collection_name=collection_name,
+                    **kwargs,
+                )
+
+                span.set_attribute("qdrant.result_count", len(result.points))
+                return result
+
         async def upsert(self, collection_name: str, points: List[Any], **kwargs):
             """Instrumented upsert operation."""
             async with qdrant_telemetry.trace_qdrant_operation(
@@ -20,6 +20,13 @@ from ..services.vector import (
     DefaultVectorSearchService,
     QdrantVectorRepository,
 )
+from ..services.vector.domain.entities import (
+    ExactTierConfig,
+    TenantLayoutConfig,
+    VectorStorageConfig,
+)
+from ..services.vector.exact_search_tier import ExactSearchTier
+from ..services.vector.repositories.content_store import PostgresContentStore
 
 logger = structlog.get_logger()
 settings = get_settings()
@@ -134,6 +141,8 @@ class VectorDatabaseManager:
                     qdrant_url=settings.QDRANT_URL,
                     collection=settings.QDRANT_COLLECTION,
                     timeout=settings.QDRANT_TIMEOUT,
+                    quantization=settings.QDRANT_QUANTIZATION,
+                    vectors_on_disk=settings.QDRANT_VECTORS_ON_DISK,
                 )
 
                 # Initialize Qdrant client
@@ -145,18 +154,73 @@ class VectorDatabaseManager:
                 # Test connectivity
                 await self._test_connectivity()
 
+                # Quantization and on-disk storage settings
+                storage_config = VectorStorageConfig(
+                    quantization=settings.QDRANT_QUANTIZATION,
+                    quantization_always_ram=settings.QDRANT_QUANTIZATION_ALWAYS_RAM,
+                    vectors_on_disk=settings.QDRANT_VECTORS_ON_DISK,
+                    rescore=settings.QDRANT_SEARCH_RESCORE,
+                    oversampling=settings.QDRANT_SEARCH_OVERSAMPLING,
+                    content_storage=settings.QDRANT_CONTENT_STORAGE,
+                )
+
+                # Tenant index and shard key layout settings
+                tenant_config = TenantLayoutConfig(
+                    tenant_index=settings.QDRANT_TENANT_INDEX,
+                    custom_sharding=settings.QDRANT_CUSTOM_SHARDING,
+                    dedicated_shard_threshold=settings.QDRANT_DEDICATED_SHARD_THRESHOLD,
+                    routing_refresh_seconds=settings.QDRANT_TENANT_ROUTING_REFRESH_SECONDS,
+                )
+
+                # Full content lives in PostgreSQL in external content mode
+                content_store = (
+                    PostgresContentStore() if storage_config.content_external else None
+                )
+
+                # Small projects can be searched in-process with exact scans
+                exact_tier = (
+                    ExactSearchTier(
+                        ExactTierConfig(
+                            max_points=settings.QDRANT_EXACT_TIER_MAX_POINTS,
+                            max_projects=settings.QDRANT_EXACT_TIER_MAX_PROJECTS,
+                            ttl_seconds=settings.QDRANT_EXACT_TIER_TTL_SECONDS,
+                            max_large_projects=settings.QDRANT_EXACT_TIER_MAX_LARGE_PROJECTS,
+                        ),
+                        dimension=QdrantVectorRepository.VECTOR_SIZE,
+                    )
+                    if settings.QDRANT_EXACT_TIER_ENABLED
+                    else None
+                )
+
                 # Initialize repository
-                self.repository = QdrantVectorRepository(self.client)
+                self.repository = QdrantVectorRepository(
+                    self.client,
+                    storage_config,
+                    tenant_config,
+                    content_store,
+                    exact_tier=exact_tier,
+                )
 
                 # Initialize collection manager
                 self.collection_manager = VectorCollectionManager(
                     qdrant_url=settings.QDRANT_URL,
                     timeout=settings.QDRANT_TIMEOUT,
+                    storage_config=storage_config,
+                    tenant_config=tenant_config,
+                    content_store=content_store,
+                    collection_info_refresh_interval=(
+                        settings.QDRANT_COLLECTION_INFO_REFRESH_SECONDS
+                    ),
                 )
 
                 # Initialize collection
                 await self.collection_manager.initialize()
 
+                # Load dedicated project shard keys for request routing and
+                # keep following promotions made by other processes
+                await self.repository.refresh_tenant_routing()
+                self.repository.start_tenant_routing_refresher()
+
                 # Initialize search service
                 self.search_service = DefaultVectorSearchService(self.repository)
 
@@ -203,6 +267,9 @@ class VectorDatabaseManager:
 
         with tracer.start_as_current_span("vector_database_cleanup"):
             try:
+                if self.repository:
+                    await self.repository.stop_tenant_routing_refresher()
+
                 if self.collection_manager:
                     await self.collection_manager.close()
 
@@ -258,7 +325,10 @@ class VectorDatabaseManager:
 
         try:
             with tracer.start_as_current_span("vector_statistics"):
-                return await self.collection_manager.get_statistics()
+                statistics = await self.collection_manager.get_statistics()
+                if self.repository and self.repository.exact_tier is not None:
+                    statistics["exact_tier"] = self.repository.exact_tier.stats()
+                return statistics
 
         except Exception as e:
             logger.error(
@@ -506,6 +506,10 @@ class ProjectIsolatedRedisClient:
         """Get all hash fields with project isolation."""
         return await self._redis.hgetall(self._make_key(name), **kwargs)
 
+    async def hmget(self, name: str, keys: list, **kwargs) -> list:
+        """Get several hash fields with project isolation."""
+        return await self._redis.hmget(self._make_key(name), keys, **kwargs)
+
     async def lpush(self, name: str, *values, **kwargs) -> int:
         """Push to list with project isolation."""
         return await self._redis.lpush(self._make_key(name), *values, **kwargs)
@@ -21,6 +21,7 @@ from opentelemetry import trace
 from opentelemetry.trace import Status, StatusCode
 
 from ...core.config import settings
+from ...core.deadline import check_deadline
 from .connection_factory import redis_connection_factory, ProjectIsolatedRedisClient
 from .exceptions import (
     RedisException,
@@ -343,6 +344,7 @@ class RedisService:
 
         Raises:
             RedisException: If operation fails after retries
+            DeadlineExceeded: If the workflow deadline passes before an attempt
         """
         with tracer.start_as_current_span(f"redis.execute.{operation}") as span:
             span.set_attribute("redis.operation", operation)
@@ -352,6 +354,8 @@ class RedisService:
             last_exception = None
 
             for attempt in range(self.config.max_retries + 1):
+                # Neither the first attempt nor a retry starts after the deadline
+                check_deadline(f"redis.{operation}")
                 try:
                     async with self.get_connection(project_id) as redis_client:
                         start_time = time.time()
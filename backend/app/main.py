@@ -41,6 +41,7 @@ from .monitoring.redis_metrics import redis_metrics_collector
 from .monitoring.health_checker import redis_health_checker
 from .monitoring.performance_monitor import redis_performance_monitor
 from .monitoring.alert_manager import redis_alert_manager
+from .agents.write_behind import tracker_write_behind
 from .api.endpoints.health import router as health_router
 from .api.endpoints.database_monitoring import router as database_monitoring_router
 from .api.endpoints.database_instrumentation import (
@@ -124,6 +125,9 @@ async def lifespan(app: FastAPI):
     logger.info("Shutting down JEEX Idea API")
 
     try:
+        # Write buffered agent tracker events while the database is still up
+        await tracker_write_behind.close()
+
         # Cleanup all Phase 3 systems
         await optimized_database.cleanup()
 
@@ -10,16 +10,21 @@ from sqlalchemy import (
     String,
     Text,
     Integer,
+    BigInteger,
     Float,
     Boolean,
     JSON,
+    LargeBinary,
     DateTime,
     ForeignKey,
     CheckConstraint,
+    PrimaryKeyConstraint,
 )
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
 from typing import Optional, Dict, Any
+import hashlib
 import uuid
 
 
@@ -150,13 +155,28 @@ class DocumentVersion(Base, TimestampMixin, SoftDeleteMixin):
     )
     document_type: Mapped[str] = mapped_column(String(50), nullable=False)
     version: Mapped[int] = mapped_column(Integer, nullable=False)
-    content: Mapped[str] = mapped_column(Text, nullable=False)
     meta_data: Mapped[Dict[str, Any]] = mapped_column(
         "metadata", JSON, default=dict, nullable=False
     )
     readability_score: Mapped[Optional[float]] = mapped_column(Float)
     grammar_score: Mapped[Optional[float]] = mapped_column(Float)
 
+    # Content storage: full snapshots, or compressed deltas against the
+    # previous version (see app.services.document_versions)
+    content_storage: Mapped[str] = mapped_column(
+        String(10), default="snapshot", server_default="snapshot", nullable=False
+    )
+    stored_content: Mapped[Optional[str]] = mapped_column(
+        "content", Text, nullable=True
+    )
+    content_delta: Mapped[Optional[bytes]] = mapped_column(LargeBinary, nullable=True)
+    delta_base_version: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    snapshot_version: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    delta_chain_length: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False
+    )
+    content_hash: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+
     # Foreign keys
     created_by: Mapped[UUID] = mapped_column(
         UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True
@@ -169,7 +189,45 @@ class DocumentVersion(Base, TimestampMixin, SoftDeleteMixin):
     created_by_user: Mapped["User"] = relationship("User")
 
     # Table constraints
-    __table_args__ = ({"schema": "public"},)
+    __table_args__ = (
+        CheckConstraint(
+            "(content_storage = 'snapshot' AND content IS NOT NULL) OR "
+            "(content_storage = 'delta' AND content_delta IS NOT NULL "
+            "AND delta_base_version IS NOT NULL)",
+            name="check_document_content_storage",
+        ),
+        {"schema": "public"},
+    )
+
+    @hybrid_property
+    def content(self) -> Optional[str]:
+        """
+        Full document text.
+
+        Delta-encoded versions return the content reconstructed by
+        DocumentVersionStore.load_contents (None until it has been loaded).
+        """
+        if self.content_storage == "delta":
+            return getattr(self, "_reconstructed_content", None)
+        return self.stored_content
+
+    @content.inplace.setter
+    def _content_setter(self, value: str) -> None:
+        """Store the text as a full snapshot."""
+        self.stored_content = value
+        self.content_storage = "snapshot"
+        self.content_delta = None
+        self.delta_base_version = None
+        self.snapshot_version = None
+        self.delta_chain_length = 0
+        self.content_hash = hashlib.sha256(value.encode("utf-8")).hexdigest()
+        self._reconstructed_content = value
+
+    @content.inplace.expression
+    @classmethod
+    def _content_expression(cls):
+        """SQL expression for content (only snapshot rows hold full text)."""
+        return cls.stored_content
 
     def __repr__(self) -> str:
         return f"<DocumentVersion(id={self.id}, project_id={self.project_id}, type={self.document_type}, version={self.version})>"
@@ -210,6 +268,16 @@ class AgentExecution(Base, TimestampMixin):
         DateTime(timezone=True), nullable=True
     )
     duration_ms: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    # Model usage accumulated over the execution's model calls
+    prompt_tokens: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, default=0, server_default="0"
+    )
+    completion_tokens: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, default=0, server_default="0"
+    )
+    cost_usd: Mapped[float] = mapped_column(
+        Float, nullable=False, default=0.0, server_default="0"
+    )
 
     # Relationships
     project: Mapped["Project"] = relationship(
@@ -220,6 +288,76 @@ class AgentExecution(Base, TimestampMixin):
         return f"<AgentExecution(id={self.id}, project_id={self.project_id}, agent={self.agent_type}, status={self.status})>"
 
 
+class AgentExecutionRollup(Base):
+    """Pre-aggregated agent execution counters per project, agent type and hour."""
+
+    __tablename__ = "agent_execution_rollups"
+
+    project_id: Mapped[UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("projects.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    agent_type: Mapped[str] = mapped_column(String(50), nullable=False)
+    # Bucket of the executions' started_at, truncated to the hour (UTC)
+    bucket_start: Mapped[DateTime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
+    started_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    completed_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    failed_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    # Executions with completed_at set, and the sum of their durations
+    finished_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    duration_seconds_sum: Mapped[float] = mapped_column(
+        Float, nullable=False, default=0.0
+    )
+    # Sum of started_at (epoch seconds) of unfinished executions, so running
+    # executions contribute their elapsed time to averages
+    open_started_epoch_sum: Mapped[float] = mapped_column(
+        Float, nullable=False, default=0.0
+    )
+    # Model usage of the bucket's executions
+    prompt_tokens_sum: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, default=0
+    )
+    completion_tokens_sum: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, default=0
+    )
+    cost_usd_sum: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+
+    __table_args__ = (PrimaryKeyConstraint("project_id", "agent_type", "bucket_start"),)
+
+    def __repr__(self) -> str:
+        return f"<AgentExecutionRollup(project_id={self.project_id}, agent={self.agent_type}, bucket={self.bucket_start}, started={self.started_count})>"
+
+
+class AgentExecutionChunk(Base):
+    """A chunk of streamed agent output, in order of seq within its execution."""
+
+    __tablename__ = "agent_execution_chunks"
+
+    # No foreign key: chunks are committed while the transaction creating
+    # the execution may still be open
+    execution_id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+    project_id: Mapped[UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("projects.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    seq: Mapped[int] = mapped_column(Integer, nullable=False)
+    content: Mapped[str] = mapped_column(Text, nullable=False)
+    created_at: Mapped[DateTime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+    __table_args__ = (PrimaryKeyConstraint("execution_id", "seq"),)
+
+    def __repr__(self) -> str:
+        return (
+            f"<AgentExecutionChunk(execution_id={self.execution_id}, seq={self.seq})>"
+        )
+
+
 class Export(Base, TimestampMixin):
     """Export tracking model."""
 
@@ -255,3 +393,50 @@ class Export(Base, TimestampMixin):
 
     def __repr__(self) -> str:
         return f"<Export(id={self.id}, project_id={self.project_id}, status={self.status})>"
+
+
+class DocumentVersionCounter(Base):
+    """Last allocated version number and latest version per document type."""
+
+    __tablename__ = "document_version_counters"
+
+    project_id: Mapped[UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("projects.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    document_type: Mapped[str] = mapped_column(String(50), nullable=False)
+    last_version: Mapped[int] = mapped_column(Integer, nullable=False)
+    # Highest existing version, maintained by a trigger on document_versions
+    latest_version_id: Mapped[Optional[UUID]] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("public.document_versions.id", ondelete="SET NULL"),
+        nullable=True,
+    )
+
+    __table_args__ = (PrimaryKeyConstraint("project_id", "document_type"),)
+
+    def __repr__(self) -> str:
+        return f"<DocumentVersionCounter(project_id={self.project_id}, type={self.document_type}, last_version={self.last_version})>"
+
+
+class VectorContent(Base):
+    """Full content of vector points, addressed by project and content hash."""
+
+    __tablename__ = "vector_contents"
+
+    project_id: Mapped[UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("projects.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    content_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    content: Mapped[str] = mapped_column(Text, nullable=False)
+    created_at: Mapped[DateTime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+    __table_args__ = (PrimaryKeyConstraint("project_id", "content_hash"),)
+
+    def __repr__(self) -> str:
+        return f"<VectorContent(project_id={self.project_id}, content_hash={self.content_hash})>"
@@ -6,9 +6,12 @@ All data access must go through repositories to ensure security boundaries.
 """
 
 from .base import BaseRepository
+from .pagination import CountMode, KeysetPage
 from .project import ProjectRepository
 
 __all__ = [
     "BaseRepository",
+    "CountMode",
+    "KeysetPage",
     "ProjectRepository",
 ]
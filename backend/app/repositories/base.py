@@ -8,15 +8,24 @@ cross-project data leakage.
 CRITICAL RULE: project_id is ALWAYS required (UUID, never Optional, never None).
 """
 
-from typing import Optional, Type
+from typing import Optional, Sequence, Tuple, Type
 from uuid import UUID
 from datetime import datetime, timezone
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from sqlalchemy.orm import DeclarativeMeta
+from sqlalchemy.orm import DeclarativeMeta, defer
 import structlog
 
 from app.models import Base
+from .pagination import (
+    CountMode,
+    KeysetPage,
+    SortKey,
+    apply_keyset,
+    count_rows,
+    heavy_columns,
+    split_page,
+)
 
 logger = structlog.get_logger()
 
@@ -39,6 +48,9 @@ class BaseRepository:
     - Errors preserve full context
     """
 
+    # Stable sort for listings: (column name, descending), ending with a unique key
+    sort_columns: Tuple[Tuple[str, bool], ...] = (("created_at", False), ("id", False))
+
     def __init__(self, session: AsyncSession, model: Type[Base]):
         """
         Initialize repository with strict input validation.
@@ -139,11 +151,7 @@ class BaseRepository:
 
         try:
             stmt = (
-                select(self.model)
-                .where(
-                    self.model.project_id == project_id,  # SEC-002
-                    self.model.is_deleted == False,
-                )
+                apply_keyset(self._project_query(project_id), self._sort_keys())
                 .offset(skip)
                 .limit(limit)
             )
@@ -172,6 +180,90 @@ class BaseRepository:
             )
             raise
 
+    async def list_page(
+        self,
+        project_id: UUID,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        summary: bool = False,
+        count: CountMode = CountMode.NONE,
+    ) -> KeysetPage:
+        """
+        List entities with keyset (cursor) pagination and project isolation.
+
+        Args:
+            project_id: Project UUID for isolation (REQUIRED)
+            limit: Maximum records to return (max 100)
+            cursor: next_cursor of the previous page (None for the first page)
+            summary: Defer Text/JSON/binary columns (content, metadata)
+            count: How to compute the total
+
+        Returns:
+            Page of entities with the next cursor
+
+        Raises:
+            ValueError: If project_id is None, limit is invalid or the cursor
+                is malformed
+        """
+        if project_id is None:
+            raise ValueError("project_id is required (cannot be None)")
+        if not 1 <= limit <= 100:
+            raise ValueError("limit must be between 1 and 100")
+
+        sort_keys = self._sort_keys()
+        stmt = apply_keyset(self._project_query(project_id), sort_keys, cursor)
+        if summary:
+            stmt = stmt.options(
+                *(defer(column) for column in heavy_columns(self.model))
+            )
+
+        try:
+            result = await self.session.execute(stmt.limit(limit + 1))
+            items, next_cursor = split_page(result.scalars().all(), limit, sort_keys)
+            total, is_estimate = await count_rows(
+                self.session, self._project_query(project_id), count
+            )
+
+            logger.debug(
+                "Repository: Entity page listed",
+                model=self.model.__name__,
+                project_id=str(project_id),
+                count=len(items),
+                has_more=next_cursor is not None,
+                limit=limit,
+            )
+
+            return KeysetPage(
+                items=items,
+                next_cursor=next_cursor,
+                total=total,
+                total_is_estimate=is_estimate,
+            )
+
+        except Exception as e:
+            logger.error(
+                "Repository: Failed to list entity page",
+                model=self.model.__name__,
+                project_id=str(project_id),
+                error=str(e),
+                exc_info=True,
+            )
+            raise
+
+    def _project_query(self, project_id: UUID):
+        """Select non-deleted entities of one project (SEC-002)."""
+        return select(self.model).where(
+            self.model.project_id == project_id,  # SEC-002
+            self.model.is_deleted == False,
+        )
+
+    def _sort_keys(self) -> Sequence[SortKey]:
+        """Resolve sort_columns against the model."""
+        return [
+            (getattr(self.model, name), descending)
+            for name, descending in self.sort_columns
+        ]
+
     async def create(self, obj: Base) -> Base:
         """
         Create new entity.
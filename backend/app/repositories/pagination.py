@@ -0,0 +1,250 @@
+"""
+Keyset (cursor) pagination helpers for repositories.
+
+Pages are read with a WHERE clause on the sort key of the last row instead of
+OFFSET, so a deep page costs the same as the first one. Sort keys must be
+unique together (end them with the primary key). Cursors are opaque,
+URL-safe strings; they carry sort key values only and every query still
+applies its own project isolation filters.
+"""
+
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+from typing import Any, Generic, List, Optional, Sequence, Tuple, TypeVar
+from uuid import UUID
+
+import structlog
+from sqlalchemy import JSON, LargeBinary, Text, and_, func, inspect, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+
+logger = structlog.get_logger()
+
+T = TypeVar("T")
+
+# (mapped column attribute, descending)
+SortKey = Tuple[Any, bool]
+
+
+class CountMode(str, Enum):
+    """How a paginated listing computes its total."""
+
+    EXACT = "exact"  # count(*) over the filtered query
+    ESTIMATED = "estimated"  # PostgreSQL planner row estimate
+    NONE = "none"  # no total
+
+
+@dataclass
+class KeysetPage(Generic[T]):
+    """One page of results with the cursor of the next page."""
+
+    items: List[T]
+    next_cursor: Optional[str] = None
+    total: Optional[int] = None
+    total_is_estimate: bool = False
+
+    @property
+    def has_more(self) -> bool:
+        """Whether another page follows."""
+        return self.next_cursor is not None
+
+
+def _encode_value(value: Any) -> List[Any]:
+    if isinstance(value, datetime):
+        return ["dt", value.isoformat()]
+    if isinstance(value, UUID):
+        return ["uuid", str(value)]
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return ["v", value]
+    raise ValueError(f"Unsupported cursor value type: {type(value).__name__}")
+
+
+def _decode_value(encoded: Any) -> Any:
+    kind, value = encoded
+    if kind == "dt":
+        return datetime.fromisoformat(value)
+    if kind == "uuid":
+        return UUID(value)
+    if kind == "v":
+        return value
+    raise ValueError(f"Unsupported cursor value kind: {kind}")
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """
+    Encode sort key values as an opaque cursor.
+
+    Args:
+        values: Sort key values of the last row of a page
+
+    Returns:
+        URL-safe cursor string
+    """
+    payload = json.dumps([_encode_value(value) for value in values])
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_keys: Sequence[SortKey]) -> List[Any]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Args:
+        cursor: Cursor string
+        sort_keys: Sort keys the cursor must match
+
+    Returns:
+        Sort key values
+
+    Raises:
+        ValueError: If the cursor is malformed or does not match the sort keys
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        encoded = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        values = [_decode_value(item) for item in encoded]
+    except (binascii.Error, UnicodeError, TypeError, ValueError) as e:
+        raise ValueError(f"Invalid pagination cursor: {e}") from e
+    if len(values) != len(sort_keys):
+        raise ValueError("Invalid pagination cursor: sort key mismatch")
+    return values
+
+
+def keyset_condition(sort_keys: Sequence[SortKey], values: Sequence[Any]):
+    """
+    Build the predicate selecting rows after the given sort key values.
+
+    Mixed sort directions are supported by expanding the row comparison:
+    (a > x) OR (a = x AND b < y) OR (a = x AND b = y AND c > z) ...
+    """
+    alternatives = []
+    for index, (column, descending) in enumerate(sort_keys):
+        equal_prefix = [
+            sort_keys[prefix][0] == values[prefix] for prefix in range(index)
+        ]
+        after = column < values[index] if descending else column > values[index]
+        alternatives.append(and_(*equal_prefix, after))
+    return or_(*alternatives)
+
+
+def apply_keyset(
+    query: Select,
+    sort_keys: Sequence[SortKey],
+    cursor: Optional[str] = None,
+) -> Select:
+    """
+    Order a query by its sort keys and start it after the cursor.
+
+    Args:
+        query: Filtered select
+        sort_keys: Sort keys (unique together)
+        cursor: Cursor of the previous page, or None for the first page
+
+    Returns:
+        Ordered query (the caller applies the limit)
+
+    Raises:
+        ValueError: If the cursor is invalid
+    """
+    query = query.order_by(
+        *(
+            column.desc() if descending else column.asc()
+            for column, descending in sort_keys
+        )
+    )
+    if cursor:
+        query = query.where(
+            keyset_condition(sort_keys, decode_cursor(cursor, sort_keys))
+        )
+    return query
+
+
+def cursor_after(row: Any, sort_keys: Sequence[SortKey]) -> str:
+    """Cursor pointing after a row."""
+    return encode_cursor([getattr(row, column.key) for column, _ in sort_keys])
+
+
+def split_page(
+    rows: Sequence[T], limit: int, sort_keys: Sequence[SortKey]
+) -> Tuple[List[T], Optional[str]]:
+    """
+    Split limit + 1 fetched rows into a page and the next cursor.
+
+    Args:
+        rows: Rows fetched with limit + 1
+        limit: Page size
+        sort_keys: Sort keys of the query
+
+    Returns:
+        Page rows and the next cursor (None on the last page)
+    """
+    items = list(rows[:limit])
+    if len(rows) > limit and items:
+        return items, cursor_after(items[-1], sort_keys)
+    return items, None
+
+
+def heavy_columns(model: Any) -> List[Any]:
+    """
+    Column attributes of a model that summary listings should defer.
+
+    Text, JSON and binary columns hold document content, metadata and
+    payloads; listings that only show summaries do not need them.
+    """
+    return [
+        getattr(model, attribute.key)
+        for attribute in inspect(model).column_attrs
+        if isinstance(attribute.columns[0].type, (Text, JSON, LargeBinary))
+    ]
+
+
+async def count_rows(
+    session: AsyncSession, query: Select, mode: CountMode = CountMode.EXACT
+) -> Tuple[Optional[int], bool]:
+    """
+    Count the rows of a filtered query.
+
+    The estimated mode reads the PostgreSQL planner's row estimate from
+    EXPLAIN, which costs the same regardless of table size; other dialects
+    fall back to an exact count. EXPLAIN runs in a savepoint, so when it
+    fails only the savepoint is rolled back and the exact count can still
+    run in the request's transaction.
+
+    Args:
+        session: Database session
+        query: Filtered select (without ordering or limits)
+        mode: Count mode
+
+    Returns:
+        Total (None for CountMode.NONE) and whether it is an estimate
+    """
+    if mode == CountMode.NONE:
+        return None, False
+
+    bind = session.get_bind()
+    if mode == CountMode.ESTIMATED and bind.dialect.name == "postgresql":
+        try:
+            compiled = query.compile(
+                dialect=bind.dialect, compile_kwargs={"literal_binds": True}
+            )
+            # Driver-level execution: literals must not be parsed as bind params
+            async with session.begin_nested():
+                connection = await session.connection()
+                result = await connection.exec_driver_sql(
+                    f"EXPLAIN (FORMAT JSON) {compiled}"
+                )
+                plan = result.scalar()
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            return int(plan[0]["Plan"]["Plan Rows"]), True
+        except Exception as e:
+            logger.warning(
+                "Row estimate failed, falling back to exact count",
+                error=str(e),
+            )
+
+    result = await session.execute(select(func.count()).select_from(query.subquery()))
+    return result.scalar() or 0, False
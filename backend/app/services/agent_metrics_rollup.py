@@ -0,0 +1,722 @@
+"""
+Incrementally maintained agent execution metrics.
+
+Execution metrics used to be three aggregate queries over agent_executions
+per request. They are now read from agent_execution_rollups: one row per
+(project_id, agent_type, hour of started_at) holding additive counters.
+
+Every execution contributes a fixed amount to its bucket's counters, derived
+from its row alone (status, started_at, completed_at; see ``contribution``).
+Writers lock the execution row, then add the difference between its new and
+old contribution with one upsert in the same transaction, so the rollup
+stays exactly equal to an aggregate over the raw table whatever order the
+status transitions come in.
+
+Running executions count towards the average duration with their elapsed
+time: the bucket keeps the sum of their started_at epochs, and the reader
+adds ``running * now - open_started_epoch_sum``.
+
+Token usage and model cost are additive as well. They only grow, so usage
+is applied as a plain increment (``record_usage``) in the transaction that
+adds it to the execution row; status transitions leave them unchanged.
+
+Existing history is loaded with the backfill command, which rebuilds the
+rollup from the raw table; the check command compares both:
+
+    python -m app.services.agent_metrics_rollup backfill [--project-id ID]
+    python -m app.services.agent_metrics_rollup check [--project-id ID]
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import sys
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+import structlog
+from sqlalchemy import Table, delete, insert, select, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.dml import Insert
+
+from ..models import AgentExecution, AgentExecutionRollup
+
+logger = structlog.get_logger()
+
+COUNTERS = (
+    "started_count",
+    "completed_count",
+    "failed_count",
+    "finished_count",
+    "duration_seconds_sum",
+    "open_started_epoch_sum",
+    "prompt_tokens_sum",
+    "completion_tokens_sum",
+    "cost_usd_sum",
+)
+INTEGER_COUNTERS = (
+    "started_count",
+    "completed_count",
+    "failed_count",
+    "finished_count",
+    "prompt_tokens_sum",
+    "completion_tokens_sum",
+)
+
+# Rows fetched per round trip when scanning agent_executions
+SCAN_BATCH_SIZE = 5000
+
+RollupKey = Tuple[UUID, str, datetime]
+
+
+@dataclass(frozen=True)
+class ExecutionState:
+    """The fields of an execution that its metrics contribution depends on.
+
+    Usage defaults to zero; transitions that do not change usage may omit it
+    on both sides, as only the difference is applied.
+    """
+
+    status: str
+    completed_at: Optional[datetime] = None
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cost_usd: float = 0.0
+
+
+RollupChange = Tuple[
+    UUID, str, datetime, Optional[ExecutionState], Optional[ExecutionState]
+]
+
+
+def _dialect_insert(dialect_name: str) -> Any:
+    if dialect_name == "postgresql":
+        return postgresql.insert
+    if dialect_name == "sqlite":
+        return sqlite.insert
+    raise ValueError(f"Metrics rollup is not supported on {dialect_name}")
+
+
+def _as_utc(value: datetime) -> datetime:
+    # Naive timestamps (datetime.utcnow(), SQLite) are UTC
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def bucket_start(started_at: datetime) -> datetime:
+    """Truncate a timestamp to the start of its rollup bucket (UTC hour)."""
+    return _as_utc(started_at).replace(minute=0, second=0, microsecond=0)
+
+
+def contribution(started_at: datetime, state: ExecutionState) -> Dict[str, float]:
+    """
+    Counters one execution adds to its bucket.
+
+    Args:
+        started_at: Execution start time
+        state: Execution status and completion time
+
+    Returns:
+        Counter name -> value
+    """
+    started = _as_utc(started_at)
+    finished = state.completed_at is not None
+    return {
+        "started_count": 1,
+        "completed_count": int(state.status == "completed"),
+        "failed_count": int(state.status == "failed"),
+        "finished_count": int(finished),
+        "duration_seconds_sum": (
+            (_as_utc(state.completed_at) - started).total_seconds() if finished else 0.0
+        ),
+        "open_started_epoch_sum": 0.0 if finished else started.timestamp(),
+        "prompt_tokens_sum": state.prompt_tokens,
+        "completion_tokens_sum": state.completion_tokens,
+        "cost_usd_sum": state.cost_usd,
+    }
+
+
+def contribution_delta(
+    started_at: datetime,
+    before: Optional[ExecutionState],
+    after: Optional[ExecutionState],
+) -> Dict[str, float]:
+    """
+    Counter changes for an execution moving from one state to another.
+
+    Args:
+        started_at: Execution start time
+        before: State before the change (None for a new execution)
+        after: State after the change (None for a deleted execution)
+
+    Returns:
+        Counter name -> change, empty if nothing changed
+    """
+    old = contribution(started_at, before) if before else {}
+    new = contribution(started_at, after) if after else {}
+    delta = {name: new.get(name, 0) - old.get(name, 0) for name in COUNTERS}
+    return {name: value for name, value in delta.items() if value}
+
+
+def summarize(rows: List[Any], now: Optional[datetime] = None) -> Dict[str, Any]:
+    """
+    Combine rollup rows into the metrics returned by the agents API.
+
+    Args:
+        rows: Rows with agent_type and the counter columns
+        now: Reference time for running executions (defaults to now)
+
+    Returns:
+        Dict with total_executions, successful_executions, failed_executions,
+        average_execution_time_seconds, success_rate,
+        executions_by_agent_type, the token and cost totals and
+        tokens_by_agent_type
+    """
+    now_epoch = _as_utc(now or datetime.now(timezone.utc)).timestamp()
+    totals = dict.fromkeys(COUNTERS, 0)
+    by_type: Dict[str, int] = {}
+    tokens_by_type: Dict[str, int] = {}
+    for row in rows:
+        for name in COUNTERS:
+            totals[name] += getattr(row, name) or 0
+        by_type[row.agent_type] = by_type.get(row.agent_type, 0) + row.started_count
+        tokens_by_type[row.agent_type] = (
+            tokens_by_type.get(row.agent_type, 0)
+            + (row.prompt_tokens_sum or 0)
+            + (row.completion_tokens_sum or 0)
+        )
+
+    total = int(totals["started_count"])
+    running = total - int(totals["finished_count"])
+    elapsed = (
+        totals["duration_seconds_sum"]
+        + running * now_epoch
+        - totals["open_started_epoch_sum"]
+    )
+    successful = int(totals["completed_count"])
+    return {
+        "total_executions": total,
+        "successful_executions": successful,
+        "failed_executions": int(totals["failed_count"]),
+        "average_execution_time_seconds": elapsed / total if total else 0.0,
+        "success_rate": successful / total * 100 if total else 0.0,
+        "executions_by_agent_type": {
+            agent_type: count for agent_type, count in by_type.items() if count
+        },
+        "total_prompt_tokens": int(totals["prompt_tokens_sum"]),
+        "total_completion_tokens": int(totals["completion_tokens_sum"]),
+        "total_tokens": int(
+            totals["prompt_tokens_sum"] + totals["completion_tokens_sum"]
+        ),
+        "total_cost_usd": float(totals["cost_usd_sum"]),
+        "tokens_by_agent_type": {
+            agent_type: tokens
+            for agent_type, tokens in tokens_by_type.items()
+            if tokens
+        },
+    }
+
+
+class AgentMetricsRollup:
+    """Maintains and reads agent_execution_rollups."""
+
+    def __init__(
+        self, executions: Optional[Table] = None, rollups: Optional[Table] = None
+    ):
+        """
+        Initialize rollup store.
+
+        Args:
+            executions: Raw executions table (defaults to agent_executions)
+            rollups: Rollup table (defaults to agent_execution_rollups)
+        """
+        self.executions = (
+            executions if executions is not None else AgentExecution.__table__
+        )
+        self.rollups = (
+            rollups if rollups is not None else AgentExecutionRollup.__table__
+        )
+
+    def increment_statement(
+        self,
+        dialect_name: str,
+        project_id: UUID,
+        agent_type: str,
+        bucket: datetime,
+        delta: Dict[str, float],
+    ) -> Insert:
+        """
+        Build the upsert adding delta to a bucket's counters.
+
+        Args:
+            dialect_name: Database dialect (postgresql or sqlite)
+            project_id: Project UUID
+            agent_type: Agent type
+            bucket: Bucket start
+            delta: Counter name -> change
+
+        Returns:
+            INSERT ... ON CONFLICT DO UPDATE SET counter = counter + excluded
+
+        Raises:
+            ValueError: If the dialect does not support upserts
+        """
+        rollups = self.rollups
+        statement = _dialect_insert(dialect_name)(rollups).values(
+            project_id=project_id,
+            agent_type=agent_type,
+            bucket_start=bucket,
+            **{name: delta.get(name, 0) for name in COUNTERS},
+        )
+        return statement.on_conflict_do_update(
+            index_elements=[
+                rollups.c.project_id,
+                rollups.c.agent_type,
+                rollups.c.bucket_start,
+            ],
+            set_={
+                name: rollups.c[name] + statement.excluded[name]
+                for name in delta
+                if name in COUNTERS
+            },
+        )
+
+    def increments_statement(
+        self, dialect_name: str, deltas: Dict[RollupKey, Dict[str, float]]
+    ) -> Insert:
+        """
+        Build one multi-row upsert adding deltas to several buckets.
+
+        Args:
+            dialect_name: Database dialect (postgresql or sqlite)
+            deltas: (project_id, agent_type, bucket_start) -> counter changes
+
+        Returns:
+            INSERT ... VALUES (...), (...) ON CONFLICT DO UPDATE
+
+        Raises:
+            ValueError: If the dialect does not support upserts
+        """
+        rollups = self.rollups
+        statement = _dialect_insert(dialect_name)(rollups).values(
+            [
+                {
+                    "project_id": project_id,
+                    "agent_type": agent_type,
+                    "bucket_start": bucket,
+                    **{name: delta.get(name, 0) for name in COUNTERS},
+                }
+                for (project_id, agent_type, bucket), delta in deltas.items()
+            ]
+        )
+        return statement.on_conflict_do_update(
+            index_elements=[
+                rollups.c.project_id,
+                rollups.c.agent_type,
+                rollups.c.bucket_start,
+            ],
+            set_={
+                name: rollups.c[name] + statement.excluded[name] for name in COUNTERS
+            },
+        )
+
+    async def lock_execution(
+        self, session: AsyncSession, execution_id: UUID
+    ) -> Optional[Row]:
+        """
+        Lock an execution row and read the fields its contribution depends on.
+
+        Call this before changing status or completed_at, so concurrent
+        writers apply their deltas one after another.
+
+        Args:
+            session: Database session (the lock is held until commit)
+            execution_id: Execution UUID
+
+        Returns:
+            Row of (project_id, agent_type, started_at, status, completed_at),
+            or None if the execution does not exist
+        """
+        executions = self.executions
+        result = await session.execute(
+            select(
+                executions.c.project_id,
+                executions.c.agent_type,
+                executions.c.started_at,
+                executions.c.status,
+                executions.c.completed_at,
+            )
+            .where(executions.c.id == execution_id)
+            .with_for_update()
+        )
+        return result.one_or_none()
+
+    async def record(
+        self,
+        session: AsyncSession,
+        project_id: UUID,
+        agent_type: str,
+        started_at: datetime,
+        before: Optional[ExecutionState],
+        after: Optional[ExecutionState],
+    ) -> None:
+        """
+        Apply an execution's state change to its bucket.
+
+        Run this in the transaction that writes the execution row.
+
+        Args:
+            session: Database session
+            project_id: Project UUID
+            agent_type: Agent type
+            started_at: Execution start time (selects the bucket)
+            before: State before the change (None for a new execution)
+            after: State after the change (None for a deleted execution)
+        """
+        delta = contribution_delta(started_at, before, after)
+        if not delta:
+            return
+        await session.execute(
+            self.increment_statement(
+                session.get_bind().dialect.name,
+                project_id,
+                agent_type,
+                bucket_start(started_at),
+                delta,
+            )
+        )
+
+    async def record_usage(
+        self,
+        session: AsyncSession,
+        project_id: UUID,
+        agent_type: str,
+        started_at: datetime,
+        prompt_tokens: int,
+        completion_tokens: int,
+        cost_usd: float,
+    ) -> None:
+        """
+        Add model usage of an execution to its bucket.
+
+        Run this in the transaction that adds the usage to the execution row.
+
+        Args:
+            session: Database session
+            project_id: Project UUID
+            agent_type: Agent type
+            started_at: Execution start time (selects the bucket)
+            prompt_tokens: Prompt tokens added
+            completion_tokens: Completion tokens added
+            cost_usd: Model cost added
+        """
+        delta = {
+            name: value
+            for name, value in (
+                ("prompt_tokens_sum", prompt_tokens),
+                ("completion_tokens_sum", completion_tokens),
+                ("cost_usd_sum", cost_usd),
+            )
+            if value
+        }
+        if not delta:
+            return
+        await session.execute(
+            self.increment_statement(
+                session.get_bind().dialect.name,
+                project_id,
+                agent_type,
+                bucket_start(started_at),
+                delta,
+            )
+        )
+
+    async def record_many(
+        self, session: AsyncSession, changes: Iterable[RollupChange]
+    ) -> None:
+        """
+        Apply several state changes with one upsert.
+
+        Args:
+            session: Database session
+            changes: (project_id, agent_type, started_at, before, after) tuples
+                as taken by record()
+        """
+        deltas: Dict[RollupKey, Dict[str, float]] = {}
+        for project_id, agent_type, started_at, before, after in changes:
+            delta = contribution_delta(started_at, before, after)
+            if not delta:
+                continue
+            merged = deltas.setdefault(
+                (project_id, agent_type, bucket_start(started_at)), {}
+            )
+            for name, value in delta.items():
+                merged[name] = merged.get(name, 0) + value
+        if deltas:
+            await session.execute(
+                self.increments_statement(session.get_bind().dialect.name, deltas)
+            )
+
+    async def read(
+        self, session: AsyncSession, project_id: UUID, since: datetime
+    ) -> Dict[str, Any]:
+        """
+        Read a project's metrics from the rollup.
+
+        Buckets are whole hours, so the window starts at the beginning of the
+        hour containing since.
+
+        Args:
+            session: Database session
+            project_id: Project UUID
+            since: Window start
+
+        Returns:
+            Metrics as returned by summarize()
+        """
+        rollups = self.rollups
+        result = await session.execute(
+            select(rollups.c.agent_type, *(rollups.c[name] for name in COUNTERS)).where(
+                rollups.c.project_id == project_id,
+                rollups.c.bucket_start >= bucket_start(since),
+            )
+        )
+        return summarize(result.all())
+
+    async def aggregate_raw(
+        self, session: AsyncSession, project_id: Optional[UUID] = None
+    ) -> Dict[RollupKey, Dict[str, float]]:
+        """
+        Compute rollup rows from agent_executions.
+
+        Args:
+            session: Database session
+            project_id: Restrict to one project (all projects if None)
+
+        Returns:
+            (project_id, agent_type, bucket_start) -> counters
+        """
+        executions = self.executions
+        query = select(
+            executions.c.project_id,
+            executions.c.agent_type,
+            executions.c.started_at,
+            executions.c.status,
+            executions.c.completed_at,
+            executions.c.prompt_tokens,
+            executions.c.completion_tokens,
+            executions.c.cost_usd,
+        ).execution_options(yield_per=SCAN_BATCH_SIZE)
+        if project_id is not None:
+            query = query.where(executions.c.project_id == project_id)
+
+        expected: Dict[RollupKey, Dict[str, float]] = {}
+        result = await session.stream(query)
+        async for partition in result.partitions():
+            for row in partition:
+                key = (row.project_id, row.agent_type, bucket_start(row.started_at))
+                counters = expected.setdefault(key, dict.fromkeys(COUNTERS, 0))
+                state = ExecutionState(
+                    row.status,
+                    row.completed_at,
+                    row.prompt_tokens or 0,
+                    row.completion_tokens or 0,
+                    row.cost_usd or 0.0,
+                )
+                for name, value in contribution(row.started_at, state).items():
+                    counters[name] += value
+        return expected
+
+    async def _stored(
+        self, session: AsyncSession, project_id: Optional[UUID]
+    ) -> Dict[RollupKey, Dict[str, float]]:
+        rollups = self.rollups
+        query = select(rollups)
+        if project_id is not None:
+            query = query.where(rollups.c.project_id == project_id)
+        result = await session.execute(query)
+        return {
+            (row.project_id, row.agent_type, bucket_start(row.bucket_start)): {
+                name: getattr(row, name) for name in COUNTERS
+            }
+            for row in result.all()
+        }
+
+    async def backfill(
+        self, session: AsyncSession, project_id: Optional[UUID] = None
+    ) -> Dict[str, Any]:
+        """
+        Rebuild rollup rows from the raw table.
+
+        On PostgreSQL agent_executions is locked in SHARE mode first, so
+        execution writes wait for the rebuild instead of being lost; the
+        lock is held until the caller commits.
+
+        Args:
+            session: Database session
+            project_id: Restrict to one project (all projects if None)
+
+        Returns:
+            Dict with the number of executions and buckets written
+        """
+        if session.get_bind().dialect.name == "postgresql":
+            await session.execute(text("LOCK TABLE agent_executions IN SHARE MODE"))
+
+        expected = await self.aggregate_raw(session, project_id)
+        rollups = self.rollups
+        clear = delete(rollups)
+        if project_id is not None:
+            clear = clear.where(rollups.c.project_id == project_id)
+        await session.execute(clear)
+
+        rows = [
+            {
+                "project_id": key[0],
+                "agent_type": key[1],
+                "bucket_start": key[2],
+                **counters,
+            }
+            for key, counters in expected.items()
+        ]
+        for offset in range(0, len(rows), SCAN_BATCH_SIZE):
+            await session.execute(
+                insert(rollups), rows[offset : offset + SCAN_BATCH_SIZE]
+            )
+
+        executions = sum(int(row["started_count"]) for row in rows)
+        logger.info(
+            "Agent metrics rollup backfilled",
+            project_id=str(project_id) if project_id else None,
+            executions=executions,
+            buckets=len(rows),
+        )
+        return {"executions": executions, "buckets": len(rows)}
+
+    async def check_consistency(
+        self,
+        session: AsyncSession,
+        project_id: Optional[UUID] = None,
+        max_reported: int = 20,
+    ) -> Dict[str, Any]:
+        """
+        Compare rollup rows with an aggregate over the raw table.
+
+        Args:
+            session: Database session
+            project_id: Restrict to one project (all projects if None)
+            max_reported: Maximum number of mismatched buckets listed
+
+        Returns:
+            Dict with consistent, buckets, mismatched and mismatches
+            (bucket key, expected and stored counters)
+        """
+        expected = await self.aggregate_raw(session, project_id)
+        stored = await self._stored(session, project_id)
+        zero = dict.fromkeys(COUNTERS, 0)
+
+        mismatches: List[Dict[str, Any]] = []
+        for key in sorted(expected.keys() | stored.keys(), key=str):
+            want, have = expected.get(key, zero), stored.get(key, zero)
+            if all(_counter_matches(name, want[name], have[name]) for name in COUNTERS):
+                continue
+            mismatches.append(
+                {
+                    "project_id": str(key[0]),
+                    "agent_type": key[1],
+                    "bucket_start": key[2].isoformat(),
+                    "expected": want,
+                    "stored": have,
+                }
+            )
+
+        report = {
+            "consistent": not mismatches,
+            "buckets": len(expected),
+            "mismatched": len(mismatches),
+            "mismatches": mismatches[:max_reported],
+        }
+        if mismatches:
+            logger.warning(
+                "Agent metrics rollup is inconsistent",
+                project_id=str(project_id) if project_id else None,
+                mismatched=len(mismatches),
+            )
+        return report
+
+
+def _counter_matches(name: str, expected: float, stored: float) -> bool:
+    if name in INTEGER_COUNTERS:
+        return int(expected) == int(stored)
+    # Float sums drift slightly with the order of increments
+    return math.isclose(expected, stored, rel_tol=1e-9, abs_tol=1e-3)
+
+
+# Shared instance used by the repository and the tracker
+agent_metrics_rollup = AgentMetricsRollup()
+
+
+async def backfill_all(project_id: Optional[UUID] = None) -> Dict[str, int]:
+    """
+    Rebuild the rollup of every project, one transaction per project.
+
+    Args:
+        project_id: Restrict to one project
+
+    Returns:
+        Totals across all rebuilt projects
+    """
+    from ..core.database import database_manager
+
+    rollup = agent_metrics_rollup
+    if project_id is not None:
+        project_ids = [project_id]
+    else:
+        async with database_manager.get_session() as session:
+            query = select(rollup.executions.c.project_id).distinct()
+            project_ids = list((await session.execute(query)).scalars())
+
+    totals = {"projects": 0, "executions": 0, "buckets": 0}
+    for backfill_project_id in project_ids:
+        async with database_manager.get_session(str(backfill_project_id)) as session:
+            counts = await rollup.backfill(session, backfill_project_id)
+        totals["projects"] += 1
+        totals["executions"] += counts["executions"]
+        totals["buckets"] += counts["buckets"]
+    return totals
+
+
+async def main() -> None:
+    """Command line entry point for rollup backfill and consistency checks."""
+    from ..core.database import database_manager
+
+    parser = argparse.ArgumentParser(description="Agent execution metrics rollup")
+    parser.add_argument("--project-id", type=UUID, default=None)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("backfill", help="Rebuild the rollup from agent_executions")
+    subparsers.add_parser("check", help="Compare the rollup with agent_executions")
+    args = parser.parse_args()
+
+    await database_manager.initialize()
+    try:
+        if args.command == "backfill":
+            result = await backfill_all(args.project_id)
+        else:
+            async with database_manager.get_session() as session:
+                result = await agent_metrics_rollup.check_consistency(
+                    session, args.project_id
+                )
+    finally:
+        await database_manager.close()
+    print(json.dumps(result, indent=2))
+    if args.command == "check" and not result["consistent"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,221 @@
+"""
+Atomic document version allocation.
+
+Each (project_id, document_type) has a counter row holding its last
+allocated version. A version is allocated with a single upsert
+
+    INSERT INTO document_version_counters ... VALUES (..., :seed)
+    ON CONFLICT (project_id, document_type)
+    DO UPDATE SET last_version = GREATEST(last_version + 1, excluded.last_version)
+    RETURNING last_version
+
+which takes the counter row lock until the transaction ends, so concurrent
+writers of one document queue on the row instead of racing on
+max(version) + 1 and retrying on unique violations. On PostgreSQL the upsert
+runs as a data-modifying CTE of the document INSERT, so allocation and insert
+share one statement and one round trip.
+
+The seed is max(version) + 1 of the existing rows, so a missing counter row
+(or one left behind by writers that do not use counters) catches up
+instead of handing out a taken number.
+
+The counter row also points at the latest existing version
+(latest_version_id, maintained by a trigger on document_versions), so the
+current version of a document is read with two primary key lookups.
+"""
+
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+from sqlalchemy import Table, func, insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Result
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+from sqlalchemy.sql.dml import Insert
+
+from ..models import DocumentVersion, DocumentVersionCounter
+
+
+class VersionAllocator:
+    """Allocates version numbers from per-document counter rows."""
+
+    def __init__(
+        self, versions: Optional[Table] = None, counters: Optional[Table] = None
+    ):
+        """
+        Initialize allocator.
+
+        Args:
+            versions: Versions table (defaults to document_versions)
+            counters: Counter table (defaults to document_version_counters)
+        """
+        self.versions = versions if versions is not None else DocumentVersion.__table__
+        self.counters = (
+            counters if counters is not None else DocumentVersionCounter.__table__
+        )
+
+    def allocation(
+        self,
+        dialect_name: str,
+        project_id: UUID,
+        document_type: str,
+        requested_version: Optional[int] = None,
+    ) -> Insert:
+        """
+        Build the counter upsert returning the allocated version.
+
+        Args:
+            dialect_name: Database dialect (postgresql or sqlite)
+            project_id: Project UUID
+            document_type: Document type
+            requested_version: Explicit version to record instead of allocating
+
+        Returns:
+            INSERT ... ON CONFLICT DO UPDATE ... RETURNING last_version
+
+        Raises:
+            ValueError: If the dialect does not support upserts
+        """
+        if dialect_name == "postgresql":
+            dialect_insert, greatest = postgresql.insert, func.greatest
+        elif dialect_name == "sqlite":
+            # SQLite's scalar max() takes several arguments like GREATEST
+            dialect_insert, greatest = sqlite.insert, func.max
+        else:
+            raise ValueError(f"Version allocation is not supported on {dialect_name}")
+
+        counters = self.counters
+        if requested_version is None:
+            seed = (
+                select(func.coalesce(func.max(self.versions.c.version), 0) + 1)
+                .where(
+                    self.versions.c.project_id == project_id,
+                    self.versions.c.document_type == document_type,
+                )
+                .scalar_subquery()
+            )
+        else:
+            seed = requested_version
+
+        statement = dialect_insert(counters).values(
+            project_id=project_id, document_type=document_type, last_version=seed
+        )
+        if requested_version is None:
+            last_version = greatest(
+                counters.c.last_version + 1, statement.excluded.last_version
+            )
+        else:
+            # An explicit version only moves the counter forward
+            last_version = greatest(
+                counters.c.last_version, statement.excluded.last_version
+            )
+        return statement.on_conflict_do_update(
+            index_elements=[counters.c.project_id, counters.c.document_type],
+            set_={"last_version": last_version},
+        ).returning(counters.c.last_version)
+
+    def insert_statement(
+        self,
+        target: Any,
+        values: Dict[str, Any],
+        requested_version: Optional[int] = None,
+    ) -> Insert:
+        """
+        Build the single-statement PostgreSQL insert.
+
+        The counter upsert runs as a data-modifying CTE whose RETURNING value
+        numbers the inserted row.
+
+        Args:
+            target: Mapped class or table to insert into
+            values: Row values including project_id and document_type,
+                excluding version
+            requested_version: Explicit version instead of the next one
+
+        Returns:
+            WITH allocated_version AS (upsert) INSERT ... RETURNING target
+        """
+        allocated = self.allocation(
+            "postgresql",
+            values["project_id"],
+            values["document_type"],
+            requested_version,
+        ).cte("allocated_version")
+        version = (
+            requested_version
+            if requested_version is not None
+            else select(allocated.c.last_version).scalar_subquery()
+        )
+        return (
+            insert(target)
+            .values(**values, version=version)
+            .add_cte(allocated)
+            .returning(target)
+        )
+
+    async def insert(
+        self,
+        session: AsyncSession,
+        target: Any,
+        values: Dict[str, Any],
+        requested_version: Optional[int] = None,
+    ) -> Result:
+        """
+        Insert a version row with an atomically allocated version number.
+
+        Args:
+            session: Database session (the counter row stays locked until
+                its transaction ends)
+            target: Mapped class or table to insert into
+            values: Row values including project_id and document_type,
+                excluding version
+            requested_version: Explicit version instead of the next one
+
+        Returns:
+            Result of INSERT ... RETURNING target
+        """
+        dialect_name = session.get_bind().dialect.name
+        if dialect_name == "postgresql":
+            return await session.execute(
+                self.insert_statement(target, values, requested_version)
+            )
+
+        # Dialects without data-modifying CTEs: two statements, one transaction
+        allocation = self.allocation(
+            dialect_name,
+            values["project_id"],
+            values["document_type"],
+            requested_version,
+        )
+        allocated_version = (await session.execute(allocation)).scalar_one()
+        version = (
+            requested_version if requested_version is not None else allocated_version
+        )
+        return await session.execute(
+            insert(target).values(**values, version=version).returning(target)
+        )
+
+
+def latest_version_query(project_id: UUID, document_type: str) -> Select:
+    """
+    Select the latest version of a document through its counter pointer.
+
+    Args:
+        project_id: Project UUID
+        document_type: Document type
+
+    Returns:
+        Select of at most one DocumentVersion
+    """
+    return (
+        select(DocumentVersion)
+        .join(
+            DocumentVersionCounter,
+            DocumentVersionCounter.latest_version_id == DocumentVersion.id,
+        )
+        .where(
+            DocumentVersionCounter.project_id == project_id,
+            DocumentVersionCounter.document_type == document_type,
+        )
+    )
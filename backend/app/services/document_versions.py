@@ -0,0 +1,493 @@
+"""
+Delta-compressed storage for document versions.
+
+Versions of one document (project_id + document_type) are stored as chains:
+a full snapshot followed by zlib-compressed line deltas, each against the
+previous version. A new snapshot starts once a chain reaches the configured
+length, so reading any version replays at most that many deltas.
+
+Delta rows keep content NULL; DocumentVersionStore.load_contents rebuilds
+their text in bulk (one range query per document) and verifies it against
+the stored SHA-256 content hash.
+"""
+
+import argparse
+import asyncio
+import difflib
+import hashlib
+import json
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+import structlog
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models import DocumentVersion
+
+logger = structlog.get_logger()
+
+SNAPSHOT = "snapshot"
+DELTA = "delta"
+DELTA_FORMAT_VERSION = 1
+
+
+def content_hash(content: str) -> str:
+    """SHA-256 hex digest of document content."""
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def encode_delta(base: str, target: str) -> bytes:
+    """
+    Encode target as a compressed line delta against base.
+
+    The delta is a list of operations: [start, end] copies base lines, a
+    string inserts literal text.
+
+    Args:
+        base: Previous version content
+        target: New version content
+
+    Returns:
+        zlib-compressed JSON delta
+    """
+    base_lines = base.splitlines(keepends=True)
+    target_lines = target.splitlines(keepends=True)
+    matcher = difflib.SequenceMatcher(None, base_lines, target_lines, autojunk=False)
+
+    operations: List[Any] = []
+    for tag, base_start, base_end, target_start, target_end in matcher.get_opcodes():
+        if tag == "equal":
+            operations.append([base_start, base_end])
+        elif tag != "delete":
+            operations.append("".join(target_lines[target_start:target_end]))
+
+    payload = {"v": DELTA_FORMAT_VERSION, "ops": operations}
+    return zlib.compress(json.dumps(payload, separators=(",", ":")).encode("utf-8"))
+
+
+def apply_delta(base: str, delta: bytes) -> str:
+    """
+    Rebuild content from its base and an encoded delta.
+
+    Args:
+        base: Content of the delta's base version
+        delta: Delta produced by encode_delta
+
+    Returns:
+        Reconstructed content
+
+    Raises:
+        ValueError: If the delta format is not supported
+    """
+    payload = json.loads(zlib.decompress(delta))
+    if payload.get("v") != DELTA_FORMAT_VERSION:
+        raise ValueError(f"Unsupported document delta format: {payload.get('v')}")
+
+    base_lines = base.splitlines(keepends=True)
+    parts: List[str] = []
+    for operation in payload["ops"]:
+        if isinstance(operation, str):
+            parts.append(operation)
+        else:
+            parts.extend(base_lines[operation[0] : operation[1]])
+    return "".join(parts)
+
+
+@dataclass(frozen=True)
+class VersionStoragePolicy:
+    """
+    When a new version is stored as a delta instead of a snapshot.
+
+    Attributes:
+        max_chain_length: Maximum deltas between a read and its snapshot
+            (0 disables delta storage)
+        max_delta_ratio: Deltas larger than this fraction of the full
+            content are not worth it and are stored as snapshots
+    """
+
+    max_chain_length: int = 16
+    max_delta_ratio: float = 0.5
+
+    def __post_init__(self):
+        if self.max_chain_length < 0:
+            raise ValueError("max_chain_length cannot be negative")
+        if not 0.0 < self.max_delta_ratio <= 1.0:
+            raise ValueError("max_delta_ratio must be in (0, 1]")
+
+    @classmethod
+    def from_settings(cls) -> "VersionStoragePolicy":
+        """Build the policy from application settings."""
+        from ..core.config import get_settings
+
+        settings = get_settings()
+        return cls(
+            max_chain_length=settings.DOCUMENT_VERSION_MAX_DELTA_CHAIN,
+            max_delta_ratio=settings.DOCUMENT_VERSION_MAX_DELTA_RATIO,
+        )
+
+
+def store_as_snapshot(row: Any, content: str) -> None:
+    """Set a version row to hold its content as a full snapshot."""
+    row.stored_content = content
+    row.content_storage = SNAPSHOT
+    row.content_delta = None
+    row.delta_base_version = None
+    row.snapshot_version = None
+    row.delta_chain_length = 0
+    row.content_hash = content_hash(content)
+    row._reconstructed_content = content
+
+
+def encode_version(
+    row: Any,
+    content: str,
+    previous: Optional[Any],
+    previous_content: Optional[str],
+    policy: VersionStoragePolicy,
+) -> None:
+    """
+    Set a version row's storage fields, as a delta when the policy allows.
+
+    Args:
+        row: Version row to encode (stored content fields are overwritten)
+        content: Full content of the version
+        previous: Version row the delta would be based on
+        previous_content: Full content of the previous version
+        policy: Storage policy
+    """
+    if previous is None or previous_content is None or policy.max_chain_length == 0:
+        store_as_snapshot(row, content)
+        return
+
+    previous_is_delta = previous.content_storage == DELTA
+    chain_length = (previous.delta_chain_length + 1) if previous_is_delta else 1
+    if chain_length > policy.max_chain_length:
+        store_as_snapshot(row, content)
+        return
+
+    delta = encode_delta(previous_content, content)
+    if len(delta) > policy.max_delta_ratio * len(content.encode("utf-8")):
+        store_as_snapshot(row, content)
+        return
+
+    row.stored_content = None
+    row.content_storage = DELTA
+    row.content_delta = delta
+    row.delta_base_version = previous.version
+    row.snapshot_version = (
+        previous.snapshot_version if previous_is_delta else previous.version
+    )
+    row.delta_chain_length = chain_length
+    row.content_hash = content_hash(content)
+    row._reconstructed_content = content
+
+
+def reconstruct_contents(rows: Iterable[Any]) -> Dict[int, str]:
+    """
+    Rebuild the content of every version in a set of rows of one document.
+
+    The rows must include each delta's base chain back to a snapshot;
+    contents already reconstructed on a row are reused.
+
+    Args:
+        rows: Version rows of one project_id and document_type
+
+    Returns:
+        Mapping of version number to full content
+
+    Raises:
+        RuntimeError: If a chain is broken or a content hash does not match
+    """
+    by_version = {row.version: row for row in rows}
+    contents: Dict[int, str] = {}
+
+    for version in sorted(by_version):
+        # Walk back to the nearest known content, then replay forwards
+        pending: List[Any] = []
+        row = by_version[version]
+        while version not in contents:
+            known = getattr(row, "_reconstructed_content", None)
+            if row.content_storage != DELTA:
+                contents[version] = row.stored_content
+                break
+            if known is not None:
+                contents[version] = known
+                break
+            pending.append(row)
+            version = row.delta_base_version
+            if version not in by_version or len(pending) > len(by_version):
+                raise RuntimeError(
+                    f"Broken delta chain: base version {version} of version "
+                    f"{row.version} is missing"
+                )
+            row = by_version[version]
+
+        content = contents[version]
+        for delta_row in reversed(pending):
+            content = apply_delta(content, delta_row.content_delta)
+            if (
+                delta_row.content_hash
+                and content_hash(content) != delta_row.content_hash
+            ):
+                raise RuntimeError(
+                    f"Content hash mismatch reconstructing version {delta_row.version}"
+                )
+            contents[delta_row.version] = content
+
+    for version, row in by_version.items():
+        row._reconstructed_content = contents[version]
+    return contents
+
+
+class DocumentVersionStore:
+    """
+    Reads and writes document version content through delta chains.
+
+    Works on the caller's session and never commits; callers flush or commit
+    as part of their own transaction.
+    """
+
+    def __init__(
+        self, session: AsyncSession, policy: Optional[VersionStoragePolicy] = None
+    ):
+        """
+        Initialize version store.
+
+        Args:
+            session: Database session
+            policy: Storage policy (defaults to application settings)
+        """
+        self.session = session
+        self.policy = policy or VersionStoragePolicy.from_settings()
+
+    async def prepare_new_version(
+        self, document: DocumentVersion, content: str
+    ) -> None:
+        """
+        Encode a new, not yet flushed version against its predecessor.
+
+        A version whose number is allocated at insert time (version None) is
+        encoded against the latest visible version; the delta records its
+        base version, so a concurrent insert in between does not matter.
+
+        Args:
+            document: New version with project_id and document_type set
+            content: Full content of the new version
+        """
+        previous = None
+        if self.policy.max_chain_length > 0:
+            query = select(DocumentVersion).where(
+                DocumentVersion.project_id == document.project_id,
+                DocumentVersion.document_type == document.document_type,
+            )
+            if document.version is not None:
+                query = query.where(DocumentVersion.version < document.version)
+            result = await self.session.execute(
+                query.order_by(DocumentVersion.version.desc()).limit(1)
+            )
+            previous = result.scalar_one_or_none()
+
+        previous_content = None
+        if previous is not None:
+            await self.load_contents([previous])
+            previous_content = previous.content
+        encode_version(document, content, previous, previous_content, self.policy)
+
+    async def load_contents(self, documents: Sequence[DocumentVersion]) -> None:
+        """
+        Reconstruct the content of delta-encoded versions in bulk.
+
+        Issues one range query per document (project_id, document_type)
+        among the delta rows that are not loaded yet.
+
+        Args:
+            documents: Versions whose content should be readable
+
+        Raises:
+            RuntimeError: If a delta chain is broken or fails verification
+        """
+        groups: Dict[Tuple[UUID, str], List[DocumentVersion]] = {}
+        for document in documents:
+            if document.content_storage == DELTA and document.content is None:
+                key = (document.project_id, document.document_type)
+                groups.setdefault(key, []).append(document)
+
+        for (project_id, document_type), group in groups.items():
+            lowest = min(document.snapshot_version or 0 for document in group)
+            highest = max(document.version for document in group)
+            result = await self.session.execute(
+                select(DocumentVersion).where(
+                    DocumentVersion.project_id == project_id,
+                    DocumentVersion.document_type == document_type,
+                    DocumentVersion.version.between(lowest, highest),
+                )
+            )
+            rows = {row.version: row for row in result.scalars().all()}
+            rows.update({document.version: document for document in group})
+            reconstruct_contents(rows.values())
+
+    async def detach_dependents(self, document: DocumentVersion) -> int:
+        """
+        Turn versions whose delta is based on this version into snapshots.
+
+        Must be called before the version is deleted or its content replaced.
+
+        Args:
+            document: Version about to be removed or rewritten
+
+        Returns:
+            Number of dependent versions converted to snapshots
+        """
+        result = await self.session.execute(
+            select(DocumentVersion).where(
+                DocumentVersion.project_id == document.project_id,
+                DocumentVersion.document_type == document.document_type,
+                DocumentVersion.content_storage == DELTA,
+                DocumentVersion.delta_base_version == document.version,
+            )
+        )
+        dependents = list(result.scalars().all())
+        if not dependents:
+            return 0
+
+        await self.load_contents([document, *dependents])
+        for dependent in dependents:
+            store_as_snapshot(dependent, dependent.content)
+        return len(dependents)
+
+    async def replace_content(self, document: DocumentVersion, content: str) -> None:
+        """
+        Replace a version's content, keeping later deltas readable.
+
+        Args:
+            document: Existing version
+            content: New full content
+        """
+        await self.detach_dependents(document)
+        store_as_snapshot(document, content)
+
+    async def compact(self, project_id: UUID, document_type: str) -> Dict[str, int]:
+        """
+        Re-encode every version of one document under the current policy.
+
+        Used to migrate rows written as full snapshots into delta chains, or
+        (with max_chain_length=0) to expand all versions back into snapshots.
+
+        Args:
+            project_id: Project ID
+            document_type: Document type
+
+        Returns:
+            Version count and stored content bytes before and after
+        """
+        result = await self.session.execute(
+            select(DocumentVersion)
+            .where(
+                DocumentVersion.project_id == project_id,
+                DocumentVersion.document_type == document_type,
+            )
+            .order_by(DocumentVersion.version)
+        )
+        rows = list(result.scalars().all())
+        contents = reconstruct_contents(rows)
+        bytes_before = sum(stored_size(row) for row in rows)
+
+        previous = None
+        for row in rows:
+            encode_version(
+                row,
+                contents[row.version],
+                previous,
+                contents[previous.version] if previous is not None else None,
+                self.policy,
+            )
+            previous = row
+
+        return {
+            "versions": len(rows),
+            "bytes_before": bytes_before,
+            "bytes_after": sum(stored_size(row) for row in rows),
+        }
+
+
+def stored_size(row: Any) -> int:
+    """Bytes of content a version row stores (snapshot text or delta)."""
+    if row.content_storage == DELTA:
+        return len(row.content_delta or b"")
+    return len((row.stored_content or "").encode("utf-8"))
+
+
+async def compact_all(
+    policy: VersionStoragePolicy, project_id: Optional[UUID] = None
+) -> Dict[str, int]:
+    """
+    Re-encode all documents, one transaction per document.
+
+    Args:
+        policy: Storage policy to apply
+        project_id: Restrict to one project
+
+    Returns:
+        Totals across all compacted documents
+    """
+    from ..core.database import database_manager
+
+    async with database_manager.get_session() as session:
+        query = select(DocumentVersion.project_id, DocumentVersion.document_type)
+        if project_id is not None:
+            query = query.where(DocumentVersion.project_id == project_id)
+        documents = (await session.execute(query.distinct())).all()
+
+    totals = {"documents": 0, "versions": 0, "bytes_before": 0, "bytes_after": 0}
+    start_time = time.perf_counter()
+    for document_project_id, document_type in documents:
+        async with database_manager.get_session(str(document_project_id)) as session:
+            stats = await DocumentVersionStore(session, policy).compact(
+                document_project_id, document_type
+            )
+        totals["documents"] += 1
+        for key, value in stats.items():
+            totals[key] += value
+        logger.info(
+            "Document versions compacted",
+            project_id=str(document_project_id),
+            document_type=document_type,
+            operation="compact_document_versions",
+            **stats,
+        )
+
+    totals["duration_seconds"] = round(time.perf_counter() - start_time, 3)
+    return totals
+
+
+async def main() -> None:
+    """Command line entry point for migrating existing version rows."""
+    from ..core.database import database_manager
+
+    parser = argparse.ArgumentParser(description="Document version storage")
+    parser.add_argument("--project-id", type=UUID, default=None)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("compact", help="Re-encode versions as snapshots plus deltas")
+    subparsers.add_parser(
+        "expand", help="Rewrite every version as a full snapshot (before downgrade)"
+    )
+    args = parser.parse_args()
+
+    policy = VersionStoragePolicy.from_settings()
+    if args.command == "expand":
+        policy = VersionStoragePolicy(max_chain_length=0)
+
+    await database_manager.initialize()
+    try:
+        result = await compact_all(policy, args.project_id)
+    finally:
+        await database_manager.close()
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,309 @@
+"""
+Project access checks with request-scoped and short-TTL caching.
+
+Every project-scoped endpoint and the agent isolation validator check that
+the project exists, is not deleted and belongs to the user. A single request
+used to repeat that SELECT three or four times. Access checks now go through
+ProjectAccessService, which answers from:
+
+1. the request memo, stored in the database session's ``info`` dict (one
+   session per request), holding grants and denials;
+2. a process-wide, bounded LRU of grants with a short TTL;
+3. the database, as a single SELECT of the project's language.
+
+Only grants are shared across requests, so a denial is always re-checked.
+Deleting a project or changing its owner or language invalidates its entries
+immediately and once more after the session commits, so a concurrent request
+cannot re-cache the pre-commit state. Other worker processes drop their
+entries when the TTL expires, which bounds cross-process staleness.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+from uuid import UUID
+
+import structlog
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, object_session
+
+from ..core.config import get_settings
+from ..models import Project
+
+logger = structlog.get_logger()
+
+# Session.info key of the request memo
+REQUEST_MEMO_KEY = "project_access"
+
+AccessKey = Tuple[UUID, UUID]
+
+
+@dataclass(frozen=True)
+class ProjectAccessGrant:
+    """A user's verified access to a live project."""
+
+    project_id: UUID
+    user_id: UUID
+    language: str
+
+
+class ProjectAccessCache:
+    """
+    Bounded, short-TTL cache of access grants shared across requests.
+
+    Lookups that started before an invalidation must not store their result:
+    each lookup reads the generation first and put() discards results from
+    an older generation.
+    """
+
+    def __init__(self, ttl_seconds: float = 5.0, max_entries: int = 10_000):
+        """
+        Initialize the cache.
+
+        Args:
+            ttl_seconds: Lifetime of a grant (0 disables cross-request caching)
+            max_entries: Maximum number of grants kept (LRU eviction)
+
+        Raises:
+            ValueError: If ttl_seconds is negative or max_entries is not positive
+        """
+        if ttl_seconds < 0:
+            raise ValueError("ttl_seconds must be non-negative")
+        if max_entries < 1:
+            raise ValueError("max_entries must be positive")
+
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[AccessKey, Tuple[ProjectAccessGrant, float]]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._request_hits = 0
+        self._shared_hits = 0
+        self._misses = 0
+        self._invalidations = 0
+        self._evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Whether grants are shared across requests."""
+        return self.ttl_seconds > 0
+
+    @property
+    def generation(self) -> int:
+        """Invalidation counter; read before a lookup and pass to put()."""
+        return self._generation
+
+    def get(self, project_id: UUID, user_id: UUID) -> Optional[ProjectAccessGrant]:
+        """Get a live grant, or None if absent or expired."""
+        if not self.enabled:
+            return None
+        key = (project_id, user_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            grant, expires_at = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            self._shared_hits += 1
+            return grant
+
+    def put(self, grant: ProjectAccessGrant, generation: int) -> None:
+        """Store a grant unless an invalidation happened since generation."""
+        if not self.enabled:
+            return
+        key = (grant.project_id, grant.user_id)
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._entries[key] = (grant, time.monotonic() + self.ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def invalidate_project(self, project_id: UUID) -> None:
+        """Drop every grant of a project."""
+        with self._lock:
+            self._generation += 1
+            self._invalidations += 1
+            for key in [key for key in self._entries if key[0] == project_id]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        """Drop every grant."""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def record_request_hit(self) -> None:
+        self._request_hits += 1
+
+    def record_miss(self) -> None:
+        self._misses += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters; every hit is an access query saved."""
+        hits = self._request_hits + self._shared_hits
+        lookups = hits + self._misses
+        return {
+            "ttl_seconds": self.ttl_seconds,
+            "max_entries": self.max_entries,
+            "entries": len(self._entries),
+            "request_hits": self._request_hits,
+            "shared_hits": self._shared_hits,
+            "misses": self._misses,
+            "queries_saved": hits,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "invalidations": self._invalidations,
+            "evictions": self._evictions,
+        }
+
+
+def _build_cache() -> ProjectAccessCache:
+    settings = get_settings()
+    return ProjectAccessCache(
+        ttl_seconds=settings.PROJECT_ACCESS_CACHE_TTL_SECONDS,
+        max_entries=settings.PROJECT_ACCESS_CACHE_MAX_ENTRIES,
+    )
+
+
+# Global cache instance
+project_access_cache = _build_cache()
+
+
+def _request_memo(session: Any) -> Dict[Any, Any]:
+    return session.info.setdefault(REQUEST_MEMO_KEY, {})
+
+
+def invalidate_project_access(
+    project_id: UUID,
+    session: Optional[Any] = None,
+    cache: Optional[ProjectAccessCache] = None,
+) -> None:
+    """
+    Invalidate cached access to a project.
+
+    Call this when a project is deleted or its owner or language changes.
+    With a session, the session's request memo is cleared as well and the
+    shared cache is invalidated again after the session commits.
+
+    Args:
+        project_id: Project UUID
+        session: Session making the change (AsyncSession or Session)
+        cache: Cache to invalidate (defaults to the global cache)
+    """
+    cache = cache or project_access_cache
+    cache.invalidate_project(project_id)
+    if session is None:
+        return
+
+    memo = _request_memo(session)
+    for key in [key for key in memo if key[0] == project_id]:
+        del memo[key]
+
+    sync_session = getattr(session, "sync_session", session)
+    if isinstance(sync_session, Session):
+        event.listen(
+            sync_session,
+            "after_commit",
+            lambda _session: cache.invalidate_project(project_id),
+            once=True,
+        )
+    logger.debug("Project access invalidated", project_id=str(project_id))
+
+
+class ProjectAccessService:
+    """Memoized project access checks for one request (one session)."""
+
+    def __init__(
+        self, session: AsyncSession, cache: Optional[ProjectAccessCache] = None
+    ):
+        self.session = session
+        self.cache = cache or project_access_cache
+
+    async def check(
+        self, project_id: UUID, user_id: UUID
+    ) -> Optional[ProjectAccessGrant]:
+        """
+        Check that a live project belongs to a user.
+
+        Args:
+            project_id: Project UUID
+            user_id: User UUID
+
+        Returns:
+            The grant, or None if the project is missing, deleted or not owned
+        """
+        memo = _request_memo(self.session)
+        key = (project_id, user_id)
+        if key in memo:
+            self.cache.record_request_hit()
+            return memo[key]
+
+        grant = self.cache.get(project_id, user_id)
+        if grant is None:
+            self.cache.record_miss()
+            generation = self.cache.generation
+            result = await self.session.execute(
+                select(Project.language).where(
+                    Project.id == project_id,
+                    Project.created_by == user_id,
+                    Project.is_deleted == False,
+                )
+            )
+            language = result.scalar_one_or_none()
+            if language is not None:
+                grant = ProjectAccessGrant(project_id, user_id, language)
+                self.cache.put(grant, generation)
+
+        memo[key] = grant
+        return grant
+
+    async def project_language(self, project_id: UUID) -> Optional[str]:
+        """
+        Get the language of a live project, reusing any grant of this request.
+
+        Args:
+            project_id: Project UUID
+
+        Returns:
+            Language code, or None if the project is missing or deleted
+        """
+        memo = _request_memo(self.session)
+        for key, grant in memo.items():
+            if key[0] == project_id and grant is not None:
+                self.cache.record_request_hit()
+                return grant.language
+
+        self.cache.record_miss()
+        result = await self.session.execute(
+            select(Project.language).where(
+                Project.id == project_id,
+                Project.is_deleted == False,
+            )
+        )
+        return result.scalar_one_or_none()
+
+    def invalidate(self, project_id: UUID) -> None:
+        """Invalidate a project changed through this session."""
+        invalidate_project_access(project_id, self.session, self.cache)
+
+
+def _on_access_attribute_set(target: Project, value: Any, oldvalue: Any, _initiator):
+    # ORM-level changes (soft delete, ownership or language) invalidate at once;
+    # bulk UPDATE statements must call invalidate_project_access explicitly
+    if target.id is None or value == oldvalue:
+        return
+    invalidate_project_access(target.id, object_session(target))
+
+
+for _attribute in (Project.created_by, Project.is_deleted, Project.language):
+    event.listen(_attribute, "set", _on_access_attribute_set)
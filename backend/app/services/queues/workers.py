@@ -9,13 +9,14 @@ import asyncio
 import logging
 import signal
 import time
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import Dict, Any, Optional, Callable, List, Set
 from uuid import UUID, uuid4
 
 from opentelemetry import trace
 from opentelemetry.trace import Status, StatusCode
 
+from app.core.deadline import deadline_scope
 from app.services.queues.queue_manager import (
     queue_manager,
     TaskData,
@@ -204,11 +205,15 @@ class QueueWorker:
         if not handler:
             raise ValueError(f"No handler for task type: {task_data.task_type}")
 
-        # Execute task with timeout
+        # Execute task with timeout; downstream operations see it as a deadline
+        deadline = datetime.now(timezone.utc) + timedelta(
+            seconds=task_data.timeout_seconds
+        )
         try:
-            result = await asyncio.wait_for(
-                handler(task_data), timeout=task_data.timeout_seconds
-            )
+            with deadline_scope(deadline):
+                result = await asyncio.wait_for(
+                    handler(task_data), timeout=task_data.timeout_seconds
+                )
 
             # Mark task as completed
             await queue_manager.complete_task(
@@ -498,10 +503,36 @@ class DefaultTaskHandlers:
 
     @staticmethod
     async def handle_embedding_computation(task_data: TaskData) -> Dict[str, Any]:
-        """Handle embedding computation task."""
-        # TODO: Implement embedding computation
-        await asyncio.sleep(1)  # Simulate work
-        return {"status": "completed", "embeddings_count": 42}
+        """
+        Handle embedding computation task.
+
+        Expects ``task_data.data["texts"]`` (list of strings). Texts are
+        embedded through the shared micro-batching embedding service, so
+        concurrent tasks from different projects share backend calls.
+        """
+        from app.services.vector.domain.entities import ContentHash
+        from app.services.vector.embedding_service import get_embedding_service
+
+        texts = task_data.data.get("texts")
+        if (
+            not isinstance(texts, list)
+            or not texts
+            or not all(isinstance(text, str) for text in texts)
+        ):
+            raise ValueError("Embedding task requires a non-empty 'texts' list")
+
+        vectors = await get_embedding_service().embed(task_data.project_id, texts)
+        return {
+            "status": "completed",
+            "embeddings_count": len(vectors),
+            "embeddings": [
+                {
+                    "content_hash": ContentHash.from_content(text).value,
+                    "vector": vector.to_list(),
+                }
+                for text, vector in zip(texts, vectors)
+            ],
+        }
 
     @staticmethod
     async def handle_agent_task(task_data: TaskData) -> Dict[str, Any]:
@@ -12,10 +12,28 @@ from .search_service import (
     build_search_filter,
 )
 from .repositories.qdrant_repository import QdrantVectorRepository
+from .repositories.content_store import InMemoryContentStore, PostgresContentStore
+from .exact_search_tier import ExactSearchTier
+from .sparse_encoder import BM25SparseEncoder
+from .embedding_service import (
+    DeterministicEmbeddingBackend,
+    EmbeddingBackend,
+    HttpEmbeddingBackend,
+    MicroBatchEmbeddingService,
+    get_embedding_service,
+)
+from .tenant_sharding import TenantShardMigrator
+from .migration import (
+    CollectionReindexer,
+    LegacyCutoverError,
+    VectorProjectExporter,
+    VectorProjectImporter,
+)
 from .repositories.interfaces import (
     VectorRepository,
     VectorSearchService,
     CollectionManager,
+    ContentStore,
 )
 
 __all__ = [
@@ -24,7 +42,22 @@ __all__ = [
     "build_mandatory_filter",
     "build_search_filter",
     "QdrantVectorRepository",
+    "BM25SparseEncoder",
+    "EmbeddingBackend",
+    "DeterministicEmbeddingBackend",
+    "HttpEmbeddingBackend",
+    "MicroBatchEmbeddingService",
+    "get_embedding_service",
+    "ExactSearchTier",
+    "TenantShardMigrator",
+    "VectorProjectExporter",
+    "VectorProjectImporter",
+    "CollectionReindexer",
+    "LegacyCutoverError",
     "VectorRepository",
     "VectorSearchService",
     "CollectionManager",
+    "ContentStore",
+    "InMemoryContentStore",
+    "PostgresContentStore",
 ]
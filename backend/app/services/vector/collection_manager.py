@@ -14,7 +14,13 @@ import structlog
 from qdrant_client import QdrantClient
 from tenacity import retry, stop_after_attempt, wait_exponential
 
-from .domain.entities import CollectionHealth, HealthStatus
+from .domain.entities import (
+    CollectionHealth,
+    HealthStatus,
+    TenantLayoutConfig,
+    VectorStorageConfig,
+)
+from .repositories.interfaces import ContentStore
 from .repositories.qdrant_repository import (
     QdrantVectorRepository,
     QdrantCollectionManager,
@@ -31,13 +37,26 @@ class VectorCollectionManager:
     with comprehensive error handling and health monitoring.
     """
 
-    def __init__(self, qdrant_url: str, timeout: int = 30):
+    def __init__(
+        self,
+        qdrant_url: str,
+        timeout: int = 30,
+        storage_config: Optional[VectorStorageConfig] = None,
+        tenant_config: Optional[TenantLayoutConfig] = None,
+        content_store: Optional[ContentStore] = None,
+        collection_info_refresh_interval: Optional[float] = None,
+    ):
         """
         Initialize collection manager.
 
         Args:
             qdrant_url: Qdrant server URL
             timeout: Request timeout in seconds
+            storage_config: Vector quantization and on-disk storage settings
+            tenant_config: Tenant index and shard key layout settings
+            content_store: External content store (external content mode)
+            collection_info_refresh_interval: Seconds between background
+                collection info snapshot refreshes
 
         Raises:
             ValueError: If qdrant_url is invalid or timeout is not positive
@@ -67,7 +86,13 @@ class VectorCollectionManager:
             url=qdrant_url.strip(),
             timeout=timeout,
         )
-        self.repository = QdrantVectorRepository(self.client)
+        self.repository = QdrantVectorRepository(
+            self.client,
+            storage_config,
+            tenant_config,
+            content_store,
+            collection_info_refresh_interval=collection_info_refresh_interval,
+        )
         self.collection_manager = QdrantCollectionManager(self.repository)
 
     @retry(
@@ -83,6 +108,8 @@ class VectorCollectionManager:
         """
         try:
             await self.collection_manager.initialize()
+            # Health, stats and validation read the snapshot kept fresh here
+            self.repository.start_collection_info_refresher()
             logger.info(
                 "Vector collection initialized successfully",
                 collection_name=self.repository.COLLECTION_NAME,
@@ -204,6 +231,8 @@ class VectorCollectionManager:
                         "payload_m": self.repository.HNSW_PAYLOAD_M,
                         "ef_construct": self.repository.HNSW_EF_CONSTRUCT,
                     },
+                    "storage": self.repository.storage_config.to_dict(),
+                    "tenant_layout": self.repository.tenant_config.to_dict(),
                     "required_indexes": [
                         "project_id",
                         "language",
@@ -222,6 +251,9 @@ class VectorCollectionManager:
                         "distance": info.get("distance"),
                         "points_count": info.get("points_count"),
                         "hnsw_config": info.get("hnsw_config"),
+                        "quantization": info.get("quantization"),
+                        "vectors_on_disk": info.get("vectors_on_disk"),
+                        "sharding_method": info.get("sharding_method"),
                     }
                 except Exception as e:
                     configuration_status["configuration_error"] = str(e)
@@ -255,8 +287,7 @@ class VectorCollectionManager:
     async def close(self) -> None:
         """Close the Qdrant client connection."""
         try:
-            # Qdrant client doesn't have explicit close method,
-            # but we can clean up resources here if needed
-            pass
+            await self.repository.stop_collection_info_refresher()
+            # Qdrant client doesn't have explicit close method
         except Exception:
             pass  # Ignore errors during cleanup
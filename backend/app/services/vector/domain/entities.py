@@ -8,7 +8,7 @@ Value objects represent immutable concepts without identity.
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, Optional, List
+from typing import Any, ClassVar, Dict, FrozenSet, Optional, List
 from uuid import UUID, uuid4
 import hashlib
 import re
@@ -30,6 +30,178 @@ class HealthStatus(str, Enum):
     UNHEALTHY = "unhealthy"
 
 
+class HybridFusion(str, Enum):
+    """Enumeration of server-side rank fusion strategies for hybrid search."""
+
+    RRF = "rrf"  # Reciprocal rank fusion (ignores weights)
+    WEIGHTED = "weighted"  # Weighted sum of dense and normalized sparse scores
+
+
+class ContentStorageMode(str, Enum):
+    """Enumeration of where full point content is stored."""
+
+    INLINE = "inline"  # Full content in the Qdrant payload
+    EXTERNAL = "external"  # Full content in an external store keyed by content_hash
+
+
+class QuantizationMode(str, Enum):
+    """Enumeration of supported vector quantization modes."""
+
+    NONE = "none"
+    SCALAR = "scalar"  # int8 scalar quantization (4x smaller)
+    BINARY = "binary"  # 1-bit binary quantization (32x smaller)
+
+
+@dataclass(frozen=True)
+class VectorStorageConfig:
+    """
+    Value object describing how vectors are stored and searched.
+
+    The default configuration keeps full float32 vectors in RAM without
+    quantization, matching the original collection layout.
+    """
+
+    quantization: QuantizationMode = QuantizationMode.NONE
+    quantization_always_ram: bool = True
+    vectors_on_disk: bool = False
+    rescore: bool = True
+    oversampling: float = 2.0
+    scalar_quantile: float = 0.99
+    content_storage: ContentStorageMode = ContentStorageMode.INLINE
+
+    def __post_init__(self) -> None:
+        """Validate quantization parameters."""
+        object.__setattr__(self, "quantization", QuantizationMode(self.quantization))
+        object.__setattr__(
+            self, "content_storage", ContentStorageMode(self.content_storage)
+        )
+
+        if not 1.0 <= self.oversampling <= 10.0:
+            raise ValueError(
+                f"Oversampling must be between 1.0 and 10.0, got: {self.oversampling}"
+            )
+
+        if not 0.5 <= self.scalar_quantile <= 1.0:
+            raise ValueError(
+                f"Scalar quantile must be between 0.5 and 1.0, got: {self.scalar_quantile}"
+            )
+
+    @property
+    def is_quantized(self) -> bool:
+        """Check if vectors are quantized."""
+        return self.quantization != QuantizationMode.NONE
+
+    @property
+    def content_external(self) -> bool:
+        """Check if full content is kept outside the Qdrant payload."""
+        return self.content_storage == ContentStorageMode.EXTERNAL
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary representation."""
+        return {
+            "quantization": self.quantization.value,
+            "quantization_always_ram": self.quantization_always_ram,
+            "vectors_on_disk": self.vectors_on_disk,
+            "rescore": self.rescore,
+            "oversampling": self.oversampling,
+            "scalar_quantile": self.scalar_quantile,
+            "content_storage": self.content_storage.value,
+        }
+
+
+@dataclass(frozen=True)
+class TenantLayoutConfig:
+    """
+    Value object describing how projects are laid out in the shared collection.
+
+    With tenant_index enabled the project_id payload index is marked as the
+    tenant key so Qdrant co-locates each project's points. With custom
+    sharding enabled, small projects share one shard key and very large
+    projects can be promoted to dedicated per-project shard keys. Every
+    process reloads that routing from Qdrant each routing_refresh_seconds.
+    """
+
+    tenant_index: bool = True
+    custom_sharding: bool = False
+    shared_shard_key: str = "shared"
+    dedicated_shard_threshold: int = 100_000
+    routing_refresh_seconds: float = 10.0
+
+    def __post_init__(self) -> None:
+        """Validate tenant layout parameters."""
+        if not re.match(r"^[a-z][a-z0-9_]{0,63}$", self.shared_shard_key):
+            raise ValueError(
+                f"Invalid shared shard key: {self.shared_shard_key}. "
+                "Must be lowercase alphanumeric with underscores."
+            )
+
+        if self.dedicated_shard_threshold < 1:
+            raise ValueError(
+                f"Dedicated shard threshold must be positive, got: {self.dedicated_shard_threshold}"
+            )
+
+        if self.routing_refresh_seconds <= 0:
+            raise ValueError(
+                f"Routing refresh interval must be positive, got: {self.routing_refresh_seconds}"
+            )
+
+    @staticmethod
+    def dedicated_shard_key(project_id: Any) -> str:
+        """Get the dedicated shard key for a project."""
+        return f"project_{project_id}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary representation."""
+        return {
+            "tenant_index": self.tenant_index,
+            "custom_sharding": self.custom_sharding,
+            "shared_shard_key": self.shared_shard_key,
+            "dedicated_shard_threshold": self.dedicated_shard_threshold,
+            "routing_refresh_seconds": self.routing_refresh_seconds,
+        }
+
+
+@dataclass(frozen=True)
+class ExactTierConfig:
+    """
+    Value object describing the in-process exact search tier.
+
+    Projects with at most max_points vectors are searched in memory with
+    exact brute-force cosine similarity instead of a Qdrant round trip.
+    Loaded projects are reloaded from Qdrant after ttl_seconds, which bounds
+    staleness from writes made by other processes. Up to max_large_projects
+    projects known to exceed max_points are remembered (LRU) so they are not
+    re-checked on every search.
+    """
+
+    max_points: int = 2000
+    max_projects: int = 256
+    ttl_seconds: float = 300.0
+    max_large_projects: int = 4096
+
+    def __post_init__(self) -> None:
+        """Validate tier limits."""
+        if self.max_points < 1:
+            raise ValueError(f"max_points must be positive, got: {self.max_points}")
+        if self.max_projects < 1:
+            raise ValueError(f"max_projects must be positive, got: {self.max_projects}")
+        if self.ttl_seconds <= 0:
+            raise ValueError(f"ttl_seconds must be positive, got: {self.ttl_seconds}")
+        if self.max_large_projects < 1:
+            raise ValueError(
+                f"max_large_projects must be positive, got: {self.max_large_projects}"
+            )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary representation."""
+        return {
+            "max_points": self.max_points,
+            "max_projects": self.max_projects,
+            "ttl_seconds": self.ttl_seconds,
+            "max_large_projects": self.max_large_projects,
+        }
+
+
 @dataclass(frozen=True)
 class ProjectId:
     """Value object representing a project identifier with validation."""
@@ -106,6 +278,112 @@ class VectorData:
         return self.value.copy()
 
 
+@dataclass(frozen=True)
+class SparseVectorData:
+    """Value object representing sparse term weights (index -> weight)."""
+
+    indices: List[int]
+    values: List[float]
+
+    def __post_init__(self) -> None:
+        """Validate sparse vector structure."""
+        if len(self.indices) != len(self.values):
+            raise ValueError(
+                f"Sparse vector indices and values differ in length: "
+                f"{len(self.indices)} != {len(self.values)}"
+            )
+
+        if len(set(self.indices)) != len(self.indices):
+            raise ValueError("Sparse vector indices must be unique")
+
+        if any(index < 0 or index > 0xFFFFFFFF for index in self.indices):
+            raise ValueError("Sparse vector indices must be unsigned 32-bit integers")
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    @property
+    def is_empty(self) -> bool:
+        """Check if the sparse vector has no terms."""
+        return not self.indices
+
+
+CONTENT_PREVIEW_LENGTH = 200
+
+
+def make_content_preview(content: str) -> str:
+    """Build the short content preview stored in the payload and shown in listings."""
+    if len(content) > CONTENT_PREVIEW_LENGTH:
+        return content[:CONTENT_PREVIEW_LENGTH] + "..."
+    return content
+
+
+def _payload_content_preview(payload: Dict[str, Any]) -> Optional[str]:
+    """Stored preview of a payload, derived from content for older points."""
+    preview = payload.get("content_preview")
+    if preview is None and "content" in payload:
+        return make_content_preview(payload["content"])
+    return preview
+
+
+@dataclass(frozen=True)
+class PayloadProjection:
+    """
+    Value object selecting which payload fields a search returns.
+
+    Fields required for isolation checks and entity construction are always
+    returned. Full content is only loaded when include_content is set; in
+    external content mode it is then fetched from the content store in bulk.
+    """
+
+    REQUIRED_FIELDS: ClassVar[FrozenSet[str]] = frozenset(
+        {"project_id", "language", "type", "content_hash", "created_at", "updated_at"}
+    )
+    OPTIONAL_FIELDS: ClassVar[FrozenSet[str]] = frozenset(
+        {"title", "metadata", "importance", "content_preview"}
+    )
+
+    fields: FrozenSet[str] = OPTIONAL_FIELDS
+    include_content: bool = False
+
+    def __post_init__(self) -> None:
+        """Validate requested fields."""
+        object.__setattr__(self, "fields", frozenset(self.fields))
+        unknown = self.fields - self.OPTIONAL_FIELDS - self.REQUIRED_FIELDS
+        if unknown:
+            raise ValueError(
+                f"Unknown payload fields: {sorted(unknown)}. "
+                f"Allowed: {sorted(self.OPTIONAL_FIELDS | {'content'})}"
+            )
+
+    @classmethod
+    def full(cls) -> "PayloadProjection":
+        """Projection returning every field including full content."""
+        return cls(include_content=True)
+
+    @classmethod
+    def from_fields(cls, fields: Optional[List[str]]) -> "PayloadProjection":
+        """
+        Build a projection from an API field list.
+
+        None selects the summary projection (everything except full content);
+        "content" in the list requests full content.
+        """
+        if fields is None:
+            return cls()
+        requested = set(fields)
+        include_content = "content" in requested
+        requested.discard("content")
+        return cls(fields=frozenset(requested), include_content=include_content)
+
+    def qdrant_fields(self, content_inline: bool) -> List[str]:
+        """Payload keys to request from Qdrant."""
+        selected = set(self.REQUIRED_FIELDS | self.fields)
+        if self.include_content and content_inline:
+            selected.add("content")
+        return sorted(selected)
+
+
 @dataclass(frozen=True)
 class SearchContext:
     """Value object representing search context with mandatory fields."""
@@ -141,6 +419,9 @@ class VectorPoint:
     importance: float = 1.0
     created_at: datetime = field(default_factory=datetime.utcnow)
     updated_at: datetime = field(default_factory=datetime.utcnow)
+    # False for search results whose full content was not requested
+    content_loaded: bool = True
+    content_preview: Optional[str] = None
 
     def __post_init__(self) -> None:
         """Initialize derived values and validate invariants."""
@@ -190,20 +471,42 @@ class VectorPoint:
             updated_at=datetime.now(timezone.utc),
         )
 
-    def get_qdrant_payload(self) -> Dict[str, Any]:
-        """Convert to Qdrant payload format."""
-        return {
+    def with_content(self, content: str) -> "VectorPoint":
+        """Return a copy with lazily loaded full content attached."""
+        from dataclasses import replace
+
+        return replace(self, content=content, content_loaded=True)
+
+    def with_content_preview(self, content: str) -> "VectorPoint":
+        """Return a copy whose preview is derived from full content."""
+        from dataclasses import replace
+
+        return replace(self, content_preview=make_content_preview(content))
+
+    def get_qdrant_payload(self, include_content: bool = True) -> Dict[str, Any]:
+        """
+        Convert to Qdrant payload format.
+
+        Args:
+            include_content: Store full content in the payload (inline mode);
+                otherwise only the preview is stored and content lives in the
+                external content store under content_hash
+        """
+        payload = {
             "project_id": str(self.project_id),
             "language": str(self.language),
             "type": self.document_type.value,
             "content_hash": str(self.content_hash),
-            "content": self.content or "",
+            "content_preview": make_content_preview(self.content or ""),
             "title": self.title,
             "metadata": self.metadata,
             "importance": self.importance,
             "created_at": self.created_at.isoformat(),
             "updated_at": self.updated_at.isoformat(),
         }
+        if include_content:
+            payload["content"] = self.content or ""
+        return payload
 
     @classmethod
     def from_qdrant_point(
@@ -236,13 +539,20 @@ class VectorPoint:
             importance=payload.get("importance", 1.0),
             created_at=datetime.fromisoformat(payload["created_at"]),
             updated_at=datetime.fromisoformat(payload["updated_at"]),
+            content_loaded="content" in payload,
+            content_preview=_payload_content_preview(payload),
         )
 
     @classmethod
     def from_qdrant_search_result(
         cls, point_id: str, payload: Dict[str, Any]
     ) -> "VectorPoint":
-        """Create VectorPoint from Qdrant search result (without vector data)."""
+        """
+        Create VectorPoint from Qdrant search result (without vector data).
+
+        The payload may be projected: points without a "content" key are
+        marked as not loaded and keep only the stored preview.
+        """
         return cls(
             id=UUID(point_id),
             vector=None,  # No vector data in search results
@@ -252,10 +562,12 @@ class VectorPoint:
             language=LanguageCode(payload["language"]),
             document_type=DocumentType(payload["type"]),
             title=payload.get("title"),
-            metadata=payload.get("metadata", {}),
+            metadata=payload.get("metadata") or {},
             importance=payload.get("importance", 1.0),
             created_at=datetime.fromisoformat(payload["created_at"]),
             updated_at=datetime.fromisoformat(payload["updated_at"]),
+            content_loaded="content" in payload,
+            content_preview=_payload_content_preview(payload),
         )
 
 
@@ -280,14 +592,27 @@ class SearchResult:
         """Check if result is relevant based on score threshold."""
         return self.score >= 0.5  # Configurable threshold
 
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary representation."""
+    def to_dict(self, full_content: bool = False) -> Dict[str, Any]:
+        """
+        Convert to dictionary representation.
+
+        Args:
+            full_content: Return loaded content untruncated instead of the preview
+        """
+        if self.point.content_loaded:
+            content = (
+                self.point.content
+                if full_content
+                else make_content_preview(self.point.content)
+            )
+        else:
+            content = self.point.content_preview or ""
+
         return {
             "id": str(self.point.id),
             "title": self.point.title,
-            "content": self.point.content[:200] + "..."
-            if len(self.point.content) > 200
-            else self.point.content,
+            "content": content,
+            "content_hash": str(self.point.content_hash),
             "score": self.score,
             "rank": self.rank,
             "metadata": self.point.metadata,
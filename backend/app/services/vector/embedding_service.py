@@ -0,0 +1,442 @@
+"""
+Micro-batched embedding computation.
+
+Embedding backends are far more efficient per text when called with many
+texts at once, while callers (upserts, searches, queue tasks) arrive one by
+one from many projects. The service queues concurrent requests and flushes
+them to the backend as a micro-batch when either the size cap is reached or
+the oldest request has waited max_wait_ms. Identical content within a batch
+(same ContentHash) is embedded once and fanned back to every caller.
+
+Backends are pluggable: DeterministicEmbeddingBackend computes stable local
+vectors without a model (development and tests), HttpEmbeddingBackend calls
+an OpenAI-compatible embeddings API.
+"""
+
+import asyncio
+import hashlib
+import time
+import zlib
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
+from uuid import UUID
+
+import numpy as np
+import structlog
+from opentelemetry.metrics import get_meter
+
+from .domain.entities import ContentHash, VectorData
+from .sparse_encoder import BM25SparseEncoder
+
+logger = structlog.get_logger()
+
+EMBEDDING_DIMENSION = 1536
+
+meter = get_meter(__name__)
+embedding_batch_size_histogram = meter.create_histogram(
+    "embedding_batch_size",
+    description="Unique texts per embedding backend call",
+)
+embedding_queue_wait_histogram = meter.create_histogram(
+    "embedding_queue_wait_seconds",
+    description="Time embedding requests wait for their micro-batch",
+    unit="s",
+)
+embedding_deduplicated_counter = meter.create_counter(
+    "embedding_deduplicated_total",
+    description="Texts served from another request in the same micro-batch",
+)
+
+
+class EmbeddingBackend(ABC):
+    """Model backend computing dense embeddings for a batch of texts."""
+
+    @abstractmethod
+    async def embed(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed a batch of texts.
+
+        Args:
+            texts: Texts to embed (already deduplicated)
+
+        Returns:
+            One vector per text, in input order
+        """
+        pass
+
+
+class DeterministicEmbeddingBackend(EmbeddingBackend):
+    """
+    Local embedder producing stable vectors without a model.
+
+    Each token maps to a fixed pseudo-random unit vector (seeded by its CRC32)
+    and a text embeds as the normalized sum of its token vectors, so texts
+    sharing words are closer than unrelated ones. Text without tokens falls
+    back to a vector seeded by its SHA-256.
+    """
+
+    def __init__(self, dimension: int = EMBEDDING_DIMENSION):
+        self.dimension = dimension
+        self._tokenizer = BM25SparseEncoder(min_token_length=1)
+        self._token_vector = lru_cache(maxsize=65_536)(self._seeded_vector)
+
+    def _seeded_vector(self, seed: int) -> np.ndarray:
+        vector = np.random.default_rng(seed).standard_normal(self.dimension)
+        return vector / np.linalg.norm(vector)
+
+    def embed_text(self, text: str) -> List[float]:
+        """Embed a single text."""
+        tokens = self._tokenizer.tokenize(text)
+        if tokens:
+            vector = np.sum(
+                [self._token_vector(zlib.crc32(t.encode("utf-8"))) for t in tokens],
+                axis=0,
+            )
+        else:
+            digest = hashlib.sha256(text.encode("utf-8")).digest()
+            vector = self._seeded_vector(int.from_bytes(digest[:8], "little"))
+        norm = np.linalg.norm(vector)
+        return (vector / norm if norm else vector).tolist()
+
+    async def embed(self, texts: List[str]) -> List[List[float]]:
+        return [self.embed_text(text) for text in texts]
+
+
+class HttpEmbeddingBackend(EmbeddingBackend):
+    """Backend for OpenAI-compatible embeddings APIs."""
+
+    def __init__(
+        self,
+        url: str,
+        model: str,
+        api_key: Optional[str] = None,
+        timeout: float = 30.0,
+    ):
+        """
+        Initialize HTTP embedding backend.
+
+        Args:
+            url: Embeddings endpoint URL
+            model: Model name sent with every request
+            api_key: Bearer token (optional for self-hosted endpoints)
+            timeout: Request timeout in seconds
+        """
+        import httpx
+
+        headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
+        self.url = url
+        self.model = model
+        self._client = httpx.AsyncClient(headers=headers, timeout=timeout)
+
+    async def embed(self, texts: List[str]) -> List[List[float]]:
+        try:
+            response = await self._client.post(
+                self.url, json={"model": self.model, "input": texts}
+            )
+            response.raise_for_status()
+            data = response.json()["data"]
+        except Exception as e:
+            raise RuntimeError(f"Embedding API request failed: {e}") from e
+        return [item["embedding"] for item in sorted(data, key=lambda d: d["index"])]
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+
+class _BucketHistogram:
+    """Fixed-bucket histogram kept in process for stats endpoints and tests."""
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = list(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def record(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+
+    def to_dict(self) -> Dict[str, Any]:
+        labels = [f"<={bound:g}" for bound in self.bounds] + [f">{self.bounds[-1]:g}"]
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else 0.0,
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+@dataclass
+class _PendingEmbedding:
+    """One text waiting for its micro-batch."""
+
+    project_id: str
+    content_hash: str
+    text: str
+    future: asyncio.Future
+    enqueued_at: float
+
+
+class MicroBatchEmbeddingService:
+    """
+    Coalesce concurrent embedding requests into bounded micro-batches.
+
+    A single dispatcher collects queued texts until max_batch_size texts are
+    collected or the oldest one has waited max_wait_ms, then hands the batch
+    to the backend. Up to max_concurrent_batches backend calls run at once;
+    while all are busy, requests keep queueing and the next batch grows.
+    """
+
+    def __init__(
+        self,
+        backend: EmbeddingBackend,
+        max_batch_size: int = 64,
+        max_wait_ms: float = 10.0,
+        max_concurrent_batches: int = 2,
+        clock: Callable[[], float] = time.perf_counter,
+    ):
+        """
+        Initialize micro-batching embedding service.
+
+        Args:
+            backend: Embedding model backend
+            max_batch_size: Maximum texts per backend call
+            max_wait_ms: Maximum time a request waits for its batch to fill
+            max_concurrent_batches: Maximum backend calls in flight
+            clock: Monotonic clock used for queue wait measurement
+
+        Raises:
+            ValueError: If any limit is out of range
+        """
+        if max_batch_size <= 0:
+            raise ValueError("max_batch_size must be positive")
+        if max_wait_ms < 0:
+            raise ValueError("max_wait_ms must be non-negative")
+        if max_concurrent_batches <= 0:
+            raise ValueError("max_concurrent_batches must be positive")
+
+        self.backend = backend
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.max_concurrent_batches = max_concurrent_batches
+        self._clock = clock
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._batch_slots: Optional[asyncio.Semaphore] = None
+        self._in_flight: Set[asyncio.Task] = set()
+        self._closed = False
+
+        self._batch_sizes = _BucketHistogram([1, 2, 4, 8, 16, 32, 64, 128, 256])
+        self._queue_waits = _BucketHistogram(
+            [0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0]
+        )
+        self._requests = 0
+        self._batches = 0
+        self._texts_embedded = 0
+        self._deduplicated = 0
+        self._failures = 0
+
+    def _ensure_started(self) -> asyncio.Queue:
+        if self._dispatcher is None or self._dispatcher.done():
+            self._queue = asyncio.Queue()
+            self._batch_slots = asyncio.Semaphore(self.max_concurrent_batches)
+            self._dispatcher = asyncio.create_task(self._dispatch_loop())
+        return self._queue
+
+    async def embed(self, project_id: UUID, texts: List[str]) -> List[VectorData]:
+        """
+        Embed texts, sharing backend calls with concurrent requests.
+
+        Args:
+            project_id: Project the texts belong to (attribution)
+            texts: Texts to embed
+
+        Returns:
+            One vector per text, in input order
+
+        Raises:
+            ValueError: If project_id is missing or the service is closed
+            RuntimeError: If the backend fails for the batch
+        """
+        if not project_id:
+            raise ValueError("project_id is required for embedding computation")
+        if self._closed:
+            raise ValueError("Embedding service is closed")
+        if not texts:
+            return []
+
+        queue = self._ensure_started()
+        loop = asyncio.get_running_loop()
+        now = self._clock()
+        pending = [
+            _PendingEmbedding(
+                project_id=str(project_id),
+                content_hash=ContentHash.from_content(text).value,
+                text=text,
+                future=loop.create_future(),
+                enqueued_at=now,
+            )
+            for text in texts
+        ]
+        self._requests += 1
+        for item in pending:
+            queue.put_nowait(item)
+
+        return list(await asyncio.gather(*(item.future for item in pending)))
+
+    async def embed_one(self, project_id: UUID, text: str) -> VectorData:
+        """Embed a single text (see embed)."""
+        (vector,) = await self.embed(project_id, [text])
+        return vector
+
+    async def _collect_batch(
+        self, queue: asyncio.Queue
+    ) -> Tuple[List[_PendingEmbedding], bool]:
+        """Collect one batch; returns the batch and whether close was requested."""
+        first = await queue.get()
+        if first is None:
+            return [], True
+
+        batch = [first]
+        deadline = first.enqueued_at + self.max_wait
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - self._clock()
+            try:
+                if timeout > 0:
+                    item = await asyncio.wait_for(queue.get(), timeout)
+                else:
+                    # Deadline passed: take what is already queued, never wait
+                    item = queue.get_nowait()
+            except (asyncio.TimeoutError, asyncio.QueueEmpty):
+                break
+            if item is None:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    async def _dispatch_loop(self) -> None:
+        queue = self._queue
+        while True:
+            batch, closing = await self._collect_batch(queue)
+            if batch:
+                await self._batch_slots.acquire()
+                task = asyncio.create_task(self._run_batch(batch))
+                self._in_flight.add(task)
+                task.add_done_callback(self._batch_done)
+            if closing:
+                return
+
+    def _batch_done(self, task: asyncio.Task) -> None:
+        self._in_flight.discard(task)
+        self._batch_slots.release()
+
+    async def _run_batch(self, batch: List[_PendingEmbedding]) -> None:
+        """Embed one micro-batch and resolve every caller's future."""
+        # Callers that were cancelled while queued are skipped
+        batch = [item for item in batch if not item.future.done()]
+        if not batch:
+            return
+
+        started = self._clock()
+        unique: Dict[str, str] = {}
+        for item in batch:
+            unique.setdefault(item.content_hash, item.text)
+            wait = started - item.enqueued_at
+            self._queue_waits.record(wait)
+            embedding_queue_wait_histogram.record(wait)
+
+        deduplicated = len(batch) - len(unique)
+        self._batches += 1
+        self._texts_embedded += len(unique)
+        self._deduplicated += deduplicated
+        self._batch_sizes.record(len(unique))
+        embedding_batch_size_histogram.record(len(unique))
+        if deduplicated:
+            embedding_deduplicated_counter.add(deduplicated)
+
+        try:
+            vectors = await self.backend.embed(list(unique.values()))
+            if len(vectors) != len(unique):
+                raise RuntimeError(
+                    f"Embedding backend returned {len(vectors)} vectors "
+                    f"for {len(unique)} texts"
+                )
+            by_hash = {
+                content_hash: VectorData(list(vector))
+                for content_hash, vector in zip(unique, vectors)
+            }
+        except Exception as e:
+            self._failures += 1
+            logger.error(
+                "Embedding batch failed",
+                batch_size=len(unique),
+                projects=len({item.project_id for item in batch}),
+                error=str(e),
+                operation="embed_batch",
+            )
+            error = RuntimeError(f"Failed to compute embeddings: {e}")
+            for item in batch:
+                if not item.future.done():
+                    item.future.set_exception(error)
+            return
+
+        for item in batch:
+            if not item.future.done():
+                item.future.set_result(by_hash[item.content_hash])
+
+    async def close(self) -> None:
+        """Stop accepting requests and finish everything already queued."""
+        self._closed = True
+        if self._dispatcher is not None and not self._dispatcher.done():
+            self._queue.put_nowait(None)
+            await self._dispatcher
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight, return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get batching statistics with batch-size and queue-wait histograms."""
+        return {
+            "requests": self._requests,
+            "batches": self._batches,
+            "texts_embedded": self._texts_embedded,
+            "texts_deduplicated": self._deduplicated,
+            "failed_batches": self._failures,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "batch_size": self._batch_sizes.to_dict(),
+            "queue_wait_seconds": self._queue_waits.to_dict(),
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000.0,
+        }
+
+
+def build_embedding_backend(settings: Any) -> EmbeddingBackend:
+    """Create the embedding backend selected by EMBEDDING_BACKEND."""
+    if settings.EMBEDDING_BACKEND == "http":
+        return HttpEmbeddingBackend(
+            url=settings.EMBEDDING_API_URL,
+            model=settings.EMBEDDING_MODEL,
+            api_key=settings.EMBEDDING_API_KEY,
+        )
+    return DeterministicEmbeddingBackend()
+
+
+_embedding_service: Optional[MicroBatchEmbeddingService] = None
+
+
+def get_embedding_service() -> MicroBatchEmbeddingService:
+    """Get the process-wide embedding service configured from settings."""
+    global _embedding_service
+    if _embedding_service is None:
+        from ...core.config import get_settings
+
+        settings = get_settings()
+        _embedding_service = MicroBatchEmbeddingService(
+            build_embedding_backend(settings),
+            max_batch_size=settings.EMBEDDING_MAX_BATCH_SIZE,
+            max_wait_ms=settings.EMBEDDING_MAX_WAIT_MS,
+        )
+    return _embedding_service
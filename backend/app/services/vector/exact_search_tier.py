@@ -0,0 +1,443 @@
+"""
+In-process exact search tier for small projects.
+
+Most projects hold a few hundred to a few thousand vectors. For those, a
+Qdrant round trip (filtered HNSW, payload serialization, HTTP) costs far more
+than an exact brute-force scan. The tier keeps each small project's vectors
+as one contiguous, L2-normalized float32 matrix and answers searches with a
+single matrix-vector product.
+
+Qdrant remains the source of truth: the repository writes to Qdrant first
+and then applies the same change to the tier. Projects are loaded lazily on
+first search, reloaded after the configured TTL (bounding staleness from
+other processes' writes) and evicted in LRU order. A project that grows past
+max_points is dropped from the tier and served by Qdrant from then on.
+
+Bookkeeping is bounded like the matrices: write generations are kept only
+for projects that are loaded or being loaded, and the projects known to be
+too large are an LRU of at most max_large_projects entries that expire
+after the TTL.
+
+Tolerance: Qdrant normalizes stored vectors and computes cosine similarity
+as a float32 dot product, exactly like the tier. Scores agree with Qdrant's
+exact search (SearchParams(exact=True)) within EXACT_TIER_SCORE_TOLERANCE
+(absolute); result order agrees except between results whose scores are
+within that tolerance of each other.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import structlog
+
+from .domain.entities import ExactTierConfig
+
+logger = structlog.get_logger()
+
+EXACT_TIER_SCORE_TOLERANCE = 1e-5
+
+
+def _normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """L2-normalize rows as Qdrant does for cosine distance (zero rows stay zero)."""
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0.0] = 1.0
+    return np.ascontiguousarray(vectors / norms, dtype=np.float32)
+
+
+class _ProjectMatrix:
+    """Vectors and filterable payload columns of one project."""
+
+    __slots__ = (
+        "ids",
+        "index",
+        "vectors",
+        "languages",
+        "types",
+        "importance",
+        "payloads",
+        "loaded_at",
+    )
+
+    def __init__(self, dimension: int, loaded_at: float):
+        self.ids: List[str] = []
+        self.index: Dict[str, int] = {}
+        self.vectors = np.empty((0, dimension), dtype=np.float32)
+        self.languages = np.empty(0, dtype=object)
+        self.types = np.empty(0, dtype=object)
+        self.importance = np.empty(0, dtype=np.float32)
+        self.payloads: List[Dict[str, Any]] = []
+        self.loaded_at = loaded_at
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def upsert(
+        self,
+        ids: Sequence[str],
+        vectors: np.ndarray,
+        payloads: Sequence[Dict[str, Any]],
+    ) -> None:
+        """Replace existing rows in place and append new ones."""
+        # Last write wins for IDs repeated within one batch
+        last_rows = {point_id: row for row, point_id in enumerate(ids)}
+        if len(last_rows) != len(ids):
+            rows = sorted(last_rows.values())
+            ids = [ids[row] for row in rows]
+            vectors = vectors[rows]
+            payloads = [payloads[row] for row in rows]
+
+        new_rows = []
+        for row, (point_id, payload) in enumerate(zip(ids, payloads)):
+            existing = self.index.get(point_id)
+            if existing is None:
+                new_rows.append(row)
+                continue
+            self.vectors[existing] = vectors[row]
+            self.languages[existing] = payload.get("language")
+            self.types[existing] = payload.get("type")
+            self.importance[existing] = payload.get("importance", 1.0)
+            self.payloads[existing] = payload
+
+        if not new_rows:
+            return
+
+        start = len(self.ids)
+        added_payloads = [payloads[row] for row in new_rows]
+        self.vectors = np.ascontiguousarray(
+            np.vstack([self.vectors, vectors[new_rows]]), dtype=np.float32
+        )
+        self.languages = np.concatenate(
+            [
+                self.languages,
+                np.array([p.get("language") for p in added_payloads], dtype=object),
+            ]
+        )
+        self.types = np.concatenate(
+            [
+                self.types,
+                np.array([p.get("type") for p in added_payloads], dtype=object),
+            ]
+        )
+        self.importance = np.concatenate(
+            [
+                self.importance,
+                np.array(
+                    [p.get("importance", 1.0) for p in added_payloads],
+                    dtype=np.float32,
+                ),
+            ]
+        )
+        for offset, row in enumerate(new_rows):
+            self.ids.append(ids[row])
+            self.index[ids[row]] = start + offset
+        self.payloads.extend(added_payloads)
+
+    def remove(self, ids: Sequence[str]) -> int:
+        """Remove rows by point ID, returning the number removed."""
+        rows = sorted({self.index[i] for i in ids if i in self.index})
+        if not rows:
+            return 0
+
+        keep = np.ones(len(self.ids), dtype=bool)
+        keep[rows] = False
+        self.vectors = np.ascontiguousarray(self.vectors[keep])
+        self.languages = self.languages[keep]
+        self.types = self.types[keep]
+        self.importance = self.importance[keep]
+        self.ids = [point_id for point_id, kept in zip(self.ids, keep) if kept]
+        self.payloads = [payload for payload, kept in zip(self.payloads, keep) if kept]
+        self.index = {point_id: row for row, point_id in enumerate(self.ids)}
+        return len(rows)
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.vectors.nbytes + self.importance.nbytes)
+
+
+class ExactSearchTier:
+    """
+    LRU cache of small projects searched with exact in-memory cosine similarity.
+
+    All methods are synchronous and never await, so they are atomic with
+    respect to other coroutines on the event loop.
+    """
+
+    def __init__(
+        self,
+        config: Optional[ExactTierConfig] = None,
+        dimension: int = 1536,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize exact search tier.
+
+        Args:
+            config: Tier limits (point threshold, project capacity, TTL)
+            dimension: Vector dimension
+            clock: Monotonic clock used for TTL expiry
+        """
+        self.config = config or ExactTierConfig()
+        self.dimension = dimension
+        self._clock = clock
+        self._projects: "OrderedDict[str, _ProjectMatrix]" = OrderedDict()
+        # Projects known to exceed max_points -> time they were checked (LRU)
+        self._large_projects: "OrderedDict[str, float]" = OrderedDict()
+        # Write generation of loaded projects and projects being loaded: a
+        # load that raced with a write is discarded
+        self._generations: Dict[str, int] = {}
+        # Project -> loads in flight (between begin_load and end_load)
+        self._loading: Dict[str, int] = {}
+        self._hits = 0
+        self._misses = 0
+        self._loads = 0
+        self._outgrown = 0
+
+    def _expired(self, timestamp: float) -> bool:
+        return self._clock() - timestamp > self.config.ttl_seconds
+
+    def is_loaded(self, project_id: Any) -> bool:
+        """Check if a project is loaded and fresh."""
+        return self._get(str(project_id)) is not None
+
+    def is_large(self, project_id: Any) -> bool:
+        """Check if a project is known to be too large for the tier."""
+        key = str(project_id)
+        checked_at = self._large_projects.get(key)
+        if checked_at is None:
+            return False
+        if self._expired(checked_at):
+            # Re-check size on next search; the project may have shrunk
+            del self._large_projects[key]
+            return False
+        return True
+
+    def generation(self, project_id: Any) -> int:
+        """Get the write generation of a project."""
+        return self._generations.get(str(project_id), 0)
+
+    def begin_load(self, project_id: Any) -> int:
+        """
+        Start loading a project; call end_load when done, however it ends.
+
+        Returns:
+            Write generation to pass to load()
+        """
+        key = str(project_id)
+        self._loading[key] = self._loading.get(key, 0) + 1
+        return self.generation(key)
+
+    def end_load(self, project_id: Any) -> None:
+        """Finish a load started with begin_load."""
+        key = str(project_id)
+        remaining = self._loading.get(key, 0) - 1
+        if remaining > 0:
+            self._loading[key] = remaining
+            return
+        self._loading.pop(key, None)
+        self._forget_generation(key)
+
+    def _bump_generation(self, key: str) -> None:
+        # Only loaded projects and loads in flight can observe a write
+        if key in self._projects or key in self._loading:
+            self._generations[key] = self._generations.get(key, 0) + 1
+
+    def _forget_generation(self, key: str) -> None:
+        if key not in self._projects and key not in self._loading:
+            self._generations.pop(key, None)
+
+    def _drop(self, key: str) -> None:
+        self._projects.pop(key, None)
+        self._forget_generation(key)
+
+    def mark_large(self, project_id: Any) -> None:
+        """Record that a project is served by Qdrant."""
+        key = str(project_id)
+        self._drop(key)
+        self._large_projects[key] = self._clock()
+        self._large_projects.move_to_end(key)
+        # Oldest markers first: drop the expired ones, then cap the rest
+        while self._large_projects:
+            oldest, checked_at = next(iter(self._large_projects.items()))
+            if len(
+                self._large_projects
+            ) <= self.config.max_large_projects and not self._expired(checked_at):
+                break
+            del self._large_projects[oldest]
+
+    def _get(self, key: str) -> Optional[_ProjectMatrix]:
+        matrix = self._projects.get(key)
+        if matrix is None:
+            return None
+        if self._expired(matrix.loaded_at):
+            self._drop(key)
+            return None
+        self._projects.move_to_end(key)
+        return matrix
+
+    def load(
+        self,
+        project_id: Any,
+        ids: Sequence[str],
+        vectors: Sequence[Sequence[float]],
+        payloads: Sequence[Dict[str, Any]],
+        generation: Optional[int] = None,
+    ) -> bool:
+        """
+        Load a project's full point set into the tier.
+
+        Args:
+            project_id: Project ID
+            ids: Point IDs
+            vectors: Dense vectors, one per point
+            payloads: Qdrant payloads, one per point
+            generation: Write generation observed before reading the points;
+                the load is discarded if a write happened since
+
+        Returns:
+            True if loaded, False if the project exceeds max_points or the
+            snapshot is stale
+        """
+        key = str(project_id)
+        if generation is not None and generation != self.generation(key):
+            return False
+        if len(ids) > self.config.max_points:
+            self.mark_large(key)
+            return False
+
+        matrix = _ProjectMatrix(self.dimension, self._clock())
+        if ids:
+            matrix.upsert(
+                list(ids),
+                _normalize_rows(np.asarray(vectors, dtype=np.float32)),
+                list(payloads),
+            )
+        self._projects[key] = matrix
+        self._projects.move_to_end(key)
+        self._large_projects.pop(key, None)
+        self._loads += 1
+
+        while len(self._projects) > self.config.max_projects:
+            evicted, _ = self._projects.popitem(last=False)
+            self._forget_generation(evicted)
+            logger.debug("Exact tier evicted project", project_id=evicted)
+        return True
+
+    def upsert(
+        self,
+        project_id: Any,
+        ids: Sequence[str],
+        vectors: Sequence[Sequence[float]],
+        payloads: Sequence[Dict[str, Any]],
+    ) -> None:
+        """Apply upserted points to a loaded project (no-op if not loaded)."""
+        key = str(project_id)
+        self._bump_generation(key)
+        matrix = self._get(key)
+        if matrix is None or not ids:
+            return
+
+        matrix.upsert(
+            list(ids),
+            _normalize_rows(np.asarray(vectors, dtype=np.float32)),
+            list(payloads),
+        )
+        if len(matrix) > self.config.max_points:
+            # Outgrown: serve from Qdrant from now on
+            self.mark_large(key)
+            self._outgrown += 1
+            logger.info(
+                "Project outgrew exact search tier",
+                project_id=key,
+                points=len(matrix),
+                max_points=self.config.max_points,
+            )
+
+    def remove(self, project_id: Any, ids: Sequence[str]) -> int:
+        """Remove points from a loaded project (no-op if not loaded)."""
+        self._bump_generation(str(project_id))
+        matrix = self._projects.get(str(project_id))
+        if matrix is None:
+            return 0
+        return matrix.remove([str(point_id) for point_id in ids])
+
+    def evict(self, project_id: Any) -> None:
+        """Drop a project so it is reloaded from Qdrant on next search."""
+        key = str(project_id)
+        self._bump_generation(key)
+        self._drop(key)
+        self._large_projects.pop(key, None)
+
+    def search(
+        self,
+        project_id: Any,
+        query_vector: Sequence[float],
+        language: str,
+        limit: int,
+        score_threshold: float = 0.0,
+        document_type: Optional[str] = None,
+        importance_min: Optional[float] = None,
+    ) -> Optional[List[Tuple[str, float, Dict[str, Any]]]]:
+        """
+        Exact cosine search within one project and language.
+
+        Args:
+            project_id: Project ID (MANDATORY isolation)
+            query_vector: Query vector
+            language: Language code (MANDATORY isolation)
+            limit: Maximum number of results
+            score_threshold: Minimum cosine similarity
+            document_type: Optional document type filter
+            importance_min: Optional minimum importance filter
+
+        Returns:
+            List of (point_id, score, payload) ordered by score descending,
+            or None if the project is not loaded
+        """
+        matrix = self._get(str(project_id))
+        if matrix is None:
+            self._misses += 1
+            return None
+        self._hits += 1
+
+        if not len(matrix):
+            return []
+
+        query = _normalize_rows(np.asarray([query_vector], dtype=np.float32))[0]
+        scores = matrix.vectors @ query
+
+        mask = matrix.languages == language
+        if document_type is not None:
+            mask &= matrix.types == document_type
+        if importance_min is not None:
+            mask &= matrix.importance >= importance_min
+        mask &= scores >= score_threshold
+
+        candidates = np.flatnonzero(mask)
+        if candidates.size > limit:
+            top = np.argpartition(-scores[candidates], limit - 1)[:limit]
+            candidates = candidates[top]
+        ordered = candidates[np.argsort(-scores[candidates], kind="stable")]
+
+        return [
+            (matrix.ids[row], float(scores[row]), matrix.payloads[row])
+            for row in ordered
+        ]
+
+    def stats(self) -> Dict[str, Any]:
+        """Get tier statistics."""
+        lookups = self._hits + self._misses
+        return {
+            "config": self.config.to_dict(),
+            "projects_loaded": len(self._projects),
+            "projects_large": len(self._large_projects),
+            "points_loaded": sum(len(m) for m in self._projects.values()),
+            "memory_bytes": sum(m.nbytes for m in self._projects.values()),
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate": self._hits / lookups if lookups else 0.0,
+            "loads": self._loads,
+            "projects_outgrown": self._outgrown,
+            "score_tolerance": EXACT_TIER_SCORE_TOLERANCE,
+        }
@@ -0,0 +1,998 @@
+"""
+Streaming export, import and zero-downtime reindex of vector points.
+
+Export scrolls a project's points page by page and writes them to a gzip
+compressed JSON Lines file, so memory stays bounded by one page regardless
+of project size. Dense vectors are stored as base64 little-endian float32
+(about a third of the size of a JSON float list). Import streams the file
+back in batches and keeps a bounded number of upserts in flight.
+
+Reindex builds a new versioned collection with the current storage settings,
+backfills it while the old collection keeps serving, catches up on points
+written during the backfill and then switches the collection alias
+atomically. Converting a collection created under the plain name into an
+alias cannot be done without downtime and must be requested explicitly. Every report includes throughput (points/s) and the peak RSS of
+the process.
+
+Usage:
+    python -m app.services.vector.migration export <project_id> <path>
+    python -m app.services.vector.migration import <path>
+    python -m app.services.vector.migration reindex [--drop-old] [--legacy-cutover]
+"""
+
+import asyncio
+import base64
+import gzip
+import json
+import os
+import resource
+import sys
+import time
+from datetime import datetime, timezone
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+from uuid import UUID
+
+import numpy as np
+import structlog
+from qdrant_client import models
+
+from .domain.entities import VectorStorageConfig
+from .repositories.qdrant_repository import QdrantVectorRepository
+
+logger = structlog.get_logger()
+
+EXPORT_FORMAT = "jeex-vectors"
+EXPORT_FORMAT_VERSION = 1
+
+# Re-embeds a page of records for a reindex that changes the vector dimension
+VectorTransform = Callable[[List[models.Record]], Awaitable[List[List[float]]]]
+
+
+def peak_rss_bytes() -> int:
+    """Get the peak resident set size of the current process in bytes."""
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes on Linux
+    return int(max_rss if sys.platform == "darwin" else max_rss * 1024)
+
+
+def encode_dense_vector(vector: List[float]) -> str:
+    """Encode a dense vector as base64 little-endian float32."""
+    return base64.b64encode(np.asarray(vector, dtype="<f4").tobytes()).decode("ascii")
+
+
+def decode_dense_vector(encoded: str) -> List[float]:
+    """Decode a base64 little-endian float32 vector."""
+    return np.frombuffer(base64.b64decode(encoded), dtype="<f4").tolist()
+
+
+def _throughput_report(points: int, duration: float) -> Dict[str, Any]:
+    return {
+        "duration_seconds": duration,
+        "points_per_second": points / duration if duration > 0 else 0.0,
+        "peak_rss_bytes": peak_rss_bytes(),
+    }
+
+
+class _BoundedUpserter:
+    """Run upsert batches concurrently with at most `concurrency` in flight."""
+
+    def __init__(
+        self,
+        upsert: Callable[[List[models.PointStruct]], Awaitable[Any]],
+        concurrency: int,
+    ):
+        self._upsert = upsert
+        self._concurrency = concurrency
+        self._pending: Set[asyncio.Task] = set()
+
+    async def submit(self, points: List[models.PointStruct]) -> None:
+        """Schedule a batch, waiting while the in-flight limit is reached."""
+        while len(self._pending) >= self._concurrency:
+            done, self._pending = await asyncio.wait(
+                self._pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            self._raise_failures(done)
+        self._pending.add(asyncio.create_task(self._upsert(points)))
+
+    async def drain(self) -> None:
+        """Wait for all scheduled batches and raise the first failure."""
+        if not self._pending:
+            return
+        done, self._pending = await asyncio.wait(self._pending)
+        self._raise_failures(done)
+
+    def _raise_failures(self, done: Set[asyncio.Task]) -> None:
+        for task in done:
+            error = task.exception()
+            if error is not None:
+                for pending in self._pending:
+                    pending.cancel()
+                raise error
+
+
+def _project_filter(
+    project_id: Optional[UUID] = None,
+    updated_since: Optional[datetime] = None,
+    updated_before: Optional[datetime] = None,
+) -> Optional[models.Filter]:
+    """Build a scroll filter for one project and/or an updated_at range."""
+    conditions: List[Any] = []
+    if project_id is not None:
+        conditions.append(
+            models.FieldCondition(
+                key="project_id", match=models.MatchValue(value=str(project_id))
+            )
+        )
+    if updated_since is not None:
+        conditions.append(
+            models.FieldCondition(
+                key="updated_at", range=models.DatetimeRange(gte=updated_since)
+            )
+        )
+    if updated_before is not None:
+        conditions.append(
+            models.FieldCondition(
+                key="updated_at", range=models.DatetimeRange(lt=updated_before)
+            )
+        )
+    return models.Filter(must=conditions) if conditions else None
+
+
+def _updated_at(payload: Optional[Dict[str, Any]]) -> Optional[datetime]:
+    """Parse a point's updated_at payload field (naive values are UTC)."""
+    value = (payload or {}).get("updated_at")
+    if not value:
+        return None
+    updated_at = datetime.fromisoformat(value)
+    if updated_at.tzinfo is None:
+        updated_at = updated_at.replace(tzinfo=timezone.utc)
+    return updated_at
+
+
+class VectorProjectExporter:
+    """Stream one project's points to a compact local file."""
+
+    SCROLL_BATCH_SIZE = 256
+
+    def __init__(
+        self, repository: QdrantVectorRepository, batch_size: Optional[int] = None
+    ):
+        """
+        Initialize project exporter.
+
+        Args:
+            repository: Repository to export from
+            batch_size: Points per scroll page (bounds memory use)
+
+        Raises:
+            ValueError: If batch_size is invalid
+        """
+        batch_size = batch_size or self.SCROLL_BATCH_SIZE
+        if batch_size <= 0:
+            raise ValueError("batch_size must be positive")
+        self.repository = repository
+        self.batch_size = batch_size
+
+    def _record_line(
+        self, record: models.Record, contents: Dict[str, str]
+    ) -> Dict[str, Any]:
+        repository = self.repository
+        line: Dict[str, Any] = {
+            "id": str(record.id),
+            "payload": record.payload,
+            "vector": encode_dense_vector(
+                repository._extract_dense_vector(record.vector)
+            ),
+        }
+        if isinstance(record.vector, dict):
+            sparse = record.vector.get(repository.SPARSE_VECTOR_NAME)
+            if sparse is not None:
+                line["sparse"] = {"indices": sparse.indices, "values": sparse.values}
+        content = contents.get(str(record.payload.get("content_hash")))
+        if content is not None:
+            line["content"] = content
+        return line
+
+    async def export_project(self, project_id: UUID, path: str) -> Dict[str, Any]:
+        """
+        Export all points of a project.
+
+        The file is written to a temporary path and renamed on success, so a
+        failed export never leaves a truncated file behind.
+
+        Args:
+            project_id: Project to export (MANDATORY isolation)
+            path: Destination file (gzip compressed JSON Lines)
+
+        Returns:
+            Export report with point count, file size, throughput and peak RSS
+
+        Raises:
+            ValueError: If project_id is missing
+            RuntimeError: If the export fails
+        """
+        if not project_id:
+            raise ValueError("project_id is required for export")
+
+        repository = self.repository
+        external = repository.storage_config.content_external
+        scroll_filter = _project_filter(project_id)
+        start_time = time.perf_counter()
+        exported = 0
+        tmp_path = f"{path}.tmp"
+
+        try:
+            with gzip.open(tmp_path, "wt", encoding="utf-8") as output:
+                header = {
+                    "format": EXPORT_FORMAT,
+                    "version": EXPORT_FORMAT_VERSION,
+                    "project_id": str(project_id),
+                    "collection": repository.COLLECTION_NAME,
+                    "vector_size": repository.VECTOR_SIZE,
+                    "exported_at": datetime.utcnow().isoformat(),
+                }
+                output.write(json.dumps(header) + "\n")
+
+                offset = None
+                while True:
+                    records, offset = await asyncio.to_thread(
+                        repository.client.scroll,
+                        collection_name=repository.COLLECTION_NAME,
+                        scroll_filter=scroll_filter,
+                        limit=self.batch_size,
+                        offset=offset,
+                        with_payload=True,
+                        with_vectors=True,
+                        shard_key_selector=repository._read_shard_key(project_id),
+                    )
+                    contents: Dict[str, str] = {}
+                    if records and external:
+                        # Keep the file self-contained: include external content
+                        contents = await repository.content_store.get_many(
+                            project_id,
+                            [
+                                str(record.payload.get("content_hash"))
+                                for record in records
+                            ],
+                        )
+                    for record in records:
+                        output.write(
+                            json.dumps(self._record_line(record, contents)) + "\n"
+                        )
+                    exported += len(records)
+                    if offset is None:
+                        break
+
+            os.replace(tmp_path, path)
+
+        except Exception as e:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            logger.error(
+                "Vector export failed",
+                project_id=str(project_id),
+                error=str(e),
+                operation="export_project",
+            )
+            raise RuntimeError(f"Failed to export project {project_id}: {e}") from e
+
+        report = {
+            "project_id": str(project_id),
+            "path": path,
+            "points": exported,
+            "file_bytes": os.path.getsize(path),
+            **_throughput_report(exported, time.perf_counter() - start_time),
+        }
+        logger.info("Vector export completed", **report)
+        return report
+
+
+class VectorProjectImporter:
+    """Stream an exported project file back into the collection."""
+
+    BATCH_SIZE = 256
+    CONCURRENCY = 4
+
+    def __init__(
+        self,
+        repository: QdrantVectorRepository,
+        batch_size: Optional[int] = None,
+        concurrency: Optional[int] = None,
+    ):
+        """
+        Initialize project importer.
+
+        Args:
+            repository: Repository to import into
+            batch_size: Points per upsert batch
+            concurrency: Maximum upsert batches in flight
+
+        Raises:
+            ValueError: If batch_size or concurrency is invalid
+        """
+        batch_size = batch_size or self.BATCH_SIZE
+        concurrency = concurrency or self.CONCURRENCY
+        if batch_size <= 0:
+            raise ValueError("batch_size must be positive")
+        if concurrency <= 0:
+            raise ValueError("concurrency must be positive")
+        self.repository = repository
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+
+    def _read_header(self, line: str) -> Dict[str, Any]:
+        header = json.loads(line) if line else {}
+        if header.get("format") != EXPORT_FORMAT:
+            raise ValueError("Not a vector export file")
+        if header.get("version") != EXPORT_FORMAT_VERSION:
+            raise ValueError(f"Unsupported export version: {header.get('version')}")
+        if header.get("vector_size") != self.repository.VECTOR_SIZE:
+            raise ValueError(
+                f"Export vector size {header.get('vector_size')} does not match "
+                f"collection vector size {self.repository.VECTOR_SIZE}"
+            )
+        return header
+
+    def _iter_batches(self, lines: Iterator[str]) -> Iterator[List[Dict[str, Any]]]:
+        batch: List[Dict[str, Any]] = []
+        for line in lines:
+            if not line.strip():
+                continue
+            batch.append(json.loads(line))
+            if len(batch) >= self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def _build_points(
+        self, project_id: str, records: List[Dict[str, Any]]
+    ) -> Tuple[List[models.PointStruct], Dict[str, str]]:
+        """Convert export records to points and collect external content."""
+        repository = self.repository
+        external = repository.storage_config.content_external
+        points: List[models.PointStruct] = []
+        contents: Dict[str, str] = {}
+
+        for record in records:
+            payload = dict(record["payload"])
+            # SECURITY: every record must belong to the exported project
+            if payload.get("project_id") != project_id:
+                raise ValueError(
+                    f"Point {record['id']} belongs to project "
+                    f"{payload.get('project_id')}, but the export is for project "
+                    f"{project_id}. Cross-project import is forbidden."
+                )
+
+            inline_content = payload.pop("content", None)
+            content = record.get("content", inline_content)
+            if content is not None:
+                if external:
+                    contents[str(payload["content_hash"])] = content
+                else:
+                    payload["content"] = content
+
+            vectors: Dict[str, Any] = {
+                repository.DENSE_VECTOR_NAME: decode_dense_vector(record["vector"])
+            }
+            sparse = record.get("sparse")
+            if sparse is None and content is not None:
+                encoded = repository.sparse_encoder.encode_document(content)
+                if not encoded.is_empty:
+                    sparse = {"indices": encoded.indices, "values": encoded.values}
+            if sparse is not None:
+                vectors[repository.SPARSE_VECTOR_NAME] = models.SparseVector(
+                    indices=sparse["indices"], values=sparse["values"]
+                )
+
+            points.append(
+                models.PointStruct(id=record["id"], vector=vectors, payload=payload)
+            )
+        return points, contents
+
+    async def import_file(self, path: str) -> Dict[str, Any]:
+        """
+        Import an exported project file.
+
+        Points keep their IDs, so importing the same file twice is idempotent.
+
+        Args:
+            path: Export file produced by VectorProjectExporter
+
+        Returns:
+            Import report with point count, throughput and peak RSS
+
+        Raises:
+            ValueError: If the file is not a compatible export or contains
+                points of another project
+            RuntimeError: If the import fails
+        """
+        repository = self.repository
+        start_time = time.perf_counter()
+        imported = 0
+        project_id: Optional[str] = None
+
+        async def upsert(points: List[models.PointStruct]) -> None:
+            for shard_key in repository._write_shard_keys(project_id):
+                await repository.client.upsert(
+                    collection_name=repository.COLLECTION_NAME,
+                    points=points,
+                    shard_key_selector=shard_key,
+                )
+
+        upserter = _BoundedUpserter(upsert, self.concurrency)
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as source:
+                header = self._read_header(source.readline())
+                project_id = header["project_id"]
+
+                for records in self._iter_batches(source):
+                    points, contents = self._build_points(project_id, records)
+                    # External content must be stored before points become searchable
+                    if contents:
+                        await repository.content_store.put_many(
+                            UUID(project_id), contents
+                        )
+                    await upserter.submit(points)
+                    imported += len(points)
+            await upserter.drain()
+
+        except ValueError:
+            await upserter.drain()
+            raise
+        except Exception as e:
+            logger.error(
+                "Vector import failed",
+                path=path,
+                project_id=project_id,
+                error=str(e),
+                operation="import_file",
+            )
+            raise RuntimeError(f"Failed to import {path}: {e}") from e
+        finally:
+            if repository.exact_tier is not None and project_id is not None:
+                repository.exact_tier.evict(project_id)
+
+        report = {
+            "project_id": project_id,
+            "path": path,
+            "points": imported,
+            **_throughput_report(imported, time.perf_counter() - start_time),
+        }
+        logger.info("Vector import completed", **report)
+        return report
+
+
+class LegacyCutoverError(RuntimeError):
+    """The plain collection was deleted but the alias replacing it was not created."""
+
+
+class CollectionReindexer:
+    """
+    Zero-downtime rebuild of the vector collection behind an alias.
+
+    The repository addresses the collection by COLLECTION_NAME, which after
+    the first reindex is an alias of a versioned physical collection
+    (e.g. jeex_memory_20251030120000). A reindex runs in four steps:
+    1. Create the new versioned collection with the target storage settings.
+    2. Backfill it from the current collection with bounded concurrent
+       upserts while the current collection keeps serving reads and writes.
+    3. Copy again any points updated since the reindex started, and delete
+       from the new collection every copied point that has since been
+       deleted from the current one.
+    4. Switch the alias atomically, then catch up once more on writes and
+       deletes that landed on the old collection from the start of step 3
+       to the switch. After the switch, new writes go to the new collection,
+       so this catch-up never replaces a point whose copy in the new
+       collection is as new or newer (by updated_at).
+
+    The first reindex of a collection created under the plain name has to
+    convert that name into an alias. A collection and an alias cannot share
+    a name, so the collection is deleted before the alias is created, and
+    the name does not resolve in between. This one-time conversion runs
+    only with legacy_cutover=True and needs a maintenance window: stop
+    writers first, because writes after the final catch-up are lost.
+    """
+
+    BATCH_SIZE = 256
+    CONCURRENCY = 4
+
+    def __init__(
+        self,
+        repository: QdrantVectorRepository,
+        batch_size: Optional[int] = None,
+        concurrency: Optional[int] = None,
+    ):
+        """
+        Initialize collection reindexer.
+
+        Args:
+            repository: Repository serving the collection (alias) to rebuild
+            batch_size: Points per scroll/upsert batch
+            concurrency: Maximum upsert batches in flight
+
+        Raises:
+            ValueError: If batch_size or concurrency is invalid
+        """
+        batch_size = batch_size or self.BATCH_SIZE
+        concurrency = concurrency or self.CONCURRENCY
+        if batch_size <= 0:
+            raise ValueError("batch_size must be positive")
+        if concurrency <= 0:
+            raise ValueError("concurrency must be positive")
+        self.repository = repository
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+
+    async def resolve_alias(self) -> Optional[str]:
+        """Get the physical collection behind the alias, or None if not aliased."""
+        aliases = await asyncio.to_thread(self.repository.client.get_aliases)
+        for alias in aliases.aliases:
+            if alias.alias_name == self.repository.COLLECTION_NAME:
+                return alias.collection_name
+        return None
+
+    def _shard_keys(self) -> List[Optional[str]]:
+        tenant_config = self.repository.tenant_config
+        if not tenant_config.custom_sharding:
+            return [None]
+        return [tenant_config.shared_shard_key] + [
+            tenant_config.dedicated_shard_key(project_id)
+            for project_id in sorted(self.repository.dedicated_projects)
+        ]
+
+    async def _create_target(
+        self,
+        target: str,
+        storage_config: VectorStorageConfig,
+        vector_size: int,
+    ) -> None:
+        """Create the versioned collection with the repository's schema."""
+        target_repository = QdrantVectorRepository(
+            self.repository.client,
+            storage_config=storage_config,
+            tenant_config=self.repository.tenant_config,
+            content_store=self.repository.content_store,
+        )
+        target_repository.COLLECTION_NAME = target
+        target_repository.VECTOR_SIZE = vector_size
+        if await target_repository.collection_exists():
+            raise ValueError(f"Target collection {target} already exists")
+        await target_repository.initialize_collection()
+
+        # initialize_collection only creates the shared shard key
+        for shard_key in self._shard_keys()[1:]:
+            await asyncio.to_thread(
+                self.repository.client.create_shard_key,
+                collection_name=target,
+                shard_key=shard_key,
+            )
+
+    async def _copy_points(
+        self,
+        source: str,
+        target: str,
+        updated_since: Optional[datetime] = None,
+        vector_transform: Optional[VectorTransform] = None,
+        keep_newer: bool = False,
+    ) -> int:
+        """
+        Copy points from source to target, shard key by shard key.
+
+        keep_newer skips source points whose copy in target has the same or
+        a later updated_at, so a catch-up after the alias switch never
+        overwrites writes that already went to target.
+        """
+        client = self.repository.client
+        scroll_filter = _project_filter(updated_since=updated_since)
+        copied = 0
+
+        for shard_key in self._shard_keys():
+
+            async def upsert(points: List[models.PointStruct], key=shard_key) -> None:
+                await client.upsert(
+                    collection_name=target, points=points, shard_key_selector=key
+                )
+
+            upserter = _BoundedUpserter(upsert, self.concurrency)
+            offset = None
+            while True:
+                records, offset = await asyncio.to_thread(
+                    client.scroll,
+                    collection_name=source,
+                    scroll_filter=scroll_filter,
+                    limit=self.batch_size,
+                    offset=offset,
+                    with_payload=True,
+                    with_vectors=True,
+                    shard_key_selector=shard_key,
+                )
+                if records and keep_newer:
+                    records = await self._newer_than_target(target, records, shard_key)
+                if records:
+                    vectors: List[Any] = [record.vector for record in records]
+                    if vector_transform is not None:
+                        dense = await vector_transform(records)
+                        vectors = [
+                            {**vector, self.repository.DENSE_VECTOR_NAME: embedding}
+                            if isinstance(vector, dict)
+                            else embedding
+                            for vector, embedding in zip(vectors, dense)
+                        ]
+                    await upserter.submit(
+                        [
+                            models.PointStruct(
+                                id=record.id, vector=vector, payload=record.payload
+                            )
+                            for record, vector in zip(records, vectors)
+                        ]
+                    )
+                    copied += len(records)
+                if offset is None:
+                    break
+            await upserter.drain()
+
+        return copied
+
+    async def _newer_than_target(
+        self,
+        target: str,
+        records: List[models.Record],
+        shard_key: Optional[str],
+    ) -> List[models.Record]:
+        """Keep the records that target lacks or holds an older version of."""
+        existing = await self.repository.client.retrieve(
+            collection_name=target,
+            ids=[record.id for record in records],
+            with_payload=["updated_at"],
+            with_vectors=False,
+            shard_key_selector=shard_key,
+        )
+        target_updated = {
+            str(record.id): _updated_at(record.payload) for record in existing
+        }
+        newer = []
+        for record in records:
+            if str(record.id) not in target_updated:
+                newer.append(record)
+                continue
+            source_at = _updated_at(record.payload)
+            target_at = target_updated[str(record.id)]
+            if source_at is not None and (target_at is None or source_at > target_at):
+                newer.append(record)
+        return newer
+
+    async def _remove_deleted_points(
+        self, source: str, target: str, updated_before: Optional[datetime] = None
+    ) -> int:
+        """
+        Delete points from target that no longer exist in source.
+
+        Scrolls target ids page by page and looks each page up in source, so
+        memory stays bounded by one page. updated_before limits the pass to
+        points written before the alias switch; later points only exist in
+        target and must be kept.
+        """
+        client = self.repository.client
+        scroll_filter = _project_filter(updated_before=updated_before)
+        removed = 0
+
+        for shard_key in self._shard_keys():
+            offset = None
+            while True:
+                records, offset = await asyncio.to_thread(
+                    client.scroll,
+                    collection_name=target,
+                    scroll_filter=scroll_filter,
+                    limit=self.batch_size,
+                    offset=offset,
+                    with_payload=False,
+                    with_vectors=False,
+                    shard_key_selector=shard_key,
+                )
+                if records:
+                    existing = await client.retrieve(
+                        collection_name=source,
+                        ids=[record.id for record in records],
+                        with_payload=False,
+                        with_vectors=False,
+                        shard_key_selector=shard_key,
+                    )
+                    existing_ids = {str(record.id) for record in existing}
+                    deleted = [
+                        record.id
+                        for record in records
+                        if str(record.id) not in existing_ids
+                    ]
+                    if deleted:
+                        await client.delete(
+                            collection_name=target,
+                            points_selector=models.PointIdsList(points=deleted),
+                            shard_key_selector=shard_key,
+                        )
+                        removed += len(deleted)
+                if offset is None:
+                    break
+
+        return removed
+
+    async def _switch_alias(self, source: str, target: str, legacy: bool) -> None:
+        """Point the alias, and the tenant routing aliases, at target atomically."""
+        alias = self.repository.COLLECTION_NAME
+        operations: List[Any] = []
+        # Routing aliases would disappear with the source collection
+        routing_prefix = self.repository.routing_alias("")
+        aliases = await asyncio.to_thread(self.repository.client.get_aliases)
+        for routing in aliases.aliases:
+            if routing.collection_name != source or not routing.alias_name.startswith(
+                routing_prefix
+            ):
+                continue
+            if not legacy:
+                operations.append(
+                    models.DeleteAliasOperation(
+                        delete_alias=models.DeleteAlias(alias_name=routing.alias_name)
+                    )
+                )
+            operations.append(
+                models.CreateAliasOperation(
+                    create_alias=models.CreateAlias(
+                        collection_name=target, alias_name=routing.alias_name
+                    )
+                )
+            )
+        if not legacy:
+            operations.append(
+                models.DeleteAliasOperation(
+                    delete_alias=models.DeleteAlias(alias_name=alias)
+                )
+            )
+        operations.append(
+            models.CreateAliasOperation(
+                create_alias=models.CreateAlias(
+                    collection_name=target, alias_name=alias
+                )
+            )
+        )
+        if not legacy:
+            await asyncio.to_thread(
+                self.repository.client.update_collection_aliases,
+                change_aliases_operations=operations,
+            )
+            return
+
+        # A collection and an alias cannot share a name: one-time conversion
+        await self.repository.client.delete_collection(collection_name=alias)
+        try:
+            await asyncio.to_thread(
+                self.repository.client.update_collection_aliases,
+                change_aliases_operations=operations,
+            )
+        except Exception as e:
+            raise LegacyCutoverError(
+                f"Collection {alias} was deleted but the alias could not be "
+                f"created; its points are in {target}. Create the alias "
+                f"{alias} -> {target} to restore service: {e}"
+            ) from e
+
+    async def reindex(
+        self,
+        storage_config: Optional[VectorStorageConfig] = None,
+        drop_old: bool = False,
+        vector_size: Optional[int] = None,
+        vector_transform: Optional[VectorTransform] = None,
+        legacy_cutover: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Rebuild the collection and switch the alias without downtime.
+
+        Args:
+            storage_config: Storage settings of the new collection
+                (defaults to the repository's settings)
+            drop_old: Delete the previous versioned collection after the switch
+            vector_size: Dense vector dimension of the new collection
+                (requires vector_transform when it changes)
+            vector_transform: Re-embeds each copied page of records
+            legacy_cutover: Convert a collection created under the plain
+                name into an alias (writers must be stopped; see class)
+
+        Returns:
+            Reindex report with source/target collections, copied points,
+            throughput and peak RSS
+
+        Raises:
+            ValueError: If the vector size changes without a vector_transform,
+                or the collection is not aliased yet and legacy_cutover is
+                not set
+            LegacyCutoverError: If the legacy collection was deleted but the
+                alias could not be created (the message names the collection
+                holding the points)
+            RuntimeError: If the reindex fails otherwise (the alias is left
+                unchanged)
+        """
+        repository = self.repository
+        storage_config = storage_config or repository.storage_config
+        vector_size = vector_size or repository.VECTOR_SIZE
+        if vector_size != repository.VECTOR_SIZE and vector_transform is None:
+            raise ValueError("Changing the vector size requires a vector_transform")
+
+        alias = repository.COLLECTION_NAME
+        started_at = datetime.utcnow()
+        start_time = time.perf_counter()
+        target = f"{alias}_{started_at:%Y%m%d%H%M%S}"
+        switched = False
+
+        try:
+            source = await self.resolve_alias()
+            legacy = source is None
+            source = source or alias
+            if legacy and not legacy_cutover:
+                raise ValueError(
+                    f"Collection {alias} is not an alias yet; converting it "
+                    "requires legacy_cutover=True and stopped writers"
+                )
+
+            logger.info(
+                "Starting collection reindex",
+                alias=alias,
+                source_collection=source,
+                target_collection=target,
+                operation="reindex",
+            )
+
+            await self._create_target(target, storage_config, vector_size)
+            copied = await self._copy_points(
+                source, target, vector_transform=vector_transform
+            )
+            catch_up_started_at = datetime.utcnow()
+            caught_up = await self._copy_points(
+                source, target, started_at, vector_transform
+            )
+            removed = await self._remove_deleted_points(source, target)
+
+            switch_started_at = datetime.utcnow()
+            if legacy:
+                # The source is deleted by the switch: last catch-up goes first
+                caught_up += await self._copy_points(
+                    source, target, switch_started_at, vector_transform
+                )
+                removed += await self._remove_deleted_points(source, target)
+            await self._switch_alias(source, target, legacy)
+            switched = True
+            if not legacy:
+                # Overlaps the catch-up above, so writes that raced it are
+                # included; target versions written since the switch are kept
+                caught_up += await self._copy_points(
+                    source,
+                    target,
+                    catch_up_started_at,
+                    vector_transform,
+                    keep_newer=True,
+                )
+                removed += await self._remove_deleted_points(
+                    source, target, updated_before=switch_started_at
+                )
+                if drop_old:
+                    await repository.client.delete_collection(collection_name=source)
+
+        except Exception as e:
+            logger.error(
+                "Collection reindex failed",
+                alias=alias,
+                target_collection=target,
+                switched=switched,
+                error=str(e),
+                operation="reindex",
+            )
+            if isinstance(e, (ValueError, LegacyCutoverError)):
+                raise
+            raise RuntimeError(f"Failed to reindex collection {alias}: {e}") from e
+
+        repository.storage_config = storage_config
+        repository.VECTOR_SIZE = vector_size
+        repository.invalidate_collection_info()
+
+        duration = time.perf_counter() - start_time
+        report = {
+            "alias": alias,
+            "source_collection": source,
+            "target_collection": target,
+            "legacy_cutover": legacy,
+            "old_collection_dropped": legacy or drop_old,
+            "storage": storage_config.to_dict(),
+            "points_copied": copied,
+            "points_caught_up": caught_up,
+            "points_removed": removed,
+            **_throughput_report(copied, duration),
+        }
+        logger.info("Collection reindex completed", **report)
+        return report
+
+
+async def main() -> None:
+    """Command line entry point for vector export, import and reindex."""
+    import argparse
+
+    from qdrant_client import QdrantClient
+
+    from ...core.config import get_settings
+    from .domain.entities import TenantLayoutConfig
+    from .repositories.content_store import PostgresContentStore
+
+    parser = argparse.ArgumentParser(description="Vector export, import and reindex")
+    parser.add_argument("--batch-size", type=int, default=None)
+    parser.add_argument("--concurrency", type=int, default=None)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    export_parser = subparsers.add_parser("export", help="Export one project")
+    export_parser.add_argument("project_id", type=UUID)
+    export_parser.add_argument("path")
+    import_parser = subparsers.add_parser("import", help="Import an export file")
+    import_parser.add_argument("path")
+    reindex_parser = subparsers.add_parser(
+        "reindex", help="Rebuild the collection and switch the alias"
+    )
+    reindex_parser.add_argument("--drop-old", action="store_true")
+    reindex_parser.add_argument(
+        "--legacy-cutover",
+        action="store_true",
+        help="Convert the plain collection into an alias (stop writers first)",
+    )
+    args = parser.parse_args()
+
+    settings = get_settings()
+    storage_config = VectorStorageConfig(
+        quantization=settings.QDRANT_QUANTIZATION,
+        quantization_always_ram=settings.QDRANT_QUANTIZATION_ALWAYS_RAM,
+        vectors_on_disk=settings.QDRANT_VECTORS_ON_DISK,
+        rescore=settings.QDRANT_SEARCH_RESCORE,
+        oversampling=settings.QDRANT_SEARCH_OVERSAMPLING,
+        content_storage=settings.QDRANT_CONTENT_STORAGE,
+    )
+    content_store = None
+    if storage_config.content_external:
+        from ...core.database import database_manager
+
+        await database_manager.initialize()
+        content_store = PostgresContentStore()
+
+    repository = QdrantVectorRepository(
+        QdrantClient(url=settings.QDRANT_URL, timeout=settings.QDRANT_TIMEOUT),
+        storage_config=storage_config,
+        tenant_config=TenantLayoutConfig(
+            tenant_index=settings.QDRANT_TENANT_INDEX,
+            custom_sharding=settings.QDRANT_CUSTOM_SHARDING,
+            dedicated_shard_threshold=settings.QDRANT_DEDICATED_SHARD_THRESHOLD,
+            routing_refresh_seconds=settings.QDRANT_TENANT_ROUTING_REFRESH_SECONDS,
+        ),
+        content_store=content_store,
+    )
+    await repository.refresh_tenant_routing()
+
+    if args.command == "export":
+        result = await VectorProjectExporter(
+            repository, args.batch_size
+        ).export_project(args.project_id, args.path)
+    elif args.command == "import":
+        result = await VectorProjectImporter(
+            repository, args.batch_size, args.concurrency
+        ).import_file(args.path)
+    else:
+        result = await CollectionReindexer(
+            repository, args.batch_size, args.concurrency
+        ).reindex(drop_old=args.drop_old, legacy_cutover=args.legacy_cutover)
+
+    print(json.dumps(result, indent=2, default=str))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,152 @@
+"""
+Content store implementations for external point content.
+
+When the collection runs in external content mode, Qdrant payloads keep only
+a short preview and the content hash; full content is stored here and loaded
+in bulk only for results that actually need it.
+"""
+
+from typing import Any, AsyncContextManager, Callable, Dict, List, Optional
+from uuid import UUID
+
+import structlog
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ....models import VectorContent
+from .interfaces import ContentStore
+
+logger = structlog.get_logger()
+
+SessionProvider = Callable[..., AsyncContextManager[AsyncSession]]
+
+
+class InMemoryContentStore(ContentStore):
+    """Process-local content store for tests and single-process development."""
+
+    def __init__(self):
+        self._contents: Dict[str, Dict[str, str]] = {}
+
+    async def put_many(self, project_id: UUID, contents: Dict[str, str]) -> None:
+        if not project_id:
+            raise ValueError("project_id is required for content storage")
+        self._contents.setdefault(str(project_id), {}).update(contents)
+
+    async def get_many(
+        self, project_id: UUID, content_hashes: List[str]
+    ) -> Dict[str, str]:
+        if not project_id:
+            raise ValueError("project_id is required for content retrieval")
+        project_contents = self._contents.get(str(project_id), {})
+        return {
+            content_hash: project_contents[content_hash]
+            for content_hash in set(content_hashes)
+            if content_hash in project_contents
+        }
+
+    async def delete_many(self, project_id: UUID, content_hashes: List[str]) -> int:
+        if not project_id:
+            raise ValueError("project_id is required for content deletion")
+        project_contents = self._contents.get(str(project_id), {})
+        return sum(
+            project_contents.pop(content_hash, None) is not None
+            for content_hash in set(content_hashes)
+        )
+
+    async def delete_project(self, project_id: UUID) -> int:
+        if not project_id:
+            raise ValueError("project_id is required for content deletion")
+        return len(self._contents.pop(str(project_id), {}))
+
+
+class PostgresContentStore(ContentStore):
+    """
+    PostgreSQL-backed content store (vector_contents table).
+
+    Writes are idempotent (ON CONFLICT DO NOTHING): a content hash always
+    maps to the same content, so re-upserting a point never rewrites rows.
+    """
+
+    def __init__(self, session_provider: Optional[SessionProvider] = None):
+        """
+        Initialize PostgreSQL content store.
+
+        Args:
+            session_provider: Async context manager factory yielding sessions
+                (defaults to the application database manager)
+        """
+        if session_provider is None:
+            from ....core.database import database_manager
+
+            session_provider = database_manager.get_session
+        self._session_provider = session_provider
+
+    async def put_many(self, project_id: UUID, contents: Dict[str, str]) -> None:
+        if not project_id:
+            raise ValueError("project_id is required for content storage")
+        if not contents:
+            return
+
+        rows: List[Dict[str, Any]] = [
+            {"project_id": project_id, "content_hash": content_hash, "content": content}
+            for content_hash, content in contents.items()
+        ]
+        try:
+            async with self._session_provider(str(project_id)) as session:
+                await session.execute(
+                    insert(VectorContent).values(rows).on_conflict_do_nothing()
+                )
+        except Exception as e:
+            raise RuntimeError(f"Failed to store point content: {e}") from e
+
+    async def get_many(
+        self, project_id: UUID, content_hashes: List[str]
+    ) -> Dict[str, str]:
+        if not project_id:
+            raise ValueError("project_id is required for content retrieval")
+        if not content_hashes:
+            return {}
+
+        try:
+            async with self._session_provider(str(project_id)) as session:
+                result = await session.execute(
+                    select(VectorContent.content_hash, VectorContent.content).where(
+                        VectorContent.project_id == project_id,
+                        VectorContent.content_hash.in_(set(content_hashes)),
+                    )
+                )
+                return {row.content_hash: row.content for row in result}
+        except Exception as e:
+            raise RuntimeError(f"Failed to load point content: {e}") from e
+
+    async def delete_many(self, project_id: UUID, content_hashes: List[str]) -> int:
+        if not project_id:
+            raise ValueError("project_id is required for content deletion")
+        if not content_hashes:
+            return 0
+
+        try:
+            async with self._session_provider(str(project_id)) as session:
+                result = await session.execute(
+                    delete(VectorContent).where(
+                        VectorContent.project_id == project_id,
+                        VectorContent.content_hash.in_(set(content_hashes)),
+                    )
+                )
+                return result.rowcount or 0
+        except Exception as e:
+            raise RuntimeError(f"Failed to delete point content: {e}") from e
+
+    async def delete_project(self, project_id: UUID) -> int:
+        if not project_id:
+            raise ValueError("project_id is required for content deletion")
+
+        try:
+            async with self._session_provider(str(project_id)) as session:
+                result = await session.execute(
+                    delete(VectorContent).where(VectorContent.project_id == project_id)
+                )
+                return result.rowcount or 0
+        except Exception as e:
+            raise RuntimeError(f"Failed to delete project content: {e}") from e
@@ -16,6 +16,8 @@ from ..domain.entities import (
     SearchContext,
     VectorData,
     DocumentType,
+    HybridFusion,
+    PayloadProjection,
 )
 
 
@@ -125,6 +127,7 @@ class VectorRepository(ABC):
         score_threshold: float = 0.0,
         document_type: Optional[DocumentType] = None,
         importance_min: Optional[float] = None,
+        projection: Optional[PayloadProjection] = None,
     ) -> List[SearchResult]:
         """
         Search for similar vectors with mandatory filtering.
@@ -139,6 +142,8 @@ class VectorRepository(ABC):
             score_threshold: Minimum similarity score threshold
             document_type: Optional document type filter
             importance_min: Optional minimum importance filter
+            projection: Payload fields to return (defaults to all fields
+                including full content)
 
         Returns:
             List of search results ranked by similarity
@@ -148,6 +153,84 @@ class VectorRepository(ABC):
         """
         pass
 
+    @abstractmethod
+    async def hybrid_search_similar(
+        self,
+        query_text: str,
+        query_vector: VectorData,
+        context: SearchContext,
+        limit: int = 10,
+        text_weight: float = 0.3,
+        vector_weight: float = 0.7,
+        fusion: HybridFusion = HybridFusion.WEIGHTED,
+        score_threshold: float = 0.0,
+        document_type: Optional[DocumentType] = None,
+        importance_min: Optional[float] = None,
+        projection: Optional[PayloadProjection] = None,
+    ) -> List[SearchResult]:
+        """
+        Search with dense vectors and sparse keyword vectors fused server-side.
+
+        CRITICAL: The project_id and language filter MUST be applied to both
+        the dense and the sparse branch, and every result MUST be re-validated.
+
+        Args:
+            query_text: Keyword query encoded as a sparse vector
+            query_vector: Query vector for similarity search
+            context: Search context with project_id and language (MANDATORY)
+            limit: Maximum number of results
+            text_weight: Weight of the keyword branch (weighted fusion only)
+            vector_weight: Weight of the dense branch (weighted fusion only)
+            fusion: Rank fusion strategy
+            score_threshold: Minimum fused score threshold
+            document_type: Optional document type filter
+            importance_min: Optional minimum importance filter
+            projection: Payload fields to return (defaults to all fields
+                including full content)
+
+        Returns:
+            List of search results ordered by fused score
+
+        Raises:
+            ValueError: If search parameters are invalid or context is missing required fields
+        """
+        pass
+
+    @abstractmethod
+    async def search_similar_batch(
+        self,
+        query_vectors: List[VectorData],
+        context: SearchContext,
+        limit: int = 10,
+        score_threshold: float = 0.0,
+        document_type: Optional[DocumentType] = None,
+        importance_min: Optional[float] = None,
+        projection: Optional[PayloadProjection] = None,
+    ) -> List[List[SearchResult]]:
+        """
+        Search for several query vectors in one round trip with mandatory filtering.
+
+        CRITICAL: The same project_id and language filter MUST be applied to
+        every query in the batch, and every result MUST be re-validated.
+
+        Args:
+            query_vectors: Query vectors for similarity search
+            context: Search context with project_id and language (MANDATORY)
+            limit: Maximum number of results per query
+            score_threshold: Minimum similarity score threshold
+            document_type: Optional document type filter
+            importance_min: Optional minimum importance filter
+            projection: Payload fields to return (defaults to all fields
+                including full content)
+
+        Returns:
+            One list of search results per query vector, in request order
+
+        Raises:
+            ValueError: If search parameters are invalid or context is missing required fields
+        """
+        pass
+
     @abstractmethod
     async def delete_points(self, point_ids: List[UUID], project_id: UUID) -> None:
         """
@@ -276,6 +359,7 @@ class VectorSearchService(ABC):
         context: SearchContext,
         limit: int = 10,
         filters: Optional[Dict[str, Any]] = None,
+        projection: Optional[PayloadProjection] = None,
     ) -> List[SearchResult]:
         """
         Search for similar vectors with mandatory filtering.
@@ -285,6 +369,8 @@ class VectorSearchService(ABC):
             context: Search context (project_id and language are mandatory)
             limit: Maximum number of results
             filters: Optional additional filters
+            projection: Payload fields to return (defaults to all fields
+                including full content)
 
         Returns:
             List of search results ranked by similarity
@@ -294,6 +380,34 @@ class VectorSearchService(ABC):
         """
         pass
 
+    @abstractmethod
+    async def search_many(
+        self,
+        query_vectors: List[VectorData],
+        context: SearchContext,
+        limit: int = 10,
+        filters: Optional[Dict[str, Any]] = None,
+        projection: Optional[PayloadProjection] = None,
+    ) -> List[List[SearchResult]]:
+        """
+        Search for several query vectors at once with mandatory filtering.
+
+        Args:
+            query_vectors: Query vectors for similarity search
+            context: Search context (project_id and language are mandatory)
+            limit: Maximum number of results per query
+            filters: Optional additional filters shared by all queries
+            projection: Payload fields to return (defaults to all fields
+                including full content)
+
+        Returns:
+            One list of search results per query vector, in request order
+
+        Raises:
+            ValueError: If context is missing required fields
+        """
+        pass
+
     @abstractmethod
     async def hybrid_search(
         self,
@@ -303,6 +417,9 @@ class VectorSearchService(ABC):
         limit: int = 10,
         text_weight: float = 0.3,
         vector_weight: float = 0.7,
+        fusion: HybridFusion = HybridFusion.WEIGHTED,
+        filters: Optional[Dict[str, Any]] = None,
+        projection: Optional[PayloadProjection] = None,
     ) -> List[SearchResult]:
         """
         Perform hybrid search combining text and vector similarity.
@@ -314,8 +431,75 @@ class VectorSearchService(ABC):
             limit: Maximum number of results
             text_weight: Weight for text search results (0.0-1.0)
             vector_weight: Weight for vector search results (0.0-1.0)
+            fusion: Rank fusion strategy (weights are ignored for RRF)
+            filters: Optional additional filters
+            projection: Payload fields to return (defaults to all fields
+                including full content)
 
         Returns:
             List of hybrid search results
         """
         pass
+
+
+class ContentStore(ABC):
+    """
+    Abstract store for full point content kept outside the vector database.
+
+    Content is addressed by (project_id, content_hash), so identical chunks
+    within a project are stored once and lookups never cross projects.
+    """
+
+    @abstractmethod
+    async def put_many(self, project_id: UUID, contents: Dict[str, str]) -> None:
+        """
+        Store content for a project, keyed by content hash.
+
+        Args:
+            project_id: Project ID (MANDATORY)
+            contents: Mapping of content_hash to full content
+        """
+        pass
+
+    @abstractmethod
+    async def get_many(
+        self, project_id: UUID, content_hashes: List[str]
+    ) -> Dict[str, str]:
+        """
+        Fetch content for many hashes in one round trip.
+
+        Args:
+            project_id: Project ID (MANDATORY)
+            content_hashes: Content hashes to fetch
+
+        Returns:
+            Mapping of content_hash to content (missing hashes are omitted)
+        """
+        pass
+
+    @abstractmethod
+    async def delete_many(self, project_id: UUID, content_hashes: List[str]) -> int:
+        """
+        Delete content of a project by hash.
+
+        Args:
+            project_id: Project ID (MANDATORY)
+            content_hashes: Content hashes no point references any more
+
+        Returns:
+            Number of content entries deleted
+        """
+        pass
+
+    @abstractmethod
+    async def delete_project(self, project_id: UUID) -> int:
+        """
+        Delete all content stored for a project.
+
+        Args:
+            project_id: Project ID (MANDATORY)
+
+        Returns:
+            Number of content entries deleted
+        """
+        pass
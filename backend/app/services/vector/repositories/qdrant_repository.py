@@ -6,8 +6,11 @@ with strict filter enforcement and project isolation.
 """
 
 import asyncio
+import time
+import zlib
+from contextlib import suppress
 from datetime import datetime
-from typing import List, Optional, Dict, Any, Tuple
+from typing import List, Optional, Dict, Any, Set, Tuple
 from uuid import UUID
 
 import structlog
@@ -34,13 +37,23 @@ from ..domain.entities import (
     VectorData,
     DocumentType,
     HealthStatus,
+    HybridFusion,
     ProjectId,
     LanguageCode,
+    PayloadProjection,
+    QuantizationMode,
+    TenantLayoutConfig,
+    VectorStorageConfig,
 )
-from .interfaces import VectorRepository, CollectionManager
+from ..exact_search_tier import ExactSearchTier
+from ..sparse_encoder import BM25SparseEncoder
+from .interfaces import VectorRepository, CollectionManager, ContentStore
 
 logger = structlog.get_logger()
 
+# Locks guarding first loads of projects into the exact search tier
+EXACT_TIER_LOCK_STRIPES = 64
+
 
 class QdrantVectorRepository(VectorRepository):
     """
@@ -59,23 +72,85 @@ class QdrantVectorRepository(VectorRepository):
     FULL_SCAN_THRESHOLD = 10000  # Enable efficient small-set filtering
     INDEXING_THRESHOLD = 20000
 
+    # Named vectors: unnamed dense embedding plus BM25 sparse term weights
+    DENSE_VECTOR_NAME = ""
+    SPARSE_VECTOR_NAME = "text"
+    HYBRID_PREFETCH_FACTOR = 4  # Candidates per branch = limit * factor
+
     # Batch operation limits
     MAX_BATCH_SIZE = 100
+    MAX_SEARCH_BATCH_SIZE = 32  # Query vectors per search_batch request
     BATCH_TIMEOUT = 30  # seconds
+    SEARCH_TIMEOUT = 5.0  # seconds
 
-    def __init__(self, client: QdrantClient):
+    # Collection info snapshot refresh interval (maximum age served from memory)
+    COLLECTION_INFO_REFRESH_INTERVAL = 30.0  # seconds
+
+    def __init__(
+        self,
+        client: QdrantClient,
+        storage_config: Optional[VectorStorageConfig] = None,
+        tenant_config: Optional[TenantLayoutConfig] = None,
+        content_store: Optional[ContentStore] = None,
+        exact_tier: Optional[ExactSearchTier] = None,
+        collection_info_refresh_interval: Optional[float] = None,
+    ):
         """
         Initialize Qdrant repository with client.
 
         Args:
             client: Configured QdrantClient instance
+            storage_config: Vector quantization and on-disk storage settings
+                (defaults to full float32 vectors in RAM)
+            tenant_config: Tenant index and shard key layout settings
+            content_store: External store for full point content
+                (required when storage_config uses external content)
+            exact_tier: Optional in-process exact search tier for small projects
+            collection_info_refresh_interval: Seconds between collection info
+                snapshot refreshes (defaults to COLLECTION_INFO_REFRESH_INTERVAL)
+
+        Raises:
+            ValueError: If external content is configured without a content store
+                or the refresh interval is not positive
         """
+        self.storage_config = storage_config or VectorStorageConfig()
+        self.tenant_config = tenant_config or TenantLayoutConfig()
+        if self.storage_config.content_external and content_store is None:
+            raise ValueError("External content storage requires a content store")
+        if collection_info_refresh_interval is not None and (
+            collection_info_refresh_interval <= 0
+        ):
+            raise ValueError("collection_info_refresh_interval must be positive")
+        self.content_store = content_store
+        self.exact_tier = exact_tier
+        # Striped locks serialize loads of a project into the exact tier; a
+        # fixed set keeps memory bounded (projects sharing a stripe wait on
+        # each other's first load only)
+        self._exact_tier_locks = [
+            asyncio.Lock() for _ in range(EXACT_TIER_LOCK_STRIPES)
+        ]
+        # Projects promoted to a dedicated shard key, and projects whose points
+        # are currently being copied there (writes go to both shard keys);
+        # reloaded from Qdrant so every process follows the same promotions
+        self._dedicated_projects: Set[str] = set()
+        self._migrating_projects: Set[str] = set()
+        self._tenant_routing_refresher: Optional[asyncio.Task] = None
+
         # Instrument the client for OpenTelemetry tracing
         from ....core.qdrant_telemetry import instrument_qdrant_client
 
         self.client = instrument_qdrant_client(client)
-        self._collection_info_cache = None
-        self._cache_timestamp = None
+        self.sparse_encoder = BM25SparseEncoder()
+        # Shared collection info snapshot: refreshed single-flight (one
+        # get_collection call in flight at a time) and served from memory
+        self.collection_info_refresh_interval = (
+            collection_info_refresh_interval or self.COLLECTION_INFO_REFRESH_INTERVAL
+        )
+        self._collection_info_cache: Optional[Dict[str, Any]] = None
+        self._cache_timestamp: Optional[float] = None
+        self._collection_info_generation = 0
+        self._collection_info_refresh: Optional[asyncio.Task] = None
+        self._collection_info_refresher: Optional[asyncio.Task] = None
 
     @retry(
         stop=stop_after_attempt(3),
@@ -96,6 +171,9 @@ class QdrantVectorRepository(VectorRepository):
             hnsw_payload_m=self.HNSW_PAYLOAD_M,
             hnsw_ef_construct=self.HNSW_EF_CONSTRUCT,
             indexing_threshold=self.INDEXING_THRESHOLD,
+            quantization=self.storage_config.quantization.value,
+            vectors_on_disk=self.storage_config.vectors_on_disk,
+            custom_sharding=self.tenant_config.custom_sharding,
         ) as span:
             if not await self.collection_exists():
                 # Create collection with optimized HNSW configuration
@@ -111,13 +189,33 @@ class QdrantVectorRepository(VectorRepository):
                             ef_construct=self.HNSW_EF_CONSTRUCT,
                             full_scan_threshold=self.FULL_SCAN_THRESHOLD,
                         ),
+                        on_disk=self.storage_config.vectors_on_disk,
                     ),
+                    sparse_vectors_config={
+                        # IDF is computed server-side from the live corpus
+                        self.SPARSE_VECTOR_NAME: models.SparseVectorParams(
+                            modifier=models.Modifier.IDF
+                        )
+                    },
                     optimizers_config=models.OptimizersConfigDiff(
                         indexing_threshold=self.INDEXING_THRESHOLD
                     ),
+                    quantization_config=self._build_quantization_config(),
                     replication_factor=1,  # Single node configuration
-                    shard_number=1,  # Single shard for development
+                    shard_number=1,  # Single shard (per shard key when custom sharding)
+                    sharding_method=models.ShardingMethod.CUSTOM
+                    if self.tenant_config.custom_sharding
+                    else None,
                 )
+                self.invalidate_collection_info()
+
+                if self.tenant_config.custom_sharding:
+                    # All projects start on the shared shard key
+                    await asyncio.to_thread(
+                        self.client.create_shard_key,
+                        collection_name=self.COLLECTION_NAME,
+                        shard_key=self.tenant_config.shared_shard_key,
+                    )
 
                 span.set_attribute("qdrant.collection_created", True)
                 logger.info(
@@ -127,6 +225,8 @@ class QdrantVectorRepository(VectorRepository):
                     hnsw_m=self.HNSW_M,
                     hnsw_payload_m=self.HNSW_PAYLOAD_M,
                     hnsw_ef_construct=self.HNSW_EF_CONSTRUCT,
+                    quantization=self.storage_config.quantization.value,
+                    vectors_on_disk=self.storage_config.vectors_on_disk,
                     operation="create_collection",
                 )
             else:
@@ -135,24 +235,353 @@ class QdrantVectorRepository(VectorRepository):
             # Create required indexes
             await self.create_indexes()
 
+            if self.tenant_config.custom_sharding:
+                await self.refresh_tenant_routing()
+
     async def collection_exists(self) -> bool:
         """Check if collection exists."""
         try:
             # Instrumented client already provides async methods
             collections = await self.client.get_collections()
-            return any(
+            if any(
                 collection.name == self.COLLECTION_NAME
                 for collection in collections.collections
+            ):
+                return True
+
+            # After a reindex the name is an alias of a versioned collection
+            aliases = await asyncio.to_thread(self.client.get_aliases)
+            return any(
+                alias.alias_name == self.COLLECTION_NAME for alias in aliases.aliases
             )
         except Exception as e:
             raise RuntimeError(f"Failed to check collection existence: {e}") from e
 
-    async def get_collection_info(self) -> Dict[str, Any]:
-        """Get detailed collection information."""
+    @property
+    def dedicated_projects(self) -> Set[str]:
+        """Project IDs that have been promoted to a dedicated shard key."""
+        return set(self._dedicated_projects)
+
+    def _read_shard_key(self, project_id: Any) -> Optional[str]:
+        """
+        Get the shard key holding a project's points.
+
+        Returns None when custom sharding is disabled. Projects that are still
+        being migrated are read from the shared shard key until cutover.
+        """
+        if not self.tenant_config.custom_sharding:
+            return None
+        if str(project_id) in self._dedicated_projects:
+            return self.tenant_config.dedicated_shard_key(project_id)
+        return self.tenant_config.shared_shard_key
+
+    def _write_shard_keys(self, project_id: Any) -> List[Optional[str]]:
+        """
+        Get the shard keys a project's writes must go to.
+
+        During migration, writes go to both the shared and the dedicated shard
+        key so no update is lost before cutover.
+        """
+        if str(project_id) in self._migrating_projects:
+            return [
+                self.tenant_config.shared_shard_key,
+                self.tenant_config.dedicated_shard_key(project_id),
+            ]
+        return [self._read_shard_key(project_id)]
+
+    def mark_project_migrating(self, project_id: UUID) -> None:
+        """Start dual writes for a project being moved to a dedicated shard."""
+        self._migrating_projects.add(str(project_id))
+
+    def mark_project_dedicated(self, project_id: UUID) -> None:
+        """Switch reads and writes of a project to its dedicated shard key."""
+        self._dedicated_projects.add(str(project_id))
+        self._migrating_projects.discard(str(project_id))
+
+    def unmark_project_migrating(self, project_id: UUID) -> None:
+        """Abort dual writes for a project whose migration failed."""
+        self._migrating_projects.discard(str(project_id))
+
+    def routing_alias(self, project_id: Any) -> str:
+        """
+        Get the alias marking a project's cutover to its dedicated shard key.
+
+        Shard keys cannot be renamed, so the dedicated shard key alone only
+        says a migration has started; this alias, created at cutover, is the
+        cluster-wide record that reads must switch to it.
+        """
+        return (
+            f"{self.COLLECTION_NAME}__"
+            f"{self.tenant_config.dedicated_shard_key(project_id)}"
+        )
+
+    async def refresh_tenant_routing(self) -> None:
+        """
+        Reload tenant shard routing from the Qdrant cluster.
+
+        Projects with a dedicated project_<uuid> shard key are being migrated
+        (writes go to both shard keys) until their routing alias exists, after
+        which they are dedicated. Both may have been created by another process.
+        """
+        if not self.tenant_config.custom_sharding:
+            return
+
+        try:
+            response = await asyncio.to_thread(
+                self.client.http.distributed_api.collection_cluster_info,
+                collection_name=self.COLLECTION_NAME,
+            )
+            aliases = await asyncio.to_thread(self.client.get_aliases)
+        except Exception as e:
+            # Keep the previous routing until Qdrant recovers
+            logger.warning(
+                "Failed to refresh tenant shard routing",
+                collection_name=self.COLLECTION_NAME,
+                error=str(e),
+                operation="refresh_tenant_routing",
+            )
+            return
+
+        cluster_info = response.result
+        shards = list(cluster_info.local_shards or []) + list(
+            cluster_info.remote_shards or []
+        )
+        key_prefix = self.tenant_config.dedicated_shard_key("")
+        sharded = {
+            str(shard.shard_key)[len(key_prefix) :]
+            for shard in shards
+            if shard.shard_key and str(shard.shard_key).startswith(key_prefix)
+        }
+        alias_prefix = self.routing_alias("")
+        cut_over = {
+            alias.alias_name[len(alias_prefix) :]
+            for alias in aliases.aliases
+            if alias.alias_name.startswith(alias_prefix)
+        }
+        self._dedicated_projects = sharded & cut_over
+        self._migrating_projects = sharded - cut_over
+        logger.info(
+            "Refreshed tenant shard routing",
+            collection_name=self.COLLECTION_NAME,
+            dedicated_projects=len(self._dedicated_projects),
+            migrating_projects=len(self._migrating_projects),
+            operation="refresh_tenant_routing",
+        )
+
+    def start_tenant_routing_refresher(self) -> None:
+        """Reload tenant shard routing every routing refresh interval."""
+        if not self.tenant_config.custom_sharding:
+            return
+        if (
+            self._tenant_routing_refresher is not None
+            and not self._tenant_routing_refresher.done()
+        ):
+            return
+        self._tenant_routing_refresher = asyncio.get_running_loop().create_task(
+            self._tenant_routing_refresh_loop()
+        )
+
+    async def stop_tenant_routing_refresher(self) -> None:
+        """Stop the background tenant routing refresher."""
+        refresher = self._tenant_routing_refresher
+        self._tenant_routing_refresher = None
+        if refresher is None:
+            return
+        refresher.cancel()
+        with suppress(asyncio.CancelledError):
+            await refresher
+
+    async def _tenant_routing_refresh_loop(self) -> None:
+        """Refresh tenant routing until cancelled (failures are logged)."""
+        while True:
+            await asyncio.sleep(self.tenant_config.routing_refresh_seconds)
+            await self.refresh_tenant_routing()
+
+    def _build_quantization_config(
+        self,
+    ) -> Optional[models.QuantizationConfig]:
+        """Build Qdrant quantization config from storage settings."""
+        mode = self.storage_config.quantization
+        if mode == QuantizationMode.SCALAR:
+            return models.ScalarQuantization(
+                scalar=models.ScalarQuantizationConfig(
+                    type=models.ScalarType.INT8,
+                    quantile=self.storage_config.scalar_quantile,
+                    always_ram=self.storage_config.quantization_always_ram,
+                )
+            )
+        if mode == QuantizationMode.BINARY:
+            return models.BinaryQuantization(
+                binary=models.BinaryQuantizationConfig(
+                    always_ram=self.storage_config.quantization_always_ram,
+                )
+            )
+        return None
+
+    def _build_search_params(self) -> Optional[models.SearchParams]:
+        """
+        Build search params for quantized collections.
+
+        Quantized search oversamples candidates using compressed vectors and
+        rescores them with the original vectors to recover precision.
+        """
+        if not self.storage_config.is_quantized:
+            return None
+        return models.SearchParams(
+            quantization=models.QuantizationSearchParams(
+                rescore=self.storage_config.rescore,
+                oversampling=self.storage_config.oversampling,
+            )
+        )
+
+    @staticmethod
+    def _quantization_mode_from_config(quantization_config: Any) -> str:
+        """Map Qdrant quantization config to a QuantizationMode value."""
+        if quantization_config is None:
+            return QuantizationMode.NONE.value
+        if isinstance(quantization_config, models.ScalarQuantization):
+            return QuantizationMode.SCALAR.value
+        if isinstance(quantization_config, models.BinaryQuantization):
+            return QuantizationMode.BINARY.value
+        return type(quantization_config).__name__
+
+    async def get_collection_info(
+        self, max_age: Optional[float] = None, force_refresh: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Get detailed collection information from the shared snapshot.
+
+        The snapshot is served from memory. A snapshot older than max_age is
+        still returned immediately while a single background refresh is
+        scheduled, so callers never wait on get_collection once a snapshot
+        exists. Points and segment counts are therefore eventually
+        consistent, lagging by at most one refresh interval.
+
+        Args:
+            max_age: Maximum snapshot age in seconds before a background
+                refresh is scheduled (defaults to the refresh interval)
+            force_refresh: Wait for a fresh snapshot instead of serving memory
+
+        Returns:
+            Collection info dictionary including snapshot_age_seconds
+
+        Raises:
+            RuntimeError: If no snapshot exists and fetching one fails
+        """
+        if force_refresh or self._collection_info_cache is None:
+            # A refresh racing an invalidation is discarded, so retry briefly
+            for _ in range(3):
+                await self._refresh_collection_info()
+                if self._collection_info_cache is not None:
+                    break
+            else:
+                raise RuntimeError(
+                    "Failed to get collection info: snapshot invalidated during refresh"
+                )
+        else:
+            if max_age is None:
+                max_age = self.collection_info_refresh_interval
+            if time.monotonic() - self._cache_timestamp > max_age:
+                self._schedule_collection_info_refresh()
+
+        info = dict(self._collection_info_cache)
+        info["snapshot_age_seconds"] = round(
+            time.monotonic() - self._cache_timestamp, 3
+        )
+        return info
+
+    def invalidate_collection_info(self) -> None:
+        """
+        Drop the collection info snapshot after a schema-changing operation.
+
+        Refreshes already in flight complete but their (possibly pre-change)
+        result is discarded; the next read fetches a new snapshot.
+        """
+        self._collection_info_generation += 1
+        self._collection_info_cache = None
+        self._cache_timestamp = None
+        self._collection_info_refresh = None
+
+    def start_collection_info_refresher(self) -> None:
+        """Start refreshing the collection info snapshot in the background."""
+        if (
+            self._collection_info_refresher is not None
+            and not self._collection_info_refresher.done()
+        ):
+            return
+        self._collection_info_refresher = asyncio.get_running_loop().create_task(
+            self._collection_info_refresh_loop()
+        )
+
+    async def stop_collection_info_refresher(self) -> None:
+        """Stop the background collection info refresher."""
+        refresher = self._collection_info_refresher
+        self._collection_info_refresher = None
+        if refresher is None:
+            return
+        refresher.cancel()
+        with suppress(asyncio.CancelledError):
+            await refresher
+
+    async def _collection_info_refresh_loop(self) -> None:
+        """Refresh the snapshot every refresh interval until cancelled."""
+        while True:
+            try:
+                await self._refresh_collection_info()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Keep serving the previous snapshot until Qdrant recovers
+                logger.warning(
+                    "Collection info refresh failed",
+                    collection_name=self.COLLECTION_NAME,
+                    error=str(e),
+                    operation="collection_info_refresh",
+                )
+            await asyncio.sleep(self.collection_info_refresh_interval)
+
+    def _schedule_collection_info_refresh(self) -> asyncio.Task:
+        """Get the in-flight snapshot refresh, starting one if needed."""
+        refresh = self._collection_info_refresh
+        if refresh is None or refresh.done():
+            refresh = asyncio.get_running_loop().create_task(
+                self._fetch_collection_info(self._collection_info_generation)
+            )
+            refresh.add_done_callback(self._log_collection_info_refresh_failure)
+            self._collection_info_refresh = refresh
+        return refresh
+
+    async def _refresh_collection_info(self) -> None:
+        """Wait for a single-flight snapshot refresh."""
+        # Shielded so a cancelled caller does not cancel the shared fetch
+        await asyncio.shield(self._schedule_collection_info_refresh())
+
+    def _log_collection_info_refresh_failure(self, refresh: asyncio.Task) -> None:
+        """Retrieve background refresh errors so they are logged, not lost."""
+        if refresh.cancelled() or refresh.exception() is None:
+            return
+        logger.warning(
+            "Background collection info refresh failed",
+            collection_name=self.COLLECTION_NAME,
+            error=str(refresh.exception()),
+            operation="collection_info_refresh",
+        )
+
+    async def _fetch_collection_info(self, generation: int) -> None:
+        """
+        Fetch collection info and store it as the snapshot.
+
+        Args:
+            generation: Snapshot generation the fetch was started for; the
+                result is discarded if the snapshot was invalidated meanwhile
+
+        Raises:
+            RuntimeError: If the collection info cannot be fetched
+        """
         try:
             # Instrumented client already provides async methods
             info = await self.client.get_collection(self.COLLECTION_NAME)
-            return {
+            snapshot = {
                 "name": self.COLLECTION_NAME,  # Use the collection name we requested
                 "vector_size": info.config.params.vectors.size,
                 "distance": str(info.config.params.vectors.distance),
@@ -165,10 +594,39 @@ class QdrantVectorRepository(VectorRepository):
                 "hnsw_config": info.config.params.vectors.hnsw_config.__dict__
                 if info.config.params.vectors.hnsw_config
                 else None,
+                "vectors_on_disk": bool(info.config.params.vectors.on_disk),
+                "quantization": self._quantization_mode_from_config(
+                    info.config.quantization_config
+                ),
+                "sharding_method": models.ShardingMethod(
+                    info.config.params.sharding_method or models.ShardingMethod.AUTO
+                ).value,
+                "sparse_vectors": sorted(info.config.params.sparse_vectors or {}),
+                "payload_indexes": self._payload_index_names(info.payload_schema),
             }
         except Exception as e:
             raise RuntimeError(f"Failed to get collection info: {e}") from e
 
+        if generation == self._collection_info_generation:
+            self._collection_info_cache = snapshot
+            self._cache_timestamp = time.monotonic()
+
+    @staticmethod
+    def _payload_index_names(payload_schema: Any) -> Optional[List[str]]:
+        """
+        Extract indexed payload field names from a collection payload schema.
+
+        Returns None when the schema format is not recognized.
+        """
+        # payload_schema is a dict in Qdrant v1.15.4+
+        if isinstance(payload_schema, dict):
+            return sorted(payload_schema.keys())
+        if hasattr(payload_schema, "get_schema"):
+            return sorted(payload_schema.get_schema().keys())
+        if hasattr(payload_schema, "__dict__"):
+            return sorted(payload_schema.__dict__.keys())
+        return None
+
     @retry(
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=2, max=8),
@@ -178,8 +636,15 @@ class QdrantVectorRepository(VectorRepository):
         async with qdrant_telemetry.trace_qdrant_operation(
             QdrantOperationType.INDEX_CREATE, collection_name=self.COLLECTION_NAME
         ) as span:
+            project_id_schema = (
+                models.KeywordIndexParams(
+                    type=models.KeywordIndexType.KEYWORD, is_tenant=True
+                )
+                if self.tenant_config.tenant_index
+                else models.PayloadSchemaType.KEYWORD
+            )
             indexes_to_create = [
-                ("project_id", models.PayloadSchemaType.KEYWORD, "project isolation"),
+                ("project_id", project_id_schema, "project isolation"),
                 ("language", models.PayloadSchemaType.KEYWORD, "language isolation"),
                 ("type", models.PayloadSchemaType.KEYWORD, "document type filtering"),
                 ("created_at", models.PayloadSchemaType.DATETIME, "temporal queries"),
@@ -211,6 +676,7 @@ class QdrantVectorRepository(VectorRepository):
                     ) from e
 
             span.set_attribute("qdrant.total_indexes_created", len(indexes_to_create))
+            self.invalidate_collection_info()
 
     async def validate_schema(self) -> List[str]:
         """Validate collection schema matches expected configuration."""
@@ -247,6 +713,32 @@ class QdrantVectorRepository(VectorRepository):
                         f"Invalid HNSW ef_construct: {hnsw_config.get('ef_construct')}, expected {self.HNSW_EF_CONSTRUCT}"
                     )
 
+            # Validate quantization and on-disk storage configuration
+            expected_quantization = self.storage_config.quantization.value
+            if info.get("quantization") != expected_quantization:
+                errors.append(
+                    f"Invalid quantization: {info.get('quantization')}, expected {expected_quantization}"
+                )
+
+            if info.get("vectors_on_disk") != self.storage_config.vectors_on_disk:
+                errors.append(
+                    f"Invalid vectors on_disk: {info.get('vectors_on_disk')}, expected {self.storage_config.vectors_on_disk}"
+                )
+
+            if self.SPARSE_VECTOR_NAME not in info.get("sparse_vectors", []):
+                errors.append(
+                    f"Missing sparse vector '{self.SPARSE_VECTOR_NAME}' required for hybrid search"
+                )
+
+            # Validate tenant shard layout
+            if (
+                self.tenant_config.custom_sharding
+                and info.get("sharding_method") != models.ShardingMethod.CUSTOM.value
+            ):
+                errors.append(
+                    f"Invalid sharding method: {info.get('sharding_method')}, expected custom"
+                )
+
             # Validate required indexes
             required_indexes = [
                 "project_id",
@@ -255,39 +747,22 @@ class QdrantVectorRepository(VectorRepository):
                 "created_at",
                 "importance",
             ]
-            try:
-                # Instrumented client already provides async methods
-                collection_info = await self.client.get_collection(self.COLLECTION_NAME)
-                payload_schema = collection_info.payload_schema
-                existing_indexes = set()
-
-                # payload_schema is a dict in Qdrant v1.15.4+
-                if isinstance(payload_schema, dict):
-                    existing_indexes = set(payload_schema.keys())
-                elif hasattr(payload_schema, "get_schema"):
-                    existing_indexes = set(payload_schema.get_schema().keys())
-                elif hasattr(payload_schema, "__dict__"):
-                    existing_indexes = set(payload_schema.__dict__.keys())
-                else:
-                    # TODO: Implement proper schema validation for different Qdrant versions
-                    # For now, fail loudly to detect schema issues early
-                    logger.error(
-                        "Unable to validate payload indexes - unknown schema format",
-                        payload_schema_type=type(payload_schema).__name__,
-                        validation_method="schema_validation",
-                    )
-                    errors.append(
-                        "Cannot validate payload indexes: unsupported schema format"
-                    )
-
-                # Only check missing indexes if we successfully extracted existing_indexes
-                if existing_indexes:
-                    missing_indexes = set(required_indexes) - existing_indexes
-                    if missing_indexes:
-                        errors.append(f"Missing payload indexes: {missing_indexes}")
-
-            except Exception as e:
-                errors.append(f"Failed to validate indexes: {e}")
+            payload_indexes = info.get("payload_indexes")
+            if payload_indexes is None:
+                # TODO: Implement proper schema validation for different Qdrant versions
+                # For now, fail loudly to detect schema issues early
+                logger.error(
+                    "Unable to validate payload indexes - unknown schema format",
+                    validation_method="schema_validation",
+                )
+                errors.append(
+                    "Cannot validate payload indexes: unsupported schema format"
+                )
+            elif payload_indexes:
+                # Local mode reports no payload schema; only check when known
+                missing_indexes = set(required_indexes) - set(payload_indexes)
+                if missing_indexes:
+                    errors.append(f"Missing payload indexes: {missing_indexes}")
 
         except Exception as e:
             errors.append(f"Schema validation failed: {e}")
@@ -326,6 +801,15 @@ class QdrantVectorRepository(VectorRepository):
                     "Cross-project upsert is forbidden."
                 )
 
+        # External content must be stored before points become searchable
+        if self.storage_config.content_external:
+            await self.content_store.put_many(
+                project_id,
+                {str(point.content_hash): point.content for point in points},
+            )
+
+        include_sparse = await self._sparse_vectors_enabled()
+
         # Enhanced telemetry for upsert operation
         total_points = len(points)
         document_types = list(set(point.document_type.value for point in points))
@@ -356,17 +840,21 @@ class QdrantVectorRepository(VectorRepository):
                 for point in batch:
                     qdrant_point = models.PointStruct(
                         id=str(point.id),
-                        vector=point.vector.to_list() if point.vector else None,
-                        payload=point.get_qdrant_payload(),
+                        vector=self._build_point_vectors(point, include_sparse),
+                        payload=point.get_qdrant_payload(
+                            include_content=not self.storage_config.content_external
+                        ),
                     )
                     qdrant_points.append(qdrant_point)
 
                 try:
                     # Instrumented client already provides async methods
-                    await self.client.upsert(
-                        collection_name=self.COLLECTION_NAME,
-                        points=qdrant_points,
-                    )
+                    for shard_key in self._write_shard_keys(project_id):
+                        await self.client.upsert(
+                            collection_name=self.COLLECTION_NAME,
+                            points=qdrant_points,
+                            shard_key_selector=shard_key,
+                        )
 
                     # Record batch completion metrics
                     span.set_attribute(f"qdrant.batch_{batch_number}_size", len(batch))
@@ -383,6 +871,18 @@ class QdrantVectorRepository(VectorRepository):
                 (total_points + self.MAX_BATCH_SIZE - 1) // self.MAX_BATCH_SIZE,
             )
 
+        if self.exact_tier is not None:
+            content_inline = not self.storage_config.content_external
+            self.exact_tier.upsert(
+                project_id,
+                [str(point.id) for point in points],
+                [point.vector.value for point in points],
+                [
+                    point.get_qdrant_payload(include_content=content_inline)
+                    for point in points
+                ],
+            )
+
     async def get_point_by_id(
         self, point_id: UUID, project_id: UUID
     ) -> Optional[VectorPoint]:
@@ -401,6 +901,7 @@ class QdrantVectorRepository(VectorRepository):
                 ids=[str(point_id)],
                 with_payload=True,
                 with_vectors=True,
+                shard_key_selector=self._read_shard_key(project_id),
             )
 
             if result:
@@ -418,40 +919,334 @@ class QdrantVectorRepository(VectorRepository):
                     )
                     return None
 
-                return VectorPoint.from_qdrant_point(
+                point = VectorPoint.from_qdrant_point(
                     point_id=str(point_data.id),
-                    vector=point_data.vector,
+                    vector=self._extract_dense_vector(point_data.vector),
                     payload=point_data.payload,
                 )
+                if not point.content_loaded and self.content_store is not None:
+                    contents = await self.content_store.get_many(
+                        project_id, [str(point.content_hash)]
+                    )
+                    point = point.with_content(
+                        contents.get(str(point.content_hash), "")
+                    )
+                return point
             return None
 
         except Exception as e:
             raise RuntimeError(f"Failed to retrieve point {point_id}: {e}") from e
 
-    async def search_similar(
+    async def _sparse_vectors_enabled(self) -> bool:
+        """
+        Whether the collection stores the BM25 sparse vector.
+
+        Collections created before hybrid search only have the dense vector;
+        their points are written and searched dense-only.
+        """
+        info = await self.get_collection_info()
+        return self.SPARSE_VECTOR_NAME in info.get("sparse_vectors", [])
+
+    def _build_point_vectors(
+        self, point: VectorPoint, include_sparse: bool = True
+    ) -> Dict[str, Any]:
+        """Build the dense (+ sparse, if enabled) named vectors stored for a point."""
+        vectors: Dict[str, Any] = {self.DENSE_VECTOR_NAME: point.vector.to_list()}
+        if not include_sparse:
+            return vectors
+        sparse = self.sparse_encoder.encode_document(point.content)
+        if not sparse.is_empty:
+            vectors[self.SPARSE_VECTOR_NAME] = models.SparseVector(
+                indices=sparse.indices, values=sparse.values
+            )
+        return vectors
+
+    def _extract_dense_vector(self, vector: Any) -> Optional[List[float]]:
+        """Extract the dense embedding from a retrieved point vector."""
+        if isinstance(vector, dict):
+            return vector.get(self.DENSE_VECTOR_NAME)
+        return vector
+
+    def _build_fusion_query(
+        self, fusion: HybridFusion, text_weight: float, vector_weight: float
+    ) -> Any:
+        """
+        Build the server-side fusion query for hybrid search.
+
+        Prefetch 0 is the dense branch and prefetch 1 the sparse branch.
+        Weighted fusion saturates the unbounded BM25 score into [0, 1) with
+        s / (s + 1) so it is comparable to the cosine score.
+        """
+        if fusion == HybridFusion.RRF:
+            return models.FusionQuery(fusion=models.Fusion.RRF)
+
+        total_weight = text_weight + vector_weight
+        saturated_text_score = models.DivExpression(
+            div=models.DivParams(
+                left="$score[1]",
+                right=models.SumExpression(sum=["$score[1]", 1.0]),
+            )
+        )
+        return models.FormulaQuery(
+            formula=models.SumExpression(
+                sum=[
+                    models.MultExpression(
+                        mult=[vector_weight / total_weight, "$score[0]"]
+                    ),
+                    models.MultExpression(
+                        mult=[text_weight / total_weight, saturated_text_score]
+                    ),
+                ]
+            ),
+            # Points found by only one branch score 0 in the other
+            defaults={"$score[0]": 0.0, "$score[1]": 0.0},
+        )
+
+    def _payload_selector(self, projection: Optional[PayloadProjection]) -> List[str]:
+        """Payload keys to request for a search projection."""
+        projection = projection or PayloadProjection.full()
+        return projection.qdrant_fields(
+            content_inline=not self.storage_config.content_external
+        )
+
+    async def load_content(
+        self, results: List[SearchResult], project_id: UUID
+    ) -> List[SearchResult]:
+        """
+        Attach full content to search results in one bulk content store fetch.
+
+        Results that already carry content are returned unchanged, so this is
+        safe to call lazily after a projected search.
+
+        Args:
+            results: Search results (possibly without content)
+            project_id: Project the results belong to (MANDATORY)
+
+        Returns:
+            Search results with full content loaded
+        """
+        if not project_id:
+            raise ValueError("project_id is required for content loading")
+
+        missing = [result for result in results if not result.point.content_loaded]
+        if not missing:
+            return results
+        if self.content_store is None:
+            raise RuntimeError(
+                "Content is not in the payload and no content store is configured"
+            )
+
+        contents = await self.content_store.get_many(
+            project_id, [str(result.point.content_hash) for result in missing]
+        )
+        return [
+            result
+            if result.point.content_loaded
+            else SearchResult(
+                point=result.point.with_content(
+                    contents.get(str(result.point.content_hash), "")
+                ),
+                score=result.score,
+                rank=result.rank,
+            )
+            for result in results
+        ]
+
+    async def _apply_projection(
         self,
-        query_vector: VectorData,
+        results: List[SearchResult],
         context: SearchContext,
-        limit: int = 10,
-        score_threshold: float = 0.0,
-        document_type: Optional[DocumentType] = None,
-        importance_min: Optional[float] = None,
+        projection: Optional[PayloadProjection],
+    ) -> List[SearchResult]:
+        """Load external content, or previews missing from older points."""
+        if (projection is None or projection.include_content) and (
+            self.storage_config.content_external
+        ):
+            return await self.load_content(results, context.project_id.value)
+        if projection is not None and "content_preview" in projection.fields:
+            return await self._fill_content_previews(results, context.project_id.value)
+        return results
+
+    async def _fill_content_previews(
+        self, results: List[SearchResult], project_id: UUID
     ) -> List[SearchResult]:
         """
-        Search for similar vectors with mandatory filtering and enhanced telemetry.
+        Derive previews for points stored before payloads carried one.
 
-        CRITICAL: All searches MUST include project_id and language filters.
-        No client can bypass these security filters.
+        Only those points' full content is fetched: from the content store in
+        external content mode, otherwise from their payload.
         """
-        if len(query_vector) != self.VECTOR_SIZE:
-            raise ValueError(
-                f"Invalid query vector dimension: {len(query_vector)}, expected {self.VECTOR_SIZE}"
+        legacy = [
+            result
+            for result in results
+            if not result.point.content_loaded and result.point.content_preview is None
+        ]
+        if not legacy:
+            return results
+
+        if self.storage_config.content_external:
+            loaded = await self.load_content(legacy, project_id)
+            contents = {str(result.point.id): result.point.content for result in loaded}
+        else:
+            # Instrumented client already provides async methods
+            records = await self.client.retrieve(
+                collection_name=self.COLLECTION_NAME,
+                ids=[str(result.point.id) for result in legacy],
+                with_payload=["content"],
+                with_vectors=False,
+                shard_key_selector=self._read_shard_key(project_id),
             )
+            contents = {
+                str(record.id): (record.payload or {}).get("content", "")
+                for record in records
+            }
+        return [
+            SearchResult(
+                point=result.point.with_content_preview(
+                    contents.get(str(result.point.id), "")
+                ),
+                score=result.score,
+                rank=result.rank,
+            )
+            if result in legacy
+            else result
+            for result in results
+        ]
 
-        if limit <= 0 or limit > 100:
-            raise ValueError(f"Invalid limit: {limit}. Must be between 1 and 100")
+    async def _ensure_exact_tier(self, project_id: Any) -> bool:
+        """
+        Make sure a small project is loaded in the exact search tier.
 
-        # Build mandatory filter - CANNOT be bypassed by client
+        Loads the project with one bounded scroll on first use. Projects with
+        more than max_points points are marked large and served by Qdrant.
+
+        Returns:
+            True if searches for the project can be served by the tier
+        """
+        tier = self.exact_tier
+        if tier is None or tier.is_large(project_id):
+            return False
+        if tier.is_loaded(project_id):
+            return True
+
+        key = str(project_id)
+        lock = self._exact_tier_locks[
+            zlib.crc32(key.encode()) % len(self._exact_tier_locks)
+        ]
+        async with lock:
+            if tier.is_loaded(project_id):
+                return True
+            if tier.is_large(project_id):
+                return False
+
+            generation = tier.begin_load(project_id)
+            try:
+                return await self._load_exact_tier(project_id, generation)
+            finally:
+                tier.end_load(project_id)
+
+    async def _load_exact_tier(self, project_id: UUID, generation: int) -> bool:
+        """Read a project's points and load them into the exact tier."""
+        tier = self.exact_tier
+        key = str(project_id)
+        try:
+            records, _ = await asyncio.to_thread(
+                self.client.scroll,
+                collection_name=self.COLLECTION_NAME,
+                scroll_filter=models.Filter(
+                    must=[
+                        models.FieldCondition(
+                            key="project_id",
+                            match=models.MatchValue(value=key),
+                        )
+                    ]
+                ),
+                # One extra point tells us the project is too large
+                limit=tier.config.max_points + 1,
+                with_payload=True,
+                with_vectors=True,
+                shard_key_selector=self._read_shard_key(project_id),
+            )
+        except Exception as e:
+            logger.warning(
+                "Failed to load project into exact search tier",
+                project_id=key,
+                error=str(e),
+            )
+            return False
+
+        loaded = tier.load(
+            project_id,
+            [str(record.id) for record in records],
+            [self._extract_dense_vector(record.vector) for record in records],
+            [record.payload for record in records],
+            generation=generation,
+        )
+        logger.debug(
+            "Exact search tier load",
+            project_id=key,
+            points=len(records),
+            loaded=loaded,
+        )
+        return loaded
+
+    async def _search_exact_tier(
+        self,
+        query_vector: VectorData,
+        context: SearchContext,
+        limit: int,
+        score_threshold: float,
+        document_type: Optional[DocumentType],
+        importance_min: Optional[float],
+        projection: Optional[PayloadProjection],
+    ) -> Optional[List[SearchResult]]:
+        """
+        Serve a search from the exact tier.
+
+        Returns:
+            Search results, or None if the project is not served by the tier
+        """
+        if not await self._ensure_exact_tier(context.project_id):
+            return None
+
+        hits = self.exact_tier.search(
+            context.project_id,
+            query_vector.value,
+            language=str(context.language),
+            limit=limit,
+            score_threshold=score_threshold,
+            document_type=document_type.value if document_type else None,
+            importance_min=importance_min,
+        )
+        if hits is None:
+            return None
+
+        selected_fields = set(self._payload_selector(projection))
+        scored_points = [
+            models.ScoredPoint(
+                id=point_id,
+                version=0,
+                score=score,
+                payload={k: v for k, v in payload.items() if k in selected_fields},
+            )
+            for point_id, score, payload in hits
+        ]
+        # Same defense-in-depth re-validation as Qdrant results
+        results, _ = self._build_search_results(scored_points, context)
+        return await self._apply_projection(results, context, projection)
+
+    def _build_search_filter(
+        self,
+        context: SearchContext,
+        document_type: Optional[DocumentType] = None,
+        importance_min: Optional[float] = None,
+    ) -> models.Filter:
+        """
+        Build the search filter with mandatory project and language isolation.
+
+        CRITICAL: project_id and language conditions are always present and
+        cannot be removed by optional refinements.
+        """
         filter_conditions = [
             models.FieldCondition(
                 key="project_id",
@@ -480,8 +1275,96 @@ class QdrantVectorRepository(VectorRepository):
                 )
             )
 
-        # Create mandatory filter
-        search_filter = models.Filter(must=filter_conditions)
+        return models.Filter(must=filter_conditions)
+
+    def _build_search_results(
+        self, scored_points: List[Any], context: SearchContext
+    ) -> Tuple[List[SearchResult], List[float]]:
+        """
+        Convert Qdrant scored points to SearchResult domain objects.
+
+        SECURITY: Re-validates project_id and language of every point and drops
+        anything that does not match the search context (defense in depth).
+
+        Returns:
+            Tuple of (search results, clamped scores)
+        """
+        results = []
+        scores = []  # Track scores for metrics
+        for rank, scored_point in enumerate(scored_points, 1):
+            payload = scored_point.payload
+            if payload.get("project_id") != str(context.project_id) or payload.get(
+                "language"
+            ) != str(context.language):
+                # Log security alert and skip this result
+                logger.warning(
+                    "SECURITY ALERT: Filter bypass detected in search result",
+                    point_id=scored_point.id,
+                    expected_project_id=str(context.project_id),
+                    actual_project_id=payload.get("project_id"),
+                    expected_language=str(context.language),
+                    actual_language=payload.get("language"),
+                    security_event="filter_bypass",
+                    operation="search_validation",
+                )
+                continue
+
+            # Validate score is within expected range
+            score = min(max(scored_point.score, 0.0), 1.0)  # Clamp to [0, 1]
+            scores.append(score)
+
+            point = VectorPoint.from_qdrant_search_result(
+                point_id=str(scored_point.id),
+                payload=payload,
+            )
+            results.append(SearchResult(point=point, score=score, rank=rank))
+
+        return results, scores
+
+    async def search_similar(
+        self,
+        query_vector: VectorData,
+        context: SearchContext,
+        limit: int = 10,
+        score_threshold: float = 0.0,
+        document_type: Optional[DocumentType] = None,
+        importance_min: Optional[float] = None,
+        projection: Optional[PayloadProjection] = None,
+    ) -> List[SearchResult]:
+        """
+        Search for similar vectors with mandatory filtering and enhanced telemetry.
+
+        CRITICAL: All searches MUST include project_id and language filters.
+        No client can bypass these security filters.
+
+        Only the payload fields selected by projection are transferred
+        (defaults to every field including full content).
+        """
+        if len(query_vector) != self.VECTOR_SIZE:
+            raise ValueError(
+                f"Invalid query vector dimension: {len(query_vector)}, expected {self.VECTOR_SIZE}"
+            )
+
+        if limit <= 0 or limit > 100:
+            raise ValueError(f"Invalid limit: {limit}. Must be between 1 and 100")
+
+        # Small projects are served by the in-process exact tier
+        tier_results = await self._search_exact_tier(
+            query_vector,
+            context,
+            limit,
+            score_threshold,
+            document_type,
+            importance_min,
+            projection,
+        )
+        if tier_results is not None:
+            return tier_results
+
+        # Build mandatory filter - CANNOT be bypassed by client
+        search_filter = self._build_search_filter(
+            context, document_type, importance_min
+        )
 
         # Enhanced telemetry for search operation
         query_params = {
@@ -491,6 +1374,7 @@ class QdrantVectorRepository(VectorRepository):
             "importance_min": importance_min,
             "collection_name": self.COLLECTION_NAME,
             "vector_size": len(query_vector),
+            "quantization": self.storage_config.quantization.value,
         }
 
         async with qdrant_telemetry.trace_qdrant_operation(
@@ -511,49 +1395,17 @@ class QdrantVectorRepository(VectorRepository):
                         query_filter=search_filter,
                         limit=limit,
                         score_threshold=score_threshold,
-                        with_payload=True,
+                        with_payload=self._payload_selector(projection),
                         with_vectors=False,  # Don't need vectors in results
+                        search_params=self._build_search_params(),
+                        shard_key_selector=self._read_shard_key(context.project_id),
                     ),
-                    timeout=5.0,  # 5 second timeout
-                )
-
-                # Convert to SearchResult domain objects
-                results = []
-                scores = []  # Track scores for metrics
-                for rank, scored_point in enumerate(search_result, 1):
-                    # Double-check that results match filter (defense in depth)
-                    payload = scored_point.payload
-                    if payload.get("project_id") != str(
-                        context.project_id
-                    ) or payload.get("language") != str(context.language):
-                        # Log security alert and skip this result
-                        logger.warning(
-                            "SECURITY ALERT: Filter bypass detected in search result",
-                            point_id=scored_point.id,
-                            expected_project_id=str(context.project_id),
-                            actual_project_id=payload.get("project_id"),
-                            expected_language=str(context.language),
-                            actual_language=payload.get("language"),
-                            security_event="filter_bypass",
-                            operation="search_validation",
-                        )
-                        continue
-
-                    # Validate score is within expected range
-                    score = min(max(scored_point.score, 0.0), 1.0)  # Clamp to [0, 1]
-                    scores.append(score)
-
-                    point = VectorPoint.from_qdrant_search_result(
-                        point_id=str(scored_point.id),
-                        payload=scored_point.payload,
-                    )
+                    timeout=self.SEARCH_TIMEOUT,
+                )
 
-                    result = SearchResult(
-                        point=point,
-                        score=score,
-                        rank=rank,
-                    )
-                    results.append(result)
+                # Convert to SearchResult domain objects (defense in depth)
+                results, scores = self._build_search_results(search_result, context)
+                results = await self._apply_projection(results, context, projection)
 
                 # Record search-specific metrics
                 qdrant_telemetry.record_search_metrics(
@@ -571,17 +1423,334 @@ class QdrantVectorRepository(VectorRepository):
                 return results
 
             except asyncio.TimeoutError as e:
-                span.set_attribute("error.timeout", "5s")
-                raise TimeoutError(f"Search query timed out after 5 seconds") from e
+                span.set_attribute("error.timeout", f"{self.SEARCH_TIMEOUT}s")
+                raise TimeoutError(
+                    f"Search query timed out after {self.SEARCH_TIMEOUT} seconds"
+                ) from e
             except Exception as e:
                 # Error handling is already done by the telemetry wrapper
                 raise RuntimeError(f"Search failed: {e}") from e
 
+    async def search_similar_batch(
+        self,
+        query_vectors: List[VectorData],
+        context: SearchContext,
+        limit: int = 10,
+        score_threshold: float = 0.0,
+        document_type: Optional[DocumentType] = None,
+        importance_min: Optional[float] = None,
+        projection: Optional[PayloadProjection] = None,
+    ) -> List[List[SearchResult]]:
+        """
+        Search for several query vectors in a single search_batch request.
+
+        CRITICAL: Every request in the batch shares the same mandatory
+        project_id and language filter, and every result is re-validated
+        against the search context exactly like search_similar.
+        """
+        if not query_vectors:
+            return []
+
+        if len(query_vectors) > self.MAX_SEARCH_BATCH_SIZE:
+            raise ValueError(
+                f"Too many query vectors: {len(query_vectors)}. "
+                f"Maximum is {self.MAX_SEARCH_BATCH_SIZE}"
+            )
+
+        for query_vector in query_vectors:
+            if len(query_vector) != self.VECTOR_SIZE:
+                raise ValueError(
+                    f"Invalid query vector dimension: {len(query_vector)}, expected {self.VECTOR_SIZE}"
+                )
+
+        if limit <= 0 or limit > 100:
+            raise ValueError(f"Invalid limit: {limit}. Must be between 1 and 100")
+
+        if await self._ensure_exact_tier(context.project_id):
+            tier_batch = []
+            for query_vector in query_vectors:
+                tier_results = await self._search_exact_tier(
+                    query_vector,
+                    context,
+                    limit,
+                    score_threshold,
+                    document_type,
+                    importance_min,
+                    projection,
+                )
+                if tier_results is None:
+                    break
+                tier_batch.append(tier_results)
+            else:
+                return tier_batch
+
+        # Build mandatory filter once - shared by all requests in the batch
+        search_filter = self._build_search_filter(
+            context, document_type, importance_min
+        )
+        search_params = self._build_search_params()
+        shard_key = self._read_shard_key(context.project_id)
+        requests = [
+            models.SearchRequest(
+                vector=query_vector.to_list(),
+                filter=search_filter,
+                params=search_params,
+                shard_key=shard_key,
+                limit=limit,
+                score_threshold=score_threshold,
+                with_payload=self._payload_selector(projection),
+                with_vector=False,
+            )
+            for query_vector in query_vectors
+        ]
+
+        query_params = {
+            "limit": limit,
+            "score_threshold": score_threshold,
+            "document_type": document_type.value if document_type else None,
+            "importance_min": importance_min,
+            "collection_name": self.COLLECTION_NAME,
+            "queries_count": len(requests),
+        }
+
+        async with qdrant_telemetry.trace_qdrant_operation(
+            QdrantOperationType.SEARCH_BATCH, **query_params
+        ) as span:
+            qdrant_telemetry.add_project_context(
+                span, context.project_id, str(context.language)
+            )
+
+            try:
+                batch_result = await asyncio.wait_for(
+                    self.client.search_batch(
+                        collection_name=self.COLLECTION_NAME,
+                        requests=requests,
+                    ),
+                    timeout=self.SEARCH_TIMEOUT,
+                )
+
+                all_results = []
+                total_found = 0
+                for scored_points in batch_result:
+                    results, scores = self._build_search_results(scored_points, context)
+                    qdrant_telemetry.record_search_metrics(
+                        QdrantOperationType.SEARCH_BATCH,
+                        len(results),
+                        scores,
+                        query_params,
+                    )
+                    total_found += len(results)
+                    all_results.append(results)
+
+                # One content store fetch for every query in the batch
+                flat_results = await self._apply_projection(
+                    [result for results in all_results for result in results],
+                    context,
+                    projection,
+                )
+                offset = 0
+                for index, results in enumerate(all_results):
+                    all_results[index] = flat_results[offset : offset + len(results)]
+                    offset += len(results)
+
+                span.set_attribute("qdrant.results_returned", total_found)
+                return all_results
+
+            except asyncio.TimeoutError as e:
+                span.set_attribute("error.timeout", f"{self.SEARCH_TIMEOUT}s")
+                raise TimeoutError(
+                    f"Batch search timed out after {self.SEARCH_TIMEOUT} seconds"
+                ) from e
+            except Exception as e:
+                raise RuntimeError(f"Batch search failed: {e}") from e
+
+    async def hybrid_search_similar(
+        self,
+        query_text: str,
+        query_vector: VectorData,
+        context: SearchContext,
+        limit: int = 10,
+        text_weight: float = 0.3,
+        vector_weight: float = 0.7,
+        fusion: HybridFusion = HybridFusion.WEIGHTED,
+        score_threshold: float = 0.0,
+        document_type: Optional[DocumentType] = None,
+        importance_min: Optional[float] = None,
+        projection: Optional[PayloadProjection] = None,
+    ) -> List[SearchResult]:
+        """
+        Combine dense similarity and BM25 keyword search in one Qdrant query.
+
+        Both prefetch branches and the fused query carry the same mandatory
+        project_id and language filter, and every result is re-validated
+        against the search context exactly like search_similar. Collections
+        without the sparse vector are searched dense-only.
+        """
+        if len(query_vector) != self.VECTOR_SIZE:
+            raise ValueError(
+                f"Invalid query vector dimension: {len(query_vector)}, expected {self.VECTOR_SIZE}"
+            )
+
+        if limit <= 0 or limit > 100:
+            raise ValueError(f"Invalid limit: {limit}. Must be between 1 and 100")
+
+        if text_weight < 0 or vector_weight < 0 or text_weight + vector_weight <= 0:
+            raise ValueError(
+                f"Invalid hybrid weights: text_weight={text_weight}, "
+                f"vector_weight={vector_weight}. Weights must be non-negative "
+                "and not both zero"
+            )
+
+        fusion = HybridFusion(fusion)
+        sparse_query = self.sparse_encoder.encode_query(query_text)
+
+        # Build mandatory filter - applied to every branch, CANNOT be bypassed
+        search_filter = self._build_search_filter(
+            context, document_type, importance_min
+        )
+        if sparse_query.is_empty or not await self._sparse_vectors_enabled():
+            # No usable keywords or no sparse vector: plain dense query
+            prefetch = None
+            query: Any = query_vector.to_list()
+            search_params = self._build_search_params()
+        else:
+            prefetch_limit = min(limit * self.HYBRID_PREFETCH_FACTOR, 100)
+            prefetch = [
+                models.Prefetch(
+                    query=query_vector.to_list(),
+                    filter=search_filter,
+                    params=self._build_search_params(),
+                    limit=prefetch_limit,
+                ),
+                models.Prefetch(
+                    query=models.SparseVector(
+                        indices=sparse_query.indices, values=sparse_query.values
+                    ),
+                    using=self.SPARSE_VECTOR_NAME,
+                    filter=search_filter,
+                    limit=prefetch_limit,
+                ),
+            ]
+            query = self._build_fusion_query(fusion, text_weight, vector_weight)
+            search_params = None
+
+        query_params = {
+            "limit": limit,
+            "score_threshold": score_threshold,
+            "document_type": document_type.value if document_type else None,
+            "importance_min": importance_min,
+            "collection_name": self.COLLECTION_NAME,
+            "fusion": fusion.value,
+            "text_weight": text_weight,
+            "vector_weight": vector_weight,
+            "query_terms": len(sparse_query),
+        }
+
+        async with qdrant_telemetry.trace_qdrant_operation(
+            QdrantOperationType.HYBRID_SEARCH, **query_params
+        ) as span:
+            qdrant_telemetry.add_project_context(
+                span, context.project_id, str(context.language)
+            )
+
+            try:
+                response = await asyncio.wait_for(
+                    self.client.query_points(
+                        collection_name=self.COLLECTION_NAME,
+                        prefetch=prefetch,
+                        query=query,
+                        query_filter=search_filter,
+                        search_params=search_params,
+                        limit=limit,
+                        score_threshold=score_threshold or None,
+                        with_payload=self._payload_selector(projection),
+                        with_vectors=False,
+                        shard_key_selector=self._read_shard_key(context.project_id),
+                    ),
+                    timeout=self.SEARCH_TIMEOUT,
+                )
+
+                results, scores = self._build_search_results(response.points, context)
+                results = await self._apply_projection(results, context, projection)
+
+                qdrant_telemetry.record_search_metrics(
+                    QdrantOperationType.HYBRID_SEARCH,
+                    len(results),
+                    scores,
+                    query_params,
+                )
+                span.set_attribute("qdrant.results_returned", len(results))
+                return results
+
+            except asyncio.TimeoutError as e:
+                span.set_attribute("error.timeout", f"{self.SEARCH_TIMEOUT}s")
+                raise TimeoutError(
+                    f"Hybrid search timed out after {self.SEARCH_TIMEOUT} seconds"
+                ) from e
+            except Exception as e:
+                raise RuntimeError(f"Hybrid search failed: {e}") from e
+
+    async def _content_hashes(self, project_id: Any, conditions: List[Any]) -> Set[str]:
+        """Content hashes of the project's points matching extra conditions."""
+        scroll_filter = models.Filter(
+            must=[
+                models.FieldCondition(
+                    key="project_id", match=models.MatchValue(value=str(project_id))
+                ),
+                *conditions,
+            ]
+        )
+        hashes: Set[str] = set()
+        offset = None
+        while True:
+            records, offset = await asyncio.to_thread(
+                self.client.scroll,
+                collection_name=self.COLLECTION_NAME,
+                scroll_filter=scroll_filter,
+                limit=self.MAX_BATCH_SIZE,
+                offset=offset,
+                with_payload=["content_hash"],
+                with_vectors=False,
+                shard_key_selector=self._read_shard_key(project_id),
+            )
+            hashes.update(
+                record.payload["content_hash"]
+                for record in records
+                if record.payload and record.payload.get("content_hash")
+            )
+            if offset is None:
+                return hashes
+
+    async def _release_content(self, project_id: Any, content_hashes: Set[str]) -> None:
+        """
+        Delete external content no remaining point of the project references.
+
+        Identical chunks share one content row, so a hash is only deleted once
+        no other point of the project still carries it.
+        """
+        hashes = sorted(content_hashes)
+        for i in range(0, len(hashes), self.MAX_BATCH_SIZE):
+            batch = hashes[i : i + self.MAX_BATCH_SIZE]
+            still_used = await self._content_hashes(
+                project_id,
+                [
+                    models.FieldCondition(
+                        key="content_hash", match=models.MatchAny(any=batch)
+                    )
+                ],
+            )
+            unused = [
+                content_hash for content_hash in batch if content_hash not in still_used
+            ]
+            if unused:
+                await self.content_store.delete_many(project_id, unused)
+
     async def delete_points(self, point_ids: List[UUID], project_id: UUID) -> None:
         """
         Delete vector points by their IDs with mandatory project isolation.
 
         SECURITY: Only deletes points that belong to the specified project.
+        In external content mode, content no other point uses is deleted too.
         """
         if not project_id:
             raise ValueError("project_id is required for point deletion")
@@ -590,15 +1759,40 @@ class QdrantVectorRepository(VectorRepository):
             return
 
         try:
-            # SECURITY: Use HasIdCondition for correct ID filtering with project isolation
-            # HasIdCondition handles ID-based filtering properly in Qdrant
+            content_hashes: Set[str] = set()
+            if self.storage_config.content_external:
+                content_hashes = await self._content_hashes(
+                    project_id,
+                    [models.HasIdCondition(has_id=[str(pid) for pid in point_ids])],
+                )
+
+            # SECURITY: Combine HasIdCondition with the project_id condition so
+            # IDs belonging to other projects are never deleted
             # Instrumented client already provides async methods
-            await self.client.delete(
-                collection_name=self.COLLECTION_NAME,
-                points_selector=models.HasIdCondition(
-                    has_id=[str(pid) for pid in point_ids]
-                ),
-            )
+            for shard_key in self._write_shard_keys(project_id):
+                await self.client.delete(
+                    collection_name=self.COLLECTION_NAME,
+                    points_selector=models.FilterSelector(
+                        filter=models.Filter(
+                            must=[
+                                models.HasIdCondition(
+                                    has_id=[str(pid) for pid in point_ids]
+                                ),
+                                models.FieldCondition(
+                                    key="project_id",
+                                    match=models.MatchValue(value=str(project_id)),
+                                ),
+                            ]
+                        )
+                    ),
+                    shard_key_selector=shard_key,
+                )
+
+            if content_hashes:
+                await self._release_content(project_id, content_hashes)
+
+            if self.exact_tier is not None:
+                self.exact_tier.remove(project_id, [str(pid) for pid in point_ids])
 
             logger.info(
                 "Deleted points with project isolation",
@@ -611,7 +1805,11 @@ class QdrantVectorRepository(VectorRepository):
             raise RuntimeError(f"Failed to delete points: {e}") from e
 
     async def delete_by_filter(self, context: SearchContext) -> int:
-        """Delete points matching project and language filter."""
+        """
+        Delete points matching project and language filter.
+
+        In external content mode, content no other point uses is deleted too.
+        """
         try:
             # Build mandatory filter
             filter_condition = models.Filter(
@@ -629,13 +1827,26 @@ class QdrantVectorRepository(VectorRepository):
 
             # Get count before deletion
             count_before = await self.count_points(context)
+            content_hashes: Set[str] = set()
+            if self.storage_config.content_external:
+                content_hashes = await self._content_hashes(
+                    context.project_id, filter_condition.must[1:]
+                )
 
-            # Delete matching points
+            # Delete matching points - only the project's shard keys are touched
             # Instrumented client already provides async methods
-            await self.client.delete(
-                collection_name=self.COLLECTION_NAME,
-                points_selector=filter_condition,
-            )
+            for shard_key in self._write_shard_keys(context.project_id):
+                await self.client.delete(
+                    collection_name=self.COLLECTION_NAME,
+                    points_selector=filter_condition,
+                    shard_key_selector=shard_key,
+                )
+
+            if content_hashes:
+                await self._release_content(context.project_id, content_hashes)
+
+            if self.exact_tier is not None:
+                self.exact_tier.evict(context.project_id)
 
             return count_before
 
@@ -662,6 +1873,7 @@ class QdrantVectorRepository(VectorRepository):
             count = await self.client.count(
                 collection_name=self.COLLECTION_NAME,
                 count_filter=filter_condition,
+                shard_key_selector=self._read_shard_key(context.project_id),
             )
             return count.count
 
@@ -688,20 +1900,8 @@ class QdrantVectorRepository(VectorRepository):
             # Validate schema
             validation_errors = await self.validate_schema()
 
-            # Check indexed fields
-            indexed_fields = []
-            try:
-                # Instrumented client already provides async methods
-                collection_info = await self.client.get_collection(self.COLLECTION_NAME)
-                payload_schema = collection_info.payload_schema
-                if hasattr(payload_schema, "get_schema"):
-                    indexed_fields = list(payload_schema.get_schema().keys())
-                elif hasattr(payload_schema, "__dict__"):
-                    indexed_fields = list(payload_schema.__dict__.keys())
-                else:
-                    indexed_fields = []
-            except Exception:
-                pass
+            # Indexed fields come from the same snapshot
+            indexed_fields = info.get("payload_indexes") or []
 
             # Check configuration
             config_status = {
@@ -709,6 +1909,11 @@ class QdrantVectorRepository(VectorRepository):
                 "distance_metric_correct": info.get("distance")
                 in ["Distance.COSINE", "Cosine"],
                 "hnsw_optimized": bool(info.get("hnsw_config")),
+                "tenant_layout_correct": not self.tenant_config.custom_sharding
+                or info.get("sharding_method") == models.ShardingMethod.CUSTOM.value,
+                "storage_config_correct": info.get("quantization")
+                == self.storage_config.quantization.value
+                and info.get("vectors_on_disk") == self.storage_config.vectors_on_disk,
                 "indexes_created": len(indexed_fields) >= 5,
             }
 
@@ -772,6 +1977,7 @@ class QdrantCollectionManager(CollectionManager):
                 await self.repository.client.delete_collection(
                     self.repository.COLLECTION_NAME,
                 )
+                self.repository.invalidate_collection_info()
                 logger.info(
                     "Deleted collection",
                     collection_name=self.repository.COLLECTION_NAME,
@@ -805,6 +2011,9 @@ class QdrantCollectionManager(CollectionManager):
                         "payload_m": self.repository.HNSW_PAYLOAD_M,
                         "ef_construct": self.repository.HNSW_EF_CONSTRUCT,
                     },
+                    "storage": self.repository.storage_config.to_dict(),
+                    "tenant_layout": self.repository.tenant_config.to_dict(),
+                    "dedicated_projects": len(self.repository.dedicated_projects),
                     "batch_size_limit": self.repository.MAX_BATCH_SIZE,
                 },
             }
@@ -5,16 +5,20 @@ Implements the VectorSearchService interface with strict security controls.
 All search operations are filtered by project_id AND language - no exceptions.
 """
 
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from uuid import UUID
 
 from qdrant_client import QdrantClient
 
+from ...core.deadline import check_deadline
+
 from .domain.entities import (
     SearchResult,
     SearchContext,
     VectorData,
     DocumentType,
+    HybridFusion,
+    PayloadProjection,
 )
 from .repositories.interfaces import VectorSearchService, VectorRepository
 
@@ -47,6 +51,7 @@ class DefaultVectorSearchService(VectorSearchService):
         context: SearchContext,
         limit: int = 10,
         filters: Optional[Dict[str, Any]] = None,
+        projection: Optional[PayloadProjection] = None,
     ) -> List[SearchResult]:
         """
         Search for similar vectors with mandatory filtering.
@@ -56,14 +61,94 @@ class DefaultVectorSearchService(VectorSearchService):
             context: Search context (project_id and language are mandatory)
             limit: Maximum number of results
             filters: Optional additional filters (document_type, importance_min, etc.)
+            projection: Payload fields to return (defaults to all fields
+                including full content)
 
         Returns:
             List of search results ranked by similarity
 
         Raises:
             ValueError: If context is missing required fields or invalid parameters
+            DeadlineExceeded: If the workflow deadline has passed
+        """
+        self._validate_context(context)
+        check_deadline("vector.search")
+        document_type, importance_min, score_threshold = self._parse_filters(filters)
+
+        # Validate limit
+        if limit <= 0 or limit > 100:
+            raise ValueError(f"Invalid limit: {limit}. Must be between 1 and 100")
+
+        # Delegate to repository with enforced filters
+        return await self.repository.search_similar(
+            query_vector=query_vector,
+            context=context,
+            limit=limit,
+            score_threshold=score_threshold,
+            document_type=document_type,
+            importance_min=importance_min,
+            projection=projection,
+        )
+
+    async def search_many(
+        self,
+        query_vectors: List[VectorData],
+        context: SearchContext,
+        limit: int = 10,
+        filters: Optional[Dict[str, Any]] = None,
+        projection: Optional[PayloadProjection] = None,
+    ) -> List[List[SearchResult]]:
+        """
+        Search for several query vectors in a single batched request.
+
+        All queries share one mandatory project_id and language filter and the
+        same optional refinements, so the repository can send them to Qdrant
+        as one search_batch call instead of N separate searches.
+
+        Args:
+            query_vectors: Query vectors for similarity search
+            context: Search context (project_id and language are mandatory)
+            limit: Maximum number of results per query
+            filters: Optional additional filters shared by all queries
+            projection: Payload fields to return (defaults to all fields
+                including full content)
+
+        Returns:
+            One list of search results per query vector, in request order
+
+        Raises:
+            ValueError: If context is missing required fields or invalid parameters
+            DeadlineExceeded: If the workflow deadline has passed
+        """
+        self._validate_context(context)
+        check_deadline("vector.search")
+        document_type, importance_min, score_threshold = self._parse_filters(filters)
+
+        if not query_vectors:
+            raise ValueError("At least one query vector is required")
+
+        # Validate limit
+        if limit <= 0 or limit > 100:
+            raise ValueError(f"Invalid limit: {limit}. Must be between 1 and 100")
+
+        return await self.repository.search_similar_batch(
+            query_vectors=query_vectors,
+            context=context,
+            limit=limit,
+            score_threshold=score_threshold,
+            document_type=document_type,
+            importance_min=importance_min,
+            projection=projection,
+        )
+
+    @staticmethod
+    def _validate_context(context: SearchContext) -> None:
+        """
+        Validate mandatory search context - CANNOT be bypassed.
+
+        Raises:
+            ValueError: If context or its mandatory fields are missing
         """
-        # Validate mandatory context - CANNOT be bypassed
         if not context:
             raise ValueError("SearchContext is required")
         if not context.project_id:
@@ -75,7 +160,19 @@ class DefaultVectorSearchService(VectorSearchService):
                 "SearchContext.language is required for language isolation"
             )
 
-        # Parse additional filters
+    @staticmethod
+    def _parse_filters(
+        filters: Optional[Dict[str, Any]],
+    ) -> Tuple[Optional[DocumentType], Optional[float], float]:
+        """
+        Parse and validate optional search filters.
+
+        Returns:
+            Tuple of (document_type, importance_min, score_threshold)
+
+        Raises:
+            ValueError: If any filter value is invalid
+        """
         document_type = None
         importance_min = None
         score_threshold = 0.0
@@ -109,19 +206,7 @@ class DefaultVectorSearchService(VectorSearchService):
                         f"Invalid score_threshold: {score_threshold}. Must be between 0.0 and 1.0"
                     )
 
-        # Validate limit
-        if limit <= 0 or limit > 100:
-            raise ValueError(f"Invalid limit: {limit}. Must be between 1 and 100")
-
-        # Delegate to repository with enforced filters
-        return await self.repository.search_similar(
-            query_vector=query_vector,
-            context=context,
-            limit=limit,
-            score_threshold=score_threshold,
-            document_type=document_type,
-            importance_min=importance_min,
-        )
+        return document_type, importance_min, score_threshold
 
     async def hybrid_search(
         self,
@@ -131,38 +216,75 @@ class DefaultVectorSearchService(VectorSearchService):
         limit: int = 10,
         text_weight: float = 0.3,
         vector_weight: float = 0.7,
+        fusion: HybridFusion = HybridFusion.WEIGHTED,
+        filters: Optional[Dict[str, Any]] = None,
+        projection: Optional[PayloadProjection] = None,
     ) -> List[SearchResult]:
         """
         Perform hybrid search combining text and vector similarity.
 
-        TODO(JEEX-VECTOR-003): Implement true hybrid search combining text + vector similarity
-        Current implementation is incomplete and ignores query_text parameter.
-        Production hybrid search should:
-        1. Perform text-based keyword search (BM25/full-text)
-        2. Perform vector similarity search
-        3. Combine scores using text_weight and vector_weight
-        4. Merge and re-rank results
-        For now, this uses vector-only search with simplified scoring adjustment.
-
-        Reference: See story "Setup Vector Database" for implementation roadmap
-        Priority: Medium (required for production-ready semantic search)
+        Runs as a single Qdrant query: a dense prefetch over the embedding and
+        a sparse BM25 prefetch over the query keywords (IDF applied
+        server-side), fused with reciprocal-rank fusion or a weighted sum of
+        the dense score and the saturated keyword score.
 
         Args:
-            query_text: Text query for keyword search (currently ignored - see TODO)
+            query_text: Text query for keyword search
             query_vector: Query vector for similarity search
             context: Search context with project_id and language
             limit: Maximum number of results
             text_weight: Weight for text search results (0.0-1.0)
             vector_weight: Weight for vector search results (0.0-1.0)
+            fusion: Rank fusion strategy (weights are ignored for RRF)
+            filters: Optional additional filters
+            projection: Payload fields to return (defaults to all fields
+                including full content)
 
         Returns:
             List of hybrid search results
+
+        Raises:
+            ValueError: If context, weights or filters are invalid
+            DeadlineExceeded: If the workflow deadline has passed
         """
-        # TODO(JEEX-VECTOR-003): Remove this NotImplementedError once hybrid search is implemented
-        # Track this feature in your issue tracker for proper prioritization
-        raise NotImplementedError(
-            "hybrid_search not implemented: query_text handling and true hybrid ranking TODO. "
-            "See JEEX-VECTOR-003 for implementation details."
+        self._validate_context(context)
+        check_deadline("vector.search")
+        document_type, importance_min, score_threshold = self._parse_filters(filters)
+
+        if not query_text or not query_text.strip():
+            raise ValueError("query_text is required for hybrid search")
+
+        if limit <= 0 or limit > 100:
+            raise ValueError(f"Invalid limit: {limit}. Must be between 1 and 100")
+
+        for name, weight in (
+            ("text_weight", text_weight),
+            ("vector_weight", vector_weight),
+        ):
+            if not 0.0 <= weight <= 1.0:
+                raise ValueError(
+                    f"Invalid {name}: {weight}. Must be between 0.0 and 1.0"
+                )
+        if text_weight + vector_weight == 0:
+            raise ValueError("text_weight and vector_weight cannot both be 0")
+
+        try:
+            fusion = HybridFusion(fusion)
+        except ValueError as e:
+            raise ValueError(f"Invalid fusion: {fusion}") from e
+
+        return await self.repository.hybrid_search_similar(
+            query_text=query_text,
+            query_vector=query_vector,
+            context=context,
+            limit=limit,
+            text_weight=text_weight,
+            vector_weight=vector_weight,
+            fusion=fusion,
+            score_threshold=score_threshold,
+            document_type=document_type,
+            importance_min=importance_min,
+            projection=projection,
         )
 
 
@@ -0,0 +1,117 @@
+"""
+BM25-style sparse encoder for hybrid vector search.
+
+Computes term-frequency weights for document content at upsert time.
+Inverse document frequency is applied server-side by Qdrant (IDF modifier
+on the sparse vector), so document weights never need recomputing when
+the corpus changes.
+"""
+
+import re
+import zlib
+from collections import Counter
+from typing import Dict, List
+
+from .domain.entities import SparseVectorData
+
+_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+class BM25SparseEncoder:
+    """
+    Encode text into sparse BM25 term-frequency vectors.
+
+    Terms are hashed into the unsigned 32-bit index space with CRC32, so no
+    vocabulary has to be stored or shared between processes. Hash collisions
+    are merged by summing their weights.
+    """
+
+    def __init__(
+        self,
+        k1: float = 1.2,
+        b: float = 0.75,
+        avg_doc_length: float = 256.0,
+        min_token_length: int = 2,
+    ):
+        """
+        Initialize BM25 sparse encoder.
+
+        Args:
+            k1: Term frequency saturation parameter
+            b: Document length normalization parameter
+            avg_doc_length: Expected average document length in tokens
+            min_token_length: Shorter tokens are ignored
+
+        Raises:
+            ValueError: If any parameter is out of range
+        """
+        if k1 < 0:
+            raise ValueError(f"k1 must be non-negative, got: {k1}")
+        if not 0.0 <= b <= 1.0:
+            raise ValueError(f"b must be between 0.0 and 1.0, got: {b}")
+        if avg_doc_length <= 0:
+            raise ValueError(f"avg_doc_length must be positive, got: {avg_doc_length}")
+
+        self.k1 = k1
+        self.b = b
+        self.avg_doc_length = avg_doc_length
+        self.min_token_length = min_token_length
+
+    def tokenize(self, text: str) -> List[str]:
+        """Split text into lowercase word tokens."""
+        return [
+            token
+            for token in _TOKEN_PATTERN.findall(text.lower())
+            if len(token) >= self.min_token_length
+        ]
+
+    @staticmethod
+    def term_index(token: str) -> int:
+        """Map a token to its sparse vector index."""
+        return zlib.crc32(token.encode("utf-8"))
+
+    def _to_sparse(self, weights: Dict[int, float]) -> SparseVectorData:
+        indices = sorted(weights)
+        return SparseVectorData(
+            indices=indices, values=[weights[index] for index in indices]
+        )
+
+    def encode_document(self, text: str) -> SparseVectorData:
+        """
+        Encode document content with BM25 term-frequency saturation.
+
+        Args:
+            text: Document content
+
+        Returns:
+            Sparse vector of BM25 term weights (without IDF)
+        """
+        tokens = self.tokenize(text)
+        if not tokens:
+            return SparseVectorData(indices=[], values=[])
+
+        length_norm = 1.0 - self.b + self.b * len(tokens) / self.avg_doc_length
+        weights: Dict[int, float] = {}
+        for token, tf in Counter(tokens).items():
+            index = self.term_index(token)
+            weight = tf * (self.k1 + 1.0) / (tf + self.k1 * length_norm)
+            weights[index] = weights.get(index, 0.0) + weight
+        return self._to_sparse(weights)
+
+    def encode_query(self, text: str) -> SparseVectorData:
+        """
+        Encode a keyword query.
+
+        Every distinct query term gets weight 1.0, so the server-side score is
+        the sum of IDF-weighted document term weights.
+
+        Args:
+            text: Query text
+
+        Returns:
+            Sparse query vector
+        """
+        weights: Dict[int, float] = {}
+        for token in set(self.tokenize(text)):
+            weights[self.term_index(token)] = 1.0
+        return self._to_sparse(weights)
@@ -0,0 +1,348 @@
+"""
+Tenant-aware shard management for the shared vector collection.
+
+Promotes very large projects from the shared shard key to a dedicated
+per-project shard key while the collection keeps serving traffic, so large
+tenants no longer slow down filtered search and bulk deletes for everyone.
+
+Usage:
+    python -m app.services.vector.tenant_sharding candidates
+    python -m app.services.vector.tenant_sharding promote <project_id>
+"""
+
+import asyncio
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+import structlog
+from qdrant_client import models
+
+from .repositories.qdrant_repository import QdrantVectorRepository
+
+logger = structlog.get_logger()
+
+
+class TenantShardMigrator:
+    """
+    Online re-sharding of project points into dedicated shard keys.
+
+    Routing is shared through Qdrant: every process reloads it every
+    routing_refresh_seconds (see QdrantVectorRepository.refresh_tenant_routing).
+    Promotion runs in four steps:
+    1. Create the dedicated shard key, which starts dual writes for the
+       project, and wait until every process has picked that up.
+    2. Copy existing points from the shared shard key with a bounded scroll.
+    3. Create the project's routing alias, which cuts reads and writes over
+       to the dedicated shard key, and wait until every process has picked
+       that up; then copy again any points updated since the migration
+       started.
+    4. Remove the project's points from the shared shard key.
+
+    Reads keep hitting the shared shard key until cutover, so search results
+    stay complete throughout the migration.
+    """
+
+    SCROLL_BATCH_SIZE = 256
+
+    def __init__(
+        self,
+        repository: QdrantVectorRepository,
+        batch_size: Optional[int] = None,
+        routing_grace_seconds: Optional[float] = None,
+    ):
+        """
+        Initialize tenant shard migrator.
+
+        Args:
+            repository: Repository configured with custom sharding
+            batch_size: Points per scroll/upsert batch
+            routing_grace_seconds: Wait after each routing change for other
+                processes to reload it (defaults to two refresh intervals)
+
+        Raises:
+            ValueError: If custom sharding is disabled, batch_size is invalid
+                or routing_grace_seconds is negative
+        """
+        if not repository.tenant_config.custom_sharding:
+            raise ValueError(
+                "Tenant shard migration requires custom sharding to be enabled"
+            )
+        batch_size = batch_size or self.SCROLL_BATCH_SIZE
+        if batch_size <= 0:
+            raise ValueError("batch_size must be positive")
+        if routing_grace_seconds is None:
+            # A refresh may be in flight when the routing changes
+            routing_grace_seconds = 2 * repository.tenant_config.routing_refresh_seconds
+        if routing_grace_seconds < 0:
+            raise ValueError("routing_grace_seconds must not be negative")
+
+        self.repository = repository
+        self.batch_size = batch_size
+        self.routing_grace_seconds = routing_grace_seconds
+
+    @property
+    def _shared_key(self) -> str:
+        return self.repository.tenant_config.shared_shard_key
+
+    @staticmethod
+    def _project_filter(
+        project_id: UUID, updated_since: Optional[datetime] = None
+    ) -> models.Filter:
+        """Build a filter selecting one project's points."""
+        conditions: List[Any] = [
+            models.FieldCondition(
+                key="project_id", match=models.MatchValue(value=str(project_id))
+            )
+        ]
+        if updated_since is not None:
+            conditions.append(
+                models.FieldCondition(
+                    key="updated_at",
+                    range=models.DatetimeRange(gte=updated_since),
+                )
+            )
+        return models.Filter(must=conditions)
+
+    async def find_promotion_candidates(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        Find projects on the shared shard key that exceed the promotion threshold.
+
+        Args:
+            limit: Maximum number of projects to inspect (largest first)
+
+        Returns:
+            List of {"project_id", "points_count"} sorted by size descending
+        """
+        response = await asyncio.to_thread(
+            self.repository.client.facet,
+            collection_name=self.repository.COLLECTION_NAME,
+            key="project_id",
+            limit=limit,
+            exact=True,
+            shard_key_selector=self._shared_key,
+        )
+        threshold = self.repository.tenant_config.dedicated_shard_threshold
+        dedicated = self.repository.dedicated_projects
+        return [
+            {"project_id": str(hit.value), "points_count": hit.count}
+            for hit in response.hits
+            if hit.count >= threshold and str(hit.value) not in dedicated
+        ]
+
+    async def _copy_points(
+        self,
+        project_id: UUID,
+        target_key: str,
+        updated_since: Optional[datetime] = None,
+    ) -> int:
+        """Copy a project's points from the shared shard key to target_key."""
+        copied = 0
+        offset = None
+        scroll_filter = self._project_filter(project_id, updated_since)
+
+        while True:
+            records, offset = await asyncio.to_thread(
+                self.repository.client.scroll,
+                collection_name=self.repository.COLLECTION_NAME,
+                scroll_filter=scroll_filter,
+                limit=self.batch_size,
+                offset=offset,
+                with_payload=True,
+                with_vectors=True,
+                shard_key_selector=self._shared_key,
+            )
+            if records:
+                await self.repository.client.upsert(
+                    collection_name=self.repository.COLLECTION_NAME,
+                    points=[
+                        models.PointStruct(
+                            id=record.id, vector=record.vector, payload=record.payload
+                        )
+                        for record in records
+                    ],
+                    shard_key_selector=target_key,
+                )
+                copied += len(records)
+            if offset is None:
+                return copied
+
+    async def _create_routing_alias(self, project_id: UUID) -> None:
+        """Record the project's cutover for every process."""
+        # Aliases cannot point at aliases: target the physical collection
+        collection = self.repository.COLLECTION_NAME
+        aliases = await asyncio.to_thread(self.repository.client.get_aliases)
+        for alias in aliases.aliases:
+            if alias.alias_name == collection:
+                collection = alias.collection_name
+        await asyncio.to_thread(
+            self.repository.client.update_collection_aliases,
+            change_aliases_operations=[
+                models.CreateAliasOperation(
+                    create_alias=models.CreateAlias(
+                        collection_name=collection,
+                        alias_name=self.repository.routing_alias(project_id),
+                    )
+                )
+            ],
+        )
+
+    async def _drop_shard_key(self, shard_key: str) -> None:
+        """Remove the shard key of a failed promotion, which ends dual writes."""
+        try:
+            await asyncio.to_thread(
+                self.repository.client.delete_shard_key,
+                collection_name=self.repository.COLLECTION_NAME,
+                shard_key=shard_key,
+            )
+        except Exception as e:
+            logger.warning(
+                "Failed to drop dedicated shard key",
+                shard_key=shard_key,
+                error=str(e),
+                operation="promote_project",
+            )
+
+    async def promote_project(self, project_id: UUID) -> Dict[str, Any]:
+        """
+        Move a project to a dedicated shard key without downtime.
+
+        Args:
+            project_id: Project to promote
+
+        Returns:
+            Migration report with copied points and throughput
+
+        Raises:
+            RuntimeError: If the migration fails (the project stays on the shared shard)
+        """
+        project_key = str(project_id)
+        if project_key in self.repository.dedicated_projects:
+            return {"project_id": project_key, "status": "already_dedicated"}
+
+        target_key = self.repository.tenant_config.dedicated_shard_key(project_id)
+        started_at = datetime.utcnow()
+        start_time = time.perf_counter()
+
+        logger.info(
+            "Starting tenant shard promotion",
+            project_id=project_key,
+            shard_key=target_key,
+            operation="promote_project",
+        )
+
+        cut_over = False
+        try:
+            await asyncio.to_thread(
+                self.repository.client.create_shard_key,
+                collection_name=self.repository.COLLECTION_NAME,
+                shard_key=target_key,
+            )
+            self.repository.mark_project_migrating(project_id)
+            # Every process must dual-write before the copy starts, or its
+            # deletes on the shared key would be undone by the copy
+            await asyncio.sleep(self.routing_grace_seconds)
+
+            copied = await self._copy_points(project_id, target_key)
+
+            await self._create_routing_alias(project_id)
+            cut_over = True
+            self.repository.mark_project_dedicated(project_id)
+            # The shared copy is only removed once no process reads it any more
+            await asyncio.sleep(self.routing_grace_seconds)
+            caught_up = await self._copy_points(
+                project_id, target_key, updated_since=started_at
+            )
+
+            await self.repository.client.delete(
+                collection_name=self.repository.COLLECTION_NAME,
+                points_selector=self._project_filter(project_id),
+                shard_key_selector=self._shared_key,
+            )
+
+        except Exception as e:
+            self.repository.unmark_project_migrating(project_id)
+            if not cut_over:
+                await self._drop_shard_key(target_key)
+            logger.error(
+                "Tenant shard promotion failed",
+                project_id=project_key,
+                shard_key=target_key,
+                error=str(e),
+                operation="promote_project",
+            )
+            raise RuntimeError(f"Failed to promote project {project_key}: {e}") from e
+
+        duration = time.perf_counter() - start_time
+        report = {
+            "project_id": project_key,
+            "status": "promoted",
+            "shard_key": target_key,
+            "points_copied": copied,
+            "points_caught_up": caught_up,
+            "duration_seconds": duration,
+            "points_per_second": copied / duration if duration > 0 else 0.0,
+        }
+        logger.info("Tenant shard promotion completed", **report)
+        return report
+
+    async def promote_large_projects(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        Promote every shared-shard project above the dedicated shard threshold.
+
+        Args:
+            limit: Maximum number of projects to inspect
+
+        Returns:
+            Migration reports, one per promoted project
+        """
+        reports = []
+        for candidate in await self.find_promotion_candidates(limit):
+            reports.append(await self.promote_project(UUID(candidate["project_id"])))
+        return reports
+
+
+async def main() -> None:
+    """Command line entry point for tenant shard management."""
+    import argparse
+    import json
+
+    from qdrant_client import QdrantClient
+
+    from ...core.config import get_settings
+    from .domain.entities import TenantLayoutConfig
+
+    parser = argparse.ArgumentParser(description="Tenant shard management")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("candidates", help="List projects above the threshold")
+    promote_parser = subparsers.add_parser("promote", help="Promote one project")
+    promote_parser.add_argument("project_id", type=UUID)
+    subparsers.add_parser("promote-all", help="Promote all projects above threshold")
+    args = parser.parse_args()
+
+    settings = get_settings()
+    repository = QdrantVectorRepository(
+        QdrantClient(url=settings.QDRANT_URL, timeout=settings.QDRANT_TIMEOUT),
+        tenant_config=TenantLayoutConfig(
+            tenant_index=settings.QDRANT_TENANT_INDEX,
+            custom_sharding=settings.QDRANT_CUSTOM_SHARDING,
+            dedicated_shard_threshold=settings.QDRANT_DEDICATED_SHARD_THRESHOLD,
+            routing_refresh_seconds=settings.QDRANT_TENANT_ROUTING_REFRESH_SECONDS,
+        ),
+    )
+    await repository.refresh_tenant_routing()
+    migrator = TenantShardMigrator(repository)
+
+    if args.command == "candidates":
+        result: Any = await migrator.find_promotion_candidates()
+    elif args.command == "promote":
+        result = await migrator.promote_project(args.project_id)
+    else:
+        result = await migrator.promote_large_projects()
+
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -21,25 +21,37 @@ Requirements Validated:
 __version__ = "1.0.0"
 __author__ = "JEEX Performance Team"
 
-from .test_vector_performance import (
-    VectorPerformanceBenchmark,
-    PerformanceMetrics,
-    BenchmarkConfig,
-    VectorDataGenerator,
-    PerformanceMonitor,
-    TestVectorPerformance,
-)
+import importlib
+from typing import Any
+
+# Exports are imported on first access: the reporter needs matplotlib, which
+# offline harnesses and their tests must not require
+_EXPORTS = {
+    "VectorPerformanceBenchmark": "test_vector_performance",
+    "PerformanceMetrics": "test_vector_performance",
+    "BenchmarkConfig": "test_vector_performance",
+    "VectorDataGenerator": "test_vector_performance",
+    "PerformanceMonitor": "test_vector_performance",
+    "TestVectorPerformance": "test_vector_performance",
+    "PerformanceBenchmarkRunner": "benchmark_runner",
+    "BenchmarkSuite": "benchmark_runner",
+    "PerformanceReporter": "performance_reporter",
+    "PerformanceTrend": "performance_reporter",
+    "PerformanceTestConfig": "config",
+    "PerformanceTargets": "config",
+    "TestConfiguration": "config",
+    "EnvironmentConfiguration": "config",
+    "get_config": "config",
+    "get_performance_threshold": "config",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(f".{module}", __name__), name)
 
-from .benchmark_runner import PerformanceBenchmarkRunner, BenchmarkSuite
-from .performance_reporter import PerformanceReporter, PerformanceTrend
-from .config import (
-    PerformanceTestConfig,
-    PerformanceTargets,
-    TestConfiguration,
-    EnvironmentConfiguration,
-    get_config,
-    get_performance_threshold,
-)
 
 __all__ = [
     # Core benchmarking classes
@@ -0,0 +1,193 @@
+"""
+Document version storage benchmark: bytes saved against read latency.
+
+Simulates an iterative agent workflow (dozens of near-identical versions of
+one document), encodes the history under several delta chain caps, and
+reports stored content bytes and the latency of reading a version (replaying
+its chain from the snapshot). Chain cap 0 is the full-snapshot baseline;
+snapshot text is also reported zlib-compressed as a proxy for TOAST.
+
+Runs in-process, no database required.
+
+Usage:
+    python -m tests.performance.document_version_benchmark
+    python -m tests.performance.document_version_benchmark --versions 200 --lines 800
+"""
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Add the backend directory to the path for imports
+backend_dir = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from app.services.document_versions import (
+    DELTA,
+    VersionStoragePolicy,
+    encode_version,
+    reconstruct_contents,
+    stored_size,
+)
+from tests.performance.offline_benchmark import percentile
+
+CHAIN_CAPS = [0, 4, 8, 16, 32]
+
+
+@dataclass
+class VersionRow:
+    """Storage columns of a document_versions row."""
+
+    version: int
+    content_storage: str = "snapshot"
+    stored_content: Optional[str] = None
+    content_delta: Optional[bytes] = None
+    delta_base_version: Optional[int] = None
+    snapshot_version: Optional[int] = None
+    delta_chain_length: int = 0
+    content_hash: Optional[str] = None
+
+
+def generate_history(versions: int, lines: int, seed: int) -> List[str]:
+    """Generate a document and successive versions with small edits."""
+    rng = random.Random(seed)
+    words = [f"term{i}" for i in range(500)]
+
+    def sentence() -> str:
+        return " ".join(rng.choice(words) for _ in range(rng.randint(8, 16))) + ".\n"
+
+    document = [sentence() for _ in range(lines)]
+    history = ["".join(document)]
+    for _ in range(versions - 1):
+        for _ in range(rng.randint(1, 4)):
+            edit = rng.random()
+            position = rng.randrange(len(document))
+            if edit < 0.6:
+                document[position] = sentence()
+            elif edit < 0.85:
+                document.insert(position, sentence())
+            elif len(document) > 1:
+                del document[position]
+        history.append("".join(document))
+    return history
+
+
+def encode_history(history: List[str], policy: VersionStoragePolicy) -> List[Any]:
+    """Encode versions in order, each against its predecessor."""
+    rows: List[VersionRow] = []
+    for number, content in enumerate(history, start=1):
+        row = VersionRow(version=number)
+        previous = rows[-1] if rows else None
+        encode_version(
+            row, content, previous, history[number - 2] if previous else None, policy
+        )
+        rows.append(row)
+    return rows
+
+
+def fresh_chain(rows: List[Any], version: int) -> List[VersionRow]:
+    """Copy the rows a read of one version loads (nothing pre-reconstructed)."""
+    target = rows[version - 1]
+    lowest = target.snapshot_version if target.content_storage == DELTA else version
+    return [
+        VersionRow(**{k: v for k, v in vars(row).items() if not k.startswith("_")})
+        for row in rows[lowest - 1 : version]
+    ]
+
+
+def benchmark_cap(
+    history: List[str], chain_cap: int, reads: int, seed: int
+) -> Dict[str, Any]:
+    """Measure storage and read latency for one chain cap."""
+    policy = VersionStoragePolicy(max_chain_length=chain_cap)
+    start = time.perf_counter()
+    rows = encode_history(history, policy)
+    encode_seconds = time.perf_counter() - start
+
+    snapshot_rows = [row for row in rows if row.content_storage != DELTA]
+    stored_bytes = sum(stored_size(row) for row in rows)
+    stored_bytes_compressed = sum(
+        len(zlib.compress(row.stored_content.encode("utf-8"))) for row in snapshot_rows
+    ) + sum(stored_size(row) for row in rows if row.content_storage == DELTA)
+
+    rng = random.Random(seed)
+    latencies_ms: List[float] = []
+    replayed: List[int] = []
+    for _ in range(reads):
+        version = rng.randint(1, len(rows))
+        chain = fresh_chain(rows, version)
+        start = time.perf_counter()
+        contents = reconstruct_contents(chain)
+        latencies_ms.append((time.perf_counter() - start) * 1000)
+        replayed.append(rows[version - 1].delta_chain_length)
+        assert contents[version] == history[version - 1]
+
+    return {
+        "chain_cap": chain_cap,
+        "snapshots": len(snapshot_rows),
+        "deltas": len(rows) - len(snapshot_rows),
+        "stored_bytes": stored_bytes,
+        "stored_bytes_snapshots_compressed": stored_bytes_compressed,
+        "encode_ms_per_version": round(encode_seconds * 1000 / len(rows), 3),
+        "read_p50_ms": round(percentile(latencies_ms, 50), 3),
+        "read_p95_ms": round(percentile(latencies_ms, 95), 3),
+        "read_mean_ms": round(statistics.fmean(latencies_ms), 3),
+        "max_deltas_replayed": max(replayed),
+    }
+
+
+def run_benchmark(
+    versions: int, lines: int, reads: int, seed: int, caps: List[int]
+) -> Dict[str, Any]:
+    """Run all chain caps on one generated history."""
+    history = generate_history(versions, lines, seed)
+    results = [benchmark_cap(history, cap, reads, seed) for cap in caps]
+    baseline = next((r for r in results if r["chain_cap"] == 0), results[0])
+    for result in results:
+        result["storage_saved_pct"] = round(
+            100 * (1 - result["stored_bytes"] / baseline["stored_bytes"]), 1
+        )
+        result["storage_saved_vs_compressed_snapshots_pct"] = round(
+            100
+            * (
+                1
+                - result["stored_bytes_snapshots_compressed"]
+                / baseline["stored_bytes_snapshots_compressed"]
+            ),
+            1,
+        )
+    return {
+        "versions": versions,
+        "document_bytes": len(history[-1].encode("utf-8")),
+        "reads": reads,
+        "results": results,
+    }
+
+
+def main() -> None:
+    """Run the benchmark from the command line."""
+    parser = argparse.ArgumentParser(description="Document version storage benchmark")
+    parser.add_argument("--versions", type=int, default=60)
+    parser.add_argument("--lines", type=int, default=400)
+    parser.add_argument("--reads", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--caps", type=int, nargs="+", default=CHAIN_CAPS)
+    parser.add_argument("--output", type=str, default=None)
+    args = parser.parse_args()
+
+    report = run_benchmark(args.versions, args.lines, args.reads, args.seed, args.caps)
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        Path(args.output).write_text(output)
+
+
+if __name__ == "__main__":
+    main()
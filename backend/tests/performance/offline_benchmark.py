@@ -0,0 +1,454 @@
+"""
+Offline benchmark harness for QdrantVectorRepository.
+
+Runs against qdrant_client's in-memory or on-disk local mode (or any client
+returned by a custom factory, e.g. a fake with injected latency), so it
+needs no Qdrant server and can run on every change. A seeded synthetic
+corpus spread over several projects is loaded, then upsert, filtered
+search, scroll and delete_by_filter are measured through the repository.
+
+Per operation the report gives p50/p95/p99 latency, throughput and
+allocations. Allocations are measured with tracemalloc on a separate sample
+of operations so tracing overhead never skews the latency numbers.
+
+Results are written as JSON; pass --baseline to diff against an earlier run.
+Local mode has no HNSW or payload indexes, so absolute numbers are only
+comparable between runs of the same mode.
+
+Usage:
+    python -m tests.performance.offline_benchmark --points 20000 --projects 20
+    python -m tests.performance.offline_benchmark --mode local --path /tmp/qdrant
+    python -m tests.performance.offline_benchmark --baseline previous.json
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from uuid import UUID, uuid4
+
+import numpy as np
+
+# Add the backend directory to the path for imports
+backend_dir = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_dir))
+
+import qdrant_client
+from qdrant_client import QdrantClient, models
+
+from app.services.vector.domain.entities import (
+    DocumentType,
+    SearchContext,
+    VectorData,
+    VectorPoint,
+)
+from app.services.vector.repositories.qdrant_repository import QdrantVectorRepository
+
+LANGUAGES = ["en", "ru"]
+DOCUMENT_TYPES = list(DocumentType)
+
+
+@dataclass
+class CorpusSpec:
+    """Shape of the seeded synthetic corpus."""
+
+    points: int = 5000
+    projects: int = 10
+    queries: int = 200
+    batch_size: int = 100
+    scroll_page_size: int = 256
+    allocation_sample: int = 20
+    seed: int = 42
+
+    @property
+    def dimension(self) -> int:
+        # Fixed by the domain model (VectorData validates 1536 dimensions)
+        return QdrantVectorRepository.VECTOR_SIZE
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Return the pct-th (nearest-rank) percentile of values.
+
+    Shared by the other offline benchmarks in this package.
+    """
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(
+    latencies_ms: List[float],
+    items: int,
+    allocations: Dict[str, float],
+) -> Dict[str, Any]:
+    """Summarize latencies, throughput and allocations of one operation."""
+    total_seconds = sum(latencies_ms) / 1000.0
+    return {
+        "operations": len(latencies_ms),
+        "items": items,
+        "latency_ms": {
+            "p50": percentile(latencies_ms, 50),
+            "p95": percentile(latencies_ms, 95),
+            "p99": percentile(latencies_ms, 99),
+            "mean": statistics.mean(latencies_ms),
+            "max": max(latencies_ms),
+        },
+        "throughput": {
+            "ops_per_second": len(latencies_ms) / total_seconds
+            if total_seconds
+            else 0.0,
+            "items_per_second": items / total_seconds if total_seconds else 0.0,
+        },
+        "allocations": allocations,
+    }
+
+
+async def measure_allocations(
+    operations: List[Callable[[], Awaitable[Any]]],
+) -> Dict[str, float]:
+    """Run operations under tracemalloc and report allocations per operation."""
+    if not operations:
+        return {"bytes_per_op": 0.0, "blocks_per_op": 0.0, "peak_bytes": 0}
+
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        base_current, _ = tracemalloc.get_traced_memory()
+        for operation in operations:
+            await operation()
+        _, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+
+    diff = after.compare_to(before, "filename")
+    allocated = sum(stat.size_diff for stat in diff if stat.size_diff > 0)
+    blocks = sum(stat.count_diff for stat in diff if stat.count_diff > 0)
+    return {
+        "bytes_per_op": allocated / len(operations),
+        "blocks_per_op": blocks / len(operations),
+        "peak_bytes": peak - base_current,
+    }
+
+
+class OfflineVectorBenchmark:
+    """Seeded repository benchmark against a local or fake Qdrant client."""
+
+    def __init__(
+        self,
+        client_factory: Callable[[], Any],
+        spec: Optional[CorpusSpec] = None,
+    ):
+        """
+        Initialize offline benchmark.
+
+        Args:
+            client_factory: Creates the Qdrant client (local mode or fake)
+            spec: Corpus and measurement parameters
+        """
+        self.spec = spec or CorpusSpec()
+        self.repository = QdrantVectorRepository(client_factory())
+        self.repository.COLLECTION_NAME = f"jeex_benchmark_offline_{uuid4().hex[:8]}"
+        self.rng = np.random.default_rng(self.spec.seed)
+        self.contexts = [
+            SearchContext.create(str(UUID(int=self.spec.seed * 1000 + i)), language)
+            for i in range(self.spec.projects)
+            for language in LANGUAGES
+        ]
+
+    def _random_vectors(self, count: int) -> np.ndarray:
+        vectors = self.rng.standard_normal((count, self.spec.dimension))
+        return (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype(
+            np.float32
+        )
+
+    def generate_batches(self) -> List[List[VectorPoint]]:
+        """Generate the corpus as per-context upsert batches."""
+        spec = self.spec
+        vectors = self._random_vectors(spec.points)
+        assignments = self.rng.integers(0, len(self.contexts), spec.points)
+        importance = self.rng.uniform(0.0, 1.0, spec.points)
+
+        by_context: Dict[int, List[VectorPoint]] = {}
+        for i, (vector, context_index) in enumerate(zip(vectors, assignments)):
+            context = self.contexts[int(context_index)]
+            by_context.setdefault(int(context_index), []).append(
+                VectorPoint(
+                    vector=VectorData(vector.tolist()),
+                    content=f"benchmark document {i} project {context.project_id}",
+                    project_id=context.project_id,
+                    language=context.language,
+                    document_type=DOCUMENT_TYPES[i % len(DOCUMENT_TYPES)],
+                    importance=float(importance[i]),
+                )
+            )
+
+        return [
+            points[start : start + spec.batch_size]
+            for _, points in sorted(by_context.items())
+            for start in range(0, len(points), spec.batch_size)
+        ]
+
+    async def bench_upsert(self, batches: List[List[VectorPoint]]) -> Dict[str, Any]:
+        latencies = []
+        for batch in batches:
+            start = time.perf_counter()
+            await self.repository.upsert_points(batch[0].project_id.value, batch)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+        # Re-upserting identical points measures allocations without growing data
+        sample = batches[: self.spec.allocation_sample]
+        allocations = await measure_allocations(
+            [
+                lambda batch=batch: self.repository.upsert_points(
+                    batch[0].project_id.value, batch
+                )
+                for batch in sample
+            ]
+        )
+        return summarize(latencies, sum(len(b) for b in batches), allocations)
+
+    async def bench_filtered_search(self) -> Dict[str, Any]:
+        queries = self._random_vectors(self.spec.queries)
+        requests = [
+            (
+                VectorData(query.tolist()),
+                self.contexts[i % len(self.contexts)],
+                DOCUMENT_TYPES[i % len(DOCUMENT_TYPES)],
+            )
+            for i, query in enumerate(queries)
+        ]
+
+        async def search(query, context, document_type):
+            return await self.repository.search_similar(
+                query, context, limit=10, document_type=document_type
+            )
+
+        latencies = []
+        results = 0
+        for request in requests:
+            start = time.perf_counter()
+            found = await search(*request)
+            latencies.append((time.perf_counter() - start) * 1000)
+            results += len(found)
+
+        allocations = await measure_allocations(
+            [
+                lambda request=request: search(*request)
+                for request in requests[: self.spec.allocation_sample]
+            ]
+        )
+        return summarize(latencies, results, allocations)
+
+    async def _scroll_project(self, context: SearchContext, timings: List[float]):
+        repository = self.repository
+        scroll_filter = models.Filter(
+            must=[
+                models.FieldCondition(
+                    key="project_id",
+                    match=models.MatchValue(value=str(context.project_id)),
+                )
+            ]
+        )
+        scrolled = 0
+        offset = None
+        while True:
+            start = time.perf_counter()
+            records, offset = await asyncio.to_thread(
+                repository.client.scroll,
+                collection_name=repository.COLLECTION_NAME,
+                scroll_filter=scroll_filter,
+                limit=self.spec.scroll_page_size,
+                offset=offset,
+                with_payload=True,
+                with_vectors=False,
+            )
+            timings.append((time.perf_counter() - start) * 1000)
+            scrolled += len(records)
+            if offset is None:
+                return scrolled
+
+    async def bench_scroll(self) -> Dict[str, Any]:
+        project_contexts = self.contexts[:: len(LANGUAGES)]
+        latencies: List[float] = []
+        scrolled = 0
+        for context in project_contexts:
+            scrolled += await self._scroll_project(context, latencies)
+
+        allocations = await measure_allocations(
+            [
+                lambda context=context: self._scroll_project(context, [])
+                for context in project_contexts[: self.spec.allocation_sample]
+            ]
+        )
+        return summarize(latencies, scrolled, allocations)
+
+    async def bench_delete_by_filter(self) -> Dict[str, Any]:
+        # Allocation sample first (deleting an already empty context is cheap
+        # and would understate allocations); at most a quarter of the contexts
+        sample_size = max(1, min(self.spec.allocation_sample, len(self.contexts) // 4))
+        sample = self.contexts[:sample_size]
+        allocations = await measure_allocations(
+            [
+                lambda context=context: self.repository.delete_by_filter(context)
+                for context in sample
+            ]
+        )
+
+        latencies = []
+        deleted = 0
+        for context in self.contexts[sample_size:]:
+            start = time.perf_counter()
+            deleted += await self.repository.delete_by_filter(context)
+            latencies.append((time.perf_counter() - start) * 1000)
+        return summarize(latencies, deleted, allocations)
+
+    async def run(self) -> Dict[str, Any]:
+        """Load the corpus and benchmark every operation."""
+        await self.repository.initialize_collection()
+        try:
+            batches = self.generate_batches()
+            results = {
+                "upsert": await self.bench_upsert(batches),
+                "filtered_search": await self.bench_filtered_search(),
+                "scroll": await self.bench_scroll(),
+                "delete_by_filter": await self.bench_delete_by_filter(),
+            }
+        finally:
+            await self.repository.client.delete_collection(
+                self.repository.COLLECTION_NAME
+            )
+        return results
+
+
+def compare_reports(
+    baseline: Dict[str, Any], current: Dict[str, Any]
+) -> Dict[str, Any]:
+    """
+    Diff two benchmark reports.
+
+    Returns relative changes (current / baseline - 1) of p50/p95/p99 latency,
+    items/s throughput and bytes allocated per operation, per operation.
+    """
+
+    def change(old: float, new: float) -> Optional[float]:
+        return new / old - 1.0 if old else None
+
+    diff: Dict[str, Any] = {}
+    for operation, result in current["results"].items():
+        base = baseline["results"].get(operation)
+        if base is None:
+            continue
+        diff[operation] = {
+            **{
+                f"latency_{pct}": change(
+                    base["latency_ms"][pct], result["latency_ms"][pct]
+                )
+                for pct in ("p50", "p95", "p99")
+            },
+            "items_per_second": change(
+                base["throughput"]["items_per_second"],
+                result["throughput"]["items_per_second"],
+            ),
+            "bytes_per_op": change(
+                base["allocations"]["bytes_per_op"],
+                result["allocations"]["bytes_per_op"],
+            ),
+        }
+    return diff
+
+
+async def run_offline_benchmark(
+    spec: CorpusSpec,
+    client_factory: Callable[[], Any],
+    mode: str = "custom",
+) -> Dict[str, Any]:
+    """Run the benchmark and build the JSON report."""
+    results = await OfflineVectorBenchmark(client_factory, spec).run()
+    return {
+        "benchmark": "vector_repository_offline",
+        "timestamp": datetime.utcnow().isoformat(),
+        "mode": mode,
+        "parameters": {**asdict(spec), "dimension": spec.dimension},
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "qdrant_client": getattr(qdrant_client, "__version__", "unknown"),
+        },
+        "results": results,
+    }
+
+
+async def main() -> None:
+    """Main entry point for the offline vector benchmark."""
+    parser = argparse.ArgumentParser(description="Offline vector repository benchmark")
+    parser.add_argument(
+        "--mode",
+        choices=["memory", "local"],
+        default="memory",
+        help="In-memory local Qdrant or on-disk local Qdrant (--path)",
+    )
+    parser.add_argument("--path", default=None, help="Storage path for --mode local")
+    parser.add_argument("--points", type=int, default=5000, help="Corpus size")
+    parser.add_argument("--projects", type=int, default=10, help="Project count")
+    parser.add_argument("--queries", type=int, default=200, help="Search queries")
+    parser.add_argument("--batch-size", type=int, default=100, help="Upsert batch")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    parser.add_argument(
+        "--output",
+        default="performance_results/offline_benchmark.json",
+        help="JSON output file",
+    )
+    parser.add_argument("--baseline", default=None, help="Earlier report to diff")
+    args = parser.parse_args()
+
+    if args.mode == "local" and not args.path:
+        parser.error("--mode local requires --path")
+
+    spec = CorpusSpec(
+        points=args.points,
+        projects=args.projects,
+        queries=args.queries,
+        batch_size=args.batch_size,
+        seed=args.seed,
+    )
+
+    def client_factory() -> QdrantClient:
+        if args.mode == "local":
+            return QdrantClient(path=args.path)
+        return QdrantClient(":memory:")
+
+    report = await run_offline_benchmark(spec, client_factory, args.mode)
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+        report["comparison"] = {
+            "baseline": args.baseline,
+            "changes": compare_reports(baseline, report),
+        }
+
+    for operation, result in report["results"].items():
+        latency = result["latency_ms"]
+        print(
+            f"{operation:>18}: p50={latency['p50']:.2f}ms p95={latency['p95']:.2f}ms "
+            f"p99={latency['p99']:.2f}ms "
+            f"{result['throughput']['items_per_second']:.0f} items/s "
+            f"{result['allocations']['bytes_per_op'] / 1024:.1f} KiB/op"
+        )
+
+    output_path = Path(args.output)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.write_text(json.dumps(report, indent=2))
+    print(f"Results saved to: {output_path}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
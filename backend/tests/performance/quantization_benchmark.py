@@ -0,0 +1,185 @@
+"""
+Quantization benchmark for the jeex_memory vector collection.
+
+Compares recall@k and search latency of quantized / on-disk storage
+configurations against the current full float32 in-RAM configuration.
+Ground truth is computed with exact brute-force cosine similarity, so recall
+measures the loss introduced by HNSW and quantization together.
+
+Requires a running Qdrant server (local mode ignores quantization).
+
+Usage:
+    python -m tests.performance.quantization_benchmark --url http://localhost:5230
+    python -m tests.performance.quantization_benchmark --points 20000 --k 10
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List
+from uuid import uuid4
+
+import numpy as np
+
+# Add the backend directory to the path for imports
+backend_dir = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from qdrant_client import QdrantClient
+
+from app.services.vector.domain.entities import (
+    DocumentType,
+    QuantizationMode,
+    SearchContext,
+    VectorData,
+    VectorPoint,
+    VectorStorageConfig,
+)
+from app.services.vector.repositories.qdrant_repository import QdrantVectorRepository
+from tests.performance.offline_benchmark import percentile
+
+BENCHMARK_CONFIGURATIONS: Dict[str, VectorStorageConfig] = {
+    "baseline_float32_ram": VectorStorageConfig(),
+    "scalar_int8_on_disk": VectorStorageConfig(
+        quantization=QuantizationMode.SCALAR, vectors_on_disk=True
+    ),
+    "binary_on_disk": VectorStorageConfig(
+        quantization=QuantizationMode.BINARY, vectors_on_disk=True, oversampling=3.0
+    ),
+}
+
+
+def generate_corpus(points: int, dimension: int, seed: int) -> np.ndarray:
+    """Generate L2-normalized synthetic embeddings."""
+    rng = np.random.default_rng(seed)
+    vectors = rng.standard_normal((points, dimension)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors
+
+
+def exact_top_k(corpus: np.ndarray, queries: np.ndarray, k: int) -> List[List[int]]:
+    """Compute exact top-k neighbours by brute-force cosine similarity."""
+    scores = queries @ corpus.T
+    return [list(np.argsort(-row)[:k]) for row in scores]
+
+
+async def benchmark_configuration(
+    client: QdrantClient,
+    name: str,
+    storage_config: VectorStorageConfig,
+    corpus: np.ndarray,
+    queries: np.ndarray,
+    ground_truth: List[List[int]],
+    k: int,
+) -> Dict[str, Any]:
+    """Load the corpus into a dedicated collection and measure recall and latency."""
+    repository = QdrantVectorRepository(client, storage_config)
+    repository.COLLECTION_NAME = f"jeex_benchmark_quant_{name}_{int(time.time())}"
+    await repository.initialize_collection()
+
+    context = SearchContext.create(str(uuid4()), "en")
+    point_ids = [uuid4() for _ in range(len(corpus))]
+    index_by_id = {str(point_id): i for i, point_id in enumerate(point_ids)}
+
+    try:
+        upsert_start = time.perf_counter()
+        points = [
+            VectorPoint(
+                id=point_id,
+                vector=VectorData(vector.tolist()),
+                content=f"benchmark document {i}",
+                project_id=context.project_id,
+                language=context.language,
+                document_type=DocumentType.KNOWLEDGE,
+            )
+            for i, (point_id, vector) in enumerate(zip(point_ids, corpus))
+        ]
+        await repository.upsert_points(context.project_id.value, points)
+        upsert_seconds = time.perf_counter() - upsert_start
+
+        latencies_ms = []
+        recalls = []
+        for query, expected in zip(queries, ground_truth):
+            start = time.perf_counter()
+            results = await repository.search_similar(
+                VectorData(query.tolist()), context, limit=k
+            )
+            latencies_ms.append((time.perf_counter() - start) * 1000)
+
+            found = {index_by_id[str(result.point.id)] for result in results}
+            recalls.append(len(found & set(expected)) / k)
+
+        info = await repository.get_collection_info()
+        return {
+            "configuration": name,
+            "storage": storage_config.to_dict(),
+            f"recall_at_{k}": statistics.mean(recalls),
+            "latency_ms": {
+                "p50": percentile(latencies_ms, 50),
+                "p95": percentile(latencies_ms, 95),
+                "p99": percentile(latencies_ms, 99),
+                "mean": statistics.mean(latencies_ms),
+            },
+            "upsert_points_per_second": len(corpus) / upsert_seconds,
+            "ram_data_size": info.get("ram_data_size"),
+            "disk_data_size": info.get("disk_data_size"),
+        }
+    finally:
+        await repository.client.delete_collection(repository.COLLECTION_NAME)
+
+
+async def main() -> None:
+    """Main entry point for the quantization benchmark."""
+    parser = argparse.ArgumentParser(description="Vector quantization benchmark")
+    parser.add_argument("--url", default="http://localhost:5230", help="Qdrant URL")
+    parser.add_argument("--points", type=int, default=10000, help="Corpus size")
+    parser.add_argument("--queries", type=int, default=100, help="Number of queries")
+    parser.add_argument("--k", type=int, default=10, help="Top-k for recall")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    parser.add_argument(
+        "--output",
+        default="performance_results/quantization_benchmark.json",
+        help="JSON output file",
+    )
+    args = parser.parse_args()
+
+    client = QdrantClient(url=args.url, timeout=60)
+    dimension = QdrantVectorRepository.VECTOR_SIZE
+
+    corpus = generate_corpus(args.points, dimension, args.seed)
+    queries = generate_corpus(args.queries, dimension, args.seed + 1)
+    ground_truth = exact_top_k(corpus, queries, args.k)
+
+    results = []
+    for name, storage_config in BENCHMARK_CONFIGURATIONS.items():
+        print(f"Benchmarking {name} ({args.points} points, k={args.k})...")
+        result = await benchmark_configuration(
+            client, name, storage_config, corpus, queries, ground_truth, args.k
+        )
+        results.append(result)
+        print(
+            f"  recall@{args.k}={result[f'recall_at_{args.k}']:.4f} "
+            f"p50={result['latency_ms']['p50']:.2f}ms "
+            f"p95={result['latency_ms']['p95']:.2f}ms"
+        )
+
+    report = {
+        "benchmark": "vector_quantization",
+        "timestamp": datetime.utcnow().isoformat(),
+        "parameters": vars(args),
+        "results": results,
+    }
+
+    output_path = Path(args.output)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.write_text(json.dumps(report, indent=2))
+    print(f"Results saved to: {output_path}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,49 @@
+"""
+Smoke test for the offline vector benchmark harness.
+"""
+
+import time
+
+import pytest
+from qdrant_client import QdrantClient
+
+from tests.performance.offline_benchmark import (
+    CorpusSpec,
+    compare_reports,
+    run_offline_benchmark,
+)
+
+
+class SlowSearchClient:
+    """Fake client adding fixed latency to searches of an in-memory Qdrant."""
+
+    def __init__(self, delay: float):
+        self._client = QdrantClient(":memory:")
+        self.delay = delay
+
+    def search(self, *args, **kwargs):
+        time.sleep(self.delay)
+        return self._client.search(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+
+@pytest.mark.asyncio
+async def test_offline_benchmark_reports_all_operations():
+    spec = CorpusSpec(points=200, projects=4, queries=10, allocation_sample=2)
+    report = await run_offline_benchmark(spec, lambda: QdrantClient(":memory:"))
+
+    results = report["results"]
+    assert set(results) == {"upsert", "filtered_search", "scroll", "delete_by_filter"}
+    assert results["upsert"]["items"] == 200
+    assert results["scroll"]["items"] == 200
+    for result in results.values():
+        latency = result["latency_ms"]
+        assert latency["p50"] <= latency["p95"] <= latency["p99"]
+        assert result["allocations"]["bytes_per_op"] > 0
+
+    slow = await run_offline_benchmark(spec, lambda: SlowSearchClient(0.01))
+    changes = compare_reports(report, slow)
+    assert slow["results"]["filtered_search"]["latency_ms"]["p50"] >= 10.0
+    assert changes["filtered_search"]["latency_p50"] > 0
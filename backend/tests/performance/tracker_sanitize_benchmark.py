@@ -0,0 +1,179 @@
+"""
+Agent tracker payload sanitization benchmark: legacy recursive walk against
+the current iterative, memoized, copy-on-write sanitizer.
+
+Generates realistic ~1 MB agent outputs (wide dicts of sections with
+thousands of keys, lists of records, long generated text, credentials mixed
+in), sanitizes each with both implementations and reports latency. Outputs
+are checked for equality on payloads the size budget does not cut.
+
+Runs in-process, no database required.
+
+Usage:
+    python -m tests.performance.tracker_sanitize_benchmark
+    python -m tests.performance.tracker_sanitize_benchmark --size-kb 2048 --runs 50
+"""
+
+import argparse
+import json
+import random
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+# Add the backend directory to the path for imports
+backend_dir = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from app.agents.sanitization import key_memo_info, sanitize_payload
+from tests.performance.offline_benchmark import percentile
+
+LEGACY_PATTERNS = [
+    re.compile(r".*password.*", re.IGNORECASE),
+    re.compile(r".*token.*", re.IGNORECASE),
+    re.compile(r".*secret.*", re.IGNORECASE),
+    re.compile(r".*key.*", re.IGNORECASE),
+    re.compile(r".*auth.*", re.IGNORECASE),
+    re.compile(r".*credential.*", re.IGNORECASE),
+    re.compile(r".*api[_-]?key.*", re.IGNORECASE),
+]
+LEGACY_TRUNCATE_FIELDS = {"user_message", "content", "description"}
+
+
+def legacy_sanitize(data: Any, max_depth: int = 5, current_depth: int = 0) -> Any:
+    """The tracker's sanitizer before the rewrite, kept as the baseline."""
+    if current_depth >= max_depth:
+        return "[max_depth_reached]"
+    if data is None or isinstance(data, (str, int, float, bool)):
+        return data
+    if isinstance(data, dict):
+        sanitized: Dict[str, Any] = {}
+        for key, value in data.items():
+            if any(p.match(key) for p in LEGACY_PATTERNS):
+                sanitized[key] = "[redacted]"
+            elif key in LEGACY_TRUNCATE_FIELDS and isinstance(value, str):
+                sanitized[key] = (
+                    value[:100] + "... [truncated]" if len(value) > 100 else value
+                )
+            else:
+                sanitized[key] = legacy_sanitize(value, max_depth, current_depth + 1)
+        return sanitized
+    if isinstance(data, list):
+        return [legacy_sanitize(item, max_depth, current_depth + 1) for item in data]
+    return data
+
+
+def generate_payload(size_kb: int, seed: int) -> Dict[str, Any]:
+    """Generate an agent output of roughly size_kb kilobytes of JSON."""
+    rng = random.Random(seed)
+    words = [f"term{i}" for i in range(400)]
+    field_names = [f"field_{i}" for i in range(300)] + [
+        "title",
+        "summary",
+        "owner",
+        "priority",
+        "status",
+        "tags",
+        "notes",
+        "estimate",
+    ]
+
+    def text(low: int, high: int) -> str:
+        return " ".join(rng.choice(words) for _ in range(rng.randint(low, high)))
+
+    def record() -> Dict[str, Any]:
+        item: Dict[str, Any] = {
+            name: text(2, 12) for name in rng.sample(field_names, rng.randint(6, 14))
+        }
+        item["description"] = text(20, 60)
+        item["metadata"] = {
+            "score": rng.random(),
+            "reviewed": rng.random() < 0.5,
+            "labels": [rng.choice(words) for _ in range(4)],
+        }
+        if rng.random() < 0.05:
+            item["access_token"] = text(1, 1)
+        return item
+
+    payload: Dict[str, Any] = {
+        "agent": "engineering_standards",
+        "api_key": "sk-" + "x" * 40,
+        "sections": {},
+        "records": [],
+    }
+    target = size_kb * 1024
+    size = 0
+    section = 0
+    while size < target:
+        batch = [record() for _ in range(50)]
+        payload["records"].extend(batch[:25])
+        payload["sections"][f"section_{section}"] = {
+            "content": text(200, 400),
+            "items": batch[25:],
+            "body": text(300, 600),
+        }
+        section += 1
+        size = len(json.dumps(payload))
+    return payload
+
+
+def measure(func: Callable[[Any], Any], payload: Any, runs: int) -> Dict[str, Any]:
+    """Latency of sanitizing one payload."""
+    latencies_ms: List[float] = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func(payload)
+        latencies_ms.append((time.perf_counter() - start) * 1000)
+    return {
+        "p50_ms": round(percentile(latencies_ms, 50), 3),
+        "p95_ms": round(percentile(latencies_ms, 95), 3),
+        "mean_ms": round(statistics.fmean(latencies_ms), 3),
+    }
+
+
+def run_benchmark(size_kb: int, runs: int, seed: int) -> Dict[str, Any]:
+    """Compare both implementations on one generated payload."""
+    payload = generate_payload(size_kb, seed)
+    payload_bytes = len(json.dumps(payload))
+    snapshot = json.dumps(payload, sort_keys=True)
+
+    legacy = measure(legacy_sanitize, payload, runs)
+    current = measure(sanitize_payload, payload, runs)
+    assert json.dumps(payload, sort_keys=True) == snapshot, "input was modified"
+
+    current_output = json.dumps(sanitize_payload(payload), sort_keys=True)
+    legacy_output = json.dumps(legacy_sanitize(payload), sort_keys=True)
+    return {
+        "payload_bytes": payload_bytes,
+        "runs": runs,
+        "legacy": legacy,
+        "current": current,
+        "speedup_p50": round(legacy["p50_ms"] / current["p50_ms"], 2),
+        "output_bytes_legacy": len(legacy_output),
+        "output_bytes_current": len(current_output),
+        "outputs_equal": current_output == legacy_output,
+        "key_memo": key_memo_info(),
+    }
+
+
+def main() -> None:
+    """Run the benchmark from the command line."""
+    parser = argparse.ArgumentParser(description="Tracker sanitization benchmark")
+    parser.add_argument("--size-kb", type=int, default=1024)
+    parser.add_argument("--runs", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", type=str, default=None)
+    args = parser.parse_args()
+
+    report = run_benchmark(args.size_kb, args.runs, args.seed)
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        Path(args.output).write_text(output)
+
+
+if __name__ == "__main__":
+    main()
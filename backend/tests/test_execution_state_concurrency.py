@@ -0,0 +1,136 @@
+"""
+Integration tests for field-level execution state updates.
+
+Requires Redis (REDIS_URL, default redis://localhost:5240, with
+REDIS_PASSWORD). Many writers update different fields of one execution
+state concurrently; no write may be lost. Skipped when Redis is unreachable.
+"""
+
+import asyncio
+import json
+import os
+from uuid import uuid4
+
+import pytest
+import pytest_asyncio
+from redis.asyncio import Redis
+
+from app.agents.context import create_context
+from app.agents.state_manager import ExecutionStateManager
+from app.infrastructure.redis.connection_factory import ProjectIsolatedRedisClient
+
+pytestmark = [pytest.mark.integration, pytest.mark.asyncio]
+
+WRITERS = 50
+UPDATES_PER_WRITER = 20
+
+
+class DirectRedisService:
+    """execute_with_retry over one client, with the production key prefixing."""
+
+    def __init__(self, client: Redis):
+        self.client = client
+        self.calls = 0
+
+    async def execute_with_retry(self, operation, func, *args, project_id, **kwargs):
+        self.calls += 1
+        conn = ProjectIsolatedRedisClient(self.client, project_id)
+        return await func(conn, *args, **kwargs)
+
+
+@pytest_asyncio.fixture
+async def redis_client():
+    client = Redis.from_url(
+        os.environ.get("REDIS_URL", "redis://localhost:5240"),
+        password=os.environ.get("REDIS_PASSWORD"),
+        decode_responses=True,
+    )
+    try:
+        await client.ping()
+    except Exception as e:
+        await client.aclose()
+        pytest.skip(f"Redis not available: {e}")
+    yield client
+    await client.aclose()
+
+
+@pytest_asyncio.fixture
+async def state(redis_client):
+    manager = ExecutionStateManager(DirectRedisService(redis_client))
+    context = create_context(
+        project_id=uuid4(), user_id=uuid4(), stage="idea", language="en"
+    )
+    await manager.create_state(context, stage="idea")
+    yield manager, context
+    await manager.cleanup(context.project_id, context.correlation_id)
+
+
+async def test_concurrent_writers_of_different_fields_lose_nothing(state):
+    manager, context = state
+    project_id, correlation_id = context.project_id, context.correlation_id
+
+    async def writer(index):
+        for step in range(1, UPDATES_PER_WRITER + 1):
+            assert await manager.update_fields(
+                project_id, correlation_id, {f"agent_{index}": step}
+            )
+            await asyncio.sleep(0)
+
+    manager.redis.calls = 0
+    await asyncio.gather(*(writer(index) for index in range(WRITERS)))
+
+    # One round trip per update
+    assert manager.redis.calls == WRITERS * UPDATES_PER_WRITER
+    result = await manager.get_state(project_id, correlation_id)
+    assert {f"agent_{index}": result[f"agent_{index}"] for index in range(WRITERS)} == {
+        f"agent_{index}": UPDATES_PER_WRITER for index in range(WRITERS)
+    }
+    # Fields written by create_state survive
+    assert result["language"] == "en"
+    assert result["status"] == "running"
+
+
+async def test_update_refreshes_ttl_and_subset_read(state, redis_client):
+    manager, context = state
+    key = "proj:{}:{}".format(
+        context.project_id,
+        manager._key(context.project_id, context.correlation_id),
+    )
+    await redis_client.expire(key, 5)
+
+    await manager.update_state(
+        context.project_id, context.correlation_id, "architect", 150
+    )
+
+    assert await redis_client.ttl(key) > 5
+    assert await manager.get_state(
+        context.project_id, context.correlation_id, ["current_agent", "progress"]
+    ) == {"current_agent": "architect", "progress": 100}
+
+
+async def test_update_of_missing_state_does_nothing(redis_client):
+    manager = ExecutionStateManager(DirectRedisService(redis_client))
+    project_id, correlation_id = uuid4(), uuid4()
+
+    assert not await manager.update_fields(project_id, correlation_id, {"x": 1})
+    assert await manager.get_state(project_id, correlation_id) is None
+
+
+async def test_legacy_json_state_is_read_and_converted(redis_client):
+    manager = ExecutionStateManager(DirectRedisService(redis_client))
+    project_id, correlation_id = uuid4(), uuid4()
+    key = f"proj:{project_id}:{manager._key(project_id, correlation_id)}"
+    await redis_client.set(key, json.dumps({"stage": "idea", "progress": 10}), ex=60)
+    try:
+        assert await manager.get_state(project_id, correlation_id, ["stage"]) == {
+            "stage": "idea"
+        }
+
+        await manager.update_state(project_id, correlation_id, "pm", 20)
+
+        assert await redis_client.type(key) == "hash"
+        state = await manager.get_state(project_id, correlation_id)
+        assert state["stage"] == "idea"
+        assert state["progress"] == 20
+    finally:
+        await redis_client.delete(key)
@@ -0,0 +1,198 @@
+"""
+Unit tests for keyset pagination helpers (SQLite in-memory).
+"""
+
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import JSON, DateTime, Integer, String, Text, Uuid, event, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import DeclarativeBase, Mapped, load_only, mapped_column
+
+from app.repositories.pagination import (
+    CountMode,
+    apply_keyset,
+    count_rows,
+    decode_cursor,
+    encode_cursor,
+    heavy_columns,
+    split_page,
+)
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class Item(Base):
+    __tablename__ = "items"
+
+    id: Mapped[uuid.UUID] = mapped_column(Uuid, primary_key=True, default=uuid.uuid4)
+    project_id: Mapped[uuid.UUID] = mapped_column(Uuid)
+    kind: Mapped[str] = mapped_column(String(20))
+    version: Mapped[int] = mapped_column(Integer)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    body: Mapped[str] = mapped_column(Text)
+    meta: Mapped[dict] = mapped_column(JSON, default=dict)
+
+
+SORT_KEYS = ((Item.kind, False), (Item.version, True), (Item.id, False))
+
+
+@pytest_asyncio.fixture
+async def session():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        yield session
+    await engine.dispose()
+
+
+async def _seed(session, project_id, count=23):
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    for index in range(count):
+        session.add(
+            Item(
+                project_id=project_id,
+                kind=["prd", "spec", "arch"][index % 3],
+                # Duplicate versions exercise the id tie-breaker
+                version=index // 6,
+                created_at=start + timedelta(minutes=index),
+                body="x" * 1000,
+                meta={"index": index},
+            )
+        )
+    await session.flush()
+
+
+async def _walk(session, query, limit):
+    pages, cursor = [], None
+    while True:
+        page_query = apply_keyset(query, SORT_KEYS, cursor).limit(limit + 1)
+        rows = (await session.execute(page_query)).scalars().all()
+        items, cursor = split_page(rows, limit, SORT_KEYS)
+        pages.append(items)
+        if cursor is None:
+            return pages
+
+
+def test_cursor_roundtrip_preserves_types():
+    values = ["spec", 3, uuid.uuid4(), datetime(2025, 5, 1, tzinfo=timezone.utc)]
+    keys = [(None, False)] * 4
+    assert decode_cursor(encode_cursor(values), keys) == values
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", encode_cursor([1])])
+def test_invalid_cursor_is_rejected(cursor):
+    with pytest.raises(ValueError, match="Invalid pagination cursor"):
+        decode_cursor(cursor, SORT_KEYS)
+
+
+@pytest.mark.asyncio
+async def test_keyset_pages_match_offset_order(session):
+    project_id = uuid.uuid4()
+    await _seed(session, project_id)
+    await _seed(session, uuid.uuid4(), count=5)
+    query = select(Item).where(Item.project_id == project_id)
+
+    pages = await _walk(session, query, limit=5)
+
+    expected = (await session.execute(apply_keyset(query, SORT_KEYS))).scalars().all()
+    assert [len(page) for page in pages] == [5, 5, 5, 5, 3]
+    assert [item.id for page in pages for item in page] == [
+        item.id for item in expected
+    ]
+
+
+@pytest.mark.asyncio
+async def test_exact_page_boundary_has_no_empty_trailing_page(session):
+    project_id = uuid.uuid4()
+    await _seed(session, project_id, count=10)
+
+    pages = await _walk(session, select(Item).where(Item.project_id == project_id), 5)
+
+    assert [len(page) for page in pages] == [5, 5]
+
+
+@pytest.mark.asyncio
+async def test_count_modes(session):
+    project_id = uuid.uuid4()
+    await _seed(session, project_id, count=7)
+    query = select(Item).where(Item.project_id == project_id)
+
+    assert await count_rows(session, query, CountMode.EXACT) == (7, False)
+    assert await count_rows(session, query, CountMode.NONE) == (None, False)
+    # Planner estimates are PostgreSQL-only; other dialects count exactly
+    assert await count_rows(session, query, CountMode.ESTIMATED) == (7, False)
+
+
+def test_estimate_query_compiles_with_literal_binds():
+    query = select(Item).where(
+        Item.project_id == uuid.uuid4(), Item.kind == "it's a spec"
+    )
+    sql = str(
+        query.compile(
+            dialect=postgresql.asyncpg.dialect(),
+            compile_kwargs={"literal_binds": True},
+        )
+    )
+    assert "'it''s a spec'" in sql
+
+
+def test_heavy_columns_are_text_json_and_binary():
+    assert {column.key for column in heavy_columns(Item)} == {"body", "meta"}
+
+
+@pytest.mark.asyncio
+async def test_summary_projection_does_not_load_heavy_columns(session):
+    project_id = uuid.uuid4()
+    await _seed(session, project_id, count=3)
+    session.expunge_all()
+
+    query = apply_keyset(
+        select(Item).where(Item.project_id == project_id), SORT_KEYS
+    ).options(load_only(Item.id, Item.kind, Item.version))
+    rows = (await session.execute(query)).scalars().all()
+
+    assert all("body" not in row.__dict__ for row in rows)
+    assert all("meta" not in row.__dict__ for row in rows)
+
+
+@pytest.mark.asyncio
+async def test_failed_estimate_rolls_back_only_its_savepoint(session, monkeypatch):
+    project_id = uuid.uuid4()
+    await _seed(session, project_id, count=7)
+    # Uncommitted rows of the request's transaction must survive the failure
+    session.add(
+        Item(
+            project_id=project_id,
+            kind="spec",
+            version=99,
+            created_at=datetime(2025, 1, 1, tzinfo=timezone.utc),
+            body="pending",
+        )
+    )
+    await session.flush()
+    statements = []
+    event.listen(
+        session.get_bind(),
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+    # Take the PostgreSQL path; SQLite rejects the EXPLAIN (FORMAT JSON)
+    monkeypatch.setattr(
+        session,
+        "get_bind",
+        lambda: type("Bind", (), {"dialect": postgresql.dialect()})(),
+    )
+    query = select(Item).where(Item.project_id == project_id)
+
+    assert await count_rows(session, query, CountMode.ESTIMATED) == (8, False)
+    assert session.in_transaction()
+    explain = next(i for i, s in enumerate(statements) if s.startswith("EXPLAIN"))
+    assert statements[explain - 1].startswith("SAVEPOINT")
+    assert statements[explain + 1].startswith("ROLLBACK TO SAVEPOINT")
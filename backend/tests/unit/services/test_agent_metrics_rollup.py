@@ -0,0 +1,292 @@
+"""
+Unit tests for the incrementally maintained agent metrics rollup (SQLite).
+"""
+
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Float,
+    Integer,
+    MetaData,
+    PrimaryKeyConstraint,
+    String,
+    Table,
+    Uuid,
+    insert,
+    update,
+)
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.services.agent_metrics_rollup import (
+    COUNTERS,
+    AgentMetricsRollup,
+    ExecutionState,
+    bucket_start,
+    contribution_delta,
+    summarize,
+)
+
+metadata = MetaData()
+
+executions = Table(
+    "agent_executions",
+    metadata,
+    Column("id", Uuid, primary_key=True),
+    Column("project_id", Uuid, nullable=False),
+    Column("agent_type", String(50), nullable=False),
+    Column("status", String(50), nullable=False),
+    Column("started_at", DateTime(timezone=True), nullable=False),
+    Column("completed_at", DateTime(timezone=True)),
+    Column("prompt_tokens", Integer, nullable=False, default=0),
+    Column("completion_tokens", Integer, nullable=False, default=0),
+    Column("cost_usd", Float, nullable=False, default=0.0),
+)
+
+rollups = Table(
+    "agent_execution_rollups",
+    metadata,
+    Column("project_id", Uuid, nullable=False),
+    Column("agent_type", String(50), nullable=False),
+    Column("bucket_start", DateTime(timezone=True), nullable=False),
+    Column("started_count", Integer, nullable=False, default=0),
+    Column("completed_count", Integer, nullable=False, default=0),
+    Column("failed_count", Integer, nullable=False, default=0),
+    Column("finished_count", Integer, nullable=False, default=0),
+    Column("duration_seconds_sum", Float, nullable=False, default=0.0),
+    Column("open_started_epoch_sum", Float, nullable=False, default=0.0),
+    Column("prompt_tokens_sum", Integer, nullable=False, default=0),
+    Column("completion_tokens_sum", Integer, nullable=False, default=0),
+    Column("cost_usd_sum", Float, nullable=False, default=0.0),
+    PrimaryKeyConstraint("project_id", "agent_type", "bucket_start"),
+)
+
+START = datetime(2025, 11, 1, 9, 15, tzinfo=timezone.utc)
+
+
+@pytest_asyncio.fixture
+async def session():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as connection:
+        await connection.run_sync(metadata.create_all)
+    async with AsyncSession(engine) as session:
+        yield session
+    await engine.dispose()
+
+
+@pytest.fixture
+def rollup():
+    return AgentMetricsRollup(executions, rollups)
+
+
+async def _start(session, rollup, project_id, agent_type, started_at):
+    execution_id = uuid.uuid4()
+    await session.execute(
+        insert(executions).values(
+            id=execution_id,
+            project_id=project_id,
+            agent_type=agent_type,
+            status="pending",
+            started_at=started_at,
+        )
+    )
+    await rollup.record(
+        session, project_id, agent_type, started_at, None, ExecutionState("pending")
+    )
+    return execution_id
+
+
+async def _transition(session, rollup, execution_id, status, completed_at=None):
+    # Same sequence as the repository: lock, update, record
+    current = await rollup.lock_execution(session, execution_id)
+    completed_at = completed_at or current.completed_at
+    await session.execute(
+        update(executions)
+        .where(executions.c.id == execution_id)
+        .values(status=status, completed_at=completed_at)
+    )
+    await rollup.record(
+        session,
+        current.project_id,
+        current.agent_type,
+        current.started_at,
+        ExecutionState(current.status, current.completed_at),
+        ExecutionState(status, completed_at),
+    )
+
+
+def test_bucket_start_truncates_to_utc_hour():
+    naive = datetime(2025, 11, 1, 9, 59, 59, 999)
+    assert bucket_start(naive) == datetime(2025, 11, 1, 9, tzinfo=timezone.utc)
+    assert bucket_start(START.astimezone(timezone(timedelta(hours=3)))) == (
+        datetime(2025, 11, 1, 9, tzinfo=timezone.utc)
+    )
+
+
+def test_contribution_delta_moves_between_final_states():
+    done = START + timedelta(seconds=30)
+    delta = contribution_delta(
+        START, ExecutionState("running"), ExecutionState("completed", done)
+    )
+    assert delta == {
+        "completed_count": 1,
+        "finished_count": 1,
+        "duration_seconds_sum": 30.0,
+        "open_started_epoch_sum": -START.timestamp(),
+    }
+    # completed -> failed with a new completion time
+    delta = contribution_delta(
+        START,
+        ExecutionState("completed", done),
+        ExecutionState("failed", done + timedelta(seconds=10)),
+    )
+    assert delta == {
+        "completed_count": -1,
+        "failed_count": 1,
+        "duration_seconds_sum": 10.0,
+    }
+    assert (
+        contribution_delta(START, ExecutionState("pending"), ExecutionState("running"))
+        == {}
+    )
+
+
+def test_summarize_counts_running_executions_up_to_now(rollup):
+    finished = contribution_delta(
+        START, None, ExecutionState("completed", START + timedelta(seconds=10))
+    )
+    running = contribution_delta(START, None, ExecutionState("running"))
+
+    def row(agent_type, counters):
+        return SimpleNamespace(
+            agent_type=agent_type, **{**dict.fromkeys(COUNTERS, 0), **counters}
+        )
+
+    metrics = summarize(
+        [row("pm", finished), row("analyst", running)],
+        now=START + timedelta(seconds=30),
+    )
+
+    assert metrics["total_executions"] == 2
+    assert metrics["successful_executions"] == 1
+    assert metrics["success_rate"] == 50.0
+    # (10 s finished + 30 s running so far) / 2
+    assert metrics["average_execution_time_seconds"] == pytest.approx(20.0)
+    assert metrics["executions_by_agent_type"] == {"pm": 1, "analyst": 1}
+
+
+def test_unsupported_dialect_is_rejected(rollup):
+    with pytest.raises(ValueError, match="not supported"):
+        rollup.increment_statement("mysql", uuid.uuid4(), "pm", START, {})
+
+
+@pytest.mark.asyncio
+async def test_incremental_updates_match_raw_table(session, rollup):
+    project_id, other_project = uuid.uuid4(), uuid.uuid4()
+    ids = []
+    for index in range(12):
+        ids.append(
+            await _start(
+                session,
+                rollup,
+                project_id if index % 4 else other_project,
+                ["pm", "analyst", "architect"][index % 3],
+                START + timedelta(minutes=25 * index),
+            )
+        )
+    for index, execution_id in enumerate(ids):
+        await _transition(session, rollup, execution_id, "running")
+        if index % 3 == 0:
+            continue  # still running
+        done = START + timedelta(minutes=25 * index, seconds=index + 1)
+        await _transition(
+            session,
+            rollup,
+            execution_id,
+            "failed" if index % 3 == 1 else "completed",
+            done,
+        )
+    # A completed execution re-marked as failed moves between counters
+    await _transition(
+        session, rollup, ids[2], "failed", START + timedelta(minutes=50, seconds=40)
+    )
+
+    report = await rollup.check_consistency(session)
+    assert report["consistent"], report["mismatches"]
+    assert report["buckets"] > 3
+
+    metrics = await rollup.read(session, project_id, START)
+    assert metrics["total_executions"] == 9
+    assert metrics["executions_by_agent_type"] == {
+        "pm": 3,
+        "analyst": 3,
+        "architect": 3,
+    }
+    assert metrics["successful_executions"] + metrics["failed_executions"] == 6
+    # Buckets before the window are excluded
+    later = await rollup.read(session, project_id, START + timedelta(hours=3))
+    assert later["total_executions"] < metrics["total_executions"]
+
+
+@pytest.mark.asyncio
+async def test_backfill_rebuilds_rollup_and_check_reports_drift(session, rollup):
+    project_id = uuid.uuid4()
+    for index in range(5):
+        await session.execute(
+            insert(executions).values(
+                id=uuid.uuid4(),
+                project_id=project_id,
+                agent_type="pm",
+                status="completed" if index % 2 else "failed",
+                started_at=START + timedelta(minutes=index),
+                completed_at=START + timedelta(minutes=index, seconds=5),
+            )
+        )
+    # History written before the rollup existed
+    report = await rollup.check_consistency(session, project_id)
+    assert not report["consistent"]
+    assert report["mismatched"] == 1
+
+    counts = await rollup.backfill(session, project_id)
+    assert counts == {"executions": 5, "buckets": 1}
+    assert (await rollup.check_consistency(session, project_id))["consistent"]
+
+    metrics = await rollup.read(session, project_id, START)
+    assert metrics["successful_executions"] == 2
+    assert metrics["failed_executions"] == 3
+    assert metrics["average_execution_time_seconds"] == pytest.approx(5.0)
+
+    # Backfill is idempotent
+    assert await rollup.backfill(session, project_id) == counts
+    assert (await rollup.check_consistency(session, project_id))["consistent"]
+
+
+@pytest.mark.asyncio
+async def test_usage_lands_on_execution_and_rollup(session, rollup):
+    from app.agents.budget import TokenUsage
+    from app.agents.tracker import AgentExecutionTracker
+
+    tracker = AgentExecutionTracker(session)
+    tracker.rollup = rollup
+    project_id = uuid.uuid4()
+    pm = await _start(session, rollup, project_id, "pm", START)
+    analyst = await _start(session, rollup, project_id, "analyst", START)
+
+    await tracker.record_usage(pm, TokenUsage(100, 20, 0.01))
+    await tracker.record_usage(pm, TokenUsage(50, 10, 0.005))
+    await tracker.record_usage(analyst, TokenUsage(7, 3, 0.001))
+    assert not await tracker.record_usage(uuid.uuid4(), TokenUsage(1, 1, 0.0))
+    await _transition(session, rollup, pm, "completed", START + timedelta(seconds=9))
+
+    assert (await rollup.check_consistency(session))["consistent"]
+    metrics = await rollup.read(session, project_id, START)
+    assert metrics["total_prompt_tokens"] == 157
+    assert metrics["total_completion_tokens"] == 33
+    assert metrics["total_tokens"] == 190
+    assert metrics["total_cost_usd"] == pytest.approx(0.016)
+    assert metrics["tokens_by_agent_type"] == {"pm": 180, "analyst": 10}
@@ -0,0 +1,185 @@
+"""
+Unit tests for atomic document version allocation (SQLite, PostgreSQL SQL).
+"""
+
+import asyncio
+import uuid
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import (
+    Column,
+    Integer,
+    MetaData,
+    PrimaryKeyConstraint,
+    String,
+    Table,
+    Text,
+    UniqueConstraint,
+    Uuid,
+    insert,
+    select,
+)
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.services.document_version_counters import VersionAllocator
+
+metadata = MetaData()
+
+versions = Table(
+    "document_versions",
+    metadata,
+    Column("id", Uuid, primary_key=True, default=uuid.uuid4),
+    Column("project_id", Uuid, nullable=False),
+    Column("document_type", String(50), nullable=False),
+    Column("version", Integer, nullable=False),
+    Column("content", Text),
+    UniqueConstraint("project_id", "document_type", "version"),
+)
+
+counters = Table(
+    "document_version_counters",
+    metadata,
+    Column("project_id", Uuid, nullable=False),
+    Column("document_type", String(50), nullable=False),
+    Column("last_version", Integer, nullable=False),
+    PrimaryKeyConstraint("project_id", "document_type"),
+)
+
+allocator = VersionAllocator(versions=versions, counters=counters)
+
+
+@pytest_asyncio.fixture
+async def sessions(tmp_path):
+    # File database: every writer gets its own connection and transaction
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'versions.db'}",
+        connect_args={"timeout": 30},
+    )
+    async with engine.begin() as connection:
+        await connection.run_sync(metadata.create_all)
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    await engine.dispose()
+
+
+async def _write(sessions, project_id, document_type="prd", requested=None):
+    async with sessions() as session, session.begin():
+        result = await allocator.insert(
+            session,
+            versions,
+            {
+                "project_id": project_id,
+                "document_type": document_type,
+                "content": "text",
+            },
+            requested_version=requested,
+        )
+        return result.one().version
+
+
+async def _versions(sessions, project_id):
+    async with sessions() as session:
+        result = await session.execute(
+            select(versions.c.version)
+            .where(versions.c.project_id == project_id)
+            .order_by(versions.c.version)
+        )
+        return list(result.scalars())
+
+
+@pytest.mark.asyncio
+async def test_parallel_writers_get_consecutive_versions_without_retries(sessions):
+    project_id = uuid.uuid4()
+    conflicts = 0
+
+    async def writer():
+        nonlocal conflicts
+        try:
+            return await _write(sessions, project_id)
+        except IntegrityError:
+            conflicts += 1
+            raise
+
+    allocated = await asyncio.gather(*(writer() for _ in range(50)))
+
+    assert conflicts == 0
+    assert sorted(allocated) == list(range(1, 51))
+    assert await _versions(sessions, project_id) == list(range(1, 51))
+
+
+@pytest.mark.asyncio
+async def test_counters_are_per_project_and_document_type(sessions):
+    first, second = uuid.uuid4(), uuid.uuid4()
+
+    assert await _write(sessions, first, "prd") == 1
+    assert await _write(sessions, first, "prd") == 2
+    assert await _write(sessions, first, "spec") == 1
+    assert await _write(sessions, second, "prd") == 1
+
+
+@pytest.mark.asyncio
+async def test_explicit_version_moves_counter_forward(sessions):
+    project_id = uuid.uuid4()
+    await _write(sessions, project_id)
+
+    assert await _write(sessions, project_id, requested=5) == 5
+    assert await _write(sessions, project_id) == 6
+    # An explicit lower version does not move the counter back
+    assert await _write(sessions, project_id, requested=3) == 3
+    assert await _write(sessions, project_id) == 7
+
+
+@pytest.mark.asyncio
+async def test_missing_counter_is_seeded_from_existing_versions(sessions):
+    project_id = uuid.uuid4()
+    async with sessions() as session, session.begin():
+        # Rows written without a counter (before the migration backfill)
+        await session.execute(
+            insert(versions),
+            [
+                {"project_id": project_id, "document_type": "prd", "version": v}
+                for v in (1, 2, 3)
+            ],
+        )
+
+    assert await _write(sessions, project_id) == 4
+
+
+@pytest.mark.asyncio
+async def test_rolled_back_allocation_is_reused(sessions):
+    project_id = uuid.uuid4()
+    async with sessions() as session:
+        async with session.begin():
+            await allocator.insert(
+                session,
+                versions,
+                {"project_id": project_id, "document_type": "prd"},
+            )
+            await session.rollback()
+
+    assert await _write(sessions, project_id) == 1
+
+
+def test_postgresql_allocates_and_inserts_in_one_statement():
+    statement = allocator.insert_statement(
+        versions, {"project_id": uuid.uuid4(), "document_type": "prd"}
+    )
+    sql = " ".join(str(statement.compile(dialect=postgresql.dialect())).split())
+
+    assert sql.startswith(
+        "WITH allocated_version AS (INSERT INTO document_version_counters"
+    )
+    assert (
+        "ON CONFLICT (project_id, document_type) DO UPDATE SET last_version = " in sql
+    )
+    assert "greatest(document_version_counters.last_version + " in sql
+    assert "INSERT INTO document_versions" in sql
+    assert "(SELECT allocated_version.last_version FROM allocated_version)" in sql
+    assert sql.count(";") == 0
+
+
+def test_unsupported_dialect_is_rejected():
+    with pytest.raises(ValueError, match="not supported"):
+        allocator.allocation("mysql", uuid.uuid4(), "prd")
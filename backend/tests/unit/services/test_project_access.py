@@ -0,0 +1,229 @@
+"""
+Unit tests for memoized project access checks.
+"""
+
+import uuid
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.agents.isolation import IsolationValidator
+from app.services.project_access import (
+    ProjectAccessCache,
+    ProjectAccessGrant,
+    ProjectAccessService,
+    invalidate_project_access,
+)
+
+
+class _Result:
+    def __init__(self, value):
+        self._value = value
+
+    def scalar_one_or_none(self):
+        return self._value
+
+
+class FakeSession:
+    """Session stand-in answering the language SELECT for owned projects."""
+
+    def __init__(self, projects):
+        # project_id -> (owner_id, language)
+        self.projects = projects
+        self.info = {}
+        self.queries = 0
+
+    async def execute(self, statement):
+        self.queries += 1
+        # Read the WHERE clause directly (column key -> bound value)
+        params = {
+            clause.left.key: getattr(clause.right, "value", None)
+            for clause in statement.whereclause.clauses
+        }
+        project_id, owner_id = params["id"], params.get("created_by")
+        project = self.projects.get(project_id)
+        if project is None or (owner_id is not None and project[0] != owner_id):
+            return _Result(None)
+        return _Result(project[1])
+
+
+@pytest.fixture
+def ids():
+    return uuid.uuid4(), uuid.uuid4()
+
+
+@pytest.fixture
+def cache():
+    return ProjectAccessCache(ttl_seconds=60, max_entries=100)
+
+
+@pytest.mark.asyncio
+async def test_request_memo_answers_repeated_checks(ids, cache):
+    project_id, user_id = ids
+    session = FakeSession({project_id: (user_id, "en")})
+    service = ProjectAccessService(session, cache)
+
+    for _ in range(3):
+        grant = await service.check(project_id, user_id)
+
+    assert grant == ProjectAccessGrant(project_id, user_id, "en")
+    assert session.queries == 1
+    assert cache.stats()["request_hits"] == 2
+
+
+@pytest.mark.asyncio
+async def test_shared_cache_serves_next_request_but_not_denials(ids, cache):
+    project_id, user_id = ids
+    stranger = uuid.uuid4()
+    projects = {project_id: (user_id, "en")}
+
+    first, second = FakeSession(projects), FakeSession(projects)
+    await ProjectAccessService(first, cache).check(project_id, user_id)
+    await ProjectAccessService(first, cache).check(project_id, stranger)
+    assert await ProjectAccessService(second, cache).check(project_id, user_id)
+    assert await ProjectAccessService(second, cache).check(project_id, stranger) is None
+
+    assert second.queries == 1  # only the denial is re-checked
+    stats = cache.stats()
+    assert stats["shared_hits"] == 1
+    assert stats["queries_saved"] == 1
+
+
+@pytest.mark.asyncio
+async def test_isolation_validator_checks_access_and_language_with_one_query(
+    ids,
+):
+    project_id, user_id = ids
+    session = FakeSession({project_id: (user_id, "ru")})
+    validator = IsolationValidator(session)
+    validator.access.cache = ProjectAccessCache(ttl_seconds=60)
+
+    await validator.validate_project_access(user_id, project_id)
+    await validator.validate_language_consistency(project_id, "ru")
+    with pytest.raises(ValueError, match="Language mismatch"):
+        await validator.validate_language_consistency(project_id, "en")
+
+    assert session.queries == 1
+
+
+@pytest.mark.asyncio
+async def test_validated_context_is_reused_without_querying(ids):
+    from app.agents.context import create_context
+    from app.agents.contracts import AgentInput
+    from app.agents.orchestrator import AgentOrchestrator
+
+    project_id, user_id = ids
+    projects = {project_id: (user_id, "ru"), uuid.uuid4(): (uuid.uuid4(), "ru")}
+    disabled = ProjectAccessCache(ttl_seconds=0)
+
+    def orchestrator(session):
+        validator = IsolationValidator(session)
+        validator.access.cache = disabled
+        return AgentOrchestrator(
+            tracker=None, state_manager=None, isolation=validator, result_cache=None
+        )
+
+    context = create_context(project_id, user_id, "architecture", "ru")
+    input_data = AgentInput(
+        project_id=project_id,
+        correlation_id=context.correlation_id,
+        language="ru",
+        user_message="Design",
+    )
+    first = FakeSession(projects)
+    validated = await orchestrator(first)._validate_request(context, input_data)
+    assert validated.access == ProjectAccessGrant(project_id, user_id, "ru")
+    assert first.queries == 1
+
+    # A later layer (another session) reuses the grant on the context
+    second = FakeSession(projects)
+    assert await orchestrator(second)._validate_request(validated, input_data)
+    assert second.queries == 0
+
+    # A grant for a different language does not cover the context
+    stale = validated.model_copy(
+        update={"access": ProjectAccessGrant(project_id, user_id, "en")}
+    )
+    await orchestrator(second)._validate_request(stale, input_data)
+    assert second.queries == 1
+
+    stranger = create_context(project_id, uuid.uuid4(), "architecture", "ru")
+    with pytest.raises(PermissionError):
+        await orchestrator(FakeSession(projects))._validate_request(
+            stranger, input_data
+        )
+
+
+@pytest.mark.asyncio
+async def test_invalidation_drops_shared_and_request_entries(ids, cache):
+    project_id, user_id = ids
+    projects = {project_id: (user_id, "en")}
+    session = FakeSession(projects)
+    service = ProjectAccessService(session, cache)
+    await service.check(project_id, user_id)
+
+    # Project deleted
+    del projects[project_id]
+    invalidate_project_access(project_id, cache=cache)
+    assert (
+        await ProjectAccessService(FakeSession(projects), cache).check(
+            project_id, user_id
+        )
+        is None
+    )
+    # The request memo still holds the grant until invalidated with the session
+    assert await service.check(project_id, user_id)
+    service.invalidate(project_id)
+    assert await service.check(project_id, user_id) is None
+
+
+@pytest.mark.asyncio
+async def test_lookup_racing_an_invalidation_is_not_cached(ids, cache):
+    project_id, user_id = ids
+    session = FakeSession({project_id: (user_id, "en")})
+    execute = session.execute
+
+    async def execute_then_invalidate(statement):
+        result = await execute(statement)
+        cache.invalidate_project(project_id)
+        return result
+
+    session.execute = execute_then_invalidate
+    await ProjectAccessService(session, cache).check(project_id, user_id)
+
+    assert cache.get(project_id, user_id) is None
+
+
+def test_invalidation_repeats_after_commit(ids, cache):
+    project_id, user_id = ids
+    session = Session()
+    invalidate_project_access(project_id, session, cache)
+    # Another request re-caches the pre-commit state before the commit
+    cache.put(ProjectAccessGrant(project_id, user_id, "en"), cache.generation)
+
+    session.commit()
+
+    assert cache.get(project_id, user_id) is None
+
+
+def test_cache_is_bounded_and_expires(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("app.services.project_access.time.monotonic", lambda: now[0])
+    cache = ProjectAccessCache(ttl_seconds=5, max_entries=2)
+    grants = [ProjectAccessGrant(uuid.uuid4(), uuid.uuid4(), "en") for _ in range(3)]
+    for grant in grants:
+        cache.put(grant, cache.generation)
+
+    assert cache.get(grants[0].project_id, grants[0].user_id) is None
+    assert cache.get(grants[2].project_id, grants[2].user_id) == grants[2]
+    assert cache.stats()["evictions"] == 1
+
+    now[0] += 5
+    assert cache.get(grants[2].project_id, grants[2].user_id) is None
+
+
+def test_zero_ttl_disables_shared_cache():
+    cache = ProjectAccessCache(ttl_seconds=0)
+    grant = ProjectAccessGrant(uuid.uuid4(), uuid.uuid4(), "en")
+    cache.put(grant, cache.generation)
+    assert cache.get(grant.project_id, grant.user_id) is None
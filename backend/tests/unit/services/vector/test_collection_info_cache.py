@@ -0,0 +1,126 @@
+"""
+Unit tests for the shared collection info snapshot of the vector repository.
+"""
+
+import asyncio
+import time
+
+import pytest
+from qdrant_client import QdrantClient
+
+from app.services.vector.domain.entities import HealthStatus
+from app.services.vector.repositories.qdrant_repository import QdrantVectorRepository
+
+
+class CountingClient:
+    """Local Qdrant client that counts and optionally delays get_collection."""
+
+    def __init__(self, delay: float = 0.0):
+        self.inner = QdrantClient(":memory:")
+        self.delay = delay
+        self.get_collection_calls = 0
+
+    def get_collection(self, collection_name, **kwargs):
+        self.get_collection_calls += 1
+        if self.delay:
+            time.sleep(self.delay)
+        return self.inner.get_collection(collection_name, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self.inner, name)
+
+
+async def _repository(delay: float = 0.0, interval: float = 60.0):
+    client = CountingClient(delay)
+    repository = QdrantVectorRepository(
+        client, collection_info_refresh_interval=interval
+    )
+    await repository.initialize_collection()
+    client.get_collection_calls = 0
+    return repository, client
+
+
+@pytest.mark.asyncio
+async def test_concurrent_readers_share_one_fetch():
+    repository, client = await _repository(delay=0.05)
+
+    infos = await asyncio.gather(*(repository.get_collection_info() for _ in range(8)))
+
+    assert client.get_collection_calls == 1
+    assert all(info["vector_size"] == 1536 for info in infos)
+    assert infos[0]["payload_indexes"] is not None
+
+    # Served from memory afterwards
+    await repository.get_collection_info()
+    assert client.get_collection_calls == 1
+
+
+@pytest.mark.asyncio
+async def test_stale_snapshot_is_served_while_refreshing_in_background():
+    repository, client = await _repository(delay=0.05)
+    await repository.get_collection_info()
+    repository._cache_timestamp -= 120
+
+    stale = await repository.get_collection_info()
+
+    assert stale["snapshot_age_seconds"] >= 120
+    assert client.get_collection_calls == 1
+    await repository._collection_info_refresh
+    assert client.get_collection_calls == 2
+    assert (await repository.get_collection_info())["snapshot_age_seconds"] < 1
+
+
+@pytest.mark.asyncio
+async def test_schema_changes_invalidate_snapshot():
+    repository, client = await _repository()
+    await repository.get_collection_info()
+
+    await repository.create_indexes()
+    assert repository._collection_info_cache is None
+
+    await repository.get_collection_info()
+    assert client.get_collection_calls == 2
+
+
+@pytest.mark.asyncio
+async def test_refresh_racing_invalidation_is_discarded():
+    repository, client = await _repository(delay=0.05)
+    refresh = repository._schedule_collection_info_refresh()
+    await asyncio.sleep(0)
+    repository.invalidate_collection_info()
+    await refresh
+
+    assert repository._collection_info_cache is None
+
+
+@pytest.mark.asyncio
+async def test_health_check_uses_single_fetch():
+    repository, client = await _repository()
+
+    health = await repository.get_collection_health()
+
+    # Local mode reports no payload indexes, so the layout is only degraded
+    assert health.status == HealthStatus.DEGRADED
+    assert health.errors == []
+    assert client.get_collection_calls == 1
+
+
+@pytest.mark.asyncio
+async def test_background_refresher_keeps_snapshot_fresh():
+    repository, client = await _repository(interval=0.02)
+
+    repository.start_collection_info_refresher()
+    await asyncio.sleep(0.1)
+    await repository.stop_collection_info_refresher()
+
+    assert client.get_collection_calls >= 2
+    calls = client.get_collection_calls
+    await repository.get_collection_info()
+    assert client.get_collection_calls == calls
+
+
+def test_rejects_non_positive_refresh_interval():
+    with pytest.raises(ValueError, match="collection_info_refresh_interval"):
+        QdrantVectorRepository(
+            QdrantClient(":memory:"), collection_info_refresh_interval=0
+        )
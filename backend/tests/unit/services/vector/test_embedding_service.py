@@ -0,0 +1,176 @@
+"""
+Unit tests for the micro-batched embedding service.
+"""
+
+import asyncio
+from uuid import uuid4
+
+import numpy as np
+import pytest
+
+from app.services.vector.embedding_service import (
+    DeterministicEmbeddingBackend,
+    EmbeddingBackend,
+    MicroBatchEmbeddingService,
+)
+
+
+class RecordingBackend(EmbeddingBackend):
+    """Deterministic backend that records every batch it receives."""
+
+    def __init__(self, fail: bool = False):
+        self.inner = DeterministicEmbeddingBackend()
+        self.batches = []
+        self.fail = fail
+
+    async def embed(self, texts):
+        self.batches.append(list(texts))
+        if self.fail:
+            raise ConnectionError("model unavailable")
+        return await self.inner.embed(texts)
+
+
+def _cosine(a, b):
+    a, b = np.asarray(a), np.asarray(b)
+    return float(a @ b / (np.linalg.norm(a) * np.linalg.norm(b)))
+
+
+@pytest.mark.asyncio
+async def test_deterministic_backend_is_stable_and_normalized():
+    backend = DeterministicEmbeddingBackend()
+    first, again, related, unrelated = await backend.embed(
+        [
+            "postgres connection pooling",
+            "postgres connection pooling",
+            "connection pooling in postgres",
+            "frontend color palette",
+        ]
+    )
+    assert len(first) == 1536
+    assert first == again
+    assert np.linalg.norm(first) == pytest.approx(1.0)
+    assert _cosine(first, related) > _cosine(first, unrelated)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_from_projects_share_one_batch():
+    backend = RecordingBackend()
+    service = MicroBatchEmbeddingService(backend, max_batch_size=16, max_wait_ms=50)
+
+    results = await asyncio.gather(
+        *(service.embed(uuid4(), [f"text {i}", "shared"]) for i in range(3))
+    )
+
+    # Three callers, six texts, one backend call with "shared" embedded once
+    assert len(backend.batches) == 1
+    assert sorted(backend.batches[0]) == ["shared", "text 0", "text 1", "text 2"]
+    assert results[0][1] == results[1][1] == results[2][1]
+    assert results[1][0].to_list() == (await backend.inner.embed(["text 1"]))[0]
+
+    stats = service.stats()
+    assert stats["texts_deduplicated"] == 2
+    assert stats["batch_size"]["count"] == 1
+    assert stats["queue_wait_seconds"]["count"] == 6
+    await service.close()
+
+
+@pytest.mark.asyncio
+async def test_size_cap_splits_batches():
+    backend = RecordingBackend()
+    service = MicroBatchEmbeddingService(backend, max_batch_size=4, max_wait_ms=50)
+
+    vectors = await service.embed(uuid4(), [f"text {i}" for i in range(10)])
+
+    assert len(vectors) == 10
+    assert [len(batch) for batch in backend.batches] == [4, 4, 2]
+    await service.close()
+
+
+@pytest.mark.asyncio
+async def test_partial_batch_is_flushed_after_max_wait():
+    backend = RecordingBackend()
+    service = MicroBatchEmbeddingService(backend, max_batch_size=64, max_wait_ms=20)
+
+    vector = await asyncio.wait_for(service.embed_one(uuid4(), "alone"), timeout=1.0)
+
+    assert len(vector) == 1536
+    assert backend.batches == [["alone"]]
+    assert service.stats()["queue_wait_seconds"]["mean"] >= 0.015
+    await service.close()
+
+
+@pytest.mark.asyncio
+async def test_backend_failure_is_raised_to_every_caller():
+    service = MicroBatchEmbeddingService(RecordingBackend(fail=True), max_wait_ms=20)
+
+    results = await asyncio.gather(
+        service.embed_one(uuid4(), "a"),
+        service.embed_one(uuid4(), "b"),
+        return_exceptions=True,
+    )
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert service.stats()["failed_batches"] == 1
+    await service.close()
+
+
+@pytest.mark.asyncio
+async def test_close_flushes_queued_requests_and_rejects_new_ones():
+    backend = RecordingBackend()
+    service = MicroBatchEmbeddingService(backend, max_batch_size=64, max_wait_ms=500)
+
+    pending = asyncio.create_task(service.embed_one(uuid4(), "queued"))
+    await asyncio.sleep(0)
+    await service.close()
+
+    assert len(await pending) == 1536
+    with pytest.raises(ValueError, match="closed"):
+        await service.embed_one(uuid4(), "late")
+
+
+def test_requires_project_id():
+    service = MicroBatchEmbeddingService(DeterministicEmbeddingBackend())
+    with pytest.raises(ValueError, match="project_id"):
+        asyncio.run(service.embed(None, ["text"]))
+
+
+@pytest.mark.asyncio
+async def test_embedding_task_handler_returns_vectors_by_content_hash():
+    from app.services.queues.queue_manager import TaskData, TaskType
+    from app.services.queues.workers import DefaultTaskHandlers
+    from app.services.vector.domain.entities import ContentHash
+
+    task = TaskData(
+        task_type=TaskType.EMBEDDING_COMPUTATION,
+        project_id=uuid4(),
+        data={"texts": ["first", "second"]},
+    )
+    result = await DefaultTaskHandlers.handle_embedding_computation(task)
+
+    assert result["embeddings_count"] == 2
+    assert result["embeddings"][1]["content_hash"] == (
+        ContentHash.from_content("second").value
+    )
+    assert len(result["embeddings"][0]["vector"]) == 1536
+
+    with pytest.raises(ValueError, match="texts"):
+        await DefaultTaskHandlers.handle_embedding_computation(
+            TaskData(task_type=TaskType.EMBEDDING_COMPUTATION, project_id=uuid4())
+        )
+
+
+def test_backend_must_be_explicit_outside_development(monkeypatch, tmp_path):
+    from pydantic import ValidationError
+
+    from app.core.config import Settings
+
+    monkeypatch.delenv("EMBEDDING_BACKEND", raising=False)
+    monkeypatch.setenv("WAL_ARCHIVE_DIRECTORY", str(tmp_path))
+    monkeypatch.setenv("ENVIRONMENT", "test")
+    assert Settings(_env_file=None).EMBEDDING_BACKEND == "deterministic"
+
+    monkeypatch.setenv("ENVIRONMENT", "production")
+    with pytest.raises(ValidationError, match="EMBEDDING_BACKEND must be set"):
+        Settings(_env_file=None)
+    monkeypatch.setenv("EMBEDDING_BACKEND", "http")
+    assert Settings(_env_file=None).EMBEDDING_BACKEND == "http"
@@ -0,0 +1,214 @@
+"""
+Unit tests for the in-process exact search tier.
+
+Local Qdrant always searches exhaustively, so it serves as the exact-search
+reference the tier must match within EXACT_TIER_SCORE_TOLERANCE.
+"""
+
+import random
+from uuid import uuid4
+
+import pytest
+import pytest_asyncio
+from qdrant_client import QdrantClient
+
+from app.services.vector.domain.entities import (
+    DocumentType,
+    ExactTierConfig,
+    PayloadProjection,
+    SearchContext,
+    VectorData,
+    VectorPoint,
+)
+from app.services.vector.exact_search_tier import (
+    EXACT_TIER_SCORE_TOLERANCE,
+    ExactSearchTier,
+)
+from app.services.vector.repositories.qdrant_repository import QdrantVectorRepository
+
+
+def _vector(rng: random.Random) -> VectorData:
+    return VectorData([rng.uniform(-1.0, 1.0) for _ in range(1536)])
+
+
+def _points(context: SearchContext, count: int, rng: random.Random):
+    document_types = [DocumentType.KNOWLEDGE, DocumentType.MEMORY]
+    return [
+        VectorPoint(
+            vector=_vector(rng),
+            content=f"doc {i}",
+            project_id=context.project_id,
+            language=context.language,
+            document_type=document_types[i % 2],
+            importance=round(rng.random(), 2),
+        )
+        for i in range(count)
+    ]
+
+
+@pytest_asyncio.fixture
+async def repositories():
+    client = QdrantClient(":memory:")
+    reference = QdrantVectorRepository(client)
+    await reference.initialize_collection()
+    tier = ExactSearchTier(ExactTierConfig(max_points=200))
+    tiered = QdrantVectorRepository(client, exact_tier=tier)
+    return reference, tiered, tier
+
+
+@pytest.mark.asyncio
+async def test_tier_matches_qdrant_exact_search(repositories):
+    reference, tiered, tier = repositories
+    rng = random.Random(21)
+    context = SearchContext.create(str(uuid4()), "en")
+    other_language = SearchContext.create(context.project_id.value, "ru")
+    await tiered.upsert_points(context.project_id.value, _points(context, 120, rng))
+    await tiered.upsert_points(
+        context.project_id.value, _points(other_language, 30, rng)
+    )
+
+    for filters in [{}, {"document_type": DocumentType.MEMORY, "importance_min": 0.3}]:
+        for _ in range(10):
+            query = _vector(rng)
+            expected = await reference.search_similar(
+                query, context, limit=10, **filters
+            )
+            actual = await tiered.search_similar(query, context, limit=10, **filters)
+
+            assert len(actual) == len(expected)
+            expected_scores = {r.point.id: r.score for r in expected}
+            for got, want in zip(actual, expected):
+                assert abs(got.score - want.score) <= EXACT_TIER_SCORE_TOLERANCE
+                if got.point.id != want.point.id:
+                    # Only near-ties may swap places
+                    reference_score = expected_scores.get(got.point.id, got.score)
+                    assert (
+                        abs(reference_score - want.score)
+                        <= 2 * EXACT_TIER_SCORE_TOLERANCE
+                    )
+            assert all(r.point.language.value == "en" for r in actual)
+
+    assert tier.is_loaded(context.project_id)
+    assert tier.stats()["hits"] == 20
+
+
+@pytest.mark.asyncio
+async def test_tier_stays_consistent_with_writes(repositories):
+    _, tiered, tier = repositories
+    rng = random.Random(5)
+    context = SearchContext.create(str(uuid4()), "en")
+    points = _points(context, 20, rng)
+    await tiered.upsert_points(context.project_id.value, points)
+    await tiered.search_similar(points[0].vector, context, limit=1)
+    assert tier.is_loaded(context.project_id)
+
+    new_point = _points(context, 1, rng)[0]
+    await tiered.upsert_points(context.project_id.value, [new_point])
+    results = await tiered.search_similar(new_point.vector, context, limit=1)
+    assert results[0].point.id == new_point.id
+
+    await tiered.delete_points([new_point.id], context.project_id.value)
+    results = await tiered.search_similar(new_point.vector, context, limit=1)
+    assert results[0].point.id != new_point.id
+    assert tier.stats()["points_loaded"] == 20
+
+
+@pytest.mark.asyncio
+async def test_project_moves_to_qdrant_when_outgrown(repositories):
+    _, tiered, tier = repositories
+    rng = random.Random(9)
+    context = SearchContext.create(str(uuid4()), "en")
+    await tiered.upsert_points(context.project_id.value, _points(context, 150, rng))
+    await tiered.search_similar(_vector(rng), context, limit=1)
+    assert tier.is_loaded(context.project_id)
+
+    extra = _points(context, 60, rng)
+    await tiered.upsert_points(context.project_id.value, extra)
+    assert tier.is_large(context.project_id)
+
+    results = await tiered.search_similar(extra[0].vector, context, limit=1)
+    assert results[0].point.id == extra[0].id
+    assert tier.stats()["projects_outgrown"] == 1
+
+
+@pytest.mark.asyncio
+async def test_tier_respects_projection_and_isolation(repositories):
+    _, tiered, _ = repositories
+    rng = random.Random(13)
+    context = SearchContext.create(str(uuid4()), "en")
+    intruder = SearchContext.create(str(uuid4()), "en")
+    points = _points(context, 5, rng)
+    await tiered.upsert_points(context.project_id.value, points)
+    await tiered.upsert_points(intruder.project_id.value, _points(intruder, 5, rng))
+
+    results = await tiered.search_similar(
+        points[0].vector, context, limit=10, projection=PayloadProjection()
+    )
+    assert len(results) <= 5
+    assert {r.point.project_id.value for r in results} == {context.project_id.value}
+    assert not results[0].point.content_loaded
+
+
+class TestExactSearchTier:
+    """Test tier bookkeeping independent of Qdrant."""
+
+    def test_stale_load_is_discarded(self):
+        tier = ExactSearchTier(ExactTierConfig(max_points=10), dimension=3)
+        generation = tier.begin_load("p")
+        tier.remove("p", ["x"])  # A write lands while the snapshot is read
+        assert not tier.load("p", [], [], [], generation=generation)
+        tier.end_load("p")
+        generation = tier.begin_load("p")
+        assert tier.load("p", [], [], [], generation=generation)
+        tier.end_load("p")
+
+    def test_bookkeeping_of_uncached_projects_is_bounded(self):
+        now = [0.0]
+        tier = ExactSearchTier(
+            ExactTierConfig(
+                max_points=1, max_projects=2, ttl_seconds=60, max_large_projects=3
+            ),
+            dimension=3,
+            clock=lambda: now[0],
+        )
+        payload = {"language": "en", "type": "knowledge", "importance": 1.0}
+
+        # Writes to projects that are neither cached nor loading leave no trace
+        for project in range(100):
+            tier.remove(f"w{project}", ["x"])
+        assert tier._generations == {}
+
+        # Evicted projects drop their generation
+        for project in ("a", "b", "c"):
+            tier.load(project, ["1"], [[1.0, 0.0, 0.0]], [payload])
+            tier.upsert(project, ["1"], [[0.0, 1.0, 0.0]], [payload])
+        assert set(tier._generations) == {"b", "c"}
+        tier.evict("b")
+        assert set(tier._generations) == {"c"}
+
+        # Large markers are capped (LRU) and expire
+        for project in range(10):
+            tier.mark_large(f"l{project}")
+        assert list(tier._large_projects) == ["l7", "l8", "l9"]
+        now[0] = 61.0
+        tier.mark_large("l10")
+        assert list(tier._large_projects) == ["l10"]
+        assert tier.stats()["projects_large"] == 1
+
+    def test_ttl_expiry_and_lru_eviction(self):
+        now = [0.0]
+        tier = ExactSearchTier(
+            ExactTierConfig(max_points=10, max_projects=2, ttl_seconds=60),
+            dimension=3,
+            clock=lambda: now[0],
+        )
+        payload = {"language": "en", "type": "knowledge", "importance": 1.0}
+        for project in ("a", "b", "c"):
+            tier.load(project, ["1"], [[1.0, 0.0, 0.0]], [payload])
+        assert not tier.is_loaded("a")
+        assert tier.search("b", [1.0, 0.0, 0.0], "en", limit=1)[0][1] == pytest.approx(
+            1.0
+        )
+
+        now[0] = 61.0
+        assert not tier.is_loaded("b")
@@ -0,0 +1,188 @@
+"""
+Unit tests for hybrid (sparse BM25 + dense) search with server-side fusion.
+"""
+
+import random
+from uuid import uuid4
+
+import pytest
+import pytest_asyncio
+from qdrant_client import QdrantClient, models
+
+from app.services.vector.domain.entities import (
+    DocumentType,
+    HybridFusion,
+    SearchContext,
+    SparseVectorData,
+    VectorData,
+    VectorPoint,
+)
+from app.services.vector.repositories.qdrant_repository import QdrantVectorRepository
+from app.services.vector.search_service import DefaultVectorSearchService
+from app.services.vector.sparse_encoder import BM25SparseEncoder
+
+CONTENTS = [
+    "OAuth authentication flow with refresh tokens",
+    "Database migration strategy for PostgreSQL",
+    "Frontend component library and design tokens",
+    "Vector search with Qdrant payload filtering",
+]
+
+
+class TestBM25SparseEncoder:
+    """Test BM25 sparse encoding."""
+
+    def test_document_weights_saturate_with_term_frequency(self):
+        encoder = BM25SparseEncoder()
+        sparse = encoder.encode_document("cache cache cache miss")
+        weights = dict(zip(sparse.indices, sparse.values))
+
+        cache_weight = weights[encoder.term_index("cache")]
+        miss_weight = weights[encoder.term_index("miss")]
+        assert miss_weight < cache_weight < 3 * miss_weight
+        assert cache_weight < encoder.k1 + 1.0
+
+    def test_query_terms_are_unique_and_unit_weight(self):
+        sparse = BM25SparseEncoder().encode_query("Search search a SEARCH index")
+        assert len(sparse) == 2
+        assert sparse.values == [1.0, 1.0]
+
+    def test_empty_text_encodes_to_empty_vector(self):
+        assert BM25SparseEncoder().encode_document("  a ! ").is_empty
+
+    def test_sparse_vector_validation(self):
+        with pytest.raises(ValueError, match="differ in length"):
+            SparseVectorData(indices=[1, 2], values=[1.0])
+        with pytest.raises(ValueError, match="unique"):
+            SparseVectorData(indices=[1, 1], values=[1.0, 1.0])
+
+
+@pytest_asyncio.fixture
+async def hybrid_repository():
+    repository = QdrantVectorRepository(QdrantClient(":memory:"))
+    await repository.initialize_collection()
+
+    rng = random.Random(11)
+    context = SearchContext.create(str(uuid4()), "en")
+    other = SearchContext.create(str(uuid4()), "en")
+    vectors = [[rng.uniform(-1.0, 1.0) for _ in range(1536)] for _ in CONTENTS]
+    for ctx in (context, other):
+        await repository.upsert_points(
+            ctx.project_id.value,
+            [
+                VectorPoint(
+                    vector=VectorData(vector),
+                    content=content,
+                    project_id=ctx.project_id,
+                    language=ctx.language,
+                    document_type=DocumentType.KNOWLEDGE,
+                )
+                for content, vector in zip(CONTENTS, vectors)
+            ],
+        )
+    return repository, context, vectors
+
+
+@pytest.mark.asyncio
+async def test_keyword_match_outranks_unrelated_dense_match(hybrid_repository):
+    repository, context, vectors = hybrid_repository
+
+    # Dense query points at the PostgreSQL document, keywords at the Qdrant one
+    results = await repository.hybrid_search_similar(
+        "qdrant payload filtering",
+        VectorData(vectors[1]),
+        context,
+        limit=4,
+        text_weight=0.9,
+        vector_weight=0.1,
+    )
+    assert results[0].point.content == CONTENTS[3]
+    assert {r.point.project_id.value for r in results} == {context.project_id.value}
+
+
+@pytest.mark.asyncio
+async def test_rrf_fusion_combines_both_branches(hybrid_repository):
+    repository, context, vectors = hybrid_repository
+
+    results = await repository.hybrid_search_similar(
+        "qdrant payload filtering",
+        VectorData(vectors[1]),
+        context,
+        limit=4,
+        fusion=HybridFusion.RRF,
+    )
+    top_two = {result.point.content for result in results[:2]}
+    assert top_two == {CONTENTS[1], CONTENTS[3]}
+    assert len(results) == len(CONTENTS)
+
+
+@pytest.mark.asyncio
+async def test_query_without_keywords_falls_back_to_dense(hybrid_repository):
+    repository, context, vectors = hybrid_repository
+
+    results = await repository.hybrid_search_similar(
+        "?", VectorData(vectors[2]), context, limit=1
+    )
+    assert results[0].point.content == CONTENTS[2]
+
+
+@pytest.mark.asyncio
+async def test_retrieved_point_keeps_dense_vector(hybrid_repository):
+    repository, context, vectors = hybrid_repository
+    hits = await repository.search_similar(VectorData(vectors[0]), context, limit=1)
+
+    point = await repository.get_point_by_id(hits[0].point.id, context.project_id.value)
+    assert len(point.vector) == 1536
+    assert await repository.validate_schema() == []
+
+
+@pytest.mark.asyncio
+async def test_service_validates_hybrid_parameters(hybrid_repository):
+    repository, context, vectors = hybrid_repository
+    service = DefaultVectorSearchService(repository)
+
+    with pytest.raises(ValueError, match="query_text"):
+        await service.hybrid_search(" ", VectorData(vectors[0]), context)
+    with pytest.raises(ValueError, match="both be 0"):
+        await service.hybrid_search(
+            "oauth", VectorData(vectors[0]), context, text_weight=0, vector_weight=0
+        )
+
+    results = await service.hybrid_search(
+        "oauth tokens", VectorData(vectors[3]), context, limit=2, fusion="rrf"
+    )
+    assert CONTENTS[0] in {result.point.content for result in results}
+
+
+@pytest.mark.asyncio
+async def test_collection_without_sparse_vector_is_used_dense_only():
+    client = QdrantClient(":memory:")
+    # Created before hybrid search: dense vector only
+    client.create_collection(
+        QdrantVectorRepository.COLLECTION_NAME,
+        vectors_config=models.VectorParams(size=1536, distance=models.Distance.COSINE),
+    )
+    repository = QdrantVectorRepository(client)
+    await repository.initialize_collection()
+
+    rng = random.Random(5)
+    context = SearchContext.create(str(uuid4()), "en")
+    vectors = [[rng.uniform(-1.0, 1.0) for _ in range(1536)] for _ in CONTENTS]
+    await repository.upsert_points(
+        context.project_id.value,
+        [
+            VectorPoint(
+                vector=VectorData(vector),
+                content=content,
+                project_id=context.project_id,
+                language=context.language,
+                document_type=DocumentType.KNOWLEDGE,
+            )
+            for content, vector in zip(CONTENTS, vectors)
+        ],
+    )
+
+    results = await repository.hybrid_search_similar(
+        "qdrant payload filtering", VectorData(vectors[1]), context, limit=1
+    )
+    assert results[0].point.content == CONTENTS[1]
@@ -0,0 +1,212 @@
+"""
+Unit tests for search payload projection and the external content store.
+"""
+
+import random
+from uuid import uuid4
+
+import pytest
+import pytest_asyncio
+from qdrant_client import QdrantClient
+
+from app.services.vector.domain.entities import (
+    ContentStorageMode,
+    DocumentType,
+    PayloadProjection,
+    SearchContext,
+    VectorData,
+    VectorPoint,
+    VectorStorageConfig,
+)
+from app.services.vector.repositories.content_store import InMemoryContentStore
+from app.services.vector.repositories.qdrant_repository import QdrantVectorRepository
+
+LONG_CONTENT = "architecture decision record " * 40
+
+
+class CountingContentStore(InMemoryContentStore):
+    """In-memory content store that records bulk fetches."""
+
+    def __init__(self):
+        super().__init__()
+        self.fetches = []
+
+    async def get_many(self, project_id, content_hashes):
+        self.fetches.append(list(content_hashes))
+        return await super().get_many(project_id, content_hashes)
+
+
+def _points(context: SearchContext, count: int):
+    rng = random.Random(7)
+    return [
+        VectorPoint(
+            vector=VectorData([rng.uniform(-1.0, 1.0) for _ in range(1536)]),
+            content=f"{i} {LONG_CONTENT}",
+            project_id=context.project_id,
+            language=context.language,
+            document_type=DocumentType.KNOWLEDGE,
+            title=f"Doc {i}",
+        )
+        for i in range(count)
+    ]
+
+
+async def _repository(storage_config=None, content_store=None):
+    repository = QdrantVectorRepository(
+        QdrantClient(":memory:"), storage_config, content_store=content_store
+    )
+    await repository.initialize_collection()
+    context = SearchContext.create(str(uuid4()), "en")
+    points = _points(context, 3)
+    await repository.upsert_points(context.project_id.value, points)
+    return repository, context, points
+
+
+@pytest_asyncio.fixture
+async def inline_repository():
+    return await _repository()
+
+
+@pytest_asyncio.fixture
+async def external_repository():
+    store = CountingContentStore()
+    repository, context, points = await _repository(
+        VectorStorageConfig(content_storage=ContentStorageMode.EXTERNAL), store
+    )
+    return repository, context, points, store
+
+
+class TestPayloadProjection:
+    """Test PayloadProjection value object."""
+
+    def test_default_excludes_content(self):
+        projection = PayloadProjection()
+        fields = projection.qdrant_fields(content_inline=True)
+        assert "content" not in fields
+        assert {"project_id", "language", "content_preview"} <= set(fields)
+
+    def test_from_fields_always_keeps_required_fields(self):
+        projection = PayloadProjection.from_fields(["title", "content"])
+        assert projection.include_content
+        fields = set(projection.qdrant_fields(content_inline=True))
+        assert fields == PayloadProjection.REQUIRED_FIELDS | {"title", "content"}
+        # External mode never asks Qdrant for content
+        assert "content" not in projection.qdrant_fields(content_inline=False)
+
+    def test_unknown_field_rejected(self):
+        with pytest.raises(ValueError, match="Unknown payload fields"):
+            PayloadProjection.from_fields(["vector"])
+
+
+@pytest.mark.asyncio
+async def test_projected_search_skips_content(inline_repository):
+    repository, context, points = inline_repository
+
+    results = await repository.search_similar(
+        points[0].vector, context, limit=1, projection=PayloadProjection()
+    )
+    point = results[0].point
+    assert not point.content_loaded
+    assert point.content == ""
+    assert results[0].to_dict()["content"] == points[0].content[:200] + "..."
+
+
+@pytest.mark.asyncio
+async def test_points_without_stored_preview_fall_back_to_content(
+    inline_repository,
+):
+    repository, context, points = inline_repository
+    # Stored before payloads carried a preview
+    repository.client.delete_payload(
+        repository.COLLECTION_NAME,
+        keys=["content_preview"],
+        points=[str(point.id) for point in points],
+    )
+
+    results = await repository.search_similar(
+        points[0].vector, context, limit=1, projection=PayloadProjection()
+    )
+    assert results[0].to_dict()["content"] == points[0].content[:200] + "..."
+
+
+@pytest.mark.asyncio
+async def test_default_search_keeps_full_content(inline_repository):
+    repository, context, points = inline_repository
+
+    results = await repository.search_similar(points[0].vector, context, limit=1)
+    assert results[0].point.content == points[0].content
+    assert results[0].to_dict(full_content=True)["content"] == points[0].content
+
+
+@pytest.mark.asyncio
+async def test_external_mode_keeps_content_out_of_qdrant(external_repository):
+    repository, context, points, store = external_repository
+
+    records, _ = repository.client.scroll(repository.COLLECTION_NAME, limit=10)
+    assert all("content" not in record.payload for record in records)
+    assert all(record.payload["content_preview"] for record in records)
+
+    results = await repository.search_similar(points[0].vector, context, limit=3)
+    assert {result.point.content for result in results} == {
+        point.content for point in points
+    }
+    # One bulk fetch for all results
+    assert len(store.fetches) == 1
+    assert len(store.fetches[0]) == 3
+
+
+@pytest.mark.asyncio
+async def test_external_content_loaded_lazily(external_repository):
+    repository, context, points, store = external_repository
+
+    results = await repository.search_similar(
+        points[0].vector, context, limit=2, projection=PayloadProjection()
+    )
+    assert store.fetches == []
+
+    loaded = await repository.load_content(results, context.project_id.value)
+    assert loaded[0].point.content == points[0].content
+    assert len(store.fetches) == 1
+
+    point = await repository.get_point_by_id(points[1].id, context.project_id.value)
+    assert point.content == points[1].content
+
+
+@pytest.mark.asyncio
+async def test_content_store_is_project_scoped():
+    store = InMemoryContentStore()
+    project_a, project_b = uuid4(), uuid4()
+    await store.put_many(project_a, {"hash": "secret"})
+
+    assert await store.get_many(project_b, ["hash"]) == {}
+    assert await store.delete_project(project_a) == 1
+
+
+def test_external_mode_requires_content_store():
+    with pytest.raises(ValueError, match="content store"):
+        QdrantVectorRepository(
+            QdrantClient(":memory:"),
+            VectorStorageConfig(content_storage=ContentStorageMode.EXTERNAL),
+        )
+
+
+@pytest.mark.asyncio
+async def test_deletes_remove_unreferenced_external_content(external_repository):
+    repository, context, points, store = external_repository
+    project_id = context.project_id.value
+    duplicate = VectorPoint(
+        vector=points[1].vector,
+        content=points[1].content,
+        project_id=context.project_id,
+        language=context.language,
+        document_type=DocumentType.KNOWLEDGE,
+    )
+    await repository.upsert_points(project_id, [duplicate])
+    hashes = [str(point.content_hash) for point in points]
+
+    await repository.delete_points([points[0].id, points[1].id], project_id)
+    # points[1]'s content is still used by its duplicate
+    assert set(await store.get_many(project_id, hashes)) == set(hashes[1:])
+
+    assert await repository.delete_by_filter(context) == 2
+    assert await store.get_many(project_id, hashes) == {}
@@ -0,0 +1,128 @@
+"""
+Unit tests for batched multi-query vector search.
+
+Runs the Qdrant repository against qdrant_client's in-memory local mode to
+verify that search_batch results keep strict project and language isolation.
+"""
+
+import random
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+import pytest_asyncio
+from qdrant_client import QdrantClient
+
+from app.services.vector.domain.entities import (
+    DocumentType,
+    SearchContext,
+    VectorData,
+    VectorPoint,
+)
+from app.services.vector.repositories.qdrant_repository import QdrantVectorRepository
+from app.services.vector.search_service import DefaultVectorSearchService
+
+
+def _random_vector(rng: random.Random) -> VectorData:
+    return VectorData([rng.uniform(-1.0, 1.0) for _ in range(1536)])
+
+
+def _make_point(context: SearchContext, vector: VectorData, content: str):
+    return VectorPoint(
+        vector=vector,
+        content=content,
+        project_id=context.project_id,
+        language=context.language,
+        document_type=DocumentType.KNOWLEDGE,
+    )
+
+
+@pytest_asyncio.fixture
+async def repository():
+    repo = QdrantVectorRepository(QdrantClient(":memory:"))
+    await repo.initialize_collection()
+    return repo
+
+
+@pytest.mark.asyncio
+async def test_search_many_returns_per_query_results(repository):
+    rng = random.Random(42)
+    context = SearchContext.create(str(uuid4()), "en")
+    other_context = SearchContext.create(str(uuid4()), "en")
+
+    vectors = [_random_vector(rng) for _ in range(5)]
+    await repository.upsert_points(
+        context.project_id.value,
+        [_make_point(context, v, f"doc {i}") for i, v in enumerate(vectors)],
+    )
+    await repository.upsert_points(
+        other_context.project_id.value,
+        [_make_point(other_context, v, "foreign") for v in vectors],
+    )
+
+    service = DefaultVectorSearchService(repository)
+    batch = await service.search_many(
+        query_vectors=[vectors[0], vectors[3]], context=context, limit=3
+    )
+
+    assert len(batch) == 2
+    assert batch[0][0].point.content == "doc 0"
+    assert batch[1][0].point.content == "doc 3"
+    for results in batch:
+        assert 1 <= len(results) <= 3
+        for result in results:
+            assert str(result.point.project_id) == str(context.project_id)
+
+
+@pytest.mark.asyncio
+async def test_search_batch_revalidates_every_result():
+    context = SearchContext.create(str(uuid4()), "en")
+    foreign_payload = {
+        "project_id": str(uuid4()),
+        "language": "en",
+        "type": "knowledge",
+        "content": "leaked",
+        "created_at": "2024-01-01T00:00:00",
+        "updated_at": "2024-01-01T00:00:00",
+    }
+    own_payload = dict(foreign_payload, project_id=str(context.project_id))
+
+    class StubClient:
+        def search_batch(self, collection_name, requests, **kwargs):
+            # Every request must carry the mandatory isolation filter
+            for request in requests:
+                keys = {condition.key for condition in request.filter.must}
+                assert {"project_id", "language"} <= keys
+            return [
+                [
+                    SimpleNamespace(
+                        id=str(uuid4()), score=0.9, payload=foreign_payload
+                    ),
+                    SimpleNamespace(id=str(uuid4()), score=0.8, payload=own_payload),
+                ]
+                for _ in requests
+            ]
+
+    repository = QdrantVectorRepository(StubClient())
+    rng = random.Random(7)
+    batch = await repository.search_similar_batch(
+        [_random_vector(rng), _random_vector(rng)], context, limit=2
+    )
+
+    assert [len(results) for results in batch] == [1, 1]
+    for results in batch:
+        assert str(results[0].point.project_id) == str(context.project_id)
+
+
+@pytest.mark.asyncio
+async def test_search_many_rejects_empty_and_oversized_batches(repository):
+    context = SearchContext.create(str(uuid4()), "en")
+    service = DefaultVectorSearchService(repository)
+    rng = random.Random(1)
+
+    with pytest.raises(ValueError, match="At least one query vector"):
+        await service.search_many(query_vectors=[], context=context)
+
+    too_many = [_random_vector(rng)] * (repository.MAX_SEARCH_BATCH_SIZE + 1)
+    with pytest.raises(ValueError, match="Too many query vectors"):
+        await service.search_many(query_vectors=too_many, context=context)
@@ -0,0 +1,91 @@
+"""
+Unit tests for vector quantization and on-disk storage configuration.
+"""
+
+from uuid import uuid4
+
+import pytest
+from qdrant_client import QdrantClient, models
+
+from app.services.vector.domain.entities import (
+    QuantizationMode,
+    SearchContext,
+    VectorData,
+    VectorStorageConfig,
+)
+from app.services.vector.repositories.qdrant_repository import QdrantVectorRepository
+
+
+class TestVectorStorageConfig:
+    """Test VectorStorageConfig value object."""
+
+    def test_default_is_unquantized_ram(self):
+        config = VectorStorageConfig()
+        assert config.quantization == QuantizationMode.NONE
+        assert not config.is_quantized
+        assert not config.vectors_on_disk
+
+    def test_mode_parsed_from_string(self):
+        config = VectorStorageConfig(quantization="binary")
+        assert config.quantization == QuantizationMode.BINARY
+        assert config.is_quantized
+
+    def test_invalid_values_rejected(self):
+        with pytest.raises(ValueError):
+            VectorStorageConfig(quantization="int4")
+        with pytest.raises(ValueError, match="Oversampling"):
+            VectorStorageConfig(oversampling=0.5)
+
+
+class TestQuantizedRepository:
+    """Test quantization wiring in QdrantVectorRepository."""
+
+    def test_no_quantization_by_default(self):
+        repository = QdrantVectorRepository(QdrantClient(":memory:"))
+        assert repository._build_quantization_config() is None
+        assert repository._build_search_params() is None
+
+    def test_scalar_quantization_config(self):
+        repository = QdrantVectorRepository(
+            QdrantClient(":memory:"),
+            VectorStorageConfig(quantization=QuantizationMode.SCALAR, oversampling=3.0),
+        )
+        config = repository._build_quantization_config()
+        assert isinstance(config, models.ScalarQuantization)
+        assert config.scalar.type == models.ScalarType.INT8
+
+        params = repository._build_search_params()
+        assert params.quantization.rescore is True
+        assert params.quantization.oversampling == 3.0
+
+    def test_binary_quantization_config(self):
+        repository = QdrantVectorRepository(
+            QdrantClient(":memory:"),
+            VectorStorageConfig(quantization=QuantizationMode.BINARY),
+        )
+        assert isinstance(
+            repository._build_quantization_config(), models.BinaryQuantization
+        )
+
+    @pytest.mark.asyncio
+    async def test_validate_schema_detects_storage_mismatch(self):
+        client = QdrantClient(":memory:")
+        await QdrantVectorRepository(client).initialize_collection()
+
+        on_disk_repository = QdrantVectorRepository(
+            client, VectorStorageConfig(vectors_on_disk=True)
+        )
+        errors = await on_disk_repository.validate_schema()
+        assert any("on_disk" in error for error in errors)
+
+    @pytest.mark.asyncio
+    async def test_quantized_search_runs(self):
+        repository = QdrantVectorRepository(
+            QdrantClient(":memory:"),
+            VectorStorageConfig(quantization=QuantizationMode.SCALAR),
+        )
+        await repository.initialize_collection()
+        context = SearchContext.create(str(uuid4()), "en")
+
+        results = await repository.search_similar(VectorData([0.1] * 1536), context)
+        assert results == []
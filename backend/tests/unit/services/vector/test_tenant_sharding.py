@@ -0,0 +1,255 @@
+"""
+Unit tests for tenant-aware shard routing and online project promotion.
+
+Local Qdrant does not support shard keys, so the tests use a small fake
+client that keeps one in-memory Qdrant instance per shard key.
+"""
+
+import random
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+import pytest_asyncio
+from qdrant_client import QdrantClient, models
+
+from app.services.vector.domain.entities import (
+    DocumentType,
+    SearchContext,
+    TenantLayoutConfig,
+    VectorData,
+    VectorPoint,
+)
+from app.services.vector.repositories.qdrant_repository import QdrantVectorRepository
+from app.services.vector.tenant_sharding import TenantShardMigrator
+
+
+class ShardedFakeClient:
+    """Fake Qdrant client with one in-memory store per custom shard key."""
+
+    def __init__(self):
+        self.shards = {}
+        self.aliases = {}
+        self.collection_args = None
+        self.calls = []
+        self.http = SimpleNamespace(
+            distributed_api=SimpleNamespace(
+                collection_cluster_info=self.collection_cluster_info
+            )
+        )
+
+    def _shards_for(self, shard_key_selector):
+        if shard_key_selector is None:
+            return list(self.shards.values())
+        keys = (
+            shard_key_selector
+            if isinstance(shard_key_selector, list)
+            else [shard_key_selector]
+        )
+        return [self.shards[key] for key in keys]
+
+    def get_collections(self):
+        names = [] if self.collection_args is None else [self.collection_args[0]]
+        return models.CollectionsResponse(
+            collections=[models.CollectionDescription(name=name) for name in names]
+        )
+
+    def get_aliases(self):
+        return models.CollectionsAliasesResponse(
+            aliases=[
+                models.AliasDescription(alias_name=alias, collection_name=collection)
+                for alias, collection in self.aliases.items()
+            ]
+        )
+
+    def update_collection_aliases(self, change_aliases_operations):
+        for operation in change_aliases_operations:
+            create = operation.create_alias
+            self.aliases[create.alias_name] = create.collection_name
+
+    def collection_cluster_info(self, collection_name):
+        shards = [SimpleNamespace(shard_key=key) for key in self.shards]
+        return SimpleNamespace(
+            result=SimpleNamespace(local_shards=shards, remote_shards=[])
+        )
+
+    def create_collection(self, collection_name, vectors_config, **kwargs):
+        assert kwargs["sharding_method"] == models.ShardingMethod.CUSTOM
+        self.collection_args = (
+            collection_name,
+            vectors_config,
+            kwargs["sparse_vectors_config"],
+        )
+        return True
+
+    def get_collection(self, collection_name):
+        return self.shards["shared"].get_collection(collection_name)
+
+    def create_shard_key(self, collection_name, shard_key):
+        client = QdrantClient(":memory:")
+        client.create_collection(
+            collection_name,
+            vectors_config=self.collection_args[1],
+            sparse_vectors_config=self.collection_args[2],
+        )
+        self.shards[shard_key] = client
+        return True
+
+    def create_payload_index(self, collection_name, field_name, field_schema):
+        self.calls.append(("create_payload_index", field_name, field_schema))
+        return True
+
+    def upsert(self, collection_name, points, shard_key_selector=None, **kwargs):
+        self.calls.append(("upsert", shard_key_selector))
+        for shard in self._shards_for(shard_key_selector):
+            shard.upsert(collection_name, points=points)
+
+    def search(self, collection_name, shard_key_selector=None, **kwargs):
+        self.calls.append(("search", shard_key_selector))
+        results = []
+        for shard in self._shards_for(shard_key_selector):
+            results.extend(shard.search(collection_name, **kwargs))
+        return sorted(results, key=lambda point: point.score, reverse=True)
+
+    def count(self, collection_name, count_filter=None, shard_key_selector=None):
+        total = sum(
+            shard.count(collection_name, count_filter=count_filter).count
+            for shard in self._shards_for(shard_key_selector)
+        )
+        return models.CountResult(count=total)
+
+    def scroll(self, collection_name, shard_key_selector=None, **kwargs):
+        (shard,) = self._shards_for(shard_key_selector)
+        return shard.scroll(collection_name, **kwargs)
+
+    def delete(self, collection_name, points_selector, shard_key_selector=None):
+        self.calls.append(("delete", shard_key_selector))
+        for shard in self._shards_for(shard_key_selector):
+            shard.delete(collection_name, points_selector=points_selector)
+
+    def facet(self, collection_name, key, shard_key_selector=None, **kwargs):
+        (shard,) = self._shards_for(shard_key_selector)
+        return shard.facet(collection_name, key, **kwargs)
+
+
+def _points(context: SearchContext, count: int, rng: random.Random):
+    return [
+        VectorPoint(
+            vector=VectorData([rng.uniform(-1.0, 1.0) for _ in range(1536)]),
+            content=f"doc {i}",
+            project_id=context.project_id,
+            language=context.language,
+            document_type=DocumentType.KNOWLEDGE,
+        )
+        for i in range(count)
+    ]
+
+
+@pytest_asyncio.fixture
+async def sharded_repository():
+    fake = ShardedFakeClient()
+    repository = QdrantVectorRepository(
+        fake,
+        tenant_config=TenantLayoutConfig(
+            custom_sharding=True, dedicated_shard_threshold=5
+        ),
+    )
+    await repository.initialize_collection()
+    return repository, fake
+
+
+@pytest.mark.asyncio
+async def test_project_id_index_is_marked_as_tenant(sharded_repository):
+    _, fake = sharded_repository
+    schemas = {
+        call[1]: call[2] for call in fake.calls if call[0] == "create_payload_index"
+    }
+    assert schemas["project_id"].is_tenant is True
+    assert "shared" in fake.shards
+
+
+@pytest.mark.asyncio
+async def test_promote_project_moves_points_to_dedicated_shard(sharded_repository):
+    repository, fake = sharded_repository
+    rng = random.Random(3)
+    big = SearchContext.create(str(uuid4()), "en")
+    small = SearchContext.create(str(uuid4()), "en")
+    big_points = _points(big, 8, rng)
+    await repository.upsert_points(big.project_id.value, big_points)
+    await repository.upsert_points(small.project_id.value, _points(small, 2, rng))
+
+    migrator = TenantShardMigrator(repository, batch_size=3, routing_grace_seconds=0)
+    candidates = await migrator.find_promotion_candidates()
+    assert [c["project_id"] for c in candidates] == [big.project_id.value]
+
+    report = await migrator.promote_project(big.project_id.value)
+    assert report["status"] == "promoted"
+    assert report["points_copied"] == 8
+
+    dedicated_key = TenantLayoutConfig.dedicated_shard_key(big.project_id.value)
+    assert big.project_id.value in repository.dedicated_projects
+    assert fake.shards[dedicated_key].count("jeex_memory").count == 8
+    # The shared shard now only holds the small project
+    assert fake.shards["shared"].count("jeex_memory").count == 2
+
+    fake.calls.clear()
+    results = await repository.search_similar(big_points[0].vector, big, limit=3)
+    assert results[0].point.content == "doc 0"
+    assert ("search", dedicated_key) in fake.calls
+    assert await repository.count_points(small) == 2
+
+
+@pytest.mark.asyncio
+async def test_writes_go_to_both_shards_while_migrating(sharded_repository):
+    repository, fake = sharded_repository
+    context = SearchContext.create(str(uuid4()), "en")
+    dedicated_key = TenantLayoutConfig.dedicated_shard_key(context.project_id.value)
+    fake.create_shard_key("jeex_memory", dedicated_key)
+
+    repository.mark_project_migrating(context.project_id.value)
+    fake.calls.clear()
+    await repository.upsert_points(
+        context.project_id.value, _points(context, 1, random.Random(5))
+    )
+
+    assert ("upsert", "shared") in fake.calls
+    assert ("upsert", dedicated_key) in fake.calls
+    # Reads stay on the shared shard until cutover
+    assert repository._read_shard_key(context.project_id.value) == "shared"
+
+
+def test_migrator_requires_custom_sharding():
+    with pytest.raises(ValueError, match="custom sharding"):
+        TenantShardMigrator(QdrantVectorRepository(QdrantClient(":memory:")))
+
+
+@pytest.mark.asyncio
+async def test_other_processes_follow_promotion_through_cluster_routing(
+    sharded_repository,
+):
+    repository, fake = sharded_repository
+    worker = QdrantVectorRepository(
+        fake, tenant_config=TenantLayoutConfig(custom_sharding=True)
+    )
+    context = SearchContext.create(str(uuid4()), "en")
+    project_id = context.project_id.value
+    dedicated_key = TenantLayoutConfig.dedicated_shard_key(project_id)
+    await repository.upsert_points(project_id, _points(context, 3, random.Random(7)))
+
+    # Shard key created, copy not finished: dual writes, reads stay shared
+    fake.create_shard_key("jeex_memory", dedicated_key)
+    await worker.refresh_tenant_routing()
+    assert worker._write_shard_keys(project_id) == ["shared", dedicated_key]
+    assert worker._read_shard_key(project_id) == "shared"
+
+    fake.shards.pop(dedicated_key)
+    report = await TenantShardMigrator(
+        repository, routing_grace_seconds=0
+    ).promote_project(project_id)
+    assert report["status"] == "promoted"
+    assert project_id not in worker.dedicated_projects
+
+    await worker.refresh_tenant_routing()
+    assert worker.dedicated_projects == {project_id}
+    assert worker._write_shard_keys(project_id) == [dedicated_key]
+    assert await worker.count_points(context) == 3
@@ -0,0 +1,309 @@
+"""
+Unit tests for streaming vector export/import and alias-based reindexing.
+"""
+
+import asyncio
+import gzip
+import json
+import random
+from uuid import uuid4
+
+import pytest
+from qdrant_client import QdrantClient, models
+
+from app.services.vector.domain.entities import (
+    ContentStorageMode,
+    DocumentType,
+    QuantizationMode,
+    SearchContext,
+    VectorData,
+    VectorPoint,
+    VectorStorageConfig,
+)
+from app.services.vector.migration import (
+    CollectionReindexer,
+    LegacyCutoverError,
+    VectorProjectExporter,
+    VectorProjectImporter,
+    _BoundedUpserter,
+    decode_dense_vector,
+    encode_dense_vector,
+)
+from app.services.vector.repositories.content_store import InMemoryContentStore
+from app.services.vector.repositories.qdrant_repository import QdrantVectorRepository
+
+
+def _points(context: SearchContext, count: int, seed: int = 11):
+    rng = random.Random(seed)
+    return [
+        VectorPoint(
+            vector=VectorData([rng.uniform(-1.0, 1.0) for _ in range(1536)]),
+            content=f"decision record {i} about caching",
+            project_id=context.project_id,
+            language=context.language,
+            document_type=DocumentType.KNOWLEDGE,
+        )
+        for i in range(count)
+    ]
+
+
+# Local Qdrant is not thread-safe, so tests against it upsert one batch at a time
+async def _repository(storage_config=None, content_store=None):
+    repository = QdrantVectorRepository(
+        QdrantClient(":memory:"), storage_config, content_store=content_store
+    )
+    await repository.initialize_collection()
+    return repository
+
+
+def test_dense_vector_encoding_roundtrip():
+    vector = [0.25, -1.5, 3.0]
+    assert decode_dense_vector(encode_dense_vector(vector)) == vector
+
+
+@pytest.mark.asyncio
+async def test_bounded_upserter_caps_batches_in_flight():
+    in_flight = 0
+    peak = 0
+    batches = []
+
+    async def upsert(points):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        batches.append(points)
+        in_flight -= 1
+
+    upserter = _BoundedUpserter(upsert, concurrency=3)
+    for batch in range(10):
+        await upserter.submit([batch])
+    await upserter.drain()
+
+    assert peak == 3
+    assert sorted(batches) == [[batch] for batch in range(10)]
+
+
+@pytest.mark.asyncio
+async def test_export_import_roundtrip_into_external_storage(tmp_path):
+    source = await _repository()
+    context = SearchContext.create(str(uuid4()), "en")
+    other = SearchContext.create(str(uuid4()), "en")
+    points = _points(context, 7)
+    await source.upsert_points(context.project_id.value, points)
+    await source.upsert_points(other.project_id.value, _points(other, 2, seed=3))
+
+    path = str(tmp_path / "project.jsonl.gz")
+    export = await VectorProjectExporter(source, batch_size=3).export_project(
+        context.project_id.value, path
+    )
+    assert export["points"] == 7
+    assert export["file_bytes"] > 0
+    assert export["peak_rss_bytes"] > 0
+
+    with gzip.open(path, "rt") as exported:
+        header = json.loads(exported.readline())
+        lines = [json.loads(line) for line in exported]
+    assert header["project_id"] == str(context.project_id.value)
+    assert len(lines) == 7
+    assert all(line["sparse"]["indices"] for line in lines)
+
+    store = InMemoryContentStore()
+    target = await _repository(
+        VectorStorageConfig(content_storage=ContentStorageMode.EXTERNAL), store
+    )
+    report = await VectorProjectImporter(
+        target, batch_size=2, concurrency=1
+    ).import_file(path)
+    assert report["points"] == 7
+    assert report["points_per_second"] > 0
+    assert await target.count_points(context) == 7
+    assert await target.count_points(other) == 0
+
+    original = await source.get_point_by_id(points[0].id, context.project_id.value)
+    restored = await target.get_point_by_id(points[0].id, context.project_id.value)
+    assert restored.content == points[0].content
+    assert restored.vector.to_list() == pytest.approx(
+        original.vector.to_list(), abs=1e-6
+    )
+
+    hybrid = await target.hybrid_search_similar(
+        "record 4", points[4].vector, context, limit=1
+    )
+    assert hybrid[0].point.id == points[4].id
+
+
+@pytest.mark.asyncio
+async def test_import_rejects_cross_project_records(tmp_path):
+    source = await _repository()
+    context = SearchContext.create(str(uuid4()), "en")
+    await source.upsert_points(context.project_id.value, _points(context, 2))
+    path = str(tmp_path / "project.jsonl.gz")
+    await VectorProjectExporter(source).export_project(context.project_id.value, path)
+
+    with gzip.open(path, "rt") as exported:
+        header, *lines = exported.read().splitlines()
+    tampered = json.loads(lines[1])
+    tampered["payload"]["project_id"] = str(uuid4())
+    with gzip.open(path, "wt") as output:
+        output.write("\n".join([header, lines[0], json.dumps(tampered)]) + "\n")
+
+    target = await _repository()
+    with pytest.raises(ValueError, match="Cross-project import is forbidden"):
+        await VectorProjectImporter(target, concurrency=1).import_file(path)
+
+
+@pytest.mark.asyncio
+async def test_reindex_switches_alias_without_losing_points():
+    repository = await _repository()
+    context = SearchContext.create(str(uuid4()), "en")
+    points = _points(context, 9)
+    await repository.upsert_points(context.project_id.value, points)
+    reindexer = CollectionReindexer(repository, batch_size=4, concurrency=1)
+
+    # Converting the plain collection name into an alias must be requested
+    with pytest.raises(ValueError, match="legacy_cutover"):
+        await reindexer.reindex()
+    assert not await reindexer.resolve_alias()
+
+    first = await reindexer.reindex(
+        VectorStorageConfig(quantization=QuantizationMode.SCALAR),
+        legacy_cutover=True,
+    )
+    assert first["legacy_cutover"] is True
+    assert first["points_copied"] == 9
+    assert await reindexer.resolve_alias() == first["target_collection"]
+    assert repository.storage_config.quantization == QuantizationMode.SCALAR
+    assert await repository.collection_exists()
+
+    results = await repository.search_similar(points[2].vector, context, limit=1)
+    assert results[0].point.id == points[2].id
+
+
+@pytest.mark.asyncio
+async def test_reindex_of_aliased_collection_keeps_old_collection():
+    client = QdrantClient(":memory:")
+    versioned = QdrantVectorRepository(client)
+    versioned.COLLECTION_NAME = "jeex_memory_v1"
+    await versioned.initialize_collection()
+    client.update_collection_aliases(
+        change_aliases_operations=[
+            models.CreateAliasOperation(
+                create_alias=models.CreateAlias(
+                    collection_name="jeex_memory_v1", alias_name="jeex_memory"
+                )
+            )
+        ]
+    )
+
+    repository = QdrantVectorRepository(client)
+    context = SearchContext.create(str(uuid4()), "en")
+    points = _points(context, 5)
+    await repository.upsert_points(context.project_id.value, points)
+
+    report = await CollectionReindexer(repository, concurrency=1).reindex()
+    assert report["legacy_cutover"] is False
+    assert report["source_collection"] == "jeex_memory_v1"
+    assert report["old_collection_dropped"] is False
+    assert client.collection_exists("jeex_memory_v1")
+    assert client.count(report["target_collection"]).count == 5
+    assert await repository.count_points(context) == 5
+
+
+@pytest.mark.asyncio
+async def test_reindex_drops_points_deleted_during_backfill():
+    repository = await _repository()
+    context = SearchContext.create(str(uuid4()), "en")
+    points = _points(context, 6)
+    await repository.upsert_points(context.project_id.value, points)
+    reindexer = CollectionReindexer(repository, batch_size=4, concurrency=1)
+
+    backfill = reindexer._copy_points
+
+    async def backfill_then_delete(source, target, updated_since=None, *args, **kw):
+        copied = await backfill(source, target, updated_since, *args, **kw)
+        if updated_since is None:
+            # Deleted from the serving collection after it was copied
+            await repository.delete_points([points[0].id], context.project_id.value)
+        return copied
+
+    reindexer._copy_points = backfill_then_delete
+    report = await reindexer.reindex(legacy_cutover=True)
+
+    assert report["points_copied"] == 6
+    assert report["points_removed"] == 1
+    assert await repository.count_points(context) == 5
+    assert (
+        await repository.get_point_by_id(points[0].id, context.project_id.value) is None
+    )
+
+
+@pytest.mark.asyncio
+async def test_reindex_requires_transform_for_new_vector_size():
+    repository = await _repository()
+    with pytest.raises(ValueError, match="vector_transform"):
+        await CollectionReindexer(repository).reindex(vector_size=768)
+
+
+async def _aliased_repository(client):
+    versioned = QdrantVectorRepository(client)
+    versioned.COLLECTION_NAME = "jeex_memory_v1"
+    await versioned.initialize_collection()
+    client.update_collection_aliases(
+        change_aliases_operations=[
+            models.CreateAliasOperation(
+                create_alias=models.CreateAlias(
+                    collection_name="jeex_memory_v1", alias_name="jeex_memory"
+                )
+            )
+        ]
+    )
+    return QdrantVectorRepository(client)
+
+
+@pytest.mark.asyncio
+async def test_catch_up_after_switch_keeps_newer_target_writes():
+    client = QdrantClient(":memory:")
+    repository = await _aliased_repository(client)
+    context = SearchContext.create(str(uuid4()), "en")
+    points = _points(context, 3)
+    await repository.upsert_points(context.project_id.value, points)
+    reindexer = CollectionReindexer(repository, concurrency=1)
+
+    switch = reindexer._switch_alias
+
+    async def switch_then_write(source, target, legacy):
+        # Written to the old collection just before the switch ...
+        await repository.upsert_points(
+            context.project_id.value, [points[1].update_content("before the switch")]
+        )
+        await switch(source, target, legacy)
+        # ... and rewritten through the alias right after it
+        await repository.upsert_points(
+            context.project_id.value,
+            [points[1].update_content("rewritten after the switch")],
+        )
+
+    reindexer._switch_alias = switch_then_write
+    await reindexer.reindex()
+
+    stored = await repository.get_point_by_id(points[1].id, context.project_id.value)
+    assert stored.content == "rewritten after the switch"
+    assert await repository.count_points(context) == 3
+
+
+@pytest.mark.asyncio
+async def test_failed_legacy_cutover_names_the_collection_holding_the_points():
+    repository = await _repository()
+    context = SearchContext.create(str(uuid4()), "en")
+    await repository.upsert_points(context.project_id.value, _points(context, 2))
+    client = repository.client
+
+    def refuse(*args, **kwargs):
+        raise ConnectionError("qdrant unavailable")
+
+    client.update_collection_aliases = refuse
+    with pytest.raises(LegacyCutoverError, match="its points are in jeex_memory_"):
+        await CollectionReindexer(repository, concurrency=1).reindex(
+            legacy_cutover=True
+        )
@@ -0,0 +1,148 @@
+import asyncio
+from uuid import uuid4
+
+import pytest
+
+from app.agents.budget import (
+    RESERVE_LUA,
+    SCRIPT_SHAS,
+    SETTLE_LUA,
+    BudgetExceeded,
+    TokenBudget,
+    TokenUsage,
+)
+from app.constants import SYSTEM_PROJECT_ID
+
+
+class CounterConnection:
+    """Project-scoped connection stand-in running the budget scripts on dicts."""
+
+    def __init__(self, store, prefix):
+        self.store = store
+        self.prefix = prefix
+
+    async def evalsha(self, sha, numkeys, *keys_and_args):
+        keys = [self.prefix + key for key in keys_and_args[:numkeys]]
+        args = [int(arg) for arg in keys_and_args[numkeys:]]
+        if sha == SCRIPT_SHAS[RESERVE_LUA]:
+            return self._reserve(keys, args)
+        assert sha == SCRIPT_SHAS[SETTLE_LUA]
+        return self._settle(keys, args)
+
+    def _counters(self, key):
+        return self.store.setdefault(key, {"used": 0, "reserved": 0})
+
+    def _reserve(self, keys, args):
+        tokens, totals = args[0], []
+        for i, key in enumerate(keys, start=1):
+            counters = self._counters(key)
+            total = counters["used"] + counters["reserved"]
+            hard = args[2 * i]
+            if hard >= 0 and total + tokens > hard:
+                return [i, total]
+            totals.append(total + tokens)
+        for key in keys:
+            self._counters(key)["reserved"] += tokens
+        return [0, *totals]
+
+    def _settle(self, keys, args):
+        reserved, used = args[0], args[1]
+        for key in keys:
+            counters = self._counters(key)
+            counters["reserved"] = max(counters["reserved"] - reserved, 0)
+            counters["used"] += used
+        return 1
+
+
+class CounterService:
+    def __init__(self):
+        self.store = {}
+
+    async def execute_with_retry(self, operation, func, *args, project_id, **kwargs):
+        await asyncio.sleep(0)  # Interleave concurrent callers
+        conn = CounterConnection(self.store, f"proj:{project_id}:")
+        return await func(conn, *args, **kwargs)
+
+    def counters(self, project_id, kind):
+        prefix = f"proj:{project_id}:budget:tokens:{kind}:"
+        return [value for key, value in self.store.items() if key.startswith(prefix)]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_reservations_never_pass_the_hard_limit():
+    budget = TokenBudget(CounterService(), per_project=1000)
+    project_id = uuid4()
+
+    results = await asyncio.gather(
+        *(budget.reserve(project_id, uuid4(), 300) for _ in range(5)),
+        return_exceptions=True,
+    )
+
+    rejected = [r for r in results if isinstance(r, BudgetExceeded)]
+    assert len(rejected) == 2
+    assert {(e.scope, e.limit, e.requested) for e in rejected} == {
+        ("project", 1000, 300)
+    }
+    assert budget.stats()["rejected_project"] == 2
+
+
+@pytest.mark.asyncio
+async def test_settle_releases_the_reservation_and_adds_usage():
+    service = CounterService()
+    budget = TokenBudget(service, per_execution=500)
+    project_id, execution_id = uuid4(), uuid4()
+
+    async with budget.spend(project_id, execution_id, 400) as reservation:
+        reservation.record(TokenUsage(prompt_tokens=150, completion_tokens=50))
+
+    [execution] = service.counters(project_id, "execution")
+    [global_window] = service.counters(SYSTEM_PROJECT_ID, "window")
+    assert execution == global_window == {"used": 200, "reserved": 0}
+    # Only actual usage counts against the limit once settled
+    await budget.reserve(project_id, execution_id, 300)
+    with pytest.raises(BudgetExceeded):
+        await budget.reserve(project_id, execution_id, 1)
+
+
+@pytest.mark.asyncio
+async def test_failed_call_releases_its_reservation_unused():
+    service = CounterService()
+    budget = TokenBudget(service, per_project=100)
+    project_id = uuid4()
+
+    with pytest.raises(RuntimeError):
+        async with budget.spend(project_id, uuid4(), 100):
+            raise RuntimeError("model error")
+
+    [window] = service.counters(project_id, "window")
+    assert window == {"used": 0, "reserved": 0}
+
+
+@pytest.mark.asyncio
+async def test_global_rejection_releases_the_project_reservation():
+    service = CounterService()
+    budget = TokenBudget(service, per_project=1000, global_limit=500)
+    project_a, project_b = uuid4(), uuid4()
+
+    await budget.reserve(project_a, uuid4(), 400)
+    with pytest.raises(BudgetExceeded) as exc_info:
+        await budget.reserve(project_b, uuid4(), 200)
+
+    assert exc_info.value.scope == "global"
+    assert exc_info.value.committed == 400
+    [window] = service.counters(project_b, "window")
+    assert window["reserved"] == 0
+
+
+@pytest.mark.asyncio
+async def test_soft_limit_is_reported_without_blocking():
+    budget = TokenBudget(CounterService(), per_project=1000, soft_ratio=0.5)
+    project_id = uuid4()
+
+    first = await budget.reserve(project_id, uuid4(), 400)
+    second = await budget.reserve(project_id, uuid4(), 400)
+
+    assert first.soft_exceeded == ()
+    assert second.soft_exceeded == ("project",)
+    assert budget.stats()["soft_exceeded_project"] == 1
+    assert budget.stats()["soft_limits"]["project"] == 500
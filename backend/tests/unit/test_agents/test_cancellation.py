@@ -0,0 +1,239 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime, timedelta
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.agents.cancellation import CancellationRegistry, ExecutionCancelled
+from app.agents.context import create_context
+from app.agents.contracts import AgentInput, AgentOutput
+from app.agents.result_cache import AgentResultCache
+from app.agents.scheduler import AgentTask, AgentTaskGraph, ConcurrencyLimiter
+from app.core.database import check_statement_deadline
+from app.core.deadline import (
+    DeadlineExceeded,
+    check_deadline,
+    deadline_scope,
+    remaining_seconds,
+)
+from app.services.project_access import ProjectAccessGrant
+
+
+class MemoryState:
+    """Execution state stand-in shared by registries of different "processes"."""
+
+    def __init__(self):
+        self.states = {}
+
+    async def create_state(self, context, stage):
+        self.states[context.correlation_id] = {"status": "running"}
+
+    async def get_state(self, project_id, correlation_id, fields=None):
+        state = self.states.get(correlation_id)
+        if state is None:
+            return None
+        return {k: v for k, v in state.items() if fields is None or k in fields}
+
+    async def update_fields(self, project_id, correlation_id, fields):
+        if correlation_id not in self.states:
+            return False
+        self.states[correlation_id].update(fields)
+        return True
+
+
+def make_context(timeout_seconds=None):
+    return create_context(
+        uuid4(), uuid4(), "architecture", "en", timeout_seconds=timeout_seconds
+    )
+
+
+@pytest.mark.asyncio
+async def test_deadline_stops_in_flight_work_and_releases_in_reverse_order():
+    registry = CancellationRegistry(poll_interval_seconds=0)
+    released = []
+
+    async def release(name):
+        # Cleanup runs outside the deadline
+        check_deadline("release")
+        released.append(name)
+
+    start = time.monotonic()
+    with pytest.raises(DeadlineExceeded):
+        async with registry.scope(make_context(timeout_seconds=0.05)) as scope:
+            scope.add_release("queue task", lambda: release("queue task"))
+            scope.add_release("reservation", lambda: release("reservation"))
+            assert 0 < remaining_seconds() <= 0.05
+            await asyncio.sleep(10)
+
+    assert time.monotonic() - start < 1
+    assert released == ["reservation", "queue task"]
+    assert remaining_seconds() is None
+    assert registry.stats()["deadline_exceeded"] == 1
+    assert registry.stats()["running"] == 0
+
+
+@pytest.mark.asyncio
+async def test_cancel_stops_a_local_workflow_and_bounds_cleanup():
+    registry = CancellationRegistry(
+        MemoryState(), poll_interval_seconds=0, release_timeout_seconds=0.05
+    )
+    context = make_context()
+    started = asyncio.Event()
+
+    async def workflow():
+        async with registry.scope(context) as scope:
+            scope.add_release("stuck", lambda: asyncio.sleep(10))
+            started.set()
+            await asyncio.sleep(10)
+
+    task = asyncio.create_task(workflow())
+    await started.wait()
+    outcome = await registry.cancel(
+        context.project_id, context.correlation_id, "user", wait_seconds=1
+    )
+
+    assert (outcome.requested, outcome.stopped) == (True, True)
+    with pytest.raises(ExecutionCancelled, match="user"):
+        await task
+    assert registry.stats()["release_failures"] == 1
+    # Finished workflows cannot be cancelled again
+    again = await registry.cancel(context.project_id, context.correlation_id)
+    assert again.requested is False
+
+
+@pytest.mark.asyncio
+async def test_cancel_reaches_a_workflow_of_another_process_through_its_state():
+    state = MemoryState()
+    worker = CancellationRegistry(state, poll_interval_seconds=0.01)
+    api = CancellationRegistry(state, poll_interval_seconds=0.01)
+    context = make_context()
+    await state.create_state(context, "architecture")
+
+    async def workflow():
+        async with worker.scope(context):
+            await asyncio.sleep(10)
+
+    task = asyncio.create_task(workflow())
+    await asyncio.sleep(0)
+    outcome = await api.cancel(context.project_id, context.correlation_id, "stop")
+
+    assert (outcome.requested, outcome.stopped) == (True, False)
+    with pytest.raises(ExecutionCancelled, match="stop"):
+        await asyncio.wait_for(task, timeout=1)
+    assert (await api.cancel(uuid4(), uuid4())).requested is False
+
+
+@pytest.mark.asyncio
+async def test_statements_are_refused_after_the_deadline():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    event.listen(engine.sync_engine, "before_cursor_execute", check_statement_deadline)
+    try:
+        async with engine.connect() as connection:
+            with deadline_scope(datetime.now(UTC) + timedelta(seconds=5)):
+                assert (await connection.execute(text("SELECT 1"))).scalar() == 1
+            with deadline_scope(datetime.now(UTC) - timedelta(seconds=1)):
+                with pytest.raises(DeadlineExceeded, match="db.execute"):
+                    await connection.execute(text("SELECT 1"))
+    finally:
+        await engine.dispose()
+
+
+class SlowAgent:
+    def __init__(self, delay):
+        self.delay = delay
+
+    async def execute(self, input: AgentInput) -> AgentOutput:
+        await asyncio.sleep(self.delay)
+        return AgentOutput(agent_type="slow", status="completed", content="done")
+
+
+class NoTransaction:
+    """Session stand-in whose transactions only record that they are open."""
+
+    def __init__(self):
+        self.open = False
+        self.transactions = 0
+
+    def in_transaction(self):
+        return self.open
+
+    @asynccontextmanager
+    async def begin(self):
+        assert not self.open, "transactions must not nest"
+        self.open = True
+        try:
+            yield
+        finally:
+            self.open = False
+            self.transactions += 1
+
+
+class RecordingTracker:
+    def __init__(self):
+        self.calls = []
+        self.session = NoTransaction()
+
+    async def start_execution(self, project_id, agent_type, correlation_id, input_data):
+        return uuid4()
+
+    async def complete_execution(self, execution_id, output_data, status="completed"):
+        self.calls.append((status, output_data))
+
+    async def fail_execution(self, correlation_id, error_message):
+        self.calls.append(("failed", error_message))
+
+
+class AllowAll:
+    async def validate(self, user_id, project_id, language):
+        return ProjectAccessGrant(project_id, user_id, language)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_graph_records_running_nodes_and_frees_slots():
+    from app.agents.orchestrator import AgentOrchestrator
+
+    state = MemoryState()
+    registry = CancellationRegistry(state, poll_interval_seconds=0)
+    tracker = RecordingTracker()
+    limiter = ConcurrencyLimiter(4, 4)
+    orchestrator = AgentOrchestrator(
+        tracker=tracker,
+        state_manager=state,
+        isolation=AllowAll(),
+        result_cache=AgentResultCache(enabled=False),
+        cancellation=registry,
+    )
+    context = make_context()
+    input_data = AgentInput(
+        project_id=context.project_id,
+        correlation_id=context.correlation_id,
+        language="en",
+        user_message="Design",
+    )
+    graph = AgentTaskGraph(
+        [
+            AgentTask("api", SlowAgent(0)),
+            AgentTask("infra", SlowAgent(10)),
+            AgentTask("review", SlowAgent(0), depends_on=("api", "infra")),
+        ]
+    )
+
+    run = asyncio.create_task(
+        orchestrator.execute_agent_graph(
+            "architecture", context, input_data, graph, limiter=limiter
+        )
+    )
+    while len(tracker.calls) < 1:
+        await asyncio.sleep(0.01)
+    await registry.cancel(context.project_id, context.correlation_id, "user")
+
+    with pytest.raises(ExecutionCancelled):
+        await asyncio.wait_for(run, timeout=1)
+    statuses = sorted(status for status, _ in tracker.calls)
+    assert statuses == ["cancelled", "completed"]
+    assert limiter.stats()["running"] == 0
+    assert state.states[context.correlation_id]["status"] == "cancelled"
@@ -0,0 +1,280 @@
+import asyncio
+from uuid import uuid4
+
+import pytest
+
+from app.agents.contracts import AgentInput, AgentOutput, IdeaStageOutput
+from app.agents.result_cache import AgentResultCache, result_key
+from app.agents.scheduler import (
+    AgentGraphScheduler,
+    AgentTask,
+    AgentTaskGraph,
+    ConcurrencyLimiter,
+)
+
+
+class MemoryConnection:
+    """Project-scoped key/value connection stand-in."""
+
+    def __init__(self, store, prefix, fail=False):
+        self.store = store
+        self.prefix = prefix
+        self.fail = fail
+
+    async def get(self, key):
+        if self.fail:
+            raise ConnectionError("redis down")
+        return self.store.get(self.prefix + key)
+
+    async def set(self, key, value, ex=None):
+        if self.fail:
+            raise ConnectionError("redis down")
+        self.store[self.prefix + key] = value
+        self.store.setdefault("__ttl__", {})[self.prefix + key] = ex
+        return True
+
+
+class MemoryService:
+    def __init__(self, fail=False):
+        self.store = {}
+        self.fail = fail
+
+    async def execute_with_retry(self, operation, func, *args, project_id, **kwargs):
+        conn = MemoryConnection(self.store, f"proj:{project_id}:", self.fail)
+        return await func(conn, *args, **kwargs)
+
+
+class CountingAgent:
+    def __init__(self, delay=0.0, status="completed", error=None):
+        self.delay = delay
+        self.status = status
+        self.error = error
+        self.calls = 0
+
+    async def execute(self, input: AgentInput) -> AgentOutput:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return AgentOutput(
+            agent_type="architect", status=self.status, content=input.user_message
+        )
+
+
+def make_input(project_id=None, **overrides):
+    fields = {
+        "project_id": project_id or uuid4(),
+        "correlation_id": uuid4(),
+        "language": "en",
+        "user_message": "Design the API",
+        "context": {"b": 1, "a": {"y": [1, 2], "x": "Café"}},
+    }
+    fields.update(overrides)
+    return AgentInput(**fields)
+
+
+def test_key_ignores_run_identity_and_formatting_only():
+    base = make_input()
+    same = make_input(
+        project_id=base.project_id,
+        user_message="  Design the API\n",
+        context={"a": {"x": "Café", "y": [1, 2]}, "b": 1},
+    )
+    key = result_key("architect", "v1", {"temperature": 0.2, "model": "m"}, base)
+
+    assert key == result_key(
+        "architect", "v1", {"model": "m", "temperature": 0.2}, same
+    )
+    assert key != result_key(
+        "architect", "v2", {"temperature": 0.2, "model": "m"}, base
+    )
+    assert key != result_key("reviewer", "v1", {"temperature": 0.2, "model": "m"}, base)
+    assert key != result_key(
+        "architect", "v1", {"temperature": 0.7, "model": "m"}, base
+    )
+    assert key != result_key(
+        "architect",
+        "v1",
+        {"temperature": 0.2, "model": "m"},
+        make_input(project_id=base.project_id, context={"b": 2}),
+    )
+
+
+@pytest.mark.asyncio
+async def test_second_run_is_served_from_cache_with_ttl():
+    service = MemoryService()
+    cache = AgentResultCache(service, ttl_seconds=120)
+    agent = CountingAgent(delay=0.02)
+    input_data = make_input()
+
+    first = await cache.get_or_compute(
+        "architect", input_data, lambda: agent.execute(input_data)
+    )
+    second = await cache.get_or_compute(
+        "architect",
+        make_input(project_id=input_data.project_id),
+        lambda: agent.execute(input_data),
+    )
+
+    assert agent.calls == 1
+    assert second == first
+    assert set(service.store["__ttl__"].values()) == {120}
+    stats = cache.stats()["agent_types"]["architect"]
+    assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (1, 1, 0.5)
+    assert stats["latency_saved_ms"] >= 15
+
+
+class UnregisteredOutput(AgentOutput):
+    extra: str = ""
+
+
+@pytest.mark.asyncio
+async def test_stage_outputs_round_trip_with_their_fields():
+    service = MemoryService()
+    cache = AgentResultCache(service)
+    input_data = make_input()
+    output = IdeaStageOutput(
+        agent_type="product_manager",
+        status="completed",
+        questions=[{"text": "Who are the users?"}],
+        section_text="Problem statement",
+    )
+
+    async def compute():
+        return output
+
+    await cache.get_or_compute("product_manager", input_data, compute)
+    hit = await cache.get_or_compute("product_manager", input_data, compute)
+
+    assert cache.stats()["agent_types"]["product_manager"]["hits"] == 1
+    assert type(hit) is IdeaStageOutput
+    assert hit == output
+
+    # Outputs of classes a hit could not be rebuilt as are not cached
+    other = UnregisteredOutput(agent_type="pm", status="completed", extra="x")
+
+    async def compute_other():
+        return other
+
+    await cache.get_or_compute("pm", input_data, compute_other)
+    assert not any(":agent:result:pm:" in key for key in service.store)
+
+
+@pytest.mark.asyncio
+async def test_entries_are_scoped_to_the_project():
+    cache = AgentResultCache(MemoryService())
+    agent = CountingAgent()
+
+    for project_id in (uuid4(), uuid4()):
+        input_data = make_input(project_id=project_id)
+        await cache.get_or_compute(
+            "architect",
+            input_data,
+            lambda input_data=input_data: agent.execute(input_data),
+        )
+
+    assert agent.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_calls_compute_once():
+    cache = AgentResultCache(MemoryService())
+    agent = CountingAgent(delay=0.05)
+    input_data = make_input()
+
+    outputs = await asyncio.gather(
+        *(
+            cache.get_or_compute(
+                "architect", input_data, lambda: agent.execute(input_data)
+            )
+            for _ in range(10)
+        )
+    )
+
+    assert agent.calls == 1
+    assert len({output.content for output in outputs}) == 1
+    stats = cache.stats()["agent_types"]["architect"]
+    assert (stats["misses"], stats["coalesced"]) == (1, 9)
+    assert cache.stats()["inflight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_failures_are_shared_but_not_cached():
+    cache = AgentResultCache(MemoryService())
+    failing = CountingAgent(delay=0.02, error=RuntimeError("model error"))
+    input_data = make_input()
+
+    results = await asyncio.gather(
+        *(
+            cache.get_or_compute(
+                "architect", input_data, lambda: failing.execute(input_data)
+            )
+            for _ in range(3)
+        ),
+        return_exceptions=True,
+    )
+    assert failing.calls == 1
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+    needs_input = CountingAgent(status="needs_input")
+    for _ in range(2):
+        await cache.get_or_compute(
+            "architect", input_data, lambda: needs_input.execute(input_data)
+        )
+    assert needs_input.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_bypass_recomputes_and_refreshes_the_entry():
+    cache = AgentResultCache(MemoryService())
+    agent = CountingAgent()
+    input_data = make_input()
+
+    await cache.get_or_compute(
+        "architect", input_data, lambda: agent.execute(input_data)
+    )
+    await cache.get_or_compute(
+        "architect", input_data, lambda: agent.execute(input_data), bypass=True
+    )
+    await cache.get_or_compute(
+        "architect", input_data, lambda: agent.execute(input_data)
+    )
+
+    assert agent.calls == 2
+    assert cache.stats()["agent_types"]["architect"]["bypassed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_cache_errors_fall_back_to_the_agent():
+    cache = AgentResultCache(MemoryService(fail=True))
+    agent = CountingAgent()
+    input_data = make_input()
+
+    output = await cache.get_or_compute(
+        "architect", input_data, lambda: agent.execute(input_data)
+    )
+
+    assert output.content == "Design the API"
+    assert cache.stats()["agent_types"]["architect"]["errors"] == 2
+
+
+@pytest.mark.asyncio
+async def test_scheduler_reruns_unchanged_graph_from_cache():
+    cache = AgentResultCache(MemoryService())
+    upstream, downstream = CountingAgent(), CountingAgent()
+    graph = AgentTaskGraph(
+        [
+            AgentTask("api", upstream, prompt_version="v1"),
+            AgentTask("review", downstream, depends_on=("api",)),
+        ]
+    )
+    scheduler = AgentGraphScheduler(
+        limiter=ConcurrencyLimiter(4, 4), result_cache=cache
+    )
+    project_id = uuid4()
+
+    for _ in range(2):
+        results = await scheduler.run(graph, make_input(project_id=project_id))
+        assert all(result.completed for result in results.values())
+
+    assert (upstream.calls, downstream.calls) == (1, 1)
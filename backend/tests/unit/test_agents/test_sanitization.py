@@ -0,0 +1,88 @@
+import copy
+
+from app.agents.sanitization import (
+    PayloadSanitizer,
+    key_memo_info,
+    sanitize_payload,
+)
+
+
+def test_redacts_sensitive_keys_and_truncates_fields():
+    payload = {
+        "API_Key": "sk-123",
+        "refresh_token": "abc",
+        "user_message": "x" * 150,
+        "description": "short",
+        "nested": {"Password": "p", "items": [{"credentials": {"a": 1}}, 3]},
+    }
+
+    result = sanitize_payload(payload)
+
+    assert result == {
+        "API_Key": "[redacted]",
+        "refresh_token": "[redacted]",
+        "user_message": "x" * 100 + "... [truncated]",
+        "description": "short",
+        "nested": {
+            "Password": "[redacted]",
+            "items": [{"credentials": "[redacted]"}, 3],
+        },
+    }
+
+
+def test_depth_limit_replaces_deep_values():
+    payload = {"a": {"b": {"c": {"d": {"e": 1}}}}, "flat": [1, [2, [3, [4]]]]}
+
+    result = sanitize_payload(payload)
+
+    assert result == {
+        "a": {"b": {"c": {"d": {"e": "[max_depth_reached]"}}}},
+        "flat": [1, [2, [3, ["[max_depth_reached]"]]]],
+    }
+
+
+def test_unchanged_subtrees_are_shared_and_input_untouched():
+    clean = {"title": "plan", "items": [{"name": "a"}, {"name": "b"}]}
+    payload = {"clean": clean, "dirty": {"secret": "s", "other": [1, 2]}}
+    before = copy.deepcopy(payload)
+
+    result = sanitize_payload(payload)
+
+    assert payload == before
+    assert result is not payload
+    assert result["clean"] is clean
+    assert result["dirty"] is not payload["dirty"]
+    assert result["dirty"]["other"] is payload["dirty"]["other"]
+    assert sanitize_payload(clean) is clean
+
+
+def test_size_budget_truncates_huge_values():
+    sanitizer = PayloadSanitizer(max_value_chars=50, budget_chars=120)
+
+    result = sanitizer.sanitize({"a": "x" * 80, "b": "y" * 80, "c": "z" * 80})
+
+    assert result["a"] == "x" * 50 + "... [truncated]"
+    assert result["b"] == "y" * 50 + "... [truncated]"
+    # Budget used up: further values are cut to the short preview length
+    assert result["c"] == "z" * 50 + "... [truncated]"
+    assert PayloadSanitizer(budget_chars=0).sanitize(["q" * 150]) == [
+        "q" * 100 + "... [truncated]"
+    ]
+
+
+def test_key_decisions_are_memoized():
+    sanitize_payload({"memo_probe_key": 1, "memo_probe_field": 2})
+    before = key_memo_info()
+
+    sanitize_payload([{"memo_probe_key": 1, "memo_probe_field": 2}] * 10)
+
+    after = key_memo_info()
+    assert after["misses"] == before["misses"]
+    assert after["hits"] >= before["hits"] + 20
+
+
+def test_non_string_keys_are_matched_as_strings():
+    assert sanitize_payload({1: "one", "2": {"token": "t"}}) == {
+        1: "one",
+        "2": {"token": "[redacted]"},
+    }
@@ -0,0 +1,481 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.agents.budget import TokenBudget, TokenUsage, current_reservation
+from app.agents.contracts import AgentInput, AgentOutput
+from app.agents.result_cache import AgentResultCache
+from app.agents.scheduler import (
+    CANCELLED,
+    AgentGraphScheduler,
+    AgentTask,
+    AgentTaskGraph,
+    ConcurrencyLimiter,
+    node_correlation_id,
+)
+from app.services.project_access import ProjectAccessGrant
+from tests.unit.test_agents.test_budget import CounterService
+
+
+class StubAgent:
+    """ADKAgentProtocol implementation that sleeps and reports its inputs."""
+
+    def __init__(self, name, delay=0.0, status="completed", error=None, probe=None):
+        self.name = name
+        self.delay = delay
+        self.status = status
+        self.error = error
+        self.probe = probe
+        self.inputs = []
+
+    async def execute(self, input: AgentInput) -> AgentOutput:
+        self.inputs.append(input)
+        if self.probe is not None:
+            self.probe.enter(input.project_id)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            if self.probe is not None:
+                self.probe.leave(input.project_id)
+        if self.error is not None:
+            raise self.error
+        return AgentOutput(
+            agent_type=self.name, status=self.status, content=f"{self.name} done"
+        )
+
+
+class MeteredAgent(StubAgent):
+    """StubAgent recording model usage on its token reservation."""
+
+    def __init__(self, name, usage):
+        super().__init__(name)
+        self.usage = usage
+
+    async def execute(self, input: AgentInput) -> AgentOutput:
+        current_reservation().record(self.usage)
+        return await super().execute(input)
+
+
+class ConcurrencyProbe:
+    """Track the peak number of agents running at once, overall and per project."""
+
+    def __init__(self):
+        self.running = {}
+        self.peak = 0
+        self.peak_per_project = {}
+
+    def enter(self, project_id):
+        self.running[project_id] = self.running.get(project_id, 0) + 1
+        self.peak = max(self.peak, sum(self.running.values()))
+        self.peak_per_project[project_id] = max(
+            self.peak_per_project.get(project_id, 0), self.running[project_id]
+        )
+
+    def leave(self, project_id):
+        self.running[project_id] -= 1
+
+
+def make_input(project_id=None):
+    return AgentInput(
+        project_id=project_id or uuid4(),
+        correlation_id=uuid4(),
+        language="en",
+        user_message="Design the architecture",
+    )
+
+
+def independent_graph(count, delay, probe=None):
+    return AgentTaskGraph(
+        AgentTask(
+            name=f"expert_{i}", agent=StubAgent(f"expert_{i}", delay, probe=probe)
+        )
+        for i in range(count)
+    )
+
+
+@pytest.mark.asyncio
+async def test_independent_tasks_run_in_parallel():
+    graph = independent_graph(4, delay=0.2)
+    scheduler = AgentGraphScheduler(limiter=ConcurrencyLimiter(8, 8))
+
+    start = time.perf_counter()
+    results = await scheduler.run(graph, make_input())
+    elapsed = time.perf_counter() - start
+
+    assert all(result.completed for result in results.values())
+    # Sequential execution would take 0.8s
+    assert elapsed < 0.5
+
+
+@pytest.mark.asyncio
+async def test_global_and_per_project_caps_are_enforced():
+    probe = ConcurrencyProbe()
+    limiter = ConcurrencyLimiter(max_concurrent=3, max_per_project=2)
+    scheduler = AgentGraphScheduler(limiter=limiter)
+    project_a, project_b = uuid4(), uuid4()
+
+    await asyncio.gather(
+        scheduler.run(independent_graph(6, 0.02, probe), make_input(project_a)),
+        scheduler.run(independent_graph(6, 0.02, probe), make_input(project_a)),
+        scheduler.run(independent_graph(6, 0.02, probe), make_input(project_b)),
+    )
+
+    assert probe.peak == 3
+    assert probe.peak_per_project[project_a] == 2
+    assert probe.peak_per_project[project_b] == 2
+    assert limiter.stats()["running"] == 0
+    assert limiter.stats()["projects"] == 0
+
+
+@pytest.mark.asyncio
+async def test_outputs_propagate_along_edges():
+    merge = StubAgent("merge")
+    graph = AgentTaskGraph(
+        [
+            AgentTask(name="security", agent=StubAgent("security", 0.01)),
+            AgentTask(name="data", agent=StubAgent("data")),
+            AgentTask(
+                name="merge",
+                agent=merge,
+                depends_on=("security", "data"),
+                user_message="Combine the findings",
+            ),
+        ]
+    )
+    input_data = make_input()
+
+    results = await AgentGraphScheduler(limiter=ConcurrencyLimiter(4, 4)).run(
+        graph, input_data
+    )
+
+    assert list(results) == ["security", "data", "merge"]
+    received = merge.inputs[0]
+    assert received.user_message == "Combine the findings"
+    assert received.correlation_id == node_correlation_id(
+        input_data.correlation_id, "merge"
+    )
+    assert received.context["upstream"]["security"]["content"] == "security done"
+    assert received.context["upstream"]["data"]["content"] == "data done"
+
+
+@pytest.mark.asyncio
+async def test_failure_cancels_downstream_only():
+    downstream = StubAgent("review")
+    finished = []
+
+    async def on_finish(task, result):
+        finished.append((task.name, result.status))
+
+    graph = AgentTaskGraph(
+        [
+            AgentTask(name="draft", agent=StubAgent("draft", error=RuntimeError("x"))),
+            AgentTask(name="review", agent=downstream, depends_on=("draft",)),
+            AgentTask(
+                name="publish", agent=StubAgent("publish"), depends_on=("review",)
+            ),
+            AgentTask(name="questions", agent=StubAgent("q", status="needs_input")),
+            AgentTask(
+                name="answers", agent=StubAgent("answers"), depends_on=("questions",)
+            ),
+            AgentTask(name="independent", agent=StubAgent("independent", 0.02)),
+        ]
+    )
+
+    results = await AgentGraphScheduler(
+        limiter=ConcurrencyLimiter(4, 4), on_finish=on_finish
+    ).run(graph, make_input())
+
+    assert results["draft"].status == "failed"
+    assert results["draft"].error == "RuntimeError: x"
+    assert results["review"].status == CANCELLED
+    assert results["publish"].status == CANCELLED
+    assert results["questions"].status == "needs_input"
+    assert results["answers"].status == CANCELLED
+    assert results["independent"].completed
+    assert downstream.inputs == []
+    assert sorted(finished) == sorted(
+        (name, result.status) for name, result in results.items()
+    )
+
+
+@pytest.mark.asyncio
+async def test_task_timeout_fails_the_node():
+    graph = AgentTaskGraph([AgentTask(name="slow", agent=StubAgent("slow", 1.0))])
+
+    results = await AgentGraphScheduler(
+        limiter=ConcurrencyLimiter(1, 1), task_timeout_seconds=0.05
+    ).run(graph, make_input())
+
+    assert results["slow"].status == "failed"
+    assert results["slow"].error.startswith("TimeoutError")
+
+
+def test_graph_validation():
+    agent = StubAgent("a")
+    with pytest.raises(ValueError, match="Duplicate"):
+        AgentTaskGraph([AgentTask("a", agent), AgentTask("a", agent)])
+    with pytest.raises(ValueError, match="unknown task"):
+        AgentTaskGraph([AgentTask("a", agent, depends_on=("b",))])
+    with pytest.raises(ValueError, match="cycle"):
+        AgentTaskGraph(
+            [
+                AgentTask("a", agent, depends_on=("c",)),
+                AgentTask("b", agent, depends_on=("a",)),
+                AgentTask("c", agent, depends_on=("b",)),
+                AgentTask("d", agent),
+            ]
+        )
+
+
+class NoTransaction:
+    """Session stand-in whose transactions only record that they are open."""
+
+    def __init__(self):
+        self.open = False
+        self.transactions = 0
+
+    def in_transaction(self):
+        return self.open
+
+    @asynccontextmanager
+    async def begin(self):
+        assert not self.open, "transactions must not nest"
+        self.open = True
+        try:
+            yield
+        finally:
+            self.open = False
+            self.transactions += 1
+
+
+class RecordingTracker:
+    """Tracker stand-in that records lifecycle calls."""
+
+    def __init__(self):
+        self.calls = []
+        self.session = NoTransaction()
+
+    async def start_execution(self, project_id, agent_type, correlation_id, input_data):
+        assert self.session.open
+        self.calls.append(("start", agent_type))
+        return uuid4()
+
+    async def complete_execution(self, execution_id, output_data, status="completed"):
+        assert self.session.open
+        self.calls.append(("complete", output_data["agent_type"], status))
+
+    async def fail_execution(self, correlation_id, error_message):
+        assert self.session.open
+        self.calls.append(("fail", error_message))
+
+    async def record_usage(self, execution_id, usage):
+        assert self.session.open
+        self.calls.append(("usage", usage.total_tokens))
+        return True
+
+
+class AllowAll:
+    async def validate(self, user_id, project_id, language):
+        return ProjectAccessGrant(project_id, user_id, language)
+
+
+class NoState:
+    async def create_state(self, context, stage):
+        return None
+
+
+@pytest.mark.asyncio
+async def test_orchestrator_tracks_each_node():
+    from app.agents.context import create_context
+    from app.agents.orchestrator import AgentOrchestrator
+
+    tracker = RecordingTracker()
+    orchestrator = AgentOrchestrator(
+        tracker=tracker,
+        state_manager=NoState(),
+        isolation=AllowAll(),
+        result_cache=AgentResultCache(enabled=False),
+    )
+    context = create_context(uuid4(), uuid4(), "architecture", "en")
+    input_data = AgentInput(
+        project_id=context.project_id,
+        correlation_id=context.correlation_id,
+        language="en",
+        user_message="Design",
+    )
+    graph = AgentTaskGraph(
+        [
+            AgentTask("api", StubAgent("api")),
+            AgentTask("infra", StubAgent("infra", error=ValueError("no region"))),
+            AgentTask("review", StubAgent("review"), depends_on=("api", "infra")),
+        ]
+    )
+
+    result = await orchestrator.execute_agent_graph(
+        "architecture", context, input_data, graph, limiter=ConcurrencyLimiter(4, 4)
+    )
+
+    assert result["status"] == "failed"
+    assert result["tasks"]["api"]["status"] == "completed"
+    assert result["tasks"]["review"]["status"] == CANCELLED
+    assert result["tasks"]["review"]["execution_id"] is None
+    assert sorted(tracker.calls) == [
+        ("complete", "api", "completed"),
+        ("fail", "ValueError: no region"),
+        ("start", "api"),
+        ("start", "infra"),
+    ]
+    # Every tracker write committed on its own
+    assert tracker.session.transactions == len(tracker.calls)
+
+
+@pytest.mark.asyncio
+async def test_budgeted_tasks_reserve_tokens_and_report_usage():
+    redis = CounterService()
+    budget = TokenBudget(redis, per_execution=500)
+    scheduler = AgentGraphScheduler(
+        limiter=ConcurrencyLimiter(4, 4), token_budget=budget
+    )
+    graph = AgentTaskGraph(
+        [
+            AgentTask("api", MeteredAgent("api", TokenUsage(100, 20)), max_tokens=400),
+            AgentTask("infra", StubAgent("infra"), max_tokens=600),
+            AgentTask("free", StubAgent("free")),
+        ]
+    )
+
+    results = await scheduler.run(graph, make_input())
+
+    assert results["api"].usage == TokenUsage(100, 20)
+    assert results["infra"].status == "failed"
+    assert results["infra"].error.startswith("BudgetExceeded: execution")
+    assert results["free"].completed and results["free"].usage is None
+    # Reservations were settled with the recorded usage
+    assert budget.stats()["settled"] == 1
+    assert budget.stats()["tokens_used"] == 120
+    assert all(c["reserved"] == 0 for c in redis.store.values())
+
+
+@pytest.mark.asyncio
+async def test_orchestrator_records_node_usage_when_it_finishes():
+    from app.agents.context import create_context
+    from app.agents.orchestrator import AgentOrchestrator
+
+    tracker = RecordingTracker()
+    orchestrator = AgentOrchestrator(
+        tracker=tracker,
+        state_manager=NoState(),
+        isolation=AllowAll(),
+        result_cache=AgentResultCache(enabled=False),
+        budget=TokenBudget(CounterService()),
+    )
+    context = create_context(uuid4(), uuid4(), "architecture", "en")
+    input_data = AgentInput(
+        project_id=context.project_id,
+        correlation_id=context.correlation_id,
+        language="en",
+        user_message="Design",
+    )
+    graph = AgentTaskGraph(
+        [AgentTask("api", MeteredAgent("api", TokenUsage(30, 12)), max_tokens=100)]
+    )
+
+    await orchestrator.execute_agent_graph(
+        "architecture", context, input_data, graph, limiter=ConcurrencyLimiter(4, 4)
+    )
+
+    assert tracker.calls == [
+        ("start", "api"),
+        ("complete", "api", "completed"),
+        ("usage", 42),
+    ]
+    # Usage is recorded in the transaction that finishes the node
+    assert tracker.session.transactions == 2
+
+
+class SessionTracker(RecordingTracker):
+    """RecordingTracker writing through a real AsyncSession."""
+
+    def __init__(self, session):
+        super().__init__()
+        self.session = session
+
+    async def _write(self, call):
+        assert self.session.in_transaction()
+        await self.session.execute(text("SELECT 1"))
+        self.calls.append(call)
+
+    async def start_execution(self, project_id, agent_type, correlation_id, input_data):
+        await self._write(("start", agent_type))
+        return uuid4()
+
+    async def complete_execution(self, execution_id, output_data, status="completed"):
+        await self._write(("complete", output_data["agent_type"], status))
+
+    async def fail_execution(self, correlation_id, error_message):
+        await self._write(("fail", error_message))
+
+
+class QueryingIsolation:
+    """Access check that misses the cache and queries the shared session."""
+
+    def __init__(self, session):
+        self.session = session
+
+    async def validate(self, user_id, project_id, language):
+        await self.session.execute(text("SELECT 1"))
+        return ProjectAccessGrant(project_id, user_id, language)
+
+
+@pytest.mark.asyncio
+async def test_graph_runs_after_access_check_on_the_shared_session():
+    from app.agents.context import create_context
+    from app.agents.orchestrator import AgentOrchestrator
+
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    try:
+        async with AsyncSession(engine) as session:
+            tracker = SessionTracker(session)
+            orchestrator = AgentOrchestrator(
+                tracker=tracker,
+                state_manager=NoState(),
+                isolation=QueryingIsolation(session),
+                result_cache=AgentResultCache(enabled=False),
+            )
+            context = create_context(uuid4(), uuid4(), "architecture", "en")
+            input_data = AgentInput(
+                project_id=context.project_id,
+                correlation_id=context.correlation_id,
+                language="en",
+                user_message="Design",
+            )
+            graph = AgentTaskGraph(
+                [
+                    AgentTask("api", StubAgent("api")),
+                    AgentTask("infra", StubAgent("infra")),
+                ]
+            )
+
+            result = await orchestrator.execute_agent_graph(
+                "architecture",
+                context,
+                input_data,
+                graph,
+                limiter=ConcurrencyLimiter(4, 4),
+            )
+
+            assert result["status"] == "completed"
+            assert sorted(tracker.calls) == [
+                ("complete", "api", "completed"),
+                ("complete", "infra", "completed"),
+                ("start", "api"),
+                ("start", "infra"),
+            ]
+            assert not session.in_transaction()
+    finally:
+        await engine.dispose()
@@ -0,0 +1,82 @@
+from uuid import uuid4
+
+import pytest
+from redis.exceptions import NoScriptError
+
+from app.agents.state_manager import (
+    SCRIPT_SHAS,
+    UPDATE_FIELDS_LUA,
+    ExecutionStateManager,
+    decode_fields,
+    encode_fields,
+)
+
+
+class RecordingConnection:
+    """Connection stand-in recording script calls."""
+
+    def __init__(self, cached: bool = True):
+        self.cached = cached
+        self.calls = []
+
+    async def evalsha(self, sha, numkeys, *keys_and_args):
+        self.calls.append(("evalsha", sha, keys_and_args))
+        if not self.cached:
+            raise NoScriptError("NOSCRIPT No matching script")
+        return 1
+
+    async def eval(self, script, numkeys, *keys_and_args):
+        self.calls.append(("eval", script, keys_and_args))
+        self.cached = True
+        return 1
+
+
+class RecordingService:
+    def __init__(self, conn):
+        self.conn = conn
+
+    async def execute_with_retry(self, operation, func, *args, project_id, **kwargs):
+        return await func(self.conn, *args, **kwargs)
+
+
+def test_fields_roundtrip_with_types():
+    fields = {"progress": 40, "current_agent": "pm", "meta": {"a": [1, None]}}
+    assert decode_fields(encode_fields(fields)) == fields
+    assert decode_fields({"progress": "1", "missing": None}) == {"progress": 1}
+
+
+@pytest.mark.asyncio
+async def test_update_sends_only_changed_fields_in_one_script_call():
+    conn = RecordingConnection()
+    manager = ExecutionStateManager(RecordingService(conn))
+    project_id, correlation_id = uuid4(), uuid4()
+
+    await manager.update_state(project_id, correlation_id, "architect", 250)
+
+    [(command, sha, (key, ttl, *pairs))] = conn.calls
+    assert (command, sha) == ("evalsha", SCRIPT_SHAS[UPDATE_FIELDS_LUA])
+    assert key == f"agent:execution:{project_id}:{correlation_id}"
+    assert ttl == manager.ttl_seconds
+    fields = dict(zip(pairs[::2], pairs[1::2]))
+    assert set(fields) == {"current_agent", "progress", "updated_at"}
+    assert fields["progress"] == "100"
+
+
+@pytest.mark.asyncio
+async def test_unknown_script_falls_back_to_eval_once():
+    conn = RecordingConnection(cached=False)
+    manager = ExecutionStateManager(RecordingService(conn))
+
+    for _ in range(2):
+        assert await manager.update_fields(uuid4(), uuid4(), {"stage": "spec"})
+
+    assert [call[0] for call in conn.calls] == ["evalsha", "eval", "evalsha"]
+
+
+@pytest.mark.asyncio
+async def test_empty_updates_and_reads_are_rejected():
+    manager = ExecutionStateManager(RecordingService(RecordingConnection()))
+    with pytest.raises(ValueError):
+        await manager.update_fields(uuid4(), uuid4(), {})
+    with pytest.raises(ValueError):
+        await manager.get_state(uuid4(), uuid4(), fields=[])
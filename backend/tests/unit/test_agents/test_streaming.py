@@ -0,0 +1,250 @@
+import asyncio
+from contextlib import asynccontextmanager
+from uuid import uuid4
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import (
+    Column,
+    Integer,
+    MetaData,
+    PrimaryKeyConstraint,
+    Table,
+    Text,
+    Uuid,
+)
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.agents.contracts import AgentInput, AgentOutput
+from app.agents.scheduler import (
+    AgentGraphScheduler,
+    AgentTask,
+    AgentTaskGraph,
+    ConcurrencyLimiter,
+)
+from app.agents.streaming import (
+    AgentOutputStreaming,
+    ChunkStore,
+    OutputStream,
+    stream_agent_output,
+    stream_operation_id,
+)
+
+metadata = MetaData()
+
+chunks = Table(
+    "agent_execution_chunks",
+    metadata,
+    Column("execution_id", Uuid, nullable=False),
+    Column("project_id", Uuid, nullable=False),
+    Column("seq", Integer, nullable=False),
+    Column("content", Text, nullable=False),
+    PrimaryKeyConstraint("execution_id", "seq"),
+)
+
+
+@pytest_asyncio.fixture
+async def store():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as connection:
+        await connection.run_sync(metadata.create_all)
+
+    @asynccontextmanager
+    async def factory():
+        async with AsyncSession(engine) as session, session.begin():
+            yield session
+
+    yield ChunkStore(session_factory=factory, chunks=chunks)
+    await engine.dispose()
+
+
+class RecordingPublisher:
+    def __init__(self, fail=False):
+        self.events = []
+        self.fail = fail
+
+    async def publish_event(self, project_id, operation_id, event):
+        if self.fail:
+            raise ConnectionError("redis down")
+        self.events.append((project_id, operation_id, event))
+
+
+class TypingAgent:
+    """Streaming agent yielding words, optionally failing part way."""
+
+    def __init__(self, words, fail_after=None, final=None):
+        self.words = words
+        self.fail_after = fail_after
+        self.final = final
+
+    async def execute(self, input: AgentInput) -> AgentOutput:
+        raise AssertionError("streaming agents are called with stream()")
+
+    async def stream(self, input: AgentInput):
+        for index, word in enumerate(self.words):
+            if index == self.fail_after:
+                raise RuntimeError("model disconnected")
+            await asyncio.sleep(0)
+            yield word
+        if self.final is not None:
+            yield self.final
+
+
+def make_input():
+    return AgentInput(
+        project_id=uuid4(), correlation_id=uuid4(), language="en", user_message="Go"
+    )
+
+
+@pytest.mark.asyncio
+async def test_chunks_are_published_at_once_and_persisted_in_bounded_batches(store):
+    publisher = RecordingPublisher()
+    execution_id, project_id = uuid4(), uuid4()
+    stream = OutputStream(
+        execution_id, project_id, store, publisher, max_batch_chunks=4
+    )
+
+    for index in range(10):
+        await stream.write(f"w{index} ")
+        assert len(publisher.events) == index + 1
+        # Never more than one unflushed batch at risk
+        assert stream.pending < 4
+        persisted = await store.read(execution_id, project_id)
+        assert len(persisted) == (index + 1) // 4 * 4
+
+    await stream.close("completed")
+
+    assert stream.flushes == 3
+    assert await stream.assemble() == "".join(f"w{i} " for i in range(10))
+    project, operation, end = publisher.events[-1]
+    assert (project, operation) == (project_id, stream_operation_id(execution_id))
+    assert end == {
+        "type": "agent.output.end",
+        "execution_id": str(execution_id),
+        "status": "completed",
+        "agent_status": "completed",
+        "chunks": 10,
+    }
+    assert [c.seq for c in await store.read(execution_id, project_id, 7)] == [8, 9]
+
+
+@pytest.mark.asyncio
+async def test_large_chunks_and_old_chunks_flush_early(store):
+    stream = OutputStream(
+        uuid4(),
+        uuid4(),
+        store,
+        RecordingPublisher(),
+        max_batch_chunks=100,
+        max_batch_chars=10,
+        flush_interval_seconds=5.0,
+    )
+    await stream.write("x" * 12)
+    assert stream.pending == 0
+
+    stream.flush_interval_seconds = 0.0
+    await stream.write("y")
+    assert stream.pending == 0
+
+
+class PausingAgent:
+    """Streaming agent that pauses after its first deltas until released."""
+
+    def __init__(self):
+        self.release = asyncio.Event()
+
+    async def stream(self, input: AgentInput):
+        yield "thinking "
+        yield "about it "
+        # Waiting on a slow model call or tool
+        await self.release.wait()
+        yield "done"
+
+
+@pytest.mark.asyncio
+async def test_chunks_are_persisted_while_the_agent_pauses(store):
+    execution_id, project_id = uuid4(), uuid4()
+    stream = OutputStream(
+        execution_id,
+        project_id,
+        store,
+        RecordingPublisher(),
+        max_batch_chunks=100,
+        flush_interval_seconds=0.05,
+    )
+    agent = PausingAgent()
+    run = asyncio.create_task(
+        stream_agent_output(agent, make_input(), stream, "writer")
+    )
+
+    for _ in range(100):
+        if stream.flushes:
+            break
+        await asyncio.sleep(0.01)
+    assert not run.done()
+    persisted = await store.read(execution_id, project_id)
+    assert [c.content for c in persisted] == ["thinking ", "about it "]
+
+    agent.release.set()
+    output = await asyncio.wait_for(run, timeout=1)
+    assert output.content == "thinking about it done"
+    assert stream._timer is None
+
+
+@pytest.mark.asyncio
+async def test_failed_agent_flushes_partial_output_and_ends_the_stream(store):
+    publisher = RecordingPublisher()
+    stream = OutputStream(uuid4(), uuid4(), store, publisher, max_batch_chunks=4)
+    agent = TypingAgent(["a", "b", "c", "d", "e", "f"], fail_after=5)
+
+    with pytest.raises(RuntimeError):
+        await stream_agent_output(agent, make_input(), stream, "writer")
+
+    assert await stream.assemble() == "abcde"
+    assert publisher.events[-1][2]["status"] == "failed"
+
+
+@pytest.mark.asyncio
+async def test_publish_errors_do_not_fail_the_agent(store):
+    stream = OutputStream(uuid4(), uuid4(), store, RecordingPublisher(fail=True))
+
+    output = await stream_agent_output(
+        TypingAgent(["Hello, ", "world"]), make_input(), stream, "writer"
+    )
+
+    assert output.content == "Hello, world"
+    assert output.status == "completed"
+    assert stream.publish_errors == 3
+
+
+@pytest.mark.asyncio
+async def test_scheduler_streams_nodes_and_keeps_the_final_output(store):
+    publisher = RecordingPublisher()
+    streaming = AgentOutputStreaming(store, publisher, max_batch_chunks=2)
+    execution_ids = {}
+
+    def open_stream(task, node_input):
+        execution_ids[task.name] = uuid4()
+        return streaming.open(execution_ids[task.name], node_input.project_id)
+
+    final = AgentOutput(
+        agent_type="writer", status="needs_input", metadata={"question": "Budget?"}
+    )
+    graph = AgentTaskGraph(
+        [AgentTask("draft", TypingAgent(["Draft ", "plan ", "ready"], final=final))]
+    )
+    input_data = make_input()
+
+    results = await AgentGraphScheduler(
+        limiter=ConcurrencyLimiter(2, 2), open_stream=open_stream
+    ).run(graph, input_data)
+
+    output = results["draft"].output
+    assert output.content == "Draft plan ready"
+    assert output.status == "needs_input"
+    assert output.metadata == {"question": "Budget?"}
+    assert await store.assemble(execution_ids["draft"], input_data.project_id) == (
+        "Draft plan ready"
+    )
+    end = publisher.events[-1][2]
+    assert (end["status"], end["agent_status"]) == ("completed", "needs_input")
@@ -0,0 +1,344 @@
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime, timedelta
+from uuid import uuid4
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import (
+    JSON,
+    Column,
+    DateTime,
+    Float,
+    Integer,
+    MetaData,
+    PrimaryKeyConstraint,
+    String,
+    Table,
+    Text,
+    Uuid,
+    insert,
+    select,
+)
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.agents.tracker import AgentExecutionTracker
+from app.agents.write_behind import TrackerEvent, TrackerWriteBehind
+from app.services.agent_metrics_rollup import AgentMetricsRollup, ExecutionState
+
+metadata = MetaData()
+
+executions = Table(
+    "agent_executions",
+    metadata,
+    Column("id", Uuid, primary_key=True),
+    Column("project_id", Uuid, nullable=False),
+    Column("agent_type", String(50), nullable=False),
+    Column("correlation_id", Uuid, nullable=False),
+    Column("output_data", JSON),
+    Column("status", String(50), nullable=False),
+    Column("error_message", Text),
+    Column("started_at", DateTime(timezone=True), nullable=False),
+    Column("completed_at", DateTime(timezone=True)),
+    Column("duration_ms", Integer),
+    Column("prompt_tokens", Integer, nullable=False, default=0),
+    Column("completion_tokens", Integer, nullable=False, default=0),
+    Column("cost_usd", Float, nullable=False, default=0.0),
+)
+
+rollups = Table(
+    "agent_execution_rollups",
+    metadata,
+    Column("project_id", Uuid, nullable=False),
+    Column("agent_type", String(50), nullable=False),
+    Column("bucket_start", DateTime(timezone=True), nullable=False),
+    Column("started_count", Integer, nullable=False, default=0),
+    Column("completed_count", Integer, nullable=False, default=0),
+    Column("failed_count", Integer, nullable=False, default=0),
+    Column("finished_count", Integer, nullable=False, default=0),
+    Column("duration_seconds_sum", Float, nullable=False, default=0.0),
+    Column("open_started_epoch_sum", Float, nullable=False, default=0.0),
+    Column("prompt_tokens_sum", Integer, nullable=False, default=0),
+    Column("completion_tokens_sum", Integer, nullable=False, default=0),
+    Column("cost_usd_sum", Float, nullable=False, default=0.0),
+    PrimaryKeyConstraint("project_id", "agent_type", "bucket_start"),
+)
+
+STARTED = datetime.now(UTC) - timedelta(seconds=30)
+
+
+@pytest_asyncio.fixture
+async def engine():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as connection:
+        await connection.run_sync(metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+def rollup():
+    return AgentMetricsRollup(executions, rollups)
+
+
+@pytest.fixture
+def sessions(engine):
+    calls = []
+
+    @asynccontextmanager
+    async def factory():
+        calls.append(1)
+        async with AsyncSession(engine) as session, session.begin():
+            yield session
+
+    factory.calls = calls
+    return factory
+
+
+def _buffer(sessions, rollup, **kwargs):
+    kwargs.setdefault("flush_interval_seconds", 5.0)
+    return TrackerWriteBehind(
+        session_factory=sessions, executions=executions, rollup=rollup, **kwargs
+    )
+
+
+async def _start(engine, rollup, count):
+    ids = []
+    async with AsyncSession(engine) as session, session.begin():
+        for _ in range(count):
+            execution_id, project_id = uuid4(), uuid4()
+            await session.execute(
+                insert(executions).values(
+                    id=execution_id,
+                    project_id=project_id,
+                    agent_type="pm",
+                    correlation_id=uuid4(),
+                    status="running",
+                    started_at=STARTED,
+                )
+            )
+            await rollup.record(
+                session, project_id, "pm", STARTED, None, ExecutionState("running")
+            )
+            ids.append(execution_id)
+    return ids
+
+
+async def _rows(engine):
+    async with engine.connect() as connection:
+        result = await connection.execute(select(executions))
+        return {row.id: row for row in result.all()}
+
+
+def _complete(execution_id, **kwargs):
+    return TrackerEvent(
+        status="completed",
+        completed_at=datetime.now(UTC),
+        execution_id=execution_id,
+        output_data={"ok": True},
+        **kwargs,
+    )
+
+
+@pytest.mark.asyncio
+async def test_full_batches_flush_early_and_close_writes_the_rest(
+    engine, rollup, sessions
+):
+    ids = await _start(engine, rollup, 25)
+    buffer = _buffer(sessions, rollup, batch_size=10)
+
+    for execution_id in ids:
+        await buffer.submit(_complete(execution_id))
+    for _ in range(50):
+        await asyncio.sleep(0.01)
+        if buffer.stats()["flushed"] == 20:
+            break
+
+    stats = buffer.stats()
+    assert (stats["flushed"], stats["batches"], buffer.pending) == (20, 2, 5)
+
+    await buffer.close()
+
+    rows = await _rows(engine)
+    assert all(row.status == "completed" for row in rows.values())
+    assert all(row.output_data == {"ok": True} for row in rows.values())
+    assert all(row.duration_ms >= 30_000 for row in rows.values())
+    assert buffer.stats()["flushed"] == 25
+    assert buffer.stats()["lost"] == 0
+    async with AsyncSession(engine) as session:
+        assert (await rollup.check_consistency(session))["consistent"]
+
+
+@pytest.mark.asyncio
+async def test_interval_flush_and_lag_metrics(engine, rollup, sessions):
+    [execution_id] = await _start(engine, rollup, 1)
+    buffer = _buffer(sessions, rollup, flush_interval_seconds=0.05)
+
+    await buffer.submit(_complete(execution_id))
+    assert buffer.stats()["queue_depth"] == 1
+    await asyncio.sleep(0.3)
+
+    stats = buffer.stats()
+    assert stats["flushed"] == 1
+    assert stats["queue_depth"] == 0
+    assert 0.04 <= stats["last_flush_lag_seconds"] < 0.3
+    await buffer.close()
+
+
+@pytest.mark.asyncio
+async def test_events_of_one_execution_merge_in_order(engine, rollup, sessions):
+    [execution_id] = await _start(engine, rollup, 1)
+    correlation_id = (await _rows(engine))[execution_id].correlation_id
+    buffer = _buffer(sessions, rollup)
+
+    await buffer.submit(_complete(execution_id))
+    await buffer.submit(
+        TrackerEvent(
+            status="failed",
+            completed_at=datetime.now(UTC),
+            correlation_id=correlation_id,
+            error_message="boom",
+        )
+    )
+    await buffer.submit(
+        TrackerEvent(
+            status="failed",
+            completed_at=datetime.now(UTC),
+            correlation_id=uuid4(),
+            error_message="unknown",
+        )
+    )
+    await buffer.close()
+
+    row = (await _rows(engine))[execution_id]
+    assert (row.status, row.error_message, row.output_data) == (
+        "failed",
+        "boom",
+        {"ok": True},
+    )
+    assert buffer.stats()["missing_executions"] == 1
+    assert buffer.stats()["batches"] == 1
+    assert len(sessions.calls) == 1
+    async with AsyncSession(engine) as session:
+        assert (await rollup.check_consistency(session))["consistent"]
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_is_retried(engine, rollup, sessions):
+    [execution_id] = await _start(engine, rollup, 1)
+    attempts = []
+
+    @asynccontextmanager
+    async def flaky():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise ConnectionError("database unavailable")
+        async with sessions() as session:
+            yield session
+
+    buffer = _buffer(flaky, rollup, flush_interval_seconds=0.01)
+    await buffer.submit(_complete(execution_id))
+    await asyncio.sleep(0.2)
+
+    assert buffer.stats()["failed_flushes"] == 1
+    assert buffer.stats()["flushed"] == 1
+    assert (await _rows(engine))[execution_id].status == "completed"
+    await buffer.close()
+    with pytest.raises(RuntimeError, match="closed"):
+        await buffer.submit(_complete(execution_id))
+
+
+@pytest.mark.asyncio
+async def test_events_wait_for_the_start_transaction_to_commit(tmp_path, rollup):
+    # A file database: the flusher's connection cannot see uncommitted rows
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'tracker.db'}")
+    async with engine.begin() as connection:
+        await connection.run_sync(metadata.create_all)
+
+    @asynccontextmanager
+    async def sessions():
+        async with AsyncSession(engine) as session, session.begin():
+            yield session
+
+    buffer = _buffer(sessions, rollup, flush_interval_seconds=0.02)
+    execution_id, project_id = uuid4(), uuid4()
+    try:
+        async with AsyncSession(engine) as session, session.begin():
+            await session.execute(
+                insert(executions).values(
+                    id=execution_id,
+                    project_id=project_id,
+                    agent_type="pm",
+                    correlation_id=uuid4(),
+                    status="running",
+                    started_at=STARTED,
+                )
+            )
+            await rollup.record(
+                session, project_id, "pm", STARTED, None, ExecutionState("running")
+            )
+            # Finished before its start transaction commits
+            await buffer.submit(_complete(execution_id))
+            await asyncio.sleep(0.1)
+            assert (buffer.stats()["flushed"], buffer.pending) == (0, 1)
+
+        for _ in range(50):
+            await asyncio.sleep(0.02)
+            if buffer.stats()["flushed"] == 1:
+                break
+        assert (await _rows(engine))[execution_id].status == "completed"
+        assert buffer.stats()["missing_executions"] == 0
+
+        # Executions that never appear are dropped once the retry age passes
+        buffer.missing_retry_seconds = 0.05
+        await buffer.submit(_complete(uuid4()))
+        await asyncio.sleep(0.3)
+        assert buffer.stats()["missing_executions"] == 1
+        assert buffer.pending == 0
+    finally:
+        await buffer.close()
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_tracker_submits_instead_of_writing(engine, rollup, sessions):
+    [execution_id] = await _start(engine, rollup, 1)
+    buffer = _buffer(sessions, rollup)
+    # No session use: the tracker only enqueues
+    tracker = AgentExecutionTracker(session=None, write_behind=buffer)
+
+    await tracker.complete_execution(execution_id, {"api_key": "secret"})
+    assert buffer.pending == 1
+    await buffer.close()
+
+    assert (await _rows(engine))[execution_id].output_data == {"api_key": "[redacted]"}
+
+
+def test_postgresql_batch_is_one_update_from_values(rollup):
+    buffer = TrackerWriteBehind(executions=executions, rollup=rollup)
+    now = datetime.now(UTC)
+    merged = {
+        uuid4(): {
+            "status": "completed",
+            "completed_at": now,
+            "duration_ms": 5,
+            "output_data": {"ok": True},
+            "error_message": None,
+        },
+        uuid4(): {
+            "status": "failed",
+            "completed_at": now,
+            "duration_ms": 7,
+            "output_data": None,
+            "error_message": "boom",
+        },
+    }
+
+    sql = str(buffer.values_update(merged).compile(dialect=postgresql.dialect()))
+
+    assert sql.count("UPDATE agent_executions") == 1
+    assert "FROM (VALUES" in sql
+    assert (
+        "coalesce(CAST(batch.output_data AS JSON), agent_executions.output_data)" in sql
+    )